@@ -1,10 +1,12 @@
+import hashlib
 import os
-from typing import Any, Dict
+from typing import Any, Dict, List
 
 from dotenv import load_dotenv
 from pydantic_settings import BaseSettings
 
 from app.core.enums import ConfigLLm, ResponseFormat
+from app.core.models.llm_endpoint import LLMEndpoint
 from app.core.system_prompts.expert_review import expert_review_prompt
 from app.infrastructure.utils.decorators.singleton import singleton
 
@@ -28,6 +30,9 @@ class Settings(BaseSettings):
 
     # API settings
     API_PREFIX: str = os.getenv("API_PREFIX", "/api")
+    RATE_LIMIT_ENABLED: bool = (
+        os.getenv("RATE_LIMIT_ENABLED", "True").lower() == "true"
+    )  # Disable only for load tests
 
     # Authentication settings
     SECRET_KEY: str = os.getenv(
@@ -35,6 +40,201 @@ class Settings(BaseSettings):
     )
     HASH_ALGORITHM: str = os.getenv("HASH_ALGORITHM", "HS256")
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
+    REFRESH_TOKEN_EXPIRE_DAYS: int = int(os.getenv("REFRESH_TOKEN_EXPIRE_DAYS", "7"))
+
+    # User cache settings (authenticated users by id, per API process)
+    USER_CACHE_ENABLED: bool = (
+        os.getenv("USER_CACHE_ENABLED", "True").lower() == "true"
+    )
+    USER_CACHE_TTL: int = int(os.getenv("USER_CACHE_TTL", "60"))
+    USER_CACHE_MAX_ENTRIES: int = int(os.getenv("USER_CACHE_MAX_ENTRIES", "10000"))
+
+    # Token revocation settings (revoked token ids kept in memory per API process)
+    TOKEN_REVOCATION_REFRESH_INTERVAL: float = float(
+        os.getenv("TOKEN_REVOCATION_REFRESH_INTERVAL", "5")
+    )
+
+    # Password hasher settings (bcrypt runs in a process pool off the event loop)
+    PASSWORD_HASHER_WORKERS: int = int(
+        os.getenv("PASSWORD_HASHER_WORKERS", str(os.cpu_count() or 1))
+    )
+    PASSWORD_HASHER_MAX_PENDING: int = int(
+        os.getenv("PASSWORD_HASHER_MAX_PENDING", "0")
+    )  # 0 means 4 per worker
+    PASSWORD_HASHER_RETRY_AFTER: int = int(
+        os.getenv("PASSWORD_HASHER_RETRY_AFTER", "1")
+    )
+
+    # Review job queue / worker settings
+    WORKER_CONCURRENCY: int = int(os.getenv("WORKER_CONCURRENCY", "4"))
+    WORKER_POLL_INTERVAL: float = float(os.getenv("WORKER_POLL_INTERVAL", "1.0"))
+    JOB_VISIBILITY_TIMEOUT: int = int(os.getenv("JOB_VISIBILITY_TIMEOUT", "120"))
+    JOB_MAX_ATTEMPTS: int = int(os.getenv("JOB_MAX_ATTEMPTS", "3"))
+    JOB_RETRY_DELAY: int = int(os.getenv("JOB_RETRY_DELAY", "10"))
+    JOB_CANCEL_POLL_INTERVAL: float = float(
+        os.getenv("JOB_CANCEL_POLL_INTERVAL", "1.0")
+    )
+    REVIEW_JOB_TIMEOUT: int = int(os.getenv("REVIEW_JOB_TIMEOUT", "300"))
+    REVIEW_DEADLINE: int = int(os.getenv("REVIEW_DEADLINE", "1800"))
+    REVIEW_SWEEP_INTERVAL: int = int(os.getenv("REVIEW_SWEEP_INTERVAL", "60"))
+    REVIEW_BATCH_MAX_SIZE: int = int(os.getenv("REVIEW_BATCH_MAX_SIZE", "100"))
+    REVIEW_BATCH_CONCURRENCY: int = int(os.getenv("REVIEW_BATCH_CONCURRENCY", "8"))
+
+    # Maintenance settings (periodic housekeeping run by one worker at a time)
+    MAINTENANCE_ENABLED: bool = (
+        os.getenv("MAINTENANCE_ENABLED", "True").lower() == "true"
+    )
+    MAINTENANCE_POLL_INTERVAL: float = float(
+        os.getenv("MAINTENANCE_POLL_INTERVAL", "10")
+    )
+    BLACKLIST_CLEANUP_INTERVAL: int = int(
+        os.getenv("BLACKLIST_CLEANUP_INTERVAL", "3600")
+    )
+    REVIEW_CACHE_EVICTION_INTERVAL: int = int(
+        os.getenv("REVIEW_CACHE_EVICTION_INTERVAL", "300")
+    )
+
+    # Metrics settings (Prometheus text format, the worker serves its own)
+    METRICS_ENABLED: bool = os.getenv("METRICS_ENABLED", "True").lower() == "true"
+    WORKER_METRICS_PORT: int = int(os.getenv("WORKER_METRICS_PORT", "9100"))
+
+    # Review scheduler settings (fair share across users, small jobs first)
+    REVIEW_SCHEDULER_ENABLED: bool = (
+        os.getenv("REVIEW_SCHEDULER_ENABLED", "True").lower() == "true"
+    )
+    REVIEW_SCHEDULER_USER_MAX_IN_FLIGHT: int = int(
+        os.getenv("REVIEW_SCHEDULER_USER_MAX_IN_FLIGHT", "2")
+    )
+    REVIEW_SCHEDULER_AGING_TOKENS_PER_SECOND: float = float(
+        os.getenv("REVIEW_SCHEDULER_AGING_TOKENS_PER_SECOND", "50")
+    )
+    REVIEW_SCHEDULER_CANDIDATES_PER_USER: int = int(
+        os.getenv("REVIEW_SCHEDULER_CANDIDATES_PER_USER", "10")
+    )
+    REVIEW_SCHEDULER_MAX_USERS: int = int(
+        os.getenv("REVIEW_SCHEDULER_MAX_USERS", "100")
+    )
+
+    # Agent executor settings (blocking LLM calls run off the event loop)
+    AGENT_EXECUTOR_WORKERS: int = int(os.getenv("AGENT_EXECUTOR_WORKERS", "8"))
+    AGENT_MAX_CONCURRENCY: int = int(
+        os.getenv("AGENT_MAX_CONCURRENCY", os.getenv("AGENT_EXECUTOR_WORKERS", "8"))
+    )
+
+    # Agent pool settings (warm agents reused across reviews)
+    AGENT_POOL_SIZE: int = int(os.getenv("AGENT_POOL_SIZE", "4"))
+    AGENT_POOL_SIZES: str = os.getenv("AGENT_POOL_SIZES", "")  # e.g. python=8,go=2
+    AGENT_POOL_IDLE_TIMEOUT: int = int(os.getenv("AGENT_POOL_IDLE_TIMEOUT", "300"))
+    AGENT_POOL_MAX_KEYS: int = int(os.getenv("AGENT_POOL_MAX_KEYS", "32"))
+
+    # Review cache settings (content-addressed cache of LLM reviews)
+    REVIEW_CACHE_ENABLED: bool = (
+        os.getenv("REVIEW_CACHE_ENABLED", "True").lower() == "true"
+    )
+    REVIEW_CACHE_TTL: int = int(os.getenv("REVIEW_CACHE_TTL", str(7 * 24 * 3600)))
+    REVIEW_CACHE_MAX_ENTRIES: int = int(
+        os.getenv("REVIEW_CACHE_MAX_ENTRIES", "100000")
+    )
+    PROMPT_VERSION: str = os.getenv("PROMPT_VERSION", "")
+
+    # Review coalescing settings (identical in-flight reviews share one LLM call)
+    REVIEW_COALESCING_ENABLED: bool = (
+        os.getenv("REVIEW_COALESCING_ENABLED", "True").lower() == "true"
+    )
+    REVIEW_COALESCING_MAX_REVIEWS: int = int(
+        os.getenv("REVIEW_COALESCING_MAX_REVIEWS", "100")
+    )
+
+    # Near-duplicate detection settings (MinHash/LSH over code shingles)
+    NEAR_DUPLICATE_ENABLED: bool = (
+        os.getenv("NEAR_DUPLICATE_ENABLED", "True").lower() == "true"
+    )
+    NEAR_DUPLICATE_THRESHOLD: float = float(
+        os.getenv("NEAR_DUPLICATE_THRESHOLD", "0.9")
+    )
+    NEAR_DUPLICATE_BANDS: int = int(os.getenv("NEAR_DUPLICATE_BANDS", "16"))
+    NEAR_DUPLICATE_REFRESH_INTERVAL: int = int(
+        os.getenv("NEAR_DUPLICATE_REFRESH_INTERVAL", "60")
+    )
+    NEAR_DUPLICATE_MAX_ENTRIES: int = int(
+        os.getenv("NEAR_DUPLICATE_MAX_ENTRIES", "100000")
+    )
+
+    # Review streaming settings (Server-Sent Events)
+    REVIEW_STREAMING_ENABLED: bool = (
+        os.getenv("REVIEW_STREAMING_ENABLED", "True").lower() == "true"
+    )
+    REVIEW_STREAM_FLUSH_INTERVAL: float = float(
+        os.getenv("REVIEW_STREAM_FLUSH_INTERVAL", "0.1")
+    )
+    REVIEW_STREAM_POLL_INTERVAL: float = float(
+        os.getenv("REVIEW_STREAM_POLL_INTERVAL", "0.25")
+    )
+    REVIEW_STREAM_TIMEOUT: int = int(os.getenv("REVIEW_STREAM_TIMEOUT", "600"))
+    REVIEW_STREAM_TTL: int = int(os.getenv("REVIEW_STREAM_TTL", "3600"))
+
+    # Chunking settings (large submissions are reviewed in parallel chunks)
+    REVIEW_CHUNKING_ENABLED: bool = (
+        os.getenv("REVIEW_CHUNKING_ENABLED", "True").lower() == "true"
+    )
+    REVIEW_CHUNK_MAX_CHARS: int = int(os.getenv("REVIEW_CHUNK_MAX_CHARS", "6000"))
+    REVIEW_CHUNK_MAX_PARALLEL: int = int(os.getenv("REVIEW_CHUNK_MAX_PARALLEL", "4"))
+    REVIEW_CHUNK_PARSE_RETRIES: int = int(os.getenv("REVIEW_CHUNK_PARSE_RETRIES", "1"))
+
+    # Provisional review settings (local static analysis at submission time)
+    PROVISIONAL_REVIEW_ENABLED: bool = (
+        os.getenv("PROVISIONAL_REVIEW_ENABLED", "True").lower() == "true"
+    )
+    PROVISIONAL_REVIEW_MAX_CHARS: int = int(
+        os.getenv("PROVISIONAL_REVIEW_MAX_CHARS", "50000")
+    )
+
+    # Token budget settings (estimated prompt tokens of reviews)
+    REVIEW_COMPACTION_ENABLED: bool = (
+        os.getenv("REVIEW_COMPACTION_ENABLED", "True").lower() == "true"
+    )
+    REVIEW_MAX_INPUT_TOKENS: int = int(os.getenv("REVIEW_MAX_INPUT_TOKENS", "8000"))
+    REVIEW_MAX_TOTAL_TOKENS: int = int(
+        os.getenv("REVIEW_MAX_TOTAL_TOKENS", "100000")
+    )
+
+    # Agent backend settings
+    AGENT_BACKEND: str = os.getenv("AGENT_BACKEND", "praison")  # praison, openai
+    LLM_HTTP_MAX_CONNECTIONS: int = int(os.getenv("LLM_HTTP_MAX_CONNECTIONS", "200"))
+    LLM_HTTP_MAX_KEEPALIVE: int = int(os.getenv("LLM_HTTP_MAX_KEEPALIVE", "100"))
+    LLM_HTTP_KEEPALIVE_EXPIRY: float = float(
+        os.getenv("LLM_HTTP_KEEPALIVE_EXPIRY", "30")
+    )
+
+    # LLM resilience settings (retries, circuit breaker and fallback endpoints)
+    LLM_RESILIENCE_ENABLED: bool = (
+        os.getenv("LLM_RESILIENCE_ENABLED", "True").lower() == "true"
+    )
+    LLM_RETRY_MAX_ATTEMPTS: int = int(os.getenv("LLM_RETRY_MAX_ATTEMPTS", "3"))
+    LLM_RETRY_BASE_DELAY: float = float(os.getenv("LLM_RETRY_BASE_DELAY", "0.5"))
+    LLM_RETRY_MAX_DELAY: float = float(os.getenv("LLM_RETRY_MAX_DELAY", "8"))
+    LLM_CIRCUIT_FAILURE_THRESHOLD: int = int(
+        os.getenv("LLM_CIRCUIT_FAILURE_THRESHOLD", "5")
+    )
+    LLM_CIRCUIT_RESET_TIMEOUT: float = float(
+        os.getenv("LLM_CIRCUIT_RESET_TIMEOUT", "30")
+    )
+    # e.g. groq/llama-3.1-8b-instant,openai/gpt-4o-mini@https://api.openai.com/v1@OPENAI_FALLBACK_KEY
+    LLM_FALLBACKS: str = os.getenv("LLM_FALLBACKS", "")
+
+    # LLM load balancing settings (pool of interchangeable endpoints)
+    # Same entries as LLM_FALLBACKS, with an optional #max_concurrency suffix
+    # e.g. groq/llama-3.3-70b-versatile@https://api.groq.com/openai/v1@GROQ_KEY_2#8
+    LLM_POOL: str = os.getenv("LLM_POOL", "")
+    LLM_ENDPOINT_MAX_CONCURRENCY: int = int(
+        os.getenv("LLM_ENDPOINT_MAX_CONCURRENCY", "0")
+    )
+    LLM_BALANCER_EWMA_ALPHA: float = float(
+        os.getenv("LLM_BALANCER_EWMA_ALPHA", "0.3")
+    )
+    LLM_BALANCER_SLOT_TIMEOUT: float = float(
+        os.getenv("LLM_BALANCER_SLOT_TIMEOUT", "30")
+    )
 
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
@@ -53,6 +253,65 @@ class Settings(BaseSettings):
 
         return f"{provider}{model}"
 
+    def get_api_model_name(self) -> str:
+        """Get the model name as the OpenAI-compatible API expects it (no provider prefix)"""
+        return os.getenv("AI_MODEL", "meta-llama/llama-4-scout-17b-16e-instruct")
+
+    def get_llm_endpoints(self) -> List[LLMEndpoint]:
+        """
+        Get the LLM endpoints in failover order: the load balanced pool (the
+        configured model, then the LLM_POOL entries), then the LLM_FALLBACKS
+        entries
+        """
+        pool = self.get_llm_pool()
+        return pool + self._parse_llm_endpoints(self.LLM_FALLBACKS, pool[0])
+
+    def get_llm_pool(self) -> List[LLMEndpoint]:
+        """
+        Get the endpoints calls are load balanced across: the configured model
+        and the LLM_POOL entries
+        """
+        llm_config = self.llm_config
+        primary = LLMEndpoint(
+            model=llm_config[ConfigLLm.MODEL],
+            api_model=self.get_api_model_name(),
+            base_url=llm_config[ConfigLLm.OPENAI_BASE_URL],
+            api_key=llm_config[ConfigLLm.API_KEY] or "",
+            max_concurrency=self.LLM_ENDPOINT_MAX_CONCURRENCY,
+        )
+        return [primary] + self._parse_llm_endpoints(self.LLM_POOL, primary)
+
+    def _parse_llm_endpoints(
+        self, entries: str, primary: LLMEndpoint
+    ) -> List[LLMEndpoint]:
+        """
+        Parse comma-separated `provider/model[@base_url[@API_KEY_ENV_VAR]][#max_concurrency]`
+        entries; the base URL and API key default to the primary ones.
+        """
+        endpoints = []
+        for entry in entries.split(","):
+            entry = entry.strip()
+            if not entry:
+                continue
+            max_concurrency = self.LLM_ENDPOINT_MAX_CONCURRENCY
+            head, _, limit = entry.rpartition("#")
+            if head and limit.isdigit():
+                entry, max_concurrency = head, int(limit)
+            model, _, rest = entry.partition("@")
+            base_url, _, api_key_var = rest.partition("@")
+            endpoints.append(
+                LLMEndpoint(
+                    model=model,
+                    api_model=model.split("/", 1)[-1],
+                    base_url=base_url or primary.base_url,
+                    api_key=(
+                        os.getenv(api_key_var, "") if api_key_var else primary.api_key
+                    ),
+                    max_concurrency=max_concurrency,
+                )
+            )
+        return endpoints
+
     def _validate_required_config(self) -> None:
         """Validate that all required configuration is present"""
         required_vars = ["AI_PROVIDER", "AI_MODEL", "OPENAI_API_KEY", "OPENAI_BASE_URL"]
@@ -68,6 +327,21 @@ class Settings(BaseSettings):
                 f"Please set these variables in your .env file or environment."
             )
 
+    def get_prompt_version(self) -> str:
+        """Get the prompt version, derived from the instructions when not set"""
+        if self.PROMPT_VERSION:
+            return self.PROMPT_VERSION
+        instructions = self.llm_config[ConfigLLm.INSTRUCTIONS]
+        return hashlib.sha256(instructions.encode("utf-8")).hexdigest()[:12]
+
+    def get_agent_pool_size(self, language: str) -> int:
+        """Get the agent pool size for a language, falling back to AGENT_POOL_SIZE"""
+        for entry in self.AGENT_POOL_SIZES.split(","):
+            name, _, size = entry.partition("=")
+            if name.strip().lower() == language.lower().strip() and size.strip():
+                return int(size)
+        return self.AGENT_POOL_SIZE
+
     @property
     def llm_config(self) -> Dict[str, Any]:
         """Get LLM configuration with proper type conversion"""
@@ -0,0 +1,26 @@
+import hashlib
+
+from pydantic import BaseModel, ConfigDict
+
+
+class LLMEndpoint(BaseModel):
+    """A model served by an OpenAI-compatible API, primary or fallback"""
+
+    model_config = ConfigDict(frozen=True)
+
+    model: str  # Provider-prefixed name, e.g. groq/meta-llama/llama-4-scout
+    api_model: str  # Name the API itself expects, without the provider prefix
+    base_url: str
+    api_key: str = ""
+    max_concurrency: int = 0  # Calls in flight at once, 0 for no limit
+
+    @property
+    def name(self) -> str:
+        """
+        Identifies the endpoint, e.g. for its circuit breaker. Keys of the same
+        API are told apart by a fingerprint, never by the key itself.
+        """
+        if not self.api_key:
+            return f"{self.model}@{self.base_url}"
+        key_id = hashlib.sha256(self.api_key.encode()).hexdigest()[:8]
+        return f"{self.model}@{self.base_url}#{key_id}"
@@ -2,7 +2,7 @@ from datetime import datetime
 from enum import StrEnum
 from typing import List, Optional
 
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 
 
 class ReviewRequest(BaseModel):
@@ -12,6 +12,13 @@ class ReviewRequest(BaseModel):
     code_submission: str
 
 
+class ReviewBatchRequest(BaseModel):
+    """Request model for submitting many reviews at once"""
+
+    reviews: List[ReviewRequest] = Field(min_length=1)
+    concurrency: Optional[int] = Field(default=None, ge=1)
+
+
 class Categories(StrEnum):
     PERFORMANCE = "performance"
     SECURITY = "security"
@@ -50,6 +57,21 @@ class CodeReviewIAResponse(BaseModel):
     refactored_example: Optional[str] = None
 
 
+class ReviewTimings(BaseModel):
+    """Where the processing time of a review went"""
+
+    source: str = "llm"  # llm, review_cache, near_duplicate, coalesced
+    model: Optional[str] = None
+    llm_calls: int = 0  # One per chunk of chunked reviews
+    llm_seconds: float = 0.0  # Summed over the LLM calls
+    time_to_first_token_seconds: Optional[float] = None  # Streamed calls only
+    parse_seconds: float = 0.0
+    parse_failures: int = 0
+    prompt_tokens: int = 0  # Estimated
+    completion_tokens: int = 0  # Estimated
+    total_seconds: float = 0.0  # From a worker picking the review up to its result
+
+
 class Review(ReviewRequest):
     """User domain model - agnostic to database implementation"""
 
@@ -57,5 +79,32 @@ class Review(ReviewRequest):
     user: str
     status: str = "pending"
     code_review: Optional[CodeReviewIAResponse] = None
+    estimated_tokens: Optional[int] = None  # Estimated prompt tokens sent to the LLM
+    queue_wait_seconds: Optional[float] = None  # From submission to a worker picking it up
+    timings: Optional[ReviewTimings] = None
+    attempts: int = 0  # Processing attempts started by workers
+    deadline_at: Optional[datetime] = None  # Recovered by the sweeper when overdue
     created_at: datetime = datetime.utcnow()
     updated_at: datetime = datetime.utcnow()
+
+
+class ReviewSignature(BaseModel):
+    """MinHash signature of a completed review, used for near-duplicate lookups"""
+
+    review_id: str
+    language: str
+    signature: bytes
+    indexed_at: datetime
+    model: Optional[str] = None  # Model and prompt version of the review
+    prompt_version: Optional[str] = None
+
+
+class ReviewStreamEvent(BaseModel):
+    """Incremental progress of a review (status transitions and LLM tokens)"""
+
+    review_id: str
+    seq: int
+    event: str  # status, token
+    data: str
+    created_at: datetime = Field(default_factory=datetime.utcnow)
+    expires_at: Optional[datetime] = None
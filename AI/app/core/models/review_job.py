@@ -0,0 +1,40 @@
+from datetime import datetime
+from enum import StrEnum
+from typing import List, Optional
+
+from pydantic import BaseModel, Field
+
+
+class JobStatus(StrEnum):
+    QUEUED = "queued"
+    LEASED = "leased"
+    HELD = "held"  # Waiting for a slot in its batch
+    DONE = "done"
+    FAILED = "failed"
+    CANCELLED = "cancelled"  # Its review was cancelled by its owner
+
+
+class ReviewJob(BaseModel):
+    """Review job domain model - a unit of work consumed by the review workers"""
+
+    id: Optional[str] = None
+    review_id: str
+    user: str
+    language: str
+    status: JobStatus = JobStatus.QUEUED
+    attempts: int = 0
+    max_attempts: int = 3
+    worker_id: Optional[str] = None
+    lease_expires_at: Optional[datetime] = None
+    available_at: datetime = Field(default_factory=datetime.utcnow)
+    last_error: Optional[str] = None
+    batch_id: Optional[str] = None
+    batch_concurrency: Optional[int] = None
+    estimated_tokens: int = 0  # Size of the review, used to schedule small jobs first
+    timeout_seconds: int = 0  # Max duration of an attempt, 0 for no limit
+    fingerprint: Optional[str] = None  # Review cache key, identical jobs coalesce
+    coalesced_review_ids: List[str] = Field(
+        default_factory=list
+    )  # Reviews completed by this job's result
+    created_at: datetime = Field(default_factory=datetime.utcnow)
+    updated_at: datetime = Field(default_factory=datetime.utcnow)
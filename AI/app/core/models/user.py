@@ -46,9 +46,18 @@ class Token(BaseModel):
     access_token: str
     token_type: str = "bearer"
     expires_in: int
+    refresh_token: Optional[str] = None
+    refresh_expires_in: Optional[int] = None
+
+
+class RefreshRequest(BaseModel):
+    """Model for refresh token exchange"""
+
+    refresh_token: str
 
 
 class TokenData(BaseModel):
     """Model for token data"""
 
     username: Optional[str] = None
+    user_id: Optional[str] = None  # Missing in tokens issued before it was added
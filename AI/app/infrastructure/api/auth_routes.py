@@ -1,12 +1,21 @@
+import uuid
 from datetime import timedelta
 
 from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
 
 from app.config.settings import Settings
-from app.core.models.user import Token, User, UserCreate, UserLogin, UserResponse
+from app.core.models.user import (
+    RefreshRequest,
+    Token,
+    User,
+    UserCreate,
+    UserLogin,
+    UserResponse,
+)
 from app.infrastructure.dependencies import get_authenticator, get_user_repository
 from app.infrastructure.logger import logger
+from app.infrastructure.services.password_hasher import PasswordHasherBusyError
 from app.interfaces.repositories.user_repository_interface import (
     UserRepositoryInterface,
 )
@@ -29,6 +38,34 @@ class AuthRoutes:
         current_user = await authenticator.get_current_user(token)
         return await authenticator.get_current_active_user(current_user)
 
+    async def _issue_tokens(
+        self, authenticator: AuthenticatorInterface, user: User, family: str
+    ) -> Token:
+        """Access token and refresh token of a login family"""
+        access_token = authenticator.create_access_token(
+            data={"sub": user.username, "uid": str(user.id), "fam": family},
+            expires_delta=timedelta(minutes=self.settings.ACCESS_TOKEN_EXPIRE_MINUTES),
+        )
+        refresh_token = await authenticator.create_refresh_token(user, family)
+
+        return Token(
+            username=user.username.capitalize(),
+            access_token=access_token,
+            token_type="bearer",
+            expires_in=self.settings.ACCESS_TOKEN_EXPIRE_MINUTES * 60,
+            refresh_token=refresh_token,
+            refresh_expires_in=self.settings.REFRESH_TOKEN_EXPIRE_DAYS * 24 * 3600,
+        )
+
+    def _busy(self, error: PasswordHasherBusyError) -> HTTPException:
+        """503 asking the client to retry once password hashes caught up"""
+        logger.warning(f"Password hasher saturated: {str(error)}")
+        return HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Authentication is busy, retry later",
+            headers={"Retry-After": str(max(1, round(error.retry_after)))},
+        )
+
     def _setup_routes(self):
         @self.router.post(
             "/register",
@@ -61,7 +98,9 @@ class AuthRoutes:
                     )
 
                 # Create new user
-                hashed_password = authenticator.get_password_hash(user_data.password)
+                hashed_password = await authenticator.get_password_hash(
+                    user_data.password
+                )
                 user = User(
                     username=user_data.username,
                     email=user_data.email,
@@ -82,6 +121,8 @@ class AuthRoutes:
             except HTTPException:
                 # Re-raise HTTPExceptions (like 400 for duplicate username/email)
                 raise
+            except PasswordHasherBusyError as e:
+                raise self._busy(e)
             except Exception as e:
                 logger.error(f"Error registering user: {str(e)}")
                 raise HTTPException(
@@ -111,22 +152,13 @@ class AuthRoutes:
                         status_code=status.HTTP_400_BAD_REQUEST, detail="Inactive user"
                     )
 
-                access_token_expires = timedelta(
-                    minutes=self.settings.ACCESS_TOKEN_EXPIRE_MINUTES
-                )
-                access_token = authenticator.create_access_token(
-                    data={"sub": user.username}, expires_delta=access_token_expires
-                )
-
-                return Token(
-                    username=user.username.capitalize(),
-                    access_token=access_token,
-                    token_type="bearer",
-                    expires_in=self.settings.ACCESS_TOKEN_EXPIRE_MINUTES * 60,
-                )
+                # Every login starts a family of rotated refresh tokens
+                return await self._issue_tokens(authenticator, user, uuid.uuid4().hex)
 
             except HTTPException:
                 raise
+            except PasswordHasherBusyError as e:
+                raise self._busy(e)
             except Exception as e:
                 logger.error(f"Error during login: {str(e)}")
                 raise HTTPException(
@@ -134,6 +166,36 @@ class AuthRoutes:
                     detail="Error during authentication",
                 )
 
+        @self.router.post("/refresh", response_model=Token)
+        async def refresh(
+            refresh_request: RefreshRequest,
+            authenticator: AuthenticatorInterface = Depends(get_authenticator),
+        ):
+            """
+            Exchange a refresh token for a new access token and refresh token
+
+            Renews a login without verifying the password again. Each refresh
+            token can be used once: using it twice revokes every refresh token of
+            the login, the client has to log in again.
+
+            Returns:
+            - 200: New access token and refresh token
+            - 401: If the refresh token is invalid, expired, used or revoked
+            """
+            try:
+                user, family = await authenticator.rotate_refresh_token(
+                    refresh_request.refresh_token
+                )
+                return await self._issue_tokens(authenticator, user, family)
+            except HTTPException:
+                raise
+            except Exception as e:
+                logger.error(f"Error refreshing token: {str(e)}")
+                raise HTTPException(
+                    status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                    detail="Error refreshing token",
+                )
+
         @self.router.post("/logout")
         async def logout(
             credentials: HTTPAuthorizationCredentials = Depends(HTTPBearer()),
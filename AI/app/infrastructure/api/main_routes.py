@@ -1,22 +1,64 @@
+import asyncio
 import csv
 import io
-from typing import List, Optional
-
-from fastapi import APIRouter, BackgroundTasks, Depends, Path, Query, Request, Response
+import json
+from datetime import datetime, timedelta
+from typing import AsyncIterator, List, Optional
+
+from fastapi import (
+    APIRouter,
+    Depends,
+    Header,
+    HTTPException,
+    Path,
+    Query,
+    Request,
+    Response,
+    status,
+)
+from fastapi.responses import StreamingResponse
 
 from app.config.settings import Settings
-from app.core.models.review import Review, ReviewRequest
+from app.core.models.review import (
+    CodeReviewIAResponse,
+    Review,
+    ReviewBatchRequest,
+    ReviewRequest,
+)
 from app.core.models.user import User
 from app.infrastructure.api.auth_routes import AuthRoutes
-from app.infrastructure.db.mongo.mongo_repository import MongoReviewRepository
+from app.infrastructure.db.mongo.mongo_repository import (
+    MongoReviewCacheRepository,
+    MongoReviewJobRepository,
+    MongoReviewRepository,
+    MongoReviewStreamRepository,
+)
 from app.infrastructure.dependencies import get_review_repository, limiter
-from app.infrastructure.jobs.tasks import IATasks
+from app.infrastructure.logger import logger
+from app.infrastructure.services.metrics_server import CONTENT_TYPE
+from app.infrastructure.services.review_cache_service import ReviewCacheService
+from app.infrastructure.services.review_metrics import ReviewMetrics
+from app.infrastructure.services.review_stream import (
+    TERMINAL_STATUSES,
+    ReviewStreamPublisher,
+)
+from app.infrastructure.services.review_token_budget import (
+    ReviewTokenBudget,
+    TokenBudgetExceededError,
+)
+from app.infrastructure.utils.sse import format_sse, format_sse_comment
+from app.infrastructure.utils.static_analysis import analyze_code, provisional_review
 from app.interfaces.repositories.review_repository_interface import (
     ReviewRepositoryInterface,
 )
+from app.use_cases.review_job_use_case import ReviewJobUseCase
 from app.use_cases.review_use_case import ReviewUseCase
 
 
+# Seconds without stream events before re-reading the review status
+REVIEW_STATUS_CHECK_SECONDS = 5
+
+
 class MainRoutes:
     def __init__(self):
         self.router = APIRouter()
@@ -24,10 +66,16 @@ class MainRoutes:
 
         # implementations
         self.review_repository = MongoReviewRepository()
+        self.review_job_repository = MongoReviewJobRepository()
+        self.review_cache = ReviewCacheService(MongoReviewCacheRepository())
+        self.review_stream_repository = MongoReviewStreamRepository()
+        self.review_stream = ReviewStreamPublisher(self.review_stream_repository)
+        self.review_budget = ReviewTokenBudget()
+        self.metrics = ReviewMetrics()
 
         # use cases
         self.review_use_case = ReviewUseCase(self.review_repository)
-        self.ia_tasks = IATasks(self.review_repository)
+        self.review_job_use_case = ReviewJobUseCase(self.review_job_repository)
         self.auth_routes = AuthRoutes()
 
         self._setup_routes()
@@ -54,6 +102,15 @@ class MainRoutes:
                 "version": self.settings.VERSION,
             }
 
+        @self.router.get("/metrics")
+        async def metrics():
+            """Prometheus metrics of this API process - Public access"""
+            if not self.settings.METRICS_ENABLED:
+                raise HTTPException(
+                    status_code=status.HTTP_404_NOT_FOUND, detail="Not found"
+                )
+            return Response(content=self.metrics.render(), media_type=CONTENT_TYPE)
+
         @self.router.get("/reviews")
         async def get_reviews(
             request: Request,
@@ -65,7 +122,7 @@ class MainRoutes:
             ),
             status: Optional[str] = Query(
                 None,
-                description="Filter by review status (pending, in_progress, completed, rejected)",
+                description="Filter by review status (pending, in_progress, completed, rejected, cancelled)",
             ),
             score: Optional[int] = Query(
                 None, ge=1, le=10, description="Filter by score (1-10)"
@@ -140,7 +197,6 @@ class MainRoutes:
         async def create_review(
             request: Request,
             review_request: ReviewRequest,
-            background_tasks: BackgroundTasks,
             current_user: User = Depends(
                 self.auth_routes.get_current_active_user_dependency
             ),
@@ -153,30 +209,157 @@ class MainRoutes:
             if not current_user.id:
                 return {"message": "User not found", "error": "authentication_error"}
 
-            # Create review with pending status
+            # Identical code already reviewed with the same prompt and model
+            cached_review = await self.review_cache.get(
+                review_request.code_submission, review_request.language
+            )
+
+            # Refuse submissions over the token budget before anything is stored
+            estimated_tokens = (
+                0 if cached_review else self._estimate_tokens(review_request)
+            )
+
+            # Provisional review from static analysis, shown until the LLM is done
+            provisional = (
+                None
+                if cached_review
+                else await self._provisional_review(review_request)
+            )
+
+            # Create review with pending status (in progress with a provisional
+            # review), or completed on a cache hit
             review = Review(
                 user=current_user.id,
                 language=review_request.language,
-                status="pending",
+                status=self._initial_status(cached_review, provisional),
                 code_submission=review_request.code_submission,
+                code_review=cached_review or provisional,
+                estimated_tokens=estimated_tokens,
+                deadline_at=self._deadline(cached_review),
             )
 
             created_review = await self.review_use_case.create_review(review)
 
             if not created_review.id:
                 return {"message": "Failed to create review", "error": "creation_error"}
-
-            # Add background task to process review with AI agent
-            background_tasks.add_task(
-                self.ia_tasks.process_review_with_agent,
-                created_review.id,
-                review_request.code_submission,
-                review_request.language,
-            )
+            self.metrics.review_submitted(created_review.language, created_review.status)
+
+            if not cached_review:
+                # Enqueue the review so a worker process runs it with the AI agent,
+                # or attach it to an in-flight job reviewing identical code
+                job = await self.review_job_use_case.enqueue_review(
+                    created_review,
+                    max_attempts=self.settings.JOB_MAX_ATTEMPTS,
+                    fingerprint=self._fingerprint(review_request),
+                    max_coalesced=self.settings.REVIEW_COALESCING_MAX_REVIEWS,
+                    timeout_seconds=self.settings.REVIEW_JOB_TIMEOUT,
+                )
+                if job.review_id != created_review.id:
+                    logger.info(
+                        f"Review {created_review.id} coalesced with job {job.id}"
+                    )
 
             return {
                 "message": "Review created successfully",
                 "review_id": created_review.id,
+                "status": created_review.status,
+            }
+
+        @self.router.post("/reviews/batch")
+        @limiter.limit("10/hour")
+        async def create_reviews_batch(
+            request: Request,
+            batch_request: ReviewBatchRequest,
+            current_user: User = Depends(
+                self.auth_routes.get_current_active_user_dependency
+            ),
+        ):
+            """Create many reviews at once - Protected endpoint - Requires authentication - Reviews are inserted with a single write and at most `concurrency` of them are processed at the same time"""
+
+            if not current_user.id:
+                return {"message": "User not found", "error": "authentication_error"}
+
+            if len(batch_request.reviews) > self.settings.REVIEW_BATCH_MAX_SIZE:
+                raise HTTPException(
+                    status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                    detail=f"A batch can contain at most {self.settings.REVIEW_BATCH_MAX_SIZE} reviews",
+                )
+
+            concurrency = min(
+                batch_request.concurrency or self.settings.REVIEW_BATCH_CONCURRENCY,
+                self.settings.REVIEW_BATCH_CONCURRENCY,
+            )
+
+            # Identical code already reviewed with the same prompt and model
+            cached_reviews = await asyncio.gather(
+                *(
+                    self.review_cache.get(item.code_submission, item.language)
+                    for item in batch_request.reviews
+                )
+            )
+
+            # Refuse the batch if any submission is over the token budget
+            estimated_tokens = [
+                0 if cached_review else self._estimate_tokens(item, index)
+                for index, (item, cached_review) in enumerate(
+                    zip(batch_request.reviews, cached_reviews)
+                )
+            ]
+
+            provisional_reviews = await asyncio.gather(
+                *(
+                    self._no_review()
+                    if cached_review
+                    else self._provisional_review(item)
+                    for item, cached_review in zip(
+                        batch_request.reviews, cached_reviews
+                    )
+                )
+            )
+
+            reviews = [
+                Review(
+                    user=current_user.id,
+                    language=item.language,
+                    status=self._initial_status(cached_review, provisional),
+                    code_submission=item.code_submission,
+                    code_review=cached_review or provisional,
+                    estimated_tokens=tokens,
+                    deadline_at=self._deadline(cached_review),
+                )
+                for item, cached_review, provisional, tokens in zip(
+                    batch_request.reviews,
+                    cached_reviews,
+                    provisional_reviews,
+                    estimated_tokens,
+                )
+            ]
+
+            created_reviews = await self.review_use_case.create_reviews(reviews)
+            for review in created_reviews:
+                self.metrics.review_submitted(review.language, review.status)
+
+            pending = [
+                (review, item)
+                for review, item in zip(created_reviews, batch_request.reviews)
+                if review.status != "completed"
+            ]
+            if pending:
+                await self.review_job_use_case.enqueue_batch(
+                    [review for review, _ in pending],
+                    max_attempts=self.settings.JOB_MAX_ATTEMPTS,
+                    concurrency=concurrency,
+                    fingerprints=[self._fingerprint(item) for _, item in pending],
+                    max_coalesced=self.settings.REVIEW_COALESCING_MAX_REVIEWS,
+                    timeout_seconds=self.settings.REVIEW_JOB_TIMEOUT,
+                )
+
+            return {
+                "message": f"{len(created_reviews)} reviews created successfully",
+                "reviews": [
+                    {"review_id": review.id, "status": review.status}
+                    for review in created_reviews
+                ],
             }
 
         @self.router.get("/reviews/{review_id}")
@@ -203,10 +386,147 @@ class MainRoutes:
                 "code_submission": review.code_submission,
                 "code_review": review.code_review,
                 "status": review.status,
+                "provisional": review.code_review is not None
+                and review.status != "completed",
+                "estimated_tokens": review.estimated_tokens,
+                "queue_wait_seconds": review.queue_wait_seconds,
+                "timings": review.timings,
+                "attempts": review.attempts,
+                "deadline_at": review.deadline_at,
                 "created_at": review.created_at,
                 "updated_at": review.updated_at,
             }
 
+        @self.router.delete("/reviews/{review_id}")
+        async def delete_review(
+            current_user: User = Depends(
+                self.auth_routes.get_current_active_user_dependency
+            ),
+            review_id: str = Path(..., description="The ID of the review to delete"),
+        ):
+            """Cancel a pending or in progress review, or delete a finished one - Protected endpoint - Requires authentication - Only the owner of the review can delete it"""
+
+            review_id = review_id.strip()
+
+            review = await self.review_use_case.get_review_by_id(review_id)
+
+            if not review or review.user != str(current_user.id):
+                raise HTTPException(
+                    status_code=status.HTTP_404_NOT_FOUND, detail="Review not found"
+                )
+
+            # Atomic, the review may finish while the request is handled
+            cancelled_review = await self.review_use_case.cancel_review(review_id)
+            if cancelled_review:
+                # Skip the job if no worker started it, abort its LLM call otherwise
+                job = await self.review_job_use_case.cancel_review_job(review_id)
+                await self.review_stream.publish_status(review_id, "cancelled")
+                logger.info(
+                    f"Review {review_id} cancelled"
+                    + (f" with job {job.id}" if job else "")
+                )
+                return {
+                    "message": "Review cancelled successfully",
+                    "review_id": review_id,
+                    "status": cancelled_review.status,
+                }
+
+            if not await self.review_use_case.delete_review(review_id):
+                raise HTTPException(
+                    status_code=status.HTTP_404_NOT_FOUND, detail="Review not found"
+                )
+            return {
+                "message": "Review deleted successfully",
+                "review_id": review_id,
+                "status": "deleted",
+            }
+
+        @self.router.get("/reviews/{review_id}/stream")
+        async def stream_review(
+            request: Request,
+            current_user: User = Depends(
+                self.auth_routes.get_current_active_user_dependency
+            ),
+            review_id: str = Path(..., description="The ID of the review to stream"),
+            last_event_id: Optional[int] = Header(None),
+        ):
+            """Stream review status transitions and LLM tokens as Server-Sent Events - Protected endpoint - Requires authentication - Resumes after the Last-Event-ID header"""
+
+            review_id = review_id.strip()
+
+            review = await self.review_use_case.get_review_by_id(review_id)
+
+            if not review or review.user != str(current_user.id):
+                return {"message": "Review not found"}
+
+            return StreamingResponse(
+                self._review_events(request, review, last_event_id or 0),
+                media_type="text/event-stream",
+                headers={
+                    "Cache-Control": "no-cache",
+                    "X-Accel-Buffering": "no",  # Disable proxy buffering
+                },
+            )
+
+    async def _review_events(
+        self, request: Request, review: Review, after_seq: int
+    ) -> AsyncIterator[str]:
+        """
+        Generate the SSE messages of a review: the current status, then status
+        and token events published by the worker, then the final review
+        """
+        yield format_sse("status", json.dumps({"status": review.status}))
+
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.settings.REVIEW_STREAM_TIMEOUT
+        last_status_check = loop.time()
+        status = review.status
+
+        while status not in TERMINAL_STATUSES and loop.time() < deadline:
+            if await request.is_disconnected():
+                return
+
+            events = await self.review_stream_repository.find_after(
+                review.id, after_seq
+            )
+            for event in events:
+                after_seq = event.seq
+                yield format_sse(event.event, event.data, event.seq)
+                if event.event == "status":
+                    status = json.loads(event.data)["status"]
+
+            if events:
+                continue
+
+            # Events may have expired or never been written, check the review itself
+            if loop.time() - last_status_check >= REVIEW_STATUS_CHECK_SECONDS:
+                last_status_check = loop.time()
+                current_review = await self.review_use_case.get_review_by_id(
+                    review.id
+                )
+                if not current_review:
+                    return
+                status = current_review.status
+                yield format_sse_comment("keep-alive")
+
+            await asyncio.sleep(self.settings.REVIEW_STREAM_POLL_INTERVAL)
+
+        final_review = await self.review_use_case.get_review_by_id(review.id)
+        if final_review:
+            yield format_sse(
+                "review",
+                json.dumps(
+                    {
+                        "status": final_review.status,
+                        "code_review": final_review.code_review.model_dump(
+                            mode="json"
+                        )
+                        if final_review.code_review
+                        else None,
+                    }
+                ),
+            )
+
     def _clean_filters(self, *args):
         """Clean the filters - converts 'all' values to None"""
         cleaned_args = []
@@ -217,6 +537,78 @@ class MainRoutes:
                 cleaned_args.append(value)
         return cleaned_args
 
+    async def _provisional_review(
+        self, review_request: ReviewRequest
+    ) -> Optional[CodeReviewIAResponse]:
+        """
+        Static analysis review of a submission, None when disabled or too large
+
+        The analysis is CPU bound, it runs in a thread so the event loop keeps
+        serving other requests meanwhile.
+        """
+        if (
+            not self.settings.PROVISIONAL_REVIEW_ENABLED
+            or len(review_request.code_submission)
+            > self.settings.PROVISIONAL_REVIEW_MAX_CHARS
+        ):
+            return None
+        try:
+            analysis = await asyncio.to_thread(
+                analyze_code, review_request.code_submission, review_request.language
+            )
+            return provisional_review(analysis)
+        except Exception as e:
+            # The LLM review still runs, the submission must not fail
+            logger.warning(f"Static analysis of a submission failed: {str(e)}")
+            return None
+
+    async def _no_review(self) -> Optional[CodeReviewIAResponse]:
+        """No provisional review, for submissions answered from the cache"""
+        return None
+
+    def _fingerprint(self, review_request: ReviewRequest) -> Optional[str]:
+        """Key identical in-flight reviews coalesce on, None when disabled"""
+        if not self.settings.REVIEW_COALESCING_ENABLED:
+            return None
+        return self.review_cache.build_key(
+            review_request.code_submission, review_request.language
+        )
+
+    def _initial_status(
+        self,
+        cached_review: Optional[CodeReviewIAResponse],
+        provisional: Optional[CodeReviewIAResponse],
+    ) -> str:
+        """Status of a new review"""
+        if cached_review:
+            return "completed"
+        return "in_progress" if provisional else "pending"
+
+    def _deadline(
+        self, cached_review: Optional[CodeReviewIAResponse]
+    ) -> Optional[datetime]:
+        """Time after which a review still unfinished is recovered by the sweeper"""
+        if cached_review:
+            return None
+        return datetime.utcnow() + timedelta(seconds=self.settings.REVIEW_DEADLINE)
+
+    def _estimate_tokens(
+        self, review_request: ReviewRequest, index: Optional[int] = None
+    ) -> int:
+        """Estimated prompt tokens of a submission, 413 when over the budget"""
+        prompt = self.review_budget.prepare(
+            review_request.code_submission, review_request.language
+        )
+        try:
+            self.review_budget.check(prompt)
+        except TokenBudgetExceededError as e:
+            prefix = f"Review {index}: " if index is not None else ""
+            raise HTTPException(
+                status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                detail=f"{prefix}{str(e)}",
+            )
+        return prompt.estimated_tokens
+
     def _generate_csv_response(
         self, reviews: List[Review], user: User, filters_applied: dict
     ) -> bytes:
@@ -236,6 +628,7 @@ class MainRoutes:
             "Suggestions",
             "Code Submission",
             "Refactored Example",
+            "Estimated Tokens",
             "Created At",
             "Updated At",
         ]
@@ -313,6 +706,9 @@ class MainRoutes:
             )
             if refactored_example
             else "",
+            "Estimated Tokens": review.estimated_tokens
+            if review.estimated_tokens is not None
+            else "",
             "Created At": review.created_at.isoformat() if review.created_at else "",
             "Updated At": review.updated_at.isoformat() if review.updated_at else "",
         }
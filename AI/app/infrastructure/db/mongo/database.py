@@ -1,3 +1,4 @@
+import hashlib
 from typing import Optional
 
 from beanie import init_beanie
@@ -5,7 +6,16 @@ from motor.motor_asyncio import AsyncIOMotorClient
 from pymongo.errors import ServerSelectionTimeoutError
 
 from app.config.settings import Settings
-from app.infrastructure.db.mongo.models import BlackListToken, User, Review
+from app.infrastructure.db.mongo.models import (
+    BlackListToken,
+    MaintenanceLease,
+    RefreshToken,
+    Review,
+    ReviewCache,
+    ReviewJob,
+    ReviewStreamEvent,
+    User,
+)
 
 
 settings = Settings()
@@ -37,9 +47,21 @@ async def connect_to_mongo():
         # Get database
         db.database = db.client[settings.MONGODB_DATABASE]
 
+        await migrate_blacklist_tokens(db.database)
+
         # Initialize Beanie with document models
         await init_beanie(
-            database=db.database, document_models=[User, BlackListToken, Review]
+            database=db.database,
+            document_models=[
+                User,
+                BlackListToken,
+                RefreshToken,
+                Review,
+                ReviewJob,
+                ReviewCache,
+                ReviewStreamEvent,
+                MaintenanceLease,
+            ],
         )
 
         print(f"✅ Beanie initialized for database: {settings.MONGODB_DATABASE}")
@@ -52,6 +74,28 @@ async def connect_to_mongo():
         raise
 
 
+async def migrate_blacklist_tokens(database) -> None:
+    """
+    Blacklist entries used to store the whole token, replace it with its id.
+    Tokens without a jti claim are identified by their hash, see
+    authenticator_jwt.token_id. Indexes that changed options are dropped for
+    Beanie to recreate them.
+    """
+    collection = database[BlackListToken.Settings.name]
+    # Dropped first, the unique token index allows a single entry without token
+    indexes = await collection.index_information()
+    if "token_1" in indexes:
+        await collection.drop_index("token_1")
+    # Expired entries are now removed by a TTL index on expire
+    if "expire_1" in indexes and "expireAfterSeconds" not in indexes["expire_1"]:
+        await collection.drop_index("expire_1")
+    async for entry in collection.find({"token": {"$exists": True}}):
+        jti = hashlib.sha256(entry["token"].encode()).hexdigest()
+        await collection.update_one(
+            {"_id": entry["_id"]}, {"$set": {"jti": jti}, "$unset": {"token": ""}}
+        )
+
+
 async def close_mongo_connection():
     """Close database connection"""
     if db.client:
@@ -2,7 +2,7 @@ import uuid
 from datetime import datetime
 from typing import Any, Dict, List, Optional
 
-from beanie import Document, Indexed, PydanticObjectId
+from beanie import Document, Indexed, PydanticObjectId, UpdateResponse
 from pydantic import EmailStr, Field
 from pymongo import IndexModel
 
@@ -74,41 +74,93 @@ class User(Document):
 
 
 class BlackListToken(Document):
-    """Blacklisted JWT tokens model"""
+    """Revoked JWT tokens model, by token id (jti)"""
 
     id: Optional[PydanticObjectId] = Field(default_factory=PydanticObjectId)
-    token: Indexed(str, unique=True)
+    jti: Indexed(str, unique=True)
     expire: datetime
     created_at: datetime = Field(default_factory=datetime.utcnow)
 
     class Settings:
         name = "blacklist_tokens"
         indexes = [
-            IndexModel([("token", 1)], unique=True),
-            IndexModel([("expire", 1)]),
+            IndexModel([("jti", 1)], unique=True),
+            IndexModel([("expire", 1)], expireAfterSeconds=0),  # TTL expiry
             IndexModel([("created_at", -1)]),
         ]
 
     @classmethod
-    async def add_token(cls, token: str, expire: datetime) -> "BlackListToken":
-        """Add a token to blacklist"""
-        blacklist_token = cls(token=token, expire=expire)
+    async def add_token(cls, jti: str, expire: datetime) -> "BlackListToken":
+        """Add a token id to blacklist, revoking it twice is a no-op"""
+        existing = await cls.find_one(cls.jti == jti)
+        if existing:
+            return existing
+        blacklist_token = cls(jti=jti, expire=expire)
         await blacklist_token.insert()
         return blacklist_token
 
     @classmethod
-    async def is_blacklisted(cls, token: str) -> bool:
-        """Check if token is blacklisted"""
-        blacklist_token = await cls.find_one(cls.token == token)
-        return blacklist_token is not None
+    async def find_revoked_since(
+        cls, since: Optional[datetime]
+    ) -> List["BlackListToken"]:
+        """Unexpired revocations added since a date, all of them if None"""
+        query = {"expire": {"$gt": datetime.utcnow()}}
+        if since is not None:
+            query["created_at"] = {"$gte": since}
+        return await cls.find(query).to_list()
 
     @classmethod
     async def cleanup_expired_tokens(cls) -> int:
         """Remove expired tokens from blacklist"""
         result = await cls.find(cls.expire < datetime.utcnow()).delete()
-        return result.deleted_count
+        return result.deleted_count if result else 0
 
 
+class RefreshToken(Document):
+    """Issued refresh tokens by token id (jti), each one can be used once"""
+
+    id: Optional[PydanticObjectId] = Field(default_factory=PydanticObjectId)
+    jti: Indexed(str, unique=True)
+    family: str  # Tokens rotated from the same login
+    user_id: str
+    expires_at: datetime
+    used_at: Optional[datetime] = None
+    revoked: bool = Field(default=False)
+    created_at: datetime = Field(default_factory=datetime.utcnow)
+
+    class Settings:
+        name = "refresh_tokens"
+        indexes = [
+            IndexModel([("jti", 1)], unique=True),
+            IndexModel([("family", 1)]),  # Revoke every token of a login
+            IndexModel([("expires_at", 1)], expireAfterSeconds=0),  # TTL expiry
+        ]
+
+    @classmethod
+    async def add_token(
+        cls, jti: str, family: str, user_id: str, expires_at: datetime
+    ) -> "RefreshToken":
+        """Record an issued refresh token"""
+        refresh_token = cls(
+            jti=jti, family=family, user_id=user_id, expires_at=expires_at
+        )
+        await refresh_token.insert()
+        return refresh_token
+
+    @classmethod
+    async def use(cls, jti: str) -> Optional["RefreshToken"]:
+        """Atomically mark a refresh token used, None if used, revoked or unknown"""
+        return await cls.find_one(
+            {"jti": jti, "used_at": None, "revoked": False}
+        ).update(
+            {"$set": {"used_at": datetime.utcnow()}},
+            response_type=UpdateResponse.NEW_DOCUMENT,
+        )
+
+    @classmethod
+    async def revoke_family(cls, family: str) -> None:
+        """Revoke every refresh token rotated from the same login"""
+        await cls.find(cls.family == family).update({"$set": {"revoked": True}})
 
 
 class Review(Document):
@@ -117,11 +169,20 @@ class Review(Document):
     id: Optional[PydanticObjectId] = Field(default_factory=PydanticObjectId)
     user: PydanticObjectId  # Reference to User who created the review
     language: str
-    status: str = Field(default="pending")  # pending, in_progress, completed, rejected
+    status: str = Field(default="pending")  # pending, in_progress, completed, rejected, cancelled
     created_at: datetime = Field(default_factory=datetime.utcnow)
     code_submission: str
     code_review: Optional[Dict[str, Any]] = None
+    estimated_tokens: Optional[int] = None  # Estimated prompt tokens sent to the LLM
+    queue_wait_seconds: Optional[float] = None  # From submission to a worker picking it up
+    timings: Optional[Dict[str, Any]] = None  # Processing time breakdown
+    attempts: int = Field(default=0)  # Processing attempts started by workers
+    deadline_at: Optional[datetime] = None  # Recovered by the sweeper when overdue
     updated_at: datetime = Field(default_factory=datetime.utcnow)
+    minhash_signature: Optional[bytes] = None  # Near-duplicate detection
+    minhash_indexed_at: Optional[datetime] = None
+    minhash_model: Optional[str] = None  # Model and prompt version of the review
+    minhash_prompt_version: Optional[str] = None
 
     class Settings:
         name = "reviews"
@@ -134,6 +195,12 @@ class Review(Document):
             IndexModel([("user", 1), ("status", 1)]),  # Compound: user + status
             IndexModel([("language", 1), ("status", 1)]),  # Compound: language + status
             IndexModel([("user", 1), ("language", 1)]),  # Compound: user + language
+            IndexModel(
+                [("status", 1), ("deadline_at", 1)]
+            ),  # Compound: find overdue reviews
+            IndexModel(
+                [("minhash_indexed_at", 1)], sparse=True
+            ),  # Load near-duplicate signatures incrementally
         ]
 
     @classmethod
@@ -191,3 +258,123 @@ class Review(Document):
 
     def __str__(self) -> str:
         return f"Review(id={self.id}, user={self.user}, language={self.language}, status={self.status})"
+
+
+class ReviewJob(Document):
+    """Queued review job consumed by the review workers"""
+
+    id: Optional[PydanticObjectId] = Field(default_factory=PydanticObjectId)
+    review_id: PydanticObjectId  # Reference to the Review being processed
+    user: PydanticObjectId
+    language: str
+    status: str = Field(default="queued")  # queued, leased, held, done, failed, cancelled
+    attempts: int = Field(default=0)
+    max_attempts: int = Field(default=3)
+    worker_id: Optional[str] = None
+    lease_expires_at: Optional[datetime] = None
+    available_at: datetime = Field(default_factory=datetime.utcnow)
+    last_error: Optional[str] = None
+    batch_id: Optional[str] = None  # Jobs submitted together share a concurrency cap
+    batch_concurrency: Optional[int] = None
+    estimated_tokens: int = Field(default=0)  # Scheduling: small jobs first
+    timeout_seconds: int = Field(default=0)  # Max duration of an attempt, 0 for no limit
+    fingerprint: Optional[str] = None  # Review cache key, identical jobs coalesce
+    coalesced_review_ids: List[PydanticObjectId] = Field(default_factory=list)
+    created_at: datetime = Field(default_factory=datetime.utcnow)
+    updated_at: datetime = Field(default_factory=datetime.utcnow)
+
+    class Settings:
+        name = "review_jobs"
+        indexes = [
+            IndexModel([("review_id", 1)]),  # Find jobs by review
+            IndexModel(
+                [("status", 1), ("available_at", 1)]
+            ),  # Compound: claim queued jobs in order
+            IndexModel(
+                [("status", 1), ("lease_expires_at", 1)]
+            ),  # Compound: reclaim expired leases
+            IndexModel(
+                [("batch_id", 1), ("status", 1)], sparse=True
+            ),  # Compound: release held jobs of a batch
+            IndexModel(
+                [("status", 1), ("user", 1), ("available_at", 1)]
+            ),  # Compound: claimable jobs of every user, oldest first
+            IndexModel(
+                [("fingerprint", 1), ("status", 1)], sparse=True
+            ),  # Compound: find an in-flight job identical to a new review
+            IndexModel(
+                [("coalesced_review_ids", 1)], sparse=True
+            ),  # Find the job a review is coalesced with
+        ]
+
+    def __str__(self) -> str:
+        return f"ReviewJob(id={self.id}, review_id={self.review_id}, status={self.status}, attempts={self.attempts})"
+
+
+class ReviewCache(Document):
+    """Content-addressed cache of validated LLM code reviews"""
+
+    id: Optional[PydanticObjectId] = Field(default_factory=PydanticObjectId)
+    key: Indexed(str, unique=True)  # sha256 of code, language, prompt version, model
+    language: str
+    model: str
+    prompt_version: str
+    code_review: Dict[str, Any]
+    hits: int = Field(default=0)
+    created_at: datetime = Field(default_factory=datetime.utcnow)
+    last_hit_at: datetime = Field(default_factory=datetime.utcnow)
+    expires_at: datetime
+
+    class Settings:
+        name = "review_cache"
+        indexes = [
+            IndexModel([("key", 1)], unique=True),
+            IndexModel([("last_hit_at", 1)]),  # Evict least recently used first
+            IndexModel([("expires_at", 1)], expireAfterSeconds=0),  # TTL expiry
+        ]
+
+    def __str__(self) -> str:
+        return f"ReviewCache(key={self.key}, language={self.language}, hits={self.hits})"
+
+
+class ReviewStreamEvent(Document):
+    """Status transition or batch of LLM tokens streamed to review clients"""
+
+    id: Optional[PydanticObjectId] = Field(default_factory=PydanticObjectId)
+    review_id: PydanticObjectId  # Reference to the Review being streamed
+    seq: int
+    event: str  # status, token
+    data: str
+    created_at: datetime = Field(default_factory=datetime.utcnow)
+    expires_at: datetime
+
+    class Settings:
+        name = "review_stream_events"
+        indexes = [
+            IndexModel(
+                [("review_id", 1), ("seq", 1)], unique=True
+            ),  # Compound: read a stream in order
+            IndexModel([("expires_at", 1)], expireAfterSeconds=0),  # TTL expiry
+        ]
+
+    def __str__(self) -> str:
+        return f"ReviewStreamEvent(review_id={self.review_id}, seq={self.seq}, event={self.event})"
+
+
+class MaintenanceLease(Document):
+    """
+    Lease of a periodic maintenance job held by the worker running it, or of a
+    batch whose held jobs a worker is releasing
+    """
+
+    id: Optional[PydanticObjectId] = Field(default_factory=PydanticObjectId)
+    name: Indexed(str, unique=True)  # One lease per maintenance job
+    owner: str
+    acquired_at: datetime = Field(default_factory=datetime.utcnow)
+    expires_at: datetime
+
+    class Settings:
+        name = "maintenance_leases"
+
+    def __str__(self) -> str:
+        return f"MaintenanceLease(name={self.name}, owner={self.owner})"
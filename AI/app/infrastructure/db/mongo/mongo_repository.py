@@ -1,18 +1,61 @@
-from typing import List, Optional
+import asyncio
+import uuid
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
 
-from beanie import PydanticObjectId
+from beanie import PydanticObjectId, UpdateResponse
+from beanie.operators import In, Set
+from pydantic import BaseModel, Field
+from pymongo.errors import BulkWriteError, DuplicateKeyError, OperationFailure
 
-from app.core.models.review import CodeReviewIAResponse, Review
+from app.core.models.review import (
+    CodeReviewIAResponse,
+    Review,
+    ReviewSignature,
+    ReviewStreamEvent,
+    ReviewTimings,
+)
+from app.core.models.review_job import JobStatus, ReviewJob
 from app.core.models.user import User
+from app.infrastructure.db.mongo.models import (
+    MaintenanceLease as MongoMaintenanceLease,
+)
 from app.infrastructure.db.mongo.models import Review as MongoReview
+from app.infrastructure.db.mongo.models import ReviewCache as MongoReviewCache
+from app.infrastructure.db.mongo.models import ReviewJob as MongoReviewJob
+from app.infrastructure.db.mongo.models import (
+    ReviewStreamEvent as MongoReviewStreamEvent,
+)
 from app.infrastructure.db.mongo.models import User as MongoUser
+from app.infrastructure.logger import logger
+from app.infrastructure.services.user_cache import UserCache
+from app.interfaces.repositories.maintenance_lease_repository_interface import (
+    MaintenanceLeaseRepositoryInterface,
+)
+from app.interfaces.repositories.review_cache_repository_interface import (
+    ReviewCacheRepositoryInterface,
+)
+from app.interfaces.repositories.review_job_repository_interface import (
+    ReviewJobRepositoryInterface,
+)
 from app.interfaces.repositories.review_repository_interface import (
     ReviewRepositoryInterface,
 )
+from app.interfaces.repositories.review_stream_repository_interface import (
+    ReviewStreamRepositoryInterface,
+)
 from app.interfaces.repositories.user_repository_interface import (
     UserRepositoryInterface,
 )
 
+# Lease serializing the releases of held jobs of a batch, long enough for a
+# count and a few updates
+BATCH_LEASE_SECONDS = 10
+# Seconds between attempts to take the lease of a batch released by another
+# worker, doubled after every attempt up to the max
+BATCH_LEASE_WAIT_SECONDS = 0.05
+BATCH_LEASE_MAX_WAIT_SECONDS = 1.0
+
 
 class MongoUserRepository(UserRepositoryInterface):
     """MongoDB implementation of UserRepositoryInterface"""
@@ -66,6 +109,8 @@ class MongoUserRepository(UserRepositoryInterface):
         mongo_user.is_active = user.is_active
 
         await mongo_user.save()
+        # Authenticated requests must not keep seeing the old user
+        UserCache().invalidate(user.id)
 
         return self._mongo_to_domain(mongo_user)
 
@@ -76,6 +121,7 @@ class MongoUserRepository(UserRepositoryInterface):
             return False
 
         await mongo_user.delete()
+        UserCache().invalidate(user_id)
         return True
 
     def _mongo_to_domain(self, mongo_user: MongoUser) -> User:
@@ -90,6 +136,23 @@ class MongoUserRepository(UserRepositoryInterface):
         )
 
 
+class _IdView(BaseModel):
+    """Projection that only loads the document id"""
+
+    id: PydanticObjectId = Field(alias="_id")
+
+
+class _SignatureView(BaseModel):
+    """Projection that only loads the near-duplicate signature of a review"""
+
+    id: PydanticObjectId = Field(alias="_id")
+    language: str
+    minhash_signature: bytes
+    minhash_indexed_at: datetime
+    minhash_model: Optional[str] = None
+    minhash_prompt_version: Optional[str] = None
+
+
 class MongoReviewRepository(ReviewRepositoryInterface):
     """MongoDB implementation of ReviewRepositoryInterface"""
 
@@ -120,6 +183,8 @@ class MongoReviewRepository(ReviewRepositoryInterface):
                 code_review=review.code_review.model_dump()
                 if review.code_review
                 else None,
+                estimated_tokens=review.estimated_tokens,
+                deadline_at=review.deadline_at,
                 created_at=review.created_at,
             )
             await mongo_review.insert()
@@ -128,6 +193,30 @@ class MongoReviewRepository(ReviewRepositoryInterface):
         except Exception as e:
             raise ValueError(f"Failed to create review: {str(e)}")
 
+    async def create_many(self, reviews: List[Review]) -> List[Review]:
+        """Create many reviews with a single write"""
+        try:
+            mongo_reviews = [
+                MongoReview(
+                    user=PydanticObjectId(review.user),
+                    language=review.language.lower().strip(),
+                    status=review.status,
+                    code_submission=review.code_submission,
+                    code_review=review.code_review.model_dump()
+                    if review.code_review
+                    else None,
+                    estimated_tokens=review.estimated_tokens,
+                    deadline_at=review.deadline_at,
+                    created_at=review.created_at,
+                )
+                for review in reviews
+            ]
+            await MongoReview.insert_many(mongo_reviews)
+
+            return [self._mongo_to_domain(mongo_review) for mongo_review in mongo_reviews]
+        except Exception as e:
+            raise ValueError(f"Failed to create reviews: {str(e)}")
+
     async def update(self, review: Review) -> Review:
         """Update an existing review"""
         try:
@@ -143,6 +232,13 @@ class MongoReviewRepository(ReviewRepositoryInterface):
             mongo_review.code_review = (
                 review.code_review.model_dump() if review.code_review else None
             )
+            mongo_review.estimated_tokens = review.estimated_tokens
+            mongo_review.queue_wait_seconds = review.queue_wait_seconds
+            mongo_review.timings = (
+                review.timings.model_dump() if review.timings else None
+            )
+            mongo_review.attempts = review.attempts
+            mongo_review.deadline_at = review.deadline_at
 
             await mongo_review.save()
 
@@ -163,6 +259,22 @@ class MongoReviewRepository(ReviewRepositoryInterface):
         except Exception:
             return False
 
+    async def cancel(self, review_id: str) -> Optional[Review]:
+        """Atomically mark a pending or in progress review as cancelled"""
+        mongo_review = await MongoReview.find_one(
+            {
+                "_id": PydanticObjectId(review_id),
+                "status": {"$in": ["pending", "in_progress"]},
+            }
+        ).update(
+            Set({"status": "cancelled", "updated_at": datetime.utcnow()}),
+            response_type=UpdateResponse.NEW_DOCUMENT,
+        )
+        if not mongo_review:
+            return None
+
+        return self._mongo_to_domain(mongo_review)
+
     async def find_by_user(self, user_id: str) -> List[Review]:
         """Find all reviews by user ID"""
         try:
@@ -219,6 +331,98 @@ class MongoReviewRepository(ReviewRepositoryInterface):
             print(f"Error in find_by_user_with_filters: {e}")
             return []
 
+    async def find_overdue(
+        self, now: datetime, created_before: datetime, limit: int
+    ) -> List[Review]:
+        """Find pending or in progress reviews past their deadline"""
+        mongo_reviews = (
+            await MongoReview.find(
+                {
+                    "status": {"$in": ["pending", "in_progress"]},
+                    "$or": [
+                        {"deadline_at": {"$lte": now}},
+                        # Submitted before reviews had deadlines
+                        {"deadline_at": None, "created_at": {"$lte": created_before}},
+                    ],
+                }
+            )
+            .sort("deadline_at")
+            .limit(limit)
+            .to_list()
+        )
+
+        return [self._mongo_to_domain(mongo_review) for mongo_review in mongo_reviews]
+
+    async def extend_deadline(
+        self,
+        review_id: str,
+        current_deadline: Optional[datetime],
+        deadline_at: datetime,
+    ) -> bool:
+        """Atomically move the deadline of a review if it is still current_deadline"""
+        result = await MongoReview.find_one(
+            {"_id": PydanticObjectId(review_id), "deadline_at": current_deadline}
+        ).update(Set({"deadline_at": deadline_at}))
+        return result.modified_count == 1
+
+    async def set_minhash_signature(
+        self, review_id: str, signature: bytes, model: str, prompt_version: str
+    ) -> None:
+        """Store the MinHash signature of a review completed by a model and prompt"""
+        await MongoReview.find_one(
+            MongoReview.id == PydanticObjectId(review_id)
+        ).update(
+            Set(
+                {
+                    "minhash_signature": signature,
+                    "minhash_indexed_at": datetime.utcnow(),
+                    "minhash_model": model,
+                    "minhash_prompt_version": prompt_version,
+                }
+            )
+        )
+
+    async def find_minhash_signatures(
+        self,
+        model: str,
+        prompt_version: str,
+        indexed_after: Optional[datetime] = None,
+        limit: Optional[int] = None,
+    ) -> List[ReviewSignature]:
+        """
+        Find signatures of reviews by a model and prompt, optionally only the
+        ones indexed after indexed_after, or only the limit most recent ones.
+        Oldest first.
+        """
+        query_dict: dict = {
+            "status": "completed",
+            "minhash_indexed_at": {"$gt": indexed_after}
+            if indexed_after
+            else {"$ne": None},
+            # Reviews of another model or prompt are never served
+            "minhash_model": model,
+            "minhash_prompt_version": prompt_version,
+        }
+        query = (
+            MongoReview.find(query_dict)
+            .sort("-minhash_indexed_at")
+            .project(_SignatureView)
+        )
+        if limit:
+            query = query.limit(limit)
+        views = list(reversed(await query.to_list()))
+        return [
+            ReviewSignature(
+                review_id=str(view.id),
+                language=view.language,
+                signature=view.minhash_signature,
+                indexed_at=view.minhash_indexed_at,
+                model=view.minhash_model,
+                prompt_version=view.minhash_prompt_version,
+            )
+            for view in views
+        ]
+
     def _mongo_to_domain(self, mongo_review: MongoReview) -> Review:
         """Convert MongoDB review to domain review"""
         # Convert code_review dict back to CodeReviewIAResponse if it exists
@@ -237,6 +441,654 @@ class MongoReviewRepository(ReviewRepositoryInterface):
             status=mongo_review.status,
             code_submission=mongo_review.code_submission,
             code_review=code_review,
+            estimated_tokens=mongo_review.estimated_tokens,
+            queue_wait_seconds=mongo_review.queue_wait_seconds,
+            timings=(
+                ReviewTimings(**mongo_review.timings) if mongo_review.timings else None
+            ),
+            attempts=mongo_review.attempts,
+            deadline_at=mongo_review.deadline_at,
             created_at=mongo_review.created_at,
             updated_at=mongo_review.updated_at,
         )
+
+
+class MongoReviewJobRepository(ReviewJobRepositoryInterface):
+    """MongoDB implementation of ReviewJobRepositoryInterface"""
+
+    # Whether the server supports $firstN, until an aggregation says otherwise
+    _first_n_supported = True
+
+    def __init__(
+        self, lease_repository: Optional[MaintenanceLeaseRepositoryInterface] = None
+    ):
+        self.lease_repository = lease_repository or MongoMaintenanceLeaseRepository()
+
+    async def enqueue(self, job: ReviewJob) -> ReviewJob:
+        """Persist a new job so that any worker can claim it"""
+        try:
+            mongo_job = MongoReviewJob(
+                review_id=PydanticObjectId(job.review_id),
+                user=PydanticObjectId(job.user),
+                language=job.language.lower().strip(),
+                status=JobStatus.QUEUED,
+                max_attempts=job.max_attempts,
+                available_at=job.available_at,
+                estimated_tokens=job.estimated_tokens,
+                timeout_seconds=job.timeout_seconds,
+                fingerprint=job.fingerprint,
+                coalesced_review_ids=[
+                    PydanticObjectId(review_id)
+                    for review_id in job.coalesced_review_ids
+                ],
+                created_at=job.created_at,
+            )
+            await mongo_job.insert()
+
+            return self._mongo_to_domain(mongo_job)
+        except Exception as e:
+            raise ValueError(f"Failed to enqueue review job: {str(e)}")
+
+    async def enqueue_many(self, jobs: List[ReviewJob]) -> List[ReviewJob]:
+        """Persist many jobs with a single write"""
+        try:
+            mongo_jobs = [
+                MongoReviewJob(
+                    review_id=PydanticObjectId(job.review_id),
+                    user=PydanticObjectId(job.user),
+                    language=job.language.lower().strip(),
+                    status=job.status,
+                    max_attempts=job.max_attempts,
+                    available_at=job.available_at,
+                    batch_id=job.batch_id,
+                    batch_concurrency=job.batch_concurrency,
+                    estimated_tokens=job.estimated_tokens,
+                    timeout_seconds=job.timeout_seconds,
+                    fingerprint=job.fingerprint,
+                    coalesced_review_ids=[
+                        PydanticObjectId(review_id)
+                        for review_id in job.coalesced_review_ids
+                    ],
+                    created_at=job.created_at,
+                )
+                for job in jobs
+            ]
+            await MongoReviewJob.insert_many(mongo_jobs)
+
+            return [self._mongo_to_domain(mongo_job) for mongo_job in mongo_jobs]
+        except Exception as e:
+            raise ValueError(f"Failed to enqueue review jobs: {str(e)}")
+
+    async def release_batch(self, batch_id: str, concurrency: int) -> int:
+        """Queue held jobs of a batch until concurrency of its jobs are active"""
+        # Workers finishing jobs of the same batch at once would all count the
+        # same free slots, releases of a batch take turns under a lease. A
+        # worker that dies holding it delays the batch until the lease expires.
+        name, owner = f"review_batch:{batch_id}", str(uuid.uuid4())
+        if not await self._acquire_batch_lease(name, owner):
+            raise TimeoutError(
+                f"Lease of batch {batch_id} still taken after {BATCH_LEASE_SECONDS}s"
+            )
+        try:
+            active = await self._count_active(batch_id)
+            released = 0
+            for _ in range(concurrency - active):
+                if not await self._queue_held(batch_id):
+                    break
+                released += 1
+            return released
+        finally:
+            await self.lease_repository.release(name, owner)
+
+    async def _acquire_batch_lease(self, name: str, owner: str) -> bool:
+        """
+        Take the lease of a batch, waiting with backoff while another worker
+        releases it. Gives up once a lease of a dead holder would have expired.
+        """
+        deadline = asyncio.get_running_loop().time() + BATCH_LEASE_SECONDS
+        wait = BATCH_LEASE_WAIT_SECONDS
+        while not await self.lease_repository.acquire(
+            name, owner, BATCH_LEASE_SECONDS
+        ):
+            remaining = deadline - asyncio.get_running_loop().time()
+            if remaining <= 0:
+                return False
+            await asyncio.sleep(min(wait, remaining))
+            wait = min(wait * 2, BATCH_LEASE_MAX_WAIT_SECONDS)
+        return True
+
+    async def _count_active(self, batch_id: str) -> int:
+        """Jobs of a batch queued or running"""
+        return await MongoReviewJob.find(
+            {
+                "batch_id": batch_id,
+                "status": {"$in": [JobStatus.QUEUED, JobStatus.LEASED]},
+            }
+        ).count()
+
+    async def _queue_held(self, batch_id: str) -> bool:
+        """Queue the oldest held job of a batch, False when none is left"""
+        now = datetime.utcnow()
+        mongo_job = await MongoReviewJob.find_one(
+            {"batch_id": batch_id, "status": JobStatus.HELD}
+        ).update(
+            Set(
+                {
+                    "status": JobStatus.QUEUED,
+                    "available_at": now,
+                    "updated_at": now,
+                }
+            ),
+            response_type=UpdateResponse.NEW_DOCUMENT,
+            sort=[("created_at", 1)],
+        )
+        return mongo_job is not None
+
+    async def attach(
+        self, fingerprint: str, review_ids: List[str], max_reviews: int
+    ) -> Optional[ReviewJob]:
+        """Atomically add reviews to the in-flight job with this fingerprint"""
+        now = datetime.utcnow()
+        mongo_job = await MongoReviewJob.find_one(
+            {
+                "fingerprint": fingerprint,
+                "$or": [
+                    {"status": {"$in": [JobStatus.QUEUED, JobStatus.HELD]}},
+                    {"status": JobStatus.LEASED, "lease_expires_at": {"$gt": now}},
+                ],
+                # Bounds the job document, later reviews start a new job
+                f"coalesced_review_ids.{max_reviews - len(review_ids)}": {
+                    "$exists": False
+                },
+            }
+        ).update(
+            {
+                "$push": {
+                    "coalesced_review_ids": {
+                        "$each": [
+                            PydanticObjectId(review_id) for review_id in review_ids
+                        ]
+                    }
+                },
+                "$set": {"updated_at": now},
+            },
+            response_type=UpdateResponse.NEW_DOCUMENT,
+            sort=[("created_at", 1)],
+        )
+        if not mongo_job:
+            return None
+
+        return self._mongo_to_domain(mongo_job)
+
+    async def close_coalescing(
+        self, job_id: str, worker_id: str
+    ) -> Optional[ReviewJob]:
+        """Stop attaching reviews to a job owned by worker_id"""
+        mongo_job = await MongoReviewJob.find_one(
+            self._owned_by(job_id, worker_id)
+        ).update(
+            Set({"fingerprint": None, "updated_at": datetime.utcnow()}),
+            response_type=UpdateResponse.NEW_DOCUMENT,
+        )
+        if not mongo_job:
+            return None
+
+        return self._mongo_to_domain(mongo_job)
+
+    async def cancel(self, review_id: str) -> Optional[ReviewJob]:
+        """Atomically cancel the in-flight job of a review with no coalesced reviews"""
+        mongo_job = await MongoReviewJob.find_one(
+            {
+                "review_id": PydanticObjectId(review_id),
+                "status": {
+                    "$in": [JobStatus.QUEUED, JobStatus.HELD, JobStatus.LEASED]
+                },
+                # Attached reviews still wait for this job's result
+                "coalesced_review_ids": {"$size": 0},
+            }
+        ).update(
+            Set(
+                {
+                    "status": JobStatus.CANCELLED,
+                    "fingerprint": None,
+                    "lease_expires_at": None,
+                    "updated_at": datetime.utcnow(),
+                }
+            ),
+            response_type=UpdateResponse.NEW_DOCUMENT,
+        )
+        if not mongo_job:
+            return None
+
+        return self._mongo_to_domain(mongo_job)
+
+    async def find_cancelled(self, job_ids: List[str]) -> List[str]:
+        """Ids of the given jobs that were cancelled"""
+        mongo_jobs = await MongoReviewJob.find(
+            {
+                "_id": {"$in": [PydanticObjectId(job_id) for job_id in job_ids]},
+                "status": JobStatus.CANCELLED,
+            },
+            projection_model=_IdView,
+        ).to_list()
+
+        return [str(mongo_job.id) for mongo_job in mongo_jobs]
+
+    async def find_by_review(self, review_id: str) -> List[ReviewJob]:
+        """Find the jobs of a review, including jobs it is coalesced with"""
+        object_id = PydanticObjectId(review_id)
+        mongo_jobs = await MongoReviewJob.find(
+            {"$or": [{"review_id": object_id}, {"coalesced_review_ids": object_id}]}
+        ).to_list()
+
+        return [self._mongo_to_domain(mongo_job) for mongo_job in mongo_jobs]
+
+    async def fail_expired(self, job_id: str, error: str) -> bool:
+        """Mark a job as failed if its lease expired with no attempts left"""
+        now = datetime.utcnow()
+        result = await MongoReviewJob.find_one(
+            {
+                "_id": PydanticObjectId(job_id),
+                "status": JobStatus.LEASED,
+                "lease_expires_at": {"$lte": now},
+                "$expr": {"$gte": ["$attempts", "$max_attempts"]},
+            }
+        ).update(
+            Set(
+                {
+                    "status": JobStatus.FAILED,
+                    "worker_id": None,
+                    "lease_expires_at": None,
+                    "last_error": error[:1000],
+                    "updated_at": now,
+                }
+            )
+        )
+        return result.modified_count == 1
+
+    async def claim(self, worker_id: str, lease_seconds: int) -> Optional[ReviewJob]:
+        """Atomically lease the oldest available job"""
+        now = datetime.utcnow()
+        mongo_job = await MongoReviewJob.find_one(self._claimable(now)).update(
+            self._lease(worker_id, lease_seconds, now),
+            response_type=UpdateResponse.NEW_DOCUMENT,
+            sort=[("available_at", 1)],
+        )
+        if not mongo_job:
+            return None
+
+        return self._mongo_to_domain(mongo_job)
+
+    async def claim_by_id(
+        self, job_id: str, worker_id: str, lease_seconds: int
+    ) -> Optional[ReviewJob]:
+        """Atomically lease a job if it is still available"""
+        now = datetime.utcnow()
+        mongo_job = await MongoReviewJob.find_one(
+            {"_id": PydanticObjectId(job_id), **self._claimable(now)}
+        ).update(
+            self._lease(worker_id, lease_seconds, now),
+            response_type=UpdateResponse.NEW_DOCUMENT,
+        )
+        if not mongo_job:
+            return None
+
+        return self._mongo_to_domain(mongo_job)
+
+    async def find_claimable(self, per_user: int, max_users: int) -> List[ReviewJob]:
+        """Oldest available jobs of every user, at most per_user each"""
+        try:
+            mongo_jobs = await self._find_claimable(per_user, max_users)
+        except OperationFailure as e:
+            # $firstN needs MongoDB 5.2, fall back to $push on older servers
+            if "$firstN" not in str(e) or not self._first_n_supported:
+                raise
+            logger.warning("MongoDB has no $firstN, grouping jobs with $push")
+            MongoReviewJobRepository._first_n_supported = False
+            mongo_jobs = await self._find_claimable(per_user, max_users)
+
+        return [self._mongo_to_domain(mongo_job) for mongo_job in mongo_jobs]
+
+    async def _find_claimable(
+        self, per_user: int, max_users: int
+    ) -> List[MongoReviewJob]:
+        if self._first_n_supported:
+            jobs = {"$firstN": {"input": "$$ROOT", "n": per_user}}
+            trim = []
+        else:
+            # Groups every claimable job of a user before trimming them
+            jobs = {"$push": "$$ROOT"}
+            trim = [{"$set": {"jobs": {"$slice": ["$jobs", per_user]}}}]
+
+        return await MongoReviewJob.aggregate(
+            [
+                {"$match": self._claimable(datetime.utcnow())},
+                {"$sort": {"available_at": 1}},
+                {
+                    "$group": {
+                        "_id": "$user",
+                        "jobs": jobs,
+                        "oldest": {"$first": "$available_at"},
+                    }
+                },
+                {"$sort": {"oldest": 1}},
+                {"$limit": max_users},
+                *trim,
+                {"$unwind": "$jobs"},
+                {"$replaceRoot": {"newRoot": "$jobs"}},
+            ],
+            projection_model=MongoReviewJob,
+        ).to_list()
+
+    async def count_in_flight_by_user(self) -> Dict[str, int]:
+        """Number of jobs of every user currently leased by a worker"""
+        counts = await MongoReviewJob.aggregate(
+            [
+                {
+                    "$match": {
+                        "status": JobStatus.LEASED,
+                        "lease_expires_at": {"$gt": datetime.utcnow()},
+                    }
+                },
+                {"$group": {"_id": "$user", "count": {"$sum": 1}}},
+            ]
+        ).to_list()
+
+        return {str(count["_id"]): count["count"] for count in counts}
+
+    async def extend_lease(
+        self, job_id: str, worker_id: str, lease_seconds: int
+    ) -> bool:
+        """Extend the lease of a job still owned by worker_id"""
+        now = datetime.utcnow()
+        result = await MongoReviewJob.find_one(
+            self._owned_by(job_id, worker_id)
+        ).update(
+            Set(
+                {
+                    "lease_expires_at": now + timedelta(seconds=lease_seconds),
+                    "updated_at": now,
+                }
+            )
+        )
+        return result.modified_count == 1
+
+    async def ack(self, job_id: str, worker_id: str) -> bool:
+        """Mark a job owned by worker_id as done"""
+        result = await MongoReviewJob.find_one(
+            self._owned_by(job_id, worker_id)
+        ).update(
+            Set(
+                {
+                    "status": JobStatus.DONE,
+                    "lease_expires_at": None,
+                    "updated_at": datetime.utcnow(),
+                }
+            )
+        )
+        return result.modified_count == 1
+
+    async def nack(
+        self, job_id: str, worker_id: str, error: str, retry_delay_seconds: int
+    ) -> Optional[ReviewJob]:
+        """Re-queue a failed job or mark it as failed once attempts are exhausted"""
+        mongo_job = await MongoReviewJob.find_one(self._owned_by(job_id, worker_id))
+        if not mongo_job:
+            return None
+
+        now = datetime.utcnow()
+        exhausted = mongo_job.attempts >= mongo_job.max_attempts
+        mongo_job = await MongoReviewJob.find_one(
+            self._owned_by(job_id, worker_id)
+        ).update(
+            Set(
+                {
+                    "status": JobStatus.FAILED if exhausted else JobStatus.QUEUED,
+                    "worker_id": None,
+                    "lease_expires_at": None,
+                    "available_at": now + timedelta(seconds=retry_delay_seconds),
+                    "last_error": error[:1000],
+                    "updated_at": now,
+                }
+            ),
+            response_type=UpdateResponse.NEW_DOCUMENT,
+        )
+        if not mongo_job:
+            return None
+
+        return self._mongo_to_domain(mongo_job)
+
+    def _claimable(self, now: datetime) -> dict:
+        """
+        Query matching jobs a worker may lease: queued and due, or leased with an
+        expired lease and attempts left
+        """
+        return {
+            "$or": [
+                {"status": JobStatus.QUEUED, "available_at": {"$lte": now}},
+                {
+                    "status": JobStatus.LEASED,
+                    "lease_expires_at": {"$lte": now},
+                    "$expr": {"$lt": ["$attempts", "$max_attempts"]},
+                },
+            ]
+        }
+
+    def _lease(self, worker_id: str, lease_seconds: int, now: datetime) -> dict:
+        """Update leasing a job to worker_id and counting the attempt"""
+        return {
+            "$set": {
+                "status": JobStatus.LEASED,
+                "worker_id": worker_id,
+                "lease_expires_at": now + timedelta(seconds=lease_seconds),
+                "updated_at": now,
+            },
+            "$inc": {"attempts": 1},
+        }
+
+    def _owned_by(self, job_id: str, worker_id: str) -> dict:
+        """Query matching a job that is currently leased by worker_id"""
+        return {
+            "_id": PydanticObjectId(job_id),
+            "status": JobStatus.LEASED,
+            "worker_id": worker_id,
+        }
+
+    def _mongo_to_domain(self, mongo_job: MongoReviewJob) -> ReviewJob:
+        """Convert MongoDB review job to domain review job"""
+        return ReviewJob(
+            id=str(mongo_job.id),
+            review_id=str(mongo_job.review_id),
+            user=str(mongo_job.user),
+            language=mongo_job.language,
+            status=JobStatus(mongo_job.status),
+            attempts=mongo_job.attempts,
+            max_attempts=mongo_job.max_attempts,
+            worker_id=mongo_job.worker_id,
+            lease_expires_at=mongo_job.lease_expires_at,
+            available_at=mongo_job.available_at,
+            last_error=mongo_job.last_error,
+            batch_id=mongo_job.batch_id,
+            batch_concurrency=mongo_job.batch_concurrency,
+            estimated_tokens=mongo_job.estimated_tokens,
+            timeout_seconds=mongo_job.timeout_seconds,
+            fingerprint=mongo_job.fingerprint,
+            coalesced_review_ids=[
+                str(review_id) for review_id in mongo_job.coalesced_review_ids
+            ],
+            created_at=mongo_job.created_at,
+            updated_at=mongo_job.updated_at,
+        )
+
+
+class MongoReviewCacheRepository(ReviewCacheRepositoryInterface):
+    """MongoDB implementation of ReviewCacheRepositoryInterface"""
+
+    async def get(self, key: str) -> Optional[CodeReviewIAResponse]:
+        """Find a cached review by key and record the hit"""
+        now = datetime.utcnow()
+        mongo_entry = await MongoReviewCache.find_one(
+            {"key": key, "expires_at": {"$gt": now}}
+        ).update(
+            {"$inc": {"hits": 1}, "$set": {"last_hit_at": now}},
+            response_type=UpdateResponse.NEW_DOCUMENT,
+        )
+        if not mongo_entry:
+            return None
+
+        try:
+            return CodeReviewIAResponse(**mongo_entry.code_review)
+        except Exception:
+            # Entries written by an incompatible model version are ignored
+            return None
+
+    async def set(
+        self,
+        key: str,
+        language: str,
+        model: str,
+        prompt_version: str,
+        code_review: CodeReviewIAResponse,
+        expires_at: datetime,
+    ) -> None:
+        """Store (or refresh) a cached review"""
+        now = datetime.utcnow()
+        await MongoReviewCache.find_one(MongoReviewCache.key == key).upsert(
+            Set(
+                {
+                    "code_review": code_review.model_dump(),
+                    "last_hit_at": now,
+                    "expires_at": expires_at,
+                }
+            ),
+            on_insert=MongoReviewCache(
+                key=key,
+                language=language.lower().strip(),
+                model=model,
+                prompt_version=prompt_version,
+                code_review=code_review.model_dump(),
+                created_at=now,
+                last_hit_at=now,
+                expires_at=expires_at,
+            ),
+        )
+
+    async def evict(self, max_entries: int) -> int:
+        """Remove the least recently used entries above max_entries"""
+        overflow = await MongoReviewCache.count() - max_entries
+        if overflow <= 0:
+            return 0
+
+        stale_entries = (
+            await MongoReviewCache.find_all()
+            .sort("+last_hit_at")
+            .limit(overflow)
+            .project(_IdView)
+            .to_list()
+        )
+        result = await MongoReviewCache.find(
+            In(MongoReviewCache.id, [entry.id for entry in stale_entries])
+        ).delete()
+        return result.deleted_count if result else 0
+
+
+class MongoReviewStreamRepository(ReviewStreamRepositoryInterface):
+    """MongoDB implementation of ReviewStreamRepositoryInterface"""
+
+    async def append(self, events: List[ReviewStreamEvent]) -> bool:
+        """
+        Store events of a review stream, False when a seq is already taken
+
+        Events are inserted in order, the ones before the taken seq are stored.
+        """
+        if not events:
+            return True
+
+        try:
+            await MongoReviewStreamEvent.insert_many(
+                [
+                    MongoReviewStreamEvent(
+                        review_id=PydanticObjectId(event.review_id),
+                        seq=event.seq,
+                        event=event.event,
+                        data=event.data,
+                        created_at=event.created_at,
+                        expires_at=event.expires_at,
+                    )
+                    for event in events
+                ]
+            )
+        except BulkWriteError as e:
+            # Unique (review_id, seq) index, another writer stored this seq
+            if all(
+                error.get("code") == 11000 for error in e.details["writeErrors"]
+            ):
+                return False
+            raise
+        return True
+
+    async def find_after(
+        self, review_id: str, after_seq: int, limit: int = 500
+    ) -> List[ReviewStreamEvent]:
+        """Find events of a review with seq greater than after_seq, in order"""
+        mongo_events = (
+            await MongoReviewStreamEvent.find(
+                MongoReviewStreamEvent.review_id == PydanticObjectId(review_id),
+                MongoReviewStreamEvent.seq > after_seq,
+            )
+            .sort("+seq")
+            .limit(limit)
+            .to_list()
+        )
+        return [self._mongo_to_domain(mongo_event) for mongo_event in mongo_events]
+
+    async def last_seq(self, review_id: str) -> int:
+        """Get the seq of the last event of a review, 0 if it has none"""
+        mongo_event = await MongoReviewStreamEvent.find(
+            MongoReviewStreamEvent.review_id == PydanticObjectId(review_id)
+        ).sort("-seq").first_or_none()
+        return mongo_event.seq if mongo_event else 0
+
+    def _mongo_to_domain(
+        self, mongo_event: MongoReviewStreamEvent
+    ) -> ReviewStreamEvent:
+        """Convert MongoDB stream event to domain stream event"""
+        return ReviewStreamEvent(
+            review_id=str(mongo_event.review_id),
+            seq=mongo_event.seq,
+            event=mongo_event.event,
+            data=mongo_event.data,
+            created_at=mongo_event.created_at,
+            expires_at=mongo_event.expires_at,
+        )
+
+
+class MongoMaintenanceLeaseRepository(MaintenanceLeaseRepositoryInterface):
+    """MongoDB implementation of MaintenanceLeaseRepositoryInterface"""
+
+    async def acquire(self, name: str, owner: str, duration_seconds: float) -> bool:
+        """Take the lease of a maintenance job if it is free or expired"""
+        now = datetime.utcnow()
+        expires_at = now + timedelta(seconds=duration_seconds)
+        try:
+            # A lease held by another owner doesn't match, inserting it again
+            # then fails on the unique name
+            lease = await MongoMaintenanceLease.find_one(
+                MongoMaintenanceLease.name == name,
+                MongoMaintenanceLease.expires_at <= now,
+            ).upsert(
+                Set({"owner": owner, "acquired_at": now, "expires_at": expires_at}),
+                on_insert=MongoMaintenanceLease(
+                    name=name, owner=owner, acquired_at=now, expires_at=expires_at
+                ),
+                response_type=UpdateResponse.NEW_DOCUMENT,
+            )
+        except DuplicateKeyError:
+            return False
+        return lease is not None and lease.owner == owner
+
+    async def release(self, name: str, owner: str) -> None:
+        """Give up a lease held by owner before it expires"""
+        await MongoMaintenanceLease.find_one(
+            MongoMaintenanceLease.name == name, MongoMaintenanceLease.owner == owner
+        ).delete()
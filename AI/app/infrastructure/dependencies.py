@@ -8,11 +8,24 @@ from passlib.context import CryptContext
 from slowapi import Limiter
 from slowapi.util import get_remote_address
 
+from app.config.settings import Settings
 from app.infrastructure.factories.repository_factory import RepositoryFactory
 from app.infrastructure.services.authenticator_jwt import AuthenticatorJWT
+from app.interfaces.repositories.maintenance_lease_repository_interface import (
+    MaintenanceLeaseRepositoryInterface,
+)
+from app.interfaces.repositories.review_cache_repository_interface import (
+    ReviewCacheRepositoryInterface,
+)
+from app.interfaces.repositories.review_job_repository_interface import (
+    ReviewJobRepositoryInterface,
+)
 from app.interfaces.repositories.review_repository_interface import (
     ReviewRepositoryInterface,
 )
+from app.interfaces.repositories.review_stream_repository_interface import (
+    ReviewStreamRepositoryInterface,
+)
 from app.interfaces.repositories.user_repository_interface import (
     UserRepositoryInterface,
 )
@@ -25,7 +38,9 @@ pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 security = HTTPBearer()
 
 # Rate limiter instance
-limiter = Limiter(key_func=get_remote_address)
+limiter = Limiter(
+    key_func=get_remote_address, enabled=Settings().RATE_LIMIT_ENABLED
+)
 
 
 def get_user_repository() -> UserRepositoryInterface:
@@ -55,6 +70,38 @@ def get_review_repository() -> ReviewRepositoryInterface:
     return RepositoryFactory.create_review_repository()
 
 
+def get_review_job_repository() -> ReviewJobRepositoryInterface:
+    """
+    Get review job queue repository instance using factory pattern.
+    This function is database-agnostic and will use the configured database type.
+    """
+    return RepositoryFactory.create_review_job_repository()
+
+
+def get_review_cache_repository() -> ReviewCacheRepositoryInterface:
+    """
+    Get review cache repository instance using factory pattern.
+    This function is database-agnostic and will use the configured database type.
+    """
+    return RepositoryFactory.create_review_cache_repository()
+
+
+def get_review_stream_repository() -> ReviewStreamRepositoryInterface:
+    """
+    Get review stream repository instance using factory pattern.
+    This function is database-agnostic and will use the configured database type.
+    """
+    return RepositoryFactory.create_review_stream_repository()
+
+
+def get_maintenance_lease_repository() -> MaintenanceLeaseRepositoryInterface:
+    """
+    Get maintenance lease repository instance using factory pattern.
+    This function is database-agnostic and will use the configured database type.
+    """
+    return RepositoryFactory.create_maintenance_lease_repository()
+
+
 def get_rate_limiter():
     """
     Get rate limiter instance for IP-based rate limiting.
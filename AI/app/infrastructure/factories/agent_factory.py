@@ -0,0 +1,69 @@
+from typing import Optional, Type
+
+from app.config.settings import Settings
+from app.infrastructure.services.openai_compatible_agent import OpenAICompatibleAgent
+from app.infrastructure.services.praison_agent import PraisonAgent
+from app.infrastructure.services.resilient_agent import ResilientAgent
+from app.interfaces.services.agent_base_interface import AgentBaseInterface
+
+
+class AgentFactory:
+    """Factory for creating agent instances based on the configured agent backend"""
+
+    _agents: dict[str, Type[AgentBaseInterface]] = {
+        "praison": PraisonAgent,
+        "openai": OpenAICompatibleAgent,
+    }
+
+    @classmethod
+    def register_agent(
+        cls, backend: str, agent_class: Type[AgentBaseInterface]
+    ) -> None:
+        """
+        Register an agent implementation for a backend name, it is created
+        with the instructions and an optional LLMEndpoint
+        """
+        cls._agents[backend.lower()] = agent_class
+
+    @classmethod
+    def create(
+        cls, instructions: str, backend: Optional[str] = None
+    ) -> AgentBaseInterface:
+        """
+        Create an agent instance for the given backend. Unless
+        LLM_RESILIENCE_ENABLED is off, the agent balances calls across the
+        LLM_POOL endpoints, retries transient failures and fails over to the
+        LLM_FALLBACKS endpoints.
+
+        Args:
+            instructions: System instructions for the agent
+            backend: Agent backend to use. If None, will use AGENT_BACKEND
+
+        Returns:
+            AgentBaseInterface: Agent instance
+
+        Raises:
+            ValueError: If no agent is registered for the backend
+        """
+        settings = Settings()
+        backend = (backend or settings.AGENT_BACKEND).lower()
+
+        if backend not in cls._agents:
+            raise ValueError(
+                f"No agent implementation registered for backend: {backend}"
+            )
+
+        agent_class = cls._agents[backend]
+        if not settings.LLM_RESILIENCE_ENABLED:
+            return agent_class(instructions)
+
+        return ResilientAgent(
+            settings.get_llm_endpoints(),
+            lambda endpoint: agent_class(instructions, endpoint=endpoint),
+            pool_size=len(settings.get_llm_pool()),
+        )
+
+    @classmethod
+    def get_supported_backends(cls) -> list[str]:
+        """Get list of registered agent backends"""
+        return list(cls._agents)
@@ -2,9 +2,21 @@ from typing import Optional, Type
 
 from app.config.settings import Settings
 from app.core.enums import DatabaseType
+from app.interfaces.repositories.maintenance_lease_repository_interface import (
+    MaintenanceLeaseRepositoryInterface,
+)
+from app.interfaces.repositories.review_cache_repository_interface import (
+    ReviewCacheRepositoryInterface,
+)
+from app.interfaces.repositories.review_job_repository_interface import (
+    ReviewJobRepositoryInterface,
+)
 from app.interfaces.repositories.review_repository_interface import (
     ReviewRepositoryInterface,
 )
+from app.interfaces.repositories.review_stream_repository_interface import (
+    ReviewStreamRepositoryInterface,
+)
 from app.interfaces.repositories.user_repository_interface import (
     UserRepositoryInterface,
 )
@@ -15,6 +27,18 @@ class RepositoryFactory:
 
     _user_repositories: dict[DatabaseType, Type[UserRepositoryInterface]] = {}
     _review_repositories: dict[DatabaseType, Type[ReviewRepositoryInterface]] = {}
+    _review_job_repositories: dict[
+        DatabaseType, Type[ReviewJobRepositoryInterface]
+    ] = {}
+    _review_cache_repositories: dict[
+        DatabaseType, Type[ReviewCacheRepositoryInterface]
+    ] = {}
+    _review_stream_repositories: dict[
+        DatabaseType, Type[ReviewStreamRepositoryInterface]
+    ] = {}
+    _maintenance_lease_repositories: dict[
+        DatabaseType, Type[MaintenanceLeaseRepositoryInterface]
+    ] = {}
 
     @classmethod
     def register_user_repository(
@@ -30,6 +54,42 @@ class RepositoryFactory:
         """Register a review repository implementation for a specific database type"""
         cls._review_repositories[db_type] = repository_class
 
+    @classmethod
+    def register_review_job_repository(
+        cls,
+        db_type: DatabaseType,
+        repository_class: Type[ReviewJobRepositoryInterface],
+    ) -> None:
+        """Register a review job repository implementation for a specific database type"""
+        cls._review_job_repositories[db_type] = repository_class
+
+    @classmethod
+    def register_review_cache_repository(
+        cls,
+        db_type: DatabaseType,
+        repository_class: Type[ReviewCacheRepositoryInterface],
+    ) -> None:
+        """Register a review cache repository implementation for a specific database type"""
+        cls._review_cache_repositories[db_type] = repository_class
+
+    @classmethod
+    def register_review_stream_repository(
+        cls,
+        db_type: DatabaseType,
+        repository_class: Type[ReviewStreamRepositoryInterface],
+    ) -> None:
+        """Register a review stream repository implementation for a specific database type"""
+        cls._review_stream_repositories[db_type] = repository_class
+
+    @classmethod
+    def register_maintenance_lease_repository(
+        cls,
+        db_type: DatabaseType,
+        repository_class: Type[MaintenanceLeaseRepositoryInterface],
+    ) -> None:
+        """Register a maintenance lease repository implementation for a specific database type"""
+        cls._maintenance_lease_repositories[db_type] = repository_class
+
     @classmethod
     def create_user_repository(
         cls, db_type: Optional[DatabaseType] = None
@@ -84,6 +144,114 @@ class RepositoryFactory:
         repository_class = cls._review_repositories[db_type]
         return repository_class()
 
+    @classmethod
+    def create_review_job_repository(
+        cls, db_type: Optional[DatabaseType] = None
+    ) -> ReviewJobRepositoryInterface:
+        """
+        Create a review job repository instance based on the database type
+
+        Args:
+            db_type: Database type to use. If None, will use the configured database type
+
+        Returns:
+            ReviewJobRepositoryInterface: Repository instance
+
+        Raises:
+            ValueError: If the database type is not supported or not registered
+        """
+        if db_type is None:
+            db_type = cls._get_database_type_from_config()
+
+        if db_type not in cls._review_job_repositories:
+            raise ValueError(
+                f"No review job repository implementation registered for database type: {db_type.value}"
+            )
+
+        repository_class = cls._review_job_repositories[db_type]
+        return repository_class()
+
+    @classmethod
+    def create_review_cache_repository(
+        cls, db_type: Optional[DatabaseType] = None
+    ) -> ReviewCacheRepositoryInterface:
+        """
+        Create a review cache repository instance based on the database type
+
+        Args:
+            db_type: Database type to use. If None, will use the configured database type
+
+        Returns:
+            ReviewCacheRepositoryInterface: Repository instance
+
+        Raises:
+            ValueError: If the database type is not supported or not registered
+        """
+        if db_type is None:
+            db_type = cls._get_database_type_from_config()
+
+        if db_type not in cls._review_cache_repositories:
+            raise ValueError(
+                f"No review cache repository implementation registered for database type: {db_type.value}"
+            )
+
+        repository_class = cls._review_cache_repositories[db_type]
+        return repository_class()
+
+    @classmethod
+    def create_review_stream_repository(
+        cls, db_type: Optional[DatabaseType] = None
+    ) -> ReviewStreamRepositoryInterface:
+        """
+        Create a review stream repository instance based on the database type
+
+        Args:
+            db_type: Database type to use. If None, will use the configured database type
+
+        Returns:
+            ReviewStreamRepositoryInterface: Repository instance
+
+        Raises:
+            ValueError: If the database type is not supported or not registered
+        """
+        if db_type is None:
+            db_type = cls._get_database_type_from_config()
+
+        if db_type not in cls._review_stream_repositories:
+            raise ValueError(
+                f"No review stream repository implementation registered for database type: {db_type.value}"
+            )
+
+        repository_class = cls._review_stream_repositories[db_type]
+        return repository_class()
+
+    @classmethod
+    def create_maintenance_lease_repository(
+        cls, db_type: Optional[DatabaseType] = None
+    ) -> MaintenanceLeaseRepositoryInterface:
+        """
+        Create a maintenance lease repository instance based on the database type
+
+        Args:
+            db_type: Database type to use. If None, will use the configured database type
+
+        Returns:
+            MaintenanceLeaseRepositoryInterface: Repository instance
+
+        Raises:
+            ValueError: If the database type is not supported or not registered
+        """
+        if db_type is None:
+            db_type = cls._get_database_type_from_config()
+
+        if db_type not in cls._maintenance_lease_repositories:
+            raise ValueError(
+                f"No maintenance lease repository implementation registered for database type: {db_type.value}"
+            )
+
+        repository_class = cls._maintenance_lease_repositories[db_type]
+        return repository_class()
+
     @classmethod
     def _get_database_type_from_config(cls) -> DatabaseType:
         """Get database type from configuration"""
@@ -119,7 +287,11 @@ class RepositoryFactory:
 # Auto-register MongoDB repositories if available
 try:
     from app.infrastructure.db.mongo.mongo_repository import (
+        MongoMaintenanceLeaseRepository,
+        MongoReviewCacheRepository,
+        MongoReviewJobRepository,
         MongoReviewRepository,
+        MongoReviewStreamRepository,
         MongoUserRepository,
     )
 
@@ -129,6 +301,18 @@ try:
     RepositoryFactory.register_review_repository(
         DatabaseType.MONGODB, MongoReviewRepository
     )
+    RepositoryFactory.register_review_job_repository(
+        DatabaseType.MONGODB, MongoReviewJobRepository
+    )
+    RepositoryFactory.register_review_cache_repository(
+        DatabaseType.MONGODB, MongoReviewCacheRepository
+    )
+    RepositoryFactory.register_review_stream_repository(
+        DatabaseType.MONGODB, MongoReviewStreamRepository
+    )
+    RepositoryFactory.register_maintenance_lease_repository(
+        DatabaseType.MONGODB, MongoMaintenanceLeaseRepository
+    )
 except ImportError:
     pass
 
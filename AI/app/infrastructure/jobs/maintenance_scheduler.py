@@ -0,0 +1,110 @@
+import time
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+from app.infrastructure.logger import logger
+from app.infrastructure.services.review_metrics import ReviewMetrics
+from app.interfaces.repositories.maintenance_lease_repository_interface import (
+    MaintenanceLeaseRepositoryInterface,
+)
+
+
+class MaintenanceJob:
+    """Periodic housekeeping task, run returns how many items it processed"""
+
+    def __init__(self, name: str, interval: float, run: Callable[[], Awaitable[int]]):
+        self.name = name
+        self.interval = interval
+        self.run = run
+        # Clock time before which this process ran it already
+        self.next_run = 0.0
+
+        # Metrics of the runs of this process
+        self.runs = 0
+        self.failures = 0
+        self.items = 0
+        self.last_duration: Optional[float] = None
+
+
+class MaintenanceScheduler:
+    """
+    Runs housekeeping jobs of every worker once per interval across all of
+    them. Each job has a lease in the database held for its interval by the
+    worker that runs it, the other workers skip the job until it expires. A run
+    that fails keeps the lease, the job is retried on the next interval.
+    """
+
+    def __init__(
+        self,
+        lease_repository: MaintenanceLeaseRepositoryInterface,
+        owner: str,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.lease_repository = lease_repository
+        self.owner = owner
+        self.clock = clock
+        self._jobs: Dict[str, MaintenanceJob] = {}
+        self.metrics = ReviewMetrics()
+
+    def register(
+        self, name: str, interval: float, run: Callable[[], Awaitable[int]]
+    ) -> None:
+        """Run a job every interval seconds, on one worker at a time"""
+        self._jobs[name] = MaintenanceJob(name, interval, run)
+
+    async def run_due(self) -> Dict[str, int]:
+        """Run the due jobs whose lease this worker gets, returns items by job"""
+        processed = {}
+        for job in self._jobs.values():
+            if self.clock() < job.next_run:
+                continue
+            try:
+                acquired = await self.lease_repository.acquire(
+                    job.name, self.owner, job.interval
+                )
+            except Exception as e:
+                logger.error(f"Error acquiring maintenance lease {job.name}: {str(e)}")
+                continue
+            if acquired:
+                job.next_run = self.clock() + job.interval
+                processed[job.name] = await self._run(job)
+        return processed
+
+    async def _run(self, job: MaintenanceJob) -> int:
+        started = self.clock()
+        try:
+            items = await job.run()
+        except Exception as e:
+            duration = self.clock() - started
+            job.failures += 1
+            job.last_duration = duration
+            self.metrics.maintenance_job_finished(job.name, duration, 0, "error")
+            logger.error(
+                f"Maintenance job {job.name} failed after {duration:.3f}s: {str(e)}"
+            )
+            return 0
+
+        duration = self.clock() - started
+        job.runs += 1
+        job.items += items
+        job.last_duration = duration
+        self.metrics.maintenance_job_finished(job.name, duration, items, "ok")
+        logger.info(
+            f"Maintenance job {job.name} processed {items} items in {duration:.3f}s"
+        )
+        return items
+
+    def stats(self) -> Dict[str, Any]:
+        """Runs of each job by this worker"""
+        return {
+            job.name: {
+                "runs": job.runs,
+                "failures": job.failures,
+                "items": job.items,
+                "last_duration": (
+                    round(job.last_duration, 3)
+                    if job.last_duration is not None
+                    else None
+                ),
+            }
+            for job in self._jobs.values()
+        }
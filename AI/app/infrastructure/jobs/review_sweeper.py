@@ -0,0 +1,111 @@
+from datetime import datetime, timedelta
+from typing import Dict
+
+from app.config.settings import Settings
+from app.core.models.review import Review
+from app.core.models.review_job import JobStatus, ReviewJob
+from app.infrastructure.logger import logger
+from app.infrastructure.services.review_metrics import ReviewMetrics
+from app.infrastructure.services.review_stream import ReviewStreamPublisher
+from app.use_cases.review_job_use_case import ReviewJobUseCase
+from app.use_cases.review_use_case import ReviewUseCase
+
+# Overdue reviews handled per sweep, the next sweep takes the rest
+SWEEP_BATCH_SIZE = 100
+
+
+class ReviewSweeper:
+    """
+    Recovers reviews stuck in pending or in_progress past their deadline: the
+    API died before enqueueing them, their job was lost, or its last attempt
+    died with its worker. Those are re-enqueued while they have attempts left
+    and rejected otherwise. Overdue reviews whose job is still queued or running
+    are left alone, their deadline is pushed back.
+
+    State lives in the database, so reviews left behind by a crashed process
+    are recovered by any worker. Workers sweep concurrently, moving the
+    deadline of a review atomically decides which one handles it.
+    """
+
+    def __init__(
+        self,
+        review_use_case: ReviewUseCase,
+        review_job_use_case: ReviewJobUseCase,
+        review_stream: ReviewStreamPublisher,
+    ):
+        self.settings = Settings()
+        self.review_use_case = review_use_case
+        self.review_job_use_case = review_job_use_case
+        self.review_stream = review_stream
+        self.metrics = ReviewMetrics()
+
+    async def sweep(self) -> Dict[str, int]:
+        """Handle overdue reviews once, returns how many were recovered"""
+        now = datetime.utcnow()
+        deadline = timedelta(seconds=self.settings.REVIEW_DEADLINE)
+        overdue = await self.review_use_case.get_overdue_reviews(
+            now, now - deadline, SWEEP_BATCH_SIZE
+        )
+
+        stats = {"overdue": 0, "requeued": 0, "rejected": 0}
+        for review in overdue:
+            # Another worker may be handling it
+            if not await self.review_use_case.extend_review_deadline(
+                review, now + deadline
+            ):
+                continue
+            stats["overdue"] += 1
+            try:
+                outcome = await self._recover(review, now)
+            except Exception as e:
+                logger.error(f"Error recovering stuck review {review.id}: {str(e)}")
+                continue
+            if outcome:
+                stats[outcome] += 1
+        return stats
+
+    async def _recover(self, review: Review, now: datetime) -> str:
+        """Re-enqueue or reject a review, returns what was done, "" if nothing"""
+        jobs = await self.review_job_use_case.get_jobs_of_review(str(review.id))
+        if any(self._is_alive(job, now) for job in jobs):
+            return ""
+
+        for job in jobs:
+            # Its last attempt died with its worker, no one will reclaim it
+            if job.status == JobStatus.LEASED:
+                await self.review_job_use_case.fail_expired_job(
+                    job, "Lease expired on the last attempt"
+                )
+
+        attempts_left = self.settings.JOB_MAX_ATTEMPTS - review.attempts
+        if attempts_left > 0:
+            job = await self.review_job_use_case.enqueue_review(
+                review,
+                max_attempts=attempts_left,
+                timeout_seconds=self.settings.REVIEW_JOB_TIMEOUT,
+            )
+            logger.warning(
+                f"Review {review.id} was stuck {review.status}, re-enqueued as "
+                f"job {job.id} with {attempts_left} attempts left"
+            )
+            return "requeued"
+
+        review.status = "rejected"
+        review.updated_at = now
+        await self.review_use_case.update_review(review)
+        await self.review_stream.publish_status(str(review.id), review.status)
+        self.metrics.review_finished(review.language, review.status, "sweeper", None)
+        logger.error(
+            f"Review {review.id} was stuck after {review.attempts} attempts, rejected"
+        )
+        return "rejected"
+
+    def _is_alive(self, job: ReviewJob, now: datetime) -> bool:
+        """Whether a worker is running the job or may still claim it"""
+        if job.status in (JobStatus.QUEUED, JobStatus.HELD):
+            return True
+        if job.status == JobStatus.LEASED:
+            lease_active = job.lease_expires_at and job.lease_expires_at > now
+            return bool(lease_active) or job.attempts < job.max_attempts
+        return False
+
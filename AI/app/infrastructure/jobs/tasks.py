@@ -1,23 +1,60 @@
-import json
-from datetime import datetime
+import asyncio
+import time
+from array import array
+from datetime import datetime, timedelta
+from typing import Any, List, Optional, Tuple
 
 from app.config.settings import Settings
 from app.core.enums import ConfigLLm
-from app.core.models.review import CodeReviewIAResponse
+from app.core.models.review import CodeReviewIAResponse, Review, ReviewTimings
 from app.infrastructure.logger import logger
-from app.infrastructure.services.praison_agent import PraisonAgent
+from app.infrastructure.services.agent_pool import AgentPool
+from app.infrastructure.services.near_duplicate_index import NearDuplicateIndex
+from app.infrastructure.services.review_metrics import ReviewMetrics
+from app.infrastructure.services.review_cache_service import ReviewCacheService
+from app.infrastructure.services.review_stream import (
+    TERMINAL_STATUSES,
+    ReviewStream,
+    ReviewStreamPublisher,
+)
+from app.infrastructure.services.review_token_budget import (
+    ReviewPrompt,
+    ReviewTokenBudget,
+)
+from app.infrastructure.utils.code_chunker import CodeChunk, split_code
+from app.infrastructure.utils.json_extractor import parse_code_review
+from app.infrastructure.utils.prompts import render_instructions
+from app.infrastructure.utils.token_estimator import estimate_tokens
+from app.infrastructure.utils.review_merge import merge_chunk_reviews
+from app.interfaces.repositories.review_cache_repository_interface import (
+    ReviewCacheRepositoryInterface,
+)
 from app.interfaces.repositories.review_repository_interface import (
     ReviewRepositoryInterface,
 )
+from app.interfaces.repositories.review_stream_repository_interface import (
+    ReviewStreamRepositoryInterface,
+)
 from app.use_cases.agent_simple_chat_use_case import AgentSimpleChatUseCase
 from app.use_cases.review_use_case import ReviewUseCase
 
 
 class IATasks:
-    def __init__(self, review_repository: ReviewRepositoryInterface):
+    def __init__(
+        self,
+        review_repository: ReviewRepositoryInterface,
+        review_cache_repository: ReviewCacheRepositoryInterface,
+        review_stream_repository: ReviewStreamRepositoryInterface,
+    ):
         self.settings = Settings()
         self.review_repository = review_repository
         self.review_use_case = ReviewUseCase(review_repository)
+        self.review_cache = ReviewCacheService(review_cache_repository)
+        self.near_duplicates = NearDuplicateIndex(review_repository)
+        self.review_stream = ReviewStreamPublisher(review_stream_repository)
+        self.review_budget = ReviewTokenBudget()
+        self.agent_pool = AgentPool()
+        self.metrics = ReviewMetrics()
 
     async def process_review_with_agent(
         self,
@@ -26,96 +63,423 @@ class IATasks:
         language: str,
     ):
         """
-        Background task to process review with AI agent and update the review
+        Process review with AI agent and update the review.
+        Errors calling the agent are re-raised so the caller can retry the job.
 
         Args:
             review_id: ID of the review to update
             code_submission: Code to be reviewed
             language: Programming language of the code
         """
+        started = time.perf_counter()
         try:
-            # Initialize agent and use case
-            agent = PraisonAgent(
-                instructions=self.settings.llm_config[ConfigLLm.INSTRUCTIONS].format(
-                    language=language
+            # Let stream clients know the review was picked up
+            stream = await self.review_stream.open(review_id)
+            if not await self._start_review(review_id, stream):
+                return
+
+            # Identical code may have been reviewed while this job was queued
+            cached_review = await self.review_cache.get(code_submission, language)
+            if cached_review:
+                await self.complete_review_with(
+                    review_id,
+                    cached_review,
+                    source="review cache",
+                    stream=stream,
+                    timings=self._finish_timings(
+                        ReviewTimings(source="review_cache"), started
+                    ),
                 )
-            )
-            agent_use_case = AgentSimpleChatUseCase(agent)
+                return
 
-            code_review_response = agent_use_case.execute(
-                message=code_submission,
-                output_pydantic=CodeReviewIAResponse,
-                output_json=True,
+            # Reuse a completed review of near-identical code for the same language
+            signature = await self.near_duplicates.compute_signature(code_submission)
+            if signature is not None and await self._reuse_near_duplicate(
+                review_id, language, signature, stream, started
+            ):
+                return
+
+            prompt = self.review_budget.prepare(code_submission, language)
+            timings = ReviewTimings(model=self._model())
+            code_review, estimated_tokens = await self._review_code(
+                prompt, language, stream, timings
             )
+
             # Get the existing review
             existing_review = await self.review_use_case.get_review_by_id(review_id)
             if not existing_review:
                 logger.error(f"Review with id {review_id} not found")
                 return
 
-            # Parse JSON response and validate against Pydantic model
-            try:
-                # Check if code_review_response is None or empty
-                if code_review_response is None:
-                    raise ValueError("Agent response is None")
-
-                if isinstance(code_review_response, str):
-                    # Clean the response by removing markdown code blocks
-                    cleaned_response = code_review_response.strip()
-
-                    # Check if cleaned response is empty
-                    if not cleaned_response:
-                        raise ValueError("Agent response is empty after cleaning")
-
-                    # Remove markdown code blocks (```json or ```)
-                    if cleaned_response.startswith("```"):
-                        # Find the first newline after the opening ```
-                        first_newline = cleaned_response.find("\n")
-                        if first_newline != -1:
-                            # Remove everything before the first newline (including ```)
-                            cleaned_response = cleaned_response[first_newline + 1 :]
-
-                        # Remove closing ``` if present
-                        if cleaned_response.endswith("```"):
-                            cleaned_response = cleaned_response[:-3]
-
-                        # Strip any remaining whitespace
-                        cleaned_response = cleaned_response.strip()
-
-                        # Check if response is empty after removing markdown
-                        if not cleaned_response:
-                            raise ValueError(
-                                "Agent response is empty after removing markdown"
-                            )
-
-                    # Parse JSON string
-                    json_data = json.loads(cleaned_response)
-                else:
-                    # Already a dict
-                    json_data = code_review_response
-
-                # Check if json_data is None or not a dict
-                if json_data is None:
-                    raise ValueError("Parsed JSON data is None")
-
-                if not isinstance(json_data, dict):
-                    raise ValueError(f"Expected dict, got {type(json_data)}")
-
-                # Validate against Pydantic model
-                validated_response = CodeReviewIAResponse(**json_data)
-                code_review = validated_response
-            except (json.JSONDecodeError, ValueError, TypeError) as e:
-                # Fallback to storing as CodeReviewIAResponse
-                code_review = None
-
             existing_review.code_review = code_review
-            existing_review.status = "completed" if code_review else "rejected"
+            existing_review.status = self._result_status(
+                existing_review, "completed" if code_review else "rejected"
+            )
+            existing_review.estimated_tokens = estimated_tokens
+            existing_review.timings = self._finish_timings(timings, started)
             existing_review.updated_at = datetime.utcnow()
 
             # Save updated review
             await self.review_use_case.update_review(existing_review)
+            await stream.status(existing_review.status)
+            self._review_finished(existing_review)
+
+            if code_review:
+                await self.review_cache.set(code_submission, language, code_review)
+                if signature is not None:
+                    await self.near_duplicates.add(review_id, language, signature)
 
             logger.info(f"Review {review_id} updated with AI review successfully")
 
         except Exception as e:
             logger.error(f"Error processing review {review_id}: {str(e)}")
+            raise
+
+    async def _review_code(
+        self,
+        prompt: ReviewPrompt,
+        language: str,
+        stream: Optional[ReviewStream],
+        timings: ReviewTimings,
+    ) -> Tuple[Optional[CodeReviewIAResponse], int]:
+        """
+        Review a compacted submission with the agent. Submissions over the
+        per-request token budget or REVIEW_CHUNK_MAX_CHARS are split at
+        function/class boundaries, the chunks are reviewed concurrently and
+        their reviews merged.
+
+        Returns:
+            The review, None if it is invalid, and the estimated prompt tokens sent
+        """
+        code = prompt.code.code
+        if not self.settings.REVIEW_CHUNKING_ENABLED:
+            if prompt.estimated_tokens > self.settings.REVIEW_MAX_INPUT_TOKENS:
+                logger.warning(
+                    f"Submission needs about {prompt.estimated_tokens} prompt tokens, "
+                    f"over the {self.settings.REVIEW_MAX_INPUT_TOKENS} token budget"
+                )
+                return None, 0
+            chunks = []
+        else:
+            chunks = split_code(
+                code, language, self.review_budget.chunk_max_chars(prompt)
+            )
+
+        if len(chunks) <= 1:
+            code_review_response = await self._run_agent(
+                code, language, stream, timings, prompt.estimated_tokens
+            )
+            return (
+                self._parse_code_review(code_review_response, language, timings),
+                prompt.estimated_tokens,
+            )
+
+        # Report chunk lines of the original submission, not the compacted one
+        chunks = [
+            CodeChunk(
+                *prompt.code.original_lines(chunk.start_line, chunk.end_line),
+                chunk.code,
+            )
+            for chunk in chunks
+        ]
+        estimated_tokens = sum(
+            prompt.instruction_tokens + estimate_tokens(chunk.code) for chunk in chunks
+        )
+
+        logger.info(f"Reviewing submission in {len(chunks)} chunks")
+        semaphore = asyncio.Semaphore(self.settings.REVIEW_CHUNK_MAX_PARALLEL)
+
+        async def review_chunk(chunk: CodeChunk) -> Optional[CodeReviewIAResponse]:
+            # A chunk whose response can't be parsed is asked again
+            for _ in range(1 + max(self.settings.REVIEW_CHUNK_PARSE_RETRIES, 0)):
+                async with semaphore:
+                    # Tokens of parallel chunks would interleave, don't stream them
+                    code_review_response = await self._run_agent(
+                        chunk.code,
+                        language,
+                        stream=None,
+                        timings=timings,
+                        prompt_tokens=prompt.instruction_tokens
+                        + estimate_tokens(chunk.code),
+                    )
+                code_review = self._parse_code_review(
+                    code_review_response, language, timings
+                )
+                if code_review:
+                    return code_review
+            return None
+
+        chunk_reviews = await asyncio.gather(
+            *(review_chunk(chunk) for chunk in chunks)
+        )
+        unreviewed = [
+            f"{chunk.start_line}-{chunk.end_line}"
+            for chunk, chunk_review in zip(chunks, chunk_reviews)
+            if not chunk_review
+        ]
+        if unreviewed:
+            # A merge of the other chunks would pass for a review of all the code
+            logger.warning(
+                f"Could not review lines {', '.join(unreviewed)} of the submission"
+            )
+            return None, estimated_tokens
+        return merge_chunk_reviews(list(zip(chunks, chunk_reviews))), estimated_tokens
+
+    async def _run_agent(
+        self,
+        code_submission: str,
+        language: str,
+        stream: Optional[ReviewStream],
+        timings: ReviewTimings,
+        prompt_tokens: int,
+    ) -> Any:
+        """
+        Run the review agent, streaming its tokens when a stream is given, and
+        record the call in the review timings and metrics
+        """
+        # Check out a warm agent for this language and run the use case
+        async with self.agent_pool.acquire(
+            instructions=self._get_instructions(language), language=language
+        ) as agent:
+            agent_use_case = AgentSimpleChatUseCase(agent)
+            started = time.perf_counter()
+            first_token_at: Optional[float] = None
+            code_review_response = None
+
+            def on_token(token: str) -> None:
+                nonlocal first_token_at
+                if first_token_at is None:
+                    first_token_at = time.perf_counter()
+                stream.push(token)
+
+            try:
+                # Blocking agents run on the agent thread pool, async agents call
+                # the API directly
+                if stream and self.settings.REVIEW_STREAMING_ENABLED:
+                    # Forward tokens to stream clients as the model produces them
+                    async with stream.flushing():
+                        code_review_response = await agent_use_case.aexecute_stream(
+                            message=code_submission,
+                            on_token=on_token,
+                            output_json=True,
+                        )
+                else:
+                    code_review_response = await agent_use_case.aexecute(
+                        message=code_submission,
+                        output_pydantic=CodeReviewIAResponse,
+                        output_json=True,
+                    )
+            finally:
+                self._record_llm_call(
+                    language,
+                    timings,
+                    seconds=time.perf_counter() - started,
+                    time_to_first_token=(
+                        first_token_at - started if first_token_at else None
+                    ),
+                    prompt_tokens=prompt_tokens,
+                    response=code_review_response,
+                )
+        return code_review_response
+
+    def _record_llm_call(
+        self,
+        language: str,
+        timings: ReviewTimings,
+        seconds: float,
+        time_to_first_token: Optional[float],
+        prompt_tokens: int,
+        response: Any,
+    ) -> None:
+        """Add an LLM call to the review timings and metrics, no response is an error"""
+        completion_tokens = estimate_tokens(str(response)) if response else 0
+        timings.llm_calls += 1
+        timings.llm_seconds = round(timings.llm_seconds + seconds, 4)
+        if time_to_first_token is not None:
+            timings.time_to_first_token_seconds = round(
+                min(
+                    time_to_first_token,
+                    timings.time_to_first_token_seconds or time_to_first_token,
+                ),
+                4,
+            )
+        timings.prompt_tokens += prompt_tokens
+        timings.completion_tokens += completion_tokens
+        self.metrics.observe_llm_call(
+            self._model(),
+            language,
+            seconds,
+            outcome="ok" if response else "error",
+            time_to_first_token=time_to_first_token,
+            prompt_tokens=prompt_tokens,
+            completion_tokens=completion_tokens,
+        )
+
+    def _parse_code_review(
+        self, code_review_response: Any, language: str, timings: ReviewTimings
+    ) -> Optional[CodeReviewIAResponse]:
+        """Parse the agent response into a validated review, None if it is invalid"""
+        started = time.perf_counter()
+        code_review = parse_code_review(code_review_response)
+        seconds = time.perf_counter() - started
+        timings.parse_seconds = round(timings.parse_seconds + seconds, 6)
+        timings.parse_failures += code_review is None
+        self.metrics.observe_parse(
+            self._model(), language, seconds, parsed=code_review is not None
+        )
+        if code_review is None:
+            logger.warning(
+                f"Could not recover a review from agent response: {str(code_review_response)[:200]!r}"
+            )
+        return code_review
+
+    async def complete_review_with(
+        self,
+        review_id: str,
+        code_review: CodeReviewIAResponse,
+        source: str,
+        stream: Optional[ReviewStream] = None,
+        timings: Optional[ReviewTimings] = None,
+    ) -> None:
+        """Complete a review with an existing code review, skipping the agent"""
+        existing_review = await self.review_use_case.get_review_by_id(review_id)
+        if not existing_review:
+            logger.error(f"Review with id {review_id} not found")
+            return
+
+        existing_review.code_review = code_review
+        existing_review.estimated_tokens = 0  # No LLM call was made
+        existing_review.status = self._result_status(existing_review, "completed")
+        existing_review.timings = timings
+        existing_review.updated_at = datetime.utcnow()
+        await self.review_use_case.update_review(existing_review)
+        if stream:
+            await stream.status(existing_review.status)
+        if timings:
+            self._review_finished(existing_review)
+
+        logger.info(f"Review {review_id} completed from {source}")
+
+    async def complete_coalesced_reviews(
+        self, review_id: str, coalesced_review_ids: List[str]
+    ) -> int:
+        """
+        Give reviews coalesced with a finished review its result, without
+        calling the agent again. Returns how many reviews were completed.
+        """
+        review = await self.review_use_case.get_review_by_id(review_id)
+        if not review or review.status not in TERMINAL_STATUSES:
+            logger.error(f"Review {review_id} has no result for its coalesced reviews")
+            return 0
+
+        completed = await asyncio.gather(
+            *(
+                self._complete_coalesced_review(coalesced_review_id, review)
+                for coalesced_review_id in coalesced_review_ids
+            )
+        )
+        return sum(completed)
+
+    async def _complete_coalesced_review(
+        self, review_id: str, source_review: Review
+    ) -> bool:
+        """Copy the result of a finished review, False if already finished"""
+        existing_review = await self.review_use_case.get_review_by_id(review_id)
+        if not existing_review or existing_review.status in TERMINAL_STATUSES:
+            return False
+
+        existing_review.code_review = source_review.code_review
+        existing_review.status = (
+            source_review.status
+            if source_review.status != "cancelled"
+            else "completed" if source_review.code_review else "rejected"
+        )
+        existing_review.estimated_tokens = 0  # No LLM call was made
+        existing_review.timings = ReviewTimings(source="coalesced")
+        existing_review.updated_at = datetime.utcnow()
+        await self.review_use_case.update_review(existing_review)
+        await self.review_stream.publish_status(review_id, existing_review.status)
+        self._review_finished(existing_review, processed=False)
+        return True
+
+    async def _start_review(self, review_id: str, stream: ReviewStream) -> bool:
+        """
+        Mark a review as in progress and count the attempt, returns False if it
+        doesn't exist
+        """
+        existing_review = await self.review_use_case.get_review_by_id(review_id)
+        if not existing_review:
+            logger.error(f"Review with id {review_id} not found")
+            return False
+        if existing_review.status == "cancelled":
+            # Still reviewed for the reviews coalesced with it
+            return True
+
+        now = datetime.utcnow()
+        existing_review.status = "in_progress"
+        existing_review.attempts += 1
+        existing_review.deadline_at = now + timedelta(
+            seconds=self.settings.REVIEW_DEADLINE
+        )
+        existing_review.updated_at = now
+        await self.review_use_case.update_review(existing_review)
+        await stream.status(existing_review.status)
+        return True
+
+    async def _reuse_near_duplicate(
+        self,
+        review_id: str,
+        language: str,
+        signature: array,
+        stream: ReviewStream,
+        started: float,
+    ) -> bool:
+        """Complete the review from a near-duplicate completed review, if one exists"""
+        match = self.near_duplicates.find_similar(language, signature)
+        if not match:
+            return False
+
+        similar_review_id, similarity = match
+        similar_review = await self.review_use_case.get_review_by_id(similar_review_id)
+        if not similar_review or not similar_review.code_review:
+            return False
+
+        await self.complete_review_with(
+            review_id,
+            similar_review.code_review,
+            source=f"near-duplicate review {similar_review_id} ({similarity:.2f})",
+            stream=stream,
+            timings=self._finish_timings(
+                ReviewTimings(source="near_duplicate"), started
+            ),
+        )
+        return True
+
+    def _result_status(self, review: Review, status: str) -> str:
+        """Status of a review given its result, cancelled reviews stay cancelled"""
+        return review.status if review.status == "cancelled" else status
+
+    def _finish_timings(self, timings: ReviewTimings, started: float) -> ReviewTimings:
+        """Set the total processing time of a review"""
+        timings.total_seconds = round(time.perf_counter() - started, 4)
+        return timings
+
+    def _review_finished(self, review: Review, processed: bool = True) -> None:
+        """Count a finished review, processed is False when it wasn't timed"""
+        timings = review.timings or ReviewTimings()
+        self.metrics.review_finished(
+            review.language,
+            review.status,
+            timings.source,
+            timings.total_seconds if processed else None,
+        )
+
+    def _model(self) -> str:
+        return self.settings.llm_config[ConfigLLm.MODEL]
+
+    def _get_instructions(self, language: str) -> str:
+        """Render the review instructions for a language"""
+        return render_instructions(
+            self.settings.llm_config[ConfigLLm.INSTRUCTIONS], language
+        )
+
@@ -0,0 +1,416 @@
+import asyncio
+import math
+import os
+import socket
+import uuid
+from typing import Dict, Optional
+
+from app.config.settings import Settings
+from app.core.models.review import Review
+from app.core.models.review_job import JobStatus, ReviewJob
+from app.infrastructure.jobs.maintenance_scheduler import MaintenanceScheduler
+from app.infrastructure.jobs.review_sweeper import ReviewSweeper
+from app.infrastructure.jobs.tasks import IATasks
+from app.infrastructure.logger import logger
+from app.infrastructure.services.agent_executor import AgentExecutor
+from app.infrastructure.services.agent_pool import AgentPool
+from app.infrastructure.services.circuit_breaker import CircuitBreakerRegistry
+from app.infrastructure.services.llm_http_client import LLMHttpClient
+from app.infrastructure.services.llm_load_balancer import LLMLoadBalancer
+from app.infrastructure.services.metrics_server import start_metrics_server
+from app.infrastructure.services.resilient_agent import LLMUnavailableError
+from app.infrastructure.services.review_metrics import ReviewMetrics
+from app.infrastructure.services.review_scheduler import ReviewScheduler
+from app.infrastructure.services.token_revocations import TokenRevocations
+from app.interfaces.repositories.maintenance_lease_repository_interface import (
+    MaintenanceLeaseRepositoryInterface,
+)
+from app.interfaces.repositories.review_cache_repository_interface import (
+    ReviewCacheRepositoryInterface,
+)
+from app.interfaces.repositories.review_job_repository_interface import (
+    ReviewJobRepositoryInterface,
+)
+from app.interfaces.repositories.review_repository_interface import (
+    ReviewRepositoryInterface,
+)
+from app.interfaces.repositories.review_stream_repository_interface import (
+    ReviewStreamRepositoryInterface,
+)
+from app.use_cases.review_job_use_case import ReviewJobUseCase
+from app.use_cases.review_use_case import ReviewUseCase
+
+
+STATS_LOG_INTERVAL_SECONDS = 60
+
+
+class ReviewWorker:
+    """Consumes queued review jobs with a fixed number of concurrent consumers"""
+
+    def __init__(
+        self,
+        review_repository: ReviewRepositoryInterface,
+        review_job_repository: ReviewJobRepositoryInterface,
+        review_cache_repository: ReviewCacheRepositoryInterface,
+        review_stream_repository: ReviewStreamRepositoryInterface,
+        concurrency: Optional[int] = None,
+        maintenance_lease_repository: Optional[
+            MaintenanceLeaseRepositoryInterface
+        ] = None,
+    ):
+        self.settings = Settings()
+        self.concurrency = concurrency or self.settings.WORKER_CONCURRENCY
+        self.review_use_case = ReviewUseCase(review_repository)
+        self.review_job_use_case = ReviewJobUseCase(
+            review_job_repository,
+            ReviewScheduler() if self.settings.REVIEW_SCHEDULER_ENABLED else None,
+        )
+        self.ia_tasks = IATasks(
+            review_repository, review_cache_repository, review_stream_repository
+        )
+        self.review_sweeper = ReviewSweeper(
+            self.review_use_case,
+            self.review_job_use_case,
+            self.ia_tasks.review_stream,
+        )
+        self.worker_id = (
+            f"{socket.gethostname()}-{os.getpid()}-{uuid.uuid4().hex[:6]}"
+        )
+        self.maintenance = (
+            self._create_maintenance(maintenance_lease_repository)
+            if maintenance_lease_repository
+            else None
+        )
+        self._stop_event = asyncio.Event()
+        self.metrics = ReviewMetrics()
+        # Processing tasks of the jobs being run, by job id
+        self._processing: Dict[str, asyncio.Task] = {}
+
+        # Metrics
+        self._coalesced_jobs = 0
+        self._coalesced_reviews = 0
+
+    async def run(self) -> None:
+        """Run the consumers until stop() is called"""
+        logger.info(
+            f"Review worker {self.worker_id} started with {self.concurrency} consumers"
+        )
+        consumers = [
+            asyncio.create_task(self._consume(f"{self.worker_id}-{index}"))
+            for index in range(self.concurrency)
+        ]
+        metrics_server = await self._start_metrics_server()
+        stats_reporter = asyncio.create_task(self._report_stats())
+        near_duplicate_refresher = asyncio.create_task(
+            self._refresh_near_duplicates()
+        )
+        cancellation_watcher = asyncio.create_task(self._watch_cancellations())
+        maintenance = asyncio.create_task(self._run_maintenance())
+        await asyncio.gather(*consumers)
+        stats_reporter.cancel()
+        near_duplicate_refresher.cancel()
+        cancellation_watcher.cancel()
+        maintenance.cancel()
+        if metrics_server:
+            metrics_server.close()
+        AgentExecutor().shutdown(wait=False)
+        await LLMHttpClient().close()
+        logger.info(f"Review worker {self.worker_id} stopped")
+
+    def stop(self) -> None:
+        """Ask the consumers to exit once their current job finishes"""
+        self._stop_event.set()
+
+    async def _consume(self, consumer_id: str) -> None:
+        """Claim and process jobs until the worker is stopped"""
+        while not self._stop_event.is_set():
+            try:
+                job = await self.review_job_use_case.claim_job(
+                    consumer_id, self.settings.JOB_VISIBILITY_TIMEOUT
+                )
+            except Exception as e:
+                logger.error(f"Error claiming review job: {str(e)}")
+                job = None
+
+            if job is None:
+                await self._wait(self.settings.WORKER_POLL_INTERVAL)
+                continue
+
+            await self.process_job(job, consumer_id)
+
+    async def process_job(self, job: ReviewJob, consumer_id: str) -> None:
+        """
+        Process a claimed job, keeping its lease alive while the agent runs.
+        The processing is aborted if the job is cancelled meanwhile or takes
+        longer than the job's timeout, which fails the attempt.
+        """
+        heartbeat = asyncio.create_task(self._heartbeat(job, consumer_id))
+        processing = asyncio.create_task(self._process_review(job, consumer_id))
+        self._processing[job.id] = processing
+        try:
+            done, _ = await asyncio.wait(
+                [processing], timeout=job.timeout_seconds or None
+            )
+            if not done:
+                processing.cancel()
+                await asyncio.wait([processing])
+        except asyncio.CancelledError:
+            processing.cancel()
+            raise
+        finally:
+            heartbeat.cancel()
+            self._processing.pop(job.id, None)
+
+        if not done:
+            await self._handle_failure(
+                job, consumer_id, f"Deadline of {job.timeout_seconds}s exceeded"
+            )
+            return
+
+        if processing.cancelled():
+            # The job is no longer leased, there is nothing to ack
+            logger.info(f"Job {job.id} was cancelled, its LLM call was aborted")
+            self.metrics.review_finished(
+                job.language, "cancelled", "job_cancelled", None
+            )
+            return
+
+        error = processing.exception()
+        if isinstance(error, LLMUnavailableError):
+            # Don't retry before a circuit lets calls through again
+            await self._handle_failure(job, consumer_id, str(error), error.retry_after)
+            return
+        if error:
+            await self._handle_failure(job, consumer_id, str(error))
+            return
+
+        if not await self.review_job_use_case.complete_job(job.id, consumer_id):
+            logger.warning(f"Job {job.id} lease was lost before it could be acked")
+            return
+
+        await self._release_batch(job)
+
+    async def _process_review(self, job: ReviewJob, consumer_id: str) -> None:
+        """Review the job's review with the agent and complete its coalesced reviews"""
+        review = await self.review_use_case.get_review_by_id(job.review_id)
+        if not review:
+            logger.warning(f"Review {job.review_id} for job {job.id} not found")
+            return
+
+        await self._record_queue_wait(review, job)
+        await self.ia_tasks.process_review_with_agent(
+            job.review_id, review.code_submission, review.language
+        )
+        await self._complete_coalesced(job, consumer_id)
+
+    async def _watch_cancellations(self) -> None:
+        """Abort the processing of jobs cancelled since they were claimed"""
+        while not self._stop_event.is_set():
+            await self._wait(self.settings.JOB_CANCEL_POLL_INTERVAL)
+            try:
+                cancelled = await self.review_job_use_case.find_cancelled_jobs(
+                    list(self._processing)
+                )
+            except Exception as e:
+                logger.error(f"Error checking for cancelled review jobs: {str(e)}")
+                continue
+            for job_id in cancelled:
+                processing = self._processing.get(job_id)
+                if processing:
+                    # Cancels the LLM request, the consumer moves on to the next job
+                    processing.cancel()
+
+    async def _record_queue_wait(self, review: Review, job: ReviewJob) -> None:
+        """Store how long the review waited for its first worker"""
+        if review.queue_wait_seconds is not None:
+            return
+        # updated_at of a freshly claimed job is the time it was leased
+        review.queue_wait_seconds = max(
+            (job.updated_at - job.created_at).total_seconds(), 0
+        )
+        self.metrics.observe_queue_wait(review.language, review.queue_wait_seconds)
+        try:
+            await self.review_use_case.update_review(review)
+        except Exception as e:
+            logger.error(f"Error recording queue wait of review {review.id}: {str(e)}")
+
+    async def _complete_coalesced(self, job: ReviewJob, consumer_id: str) -> None:
+        """Complete the reviews attached to the job with its review's result"""
+        if not job.fingerprint and not job.coalesced_review_ids:
+            return
+        # No more reviews can be attached once the result is being copied
+        closed_job = await self.review_job_use_case.close_coalescing(
+            job.id, consumer_id
+        )
+        if not closed_job or not closed_job.coalesced_review_ids:
+            return
+
+        completed = await self.ia_tasks.complete_coalesced_reviews(
+            job.review_id, closed_job.coalesced_review_ids
+        )
+        self._coalesced_jobs += 1
+        self._coalesced_reviews += completed
+        logger.info(f"Job {job.id} completed {completed} coalesced reviews")
+
+    def coalescing_stats(self) -> Dict[str, int]:
+        """Snapshot of LLM calls saved by coalescing identical reviews"""
+        return {
+            "coalesced_jobs": self._coalesced_jobs,
+            "coalesced_reviews": self._coalesced_reviews,
+        }
+
+    async def _handle_failure(
+        self, job: ReviewJob, consumer_id: str, error: str, min_delay: float = 0
+    ) -> None:
+        """Re-queue a failed job with exponential backoff or give up on it"""
+        retry_delay = max(
+            self.settings.JOB_RETRY_DELAY * 2 ** max(job.attempts - 1, 0),
+            math.ceil(min_delay),
+        )
+        try:
+            failed_job = await self.review_job_use_case.fail_job(
+                job.id, consumer_id, error, retry_delay
+            )
+        except Exception as e:
+            logger.error(f"Error releasing review job {job.id}: {str(e)}")
+            return
+
+        if failed_job and failed_job.status == JobStatus.FAILED:
+            logger.error(
+                f"Job {job.id} failed after {failed_job.attempts} attempts: {error}"
+            )
+            for review_id in [job.review_id, *failed_job.coalesced_review_ids]:
+                await self._set_review_status(review_id, "rejected")
+            await self._release_batch(job)
+        else:
+            logger.warning(
+                f"Job {job.id} attempt {job.attempts} failed, retrying in {retry_delay}s"
+            )
+            await self._set_review_status(job.review_id, "pending")
+
+    async def _release_batch(self, job: ReviewJob) -> None:
+        """Let the next held job of the finished job's batch run"""
+        try:
+            await self.review_job_use_case.release_batch(job)
+        except Exception as e:
+            logger.error(f"Error releasing batch {job.batch_id}: {str(e)}")
+
+    async def _set_review_status(self, review_id: str, status: str) -> None:
+        """Update the status of a failed job's review and notify stream clients"""
+        try:
+            review = await self.review_use_case.get_review_by_id(review_id)
+            # A cancelled review stays cancelled
+            if review and review.status != "cancelled":
+                review.status = status
+                await self.review_use_case.update_review(review)
+                await self.ia_tasks.review_stream.publish_status(review_id, status)
+                if status == "rejected":
+                    self.metrics.review_finished(
+                        review.language, status, "job_failed", None
+                    )
+        except Exception as e:
+            logger.error(f"Error setting review {review_id} as {status}: {str(e)}")
+
+    async def _start_metrics_server(self) -> Optional[asyncio.AbstractServer]:
+        """Serve this process' metrics on WORKER_METRICS_PORT, if enabled"""
+        port = self.settings.WORKER_METRICS_PORT
+        if not self.settings.METRICS_ENABLED or not port:
+            return None
+        try:
+            server = await start_metrics_server(port, self.metrics.render)
+        except OSError as e:
+            # e.g. another worker process on this host already uses the port
+            logger.error(f"Could not serve worker metrics on port {port}: {str(e)}")
+            return None
+        logger.info(f"Worker metrics available on port {port} at /metrics")
+        return server
+
+    async def _heartbeat(self, job: ReviewJob, consumer_id: str) -> None:
+        """Extend the job lease periodically so other workers don't reclaim it"""
+        interval = max(self.settings.JOB_VISIBILITY_TIMEOUT / 3, 1)
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                extended = await self.review_job_use_case.extend_lease(
+                    job.id, consumer_id, self.settings.JOB_VISIBILITY_TIMEOUT
+                )
+                if not extended:
+                    logger.warning(f"Lost lease on review job {job.id}")
+                    return
+            except Exception as e:
+                logger.error(f"Error extending lease of job {job.id}: {str(e)}")
+
+    async def _report_stats(self) -> None:
+        """Log agent, review cache, LLM and coalescing metrics periodically"""
+        while not self._stop_event.is_set():
+            await self._wait(STATS_LOG_INTERVAL_SECONDS)
+            logger.info(f"Agent executor stats: {AgentExecutor().stats()}")
+            logger.info(f"Agent pool stats: {AgentPool().stats()}")
+            logger.info(f"Review cache stats: {self.ia_tasks.review_cache.stats()}")
+            logger.info(
+                f"Near-duplicate index stats: {self.ia_tasks.near_duplicates.stats()}"
+            )
+            logger.info(f"Review stream stats: {self.ia_tasks.review_stream.stats()}")
+            logger.info(f"LLM circuit breaker stats: {CircuitBreakerRegistry().stats()}")
+            logger.info(f"LLM load balancer stats: {LLMLoadBalancer().stats()}")
+            logger.info(f"Review coalescing stats: {self.coalescing_stats()}")
+            if self.maintenance:
+                logger.info(f"Maintenance stats: {self.maintenance.stats()}")
+
+    async def _refresh_near_duplicates(self) -> None:
+        """Load near-duplicate signatures of reviews completed by any worker"""
+        while not self._stop_event.is_set():
+            try:
+                loaded = await self.ia_tasks.near_duplicates.refresh()
+                if loaded:
+                    logger.info(f"Loaded {loaded} near-duplicate review signatures")
+            except Exception as e:
+                logger.error(f"Error refreshing near-duplicate index: {str(e)}")
+            await self._wait(self.settings.NEAR_DUPLICATE_REFRESH_INTERVAL)
+
+    def _create_maintenance(
+        self, lease_repository: MaintenanceLeaseRepositoryInterface
+    ) -> MaintenanceScheduler:
+        """Housekeeping jobs, each one run by a single worker per interval"""
+        maintenance = MaintenanceScheduler(lease_repository, self.worker_id)
+        maintenance.register(
+            "review_sweep",
+            self.settings.REVIEW_SWEEP_INTERVAL,
+            self._sweep_stuck_reviews,
+        )
+        maintenance.register(
+            "review_cache_eviction",
+            self.settings.REVIEW_CACHE_EVICTION_INTERVAL,
+            self.ia_tasks.review_cache.evict,
+        )
+        maintenance.register(
+            "blacklist_cleanup",
+            self.settings.BLACKLIST_CLEANUP_INTERVAL,
+            TokenRevocations().cleanup_expired,
+        )
+        return maintenance
+
+    async def _run_maintenance(self) -> None:
+        """Run the due maintenance jobs no other worker is running"""
+        if not self.maintenance or not self.settings.MAINTENANCE_ENABLED:
+            return
+        while not self._stop_event.is_set():
+            await self.maintenance.run_due()
+            await self._wait(self.settings.MAINTENANCE_POLL_INTERVAL)
+
+    async def _sweep_stuck_reviews(self) -> int:
+        """
+        Recover overdue reviews no worker is processing anymore, returns how
+        many were overdue
+        """
+        stats = await self.review_sweeper.sweep()
+        if stats["requeued"] or stats["rejected"]:
+            logger.info(f"Review sweeper stats: {stats}")
+        return stats["overdue"]
+
+    async def _wait(self, seconds: float) -> None:
+        """Sleep for the given seconds or until the worker is stopped"""
+        try:
+            await asyncio.wait_for(self._stop_event.wait(), timeout=seconds)
+        except asyncio.TimeoutError:
+            pass
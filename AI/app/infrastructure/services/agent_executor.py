@@ -0,0 +1,126 @@
+import asyncio
+import functools
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional
+
+from app.config.settings import Settings
+from app.infrastructure.utils.decorators.singleton import singleton
+from app.infrastructure.utils.event_loop import call_soon
+
+
+@singleton
+class AgentExecutor:
+    """
+    Runs blocking agent calls on a dedicated thread pool so they never block
+    the event loop. A semaphore bounds how many calls run at once; callers
+    over the limit wait in line and are reported as queued. A call keeps its
+    permit until its thread returns, even when its caller was cancelled.
+    """
+
+    def __init__(self):
+        self.settings = Settings()
+        self.max_workers = self.settings.AGENT_EXECUTOR_WORKERS
+        self.max_concurrency = min(
+            self.settings.AGENT_MAX_CONCURRENCY, self.max_workers
+        )
+        self._executor = ThreadPoolExecutor(
+            max_workers=self.max_workers, thread_name_prefix="agent"
+        )
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+        # Metrics
+        self._queued = 0
+        self._max_queued = 0
+        self._in_flight = 0
+        self._completed = 0
+        self._failed = 0
+        self._total_wait_seconds = 0.0
+        self._total_run_seconds = 0.0
+
+    async def run(self, func: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        """
+        Run a blocking callable on the agent thread pool
+
+        Args:
+            func: Blocking callable, e.g. AgentSimpleChatUseCase.execute
+            *args: Positional arguments for func
+            **kwargs: Keyword arguments for func
+
+        Returns:
+            Any: Whatever func returns
+        """
+        semaphore = self._get_semaphore()
+        enqueued_at = time.monotonic()
+
+        self._queued += 1
+        self._max_queued = max(self._max_queued, self._queued)
+        try:
+            await semaphore.acquire()
+        finally:
+            self._queued -= 1
+
+        started_at = time.monotonic()
+        self._total_wait_seconds += started_at - enqueued_at
+        self._in_flight += 1
+        loop = asyncio.get_running_loop()
+        try:
+            future = self._executor.submit(functools.partial(func, *args, **kwargs))
+        except BaseException:
+            self._in_flight -= 1
+            semaphore.release()
+            raise
+        # The permit is held until the thread returns, not until the caller
+        # stops waiting: a cancelled caller leaves its thread running
+        future.add_done_callback(
+            lambda done: call_soon(loop, self._finished, semaphore, done, started_at)
+        )
+        return await asyncio.wrap_future(future, loop=loop)
+
+    def _finished(
+        self,
+        semaphore: asyncio.Semaphore,
+        future: Future,
+        started_at: float,
+    ) -> None:
+        """Record a call whose thread returned and free its permit"""
+        self._in_flight -= 1
+        self._total_run_seconds += time.monotonic() - started_at
+        if future.cancelled() or future.exception() is not None:
+            self._failed += 1
+        else:
+            self._completed += 1
+        semaphore.release()
+
+    def stats(self) -> Dict[str, Any]:
+        """Snapshot of the executor queue depth and throughput metrics"""
+        finished = self._completed + self._failed
+        return {
+            "max_workers": self.max_workers,
+            "max_concurrency": self.max_concurrency,
+            "queued": self._queued,
+            "max_queued": self._max_queued,
+            "in_flight": self._in_flight,
+            "completed": self._completed,
+            "failed": self._failed,
+            "avg_wait_seconds": round(self._total_wait_seconds / finished, 3)
+            if finished
+            else 0.0,
+            "avg_run_seconds": round(self._total_run_seconds / finished, 3)
+            if finished
+            else 0.0,
+        }
+
+    def shutdown(self, wait: bool = True) -> None:
+        """Stop the thread pool, optionally waiting for running calls"""
+        self._executor.shutdown(wait=wait)
+
+    def _get_semaphore(self) -> asyncio.Semaphore:
+        """Semaphore bound to the running event loop"""
+        loop = asyncio.get_running_loop()
+        if self._semaphore is None or self._loop is not loop:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+            self._loop = loop
+        return self._semaphore
+
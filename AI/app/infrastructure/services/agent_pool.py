@@ -0,0 +1,169 @@
+import asyncio
+import time
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional, Tuple
+
+from app.config.settings import Settings
+from app.core.enums import ConfigLLm
+from app.infrastructure.factories.agent_factory import AgentFactory
+from app.infrastructure.utils.decorators.singleton import singleton
+from app.interfaces.services.agent_base_interface import AgentBaseInterface
+
+PoolKey = Tuple[str, str]
+
+
+class _PoolBucket:
+    """Agents sharing the same (model, instructions) key"""
+
+    def __init__(self, max_size: int):
+        self.max_size = max_size
+        self.created = 0
+        self.idle: List[Tuple[AgentBaseInterface, float]] = []
+        self.condition = asyncio.Condition()
+
+    @property
+    def in_use(self) -> int:
+        return self.created - len(self.idle)
+
+
+@singleton
+class AgentPool:
+    """
+    Warm, bounded pool of agents keyed by (model, rendered instructions).
+
+    Agents are created lazily up to the per-language pool size, handed out to
+    one caller at a time and returned after use, so the underlying LLM client
+    and its HTTP connections are reused across reviews. Agents idle for longer
+    than AGENT_POOL_IDLE_TIMEOUT are evicted.
+    """
+
+    def __init__(
+        self, agent_factory: Callable[[str], AgentBaseInterface] = AgentFactory.create
+    ):
+        self.settings = Settings()
+        self.agent_factory = agent_factory
+        self._buckets: "OrderedDict[PoolKey, _PoolBucket]" = OrderedDict()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+        # Metrics
+        self._reused = 0
+        self._created = 0
+        self._evicted = 0
+        self._discarded = 0
+
+    @asynccontextmanager
+    async def acquire(
+        self, instructions: str, language: str
+    ) -> AsyncIterator[AgentBaseInterface]:
+        """
+        Check out an agent for the given instructions
+
+        Args:
+            instructions: Rendered system instructions for the agent
+            language: Programming language, used to size the pool
+
+        Yields:
+            AgentBaseInterface: An agent owned by the caller until the block exits
+        """
+        key = (self.settings.llm_config[ConfigLLm.MODEL], instructions)
+        bucket = self._get_bucket(key, language)
+
+        agent = await self._checkout(bucket, instructions)
+        try:
+            yield agent
+        except BaseException:
+            # The agent may be left in a broken state, don't return it to the pool
+            await self._discard(bucket)
+            raise
+        else:
+            await self._checkin(bucket, agent)
+
+    def stats(self) -> Dict[str, Any]:
+        """Snapshot of pool sizes and reuse metrics"""
+        return {
+            "keys": len(self._buckets),
+            "agents": sum(bucket.created for bucket in self._buckets.values()),
+            "idle": sum(len(bucket.idle) for bucket in self._buckets.values()),
+            "reused": self._reused,
+            "created": self._created,
+            "evicted": self._evicted,
+            "discarded": self._discarded,
+        }
+
+    async def _checkout(
+        self, bucket: _PoolBucket, instructions: str
+    ) -> AgentBaseInterface:
+        """Take an idle agent, create a new one or wait for one to be returned"""
+        async with bucket.condition:
+            while not bucket.idle and bucket.created >= bucket.max_size:
+                await bucket.condition.wait()
+
+            if bucket.idle:
+                agent, _ = bucket.idle.pop()
+                self._reused += 1
+                return agent
+
+            bucket.created += 1
+
+        try:
+            # Building the agent sets up the LLM client, keep it off the event loop
+            agent = await asyncio.to_thread(self.agent_factory, instructions)
+        except BaseException:
+            await self._discard(bucket)
+            raise
+        self._created += 1
+        return agent
+
+    async def _checkin(self, bucket: _PoolBucket, agent: AgentBaseInterface) -> None:
+        """Return an agent to the pool and wake up a waiting caller"""
+        agent.reset()
+        async with bucket.condition:
+            bucket.idle.append((agent, time.monotonic()))
+            bucket.condition.notify()
+        self._evict_idle()
+
+    async def _discard(self, bucket: _PoolBucket) -> None:
+        """Forget a checked out agent, freeing its slot for a new one"""
+        async with bucket.condition:
+            bucket.created -= 1
+            bucket.condition.notify()
+        self._discarded += 1
+
+    def _get_bucket(self, key: PoolKey, language: str) -> _PoolBucket:
+        """Get or create the bucket for a key, keeping the number of keys bounded"""
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            # Conditions are bound to the loop they were first used on
+            self._buckets.clear()
+            self._loop = loop
+
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            bucket = _PoolBucket(self.settings.get_agent_pool_size(language))
+            self._buckets[key] = bucket
+            self._evict_keys()
+        self._buckets.move_to_end(key)
+        return bucket
+
+    def _evict_idle(self) -> None:
+        """Drop agents that have been idle for longer than the idle timeout"""
+        deadline = time.monotonic() - self.settings.AGENT_POOL_IDLE_TIMEOUT
+        for key, bucket in list(self._buckets.items()):
+            fresh = [(agent, used) for agent, used in bucket.idle if used >= deadline]
+            evicted = len(bucket.idle) - len(fresh)
+            if evicted:
+                bucket.idle = fresh
+                bucket.created -= evicted
+                self._evicted += evicted
+            if bucket.created == 0:
+                del self._buckets[key]
+
+    def _evict_keys(self) -> None:
+        """Drop the least recently used keys that have no agents checked out"""
+        for key, bucket in list(self._buckets.items()):
+            if len(self._buckets) <= self.settings.AGENT_POOL_MAX_KEYS:
+                return
+            if bucket.in_use == 0:
+                self._evicted += len(bucket.idle)
+                del self._buckets[key]
@@ -1,5 +1,7 @@
+import hashlib
+import uuid
 from datetime import datetime, timedelta
-from typing import Optional
+from typing import Any, Dict, Optional, Tuple
 
 from fastapi import HTTPException, status
 from fastapi.security import HTTPBearer
@@ -8,13 +10,21 @@ from passlib.context import CryptContext
 
 from app.config.settings import Settings
 from app.core.models.user import TokenData, User
-from app.infrastructure.db.mongo.models import BlackListToken
+from app.infrastructure.db.mongo.models import RefreshToken
+from app.infrastructure.logger import logger
+from app.infrastructure.services.password_hasher import PasswordHasher
+from app.infrastructure.services.token_revocations import TokenRevocations
+from app.infrastructure.services.user_cache import UserCache
 from app.interfaces.repositories.user_repository_interface import (
     UserRepositoryInterface,
 )
 from app.interfaces.services.authenticator_interface import AuthenticatorInterface
 
 
+# Claim "type" of refresh tokens, access tokens have none
+REFRESH_TOKEN_TYPE = "refresh"
+
+
 class AuthenticatorJWT(AuthenticatorInterface):
     def __init__(
         self,
@@ -25,15 +35,20 @@ class AuthenticatorJWT(AuthenticatorInterface):
         self.security = security
         self.pwd_context = pwd_context
         self.user_repository = user_repository
+        self.user_cache = UserCache()
+        self.revocations = TokenRevocations()
+        self.password_hasher = PasswordHasher()
         self.settings = Settings()
 
-    def verify_password(self, plain_password: str, hashed_password: str) -> bool:
-        """Verify a password against its hash"""
-        return self.pwd_context.verify(plain_password, hashed_password)
+    async def verify_password(self, plain_password: str, hashed_password: str) -> bool:
+        """Verify a password against its hash, off the event loop"""
+        return await self.password_hasher.verify(
+            self.pwd_context, plain_password, hashed_password
+        )
 
-    def get_password_hash(self, password: str) -> str:
-        """Hash a password"""
-        return self.pwd_context.hash(password)
+    async def get_password_hash(self, password: str) -> str:
+        """Hash a password, off the event loop"""
+        return await self.password_hasher.hash(self.pwd_context, password)
 
     def create_access_token(
         self, data: dict, expires_delta: Optional[timedelta] = None
@@ -48,11 +63,69 @@ class AuthenticatorJWT(AuthenticatorInterface):
             )
 
         to_encode.update({"exp": expire})
+        to_encode.setdefault("jti", uuid.uuid4().hex)
         encoded_jwt = jwt.encode(
             to_encode, self.settings.SECRET_KEY, algorithm=self.settings.HASH_ALGORITHM
         )
         return encoded_jwt
 
+    async def create_refresh_token(self, user: User, family: str) -> str:
+        """Create a refresh token of a login, it can be used once"""
+        expire = datetime.utcnow() + timedelta(
+            days=self.settings.REFRESH_TOKEN_EXPIRE_DAYS
+        )
+        jti = uuid.uuid4().hex
+        await RefreshToken.add_token(jti, family, str(user.id), expire)
+        return jwt.encode(
+            {
+                "sub": user.username,
+                "jti": jti,
+                "fam": family,
+                "type": REFRESH_TOKEN_TYPE,
+                "exp": expire,
+            },
+            self.settings.SECRET_KEY,
+            algorithm=self.settings.HASH_ALGORITHM,
+        )
+
+    async def rotate_refresh_token(self, refresh_token: str) -> Tuple[User, str]:
+        """
+        Use a refresh token, returns its user and login family to issue new
+        tokens for. A token used twice was stolen or replayed, every token of
+        its login is revoked.
+        """
+        credentials_exception = HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid refresh token",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+        try:
+            payload = jwt.decode(
+                refresh_token,
+                self.settings.SECRET_KEY,
+                algorithms=[self.settings.HASH_ALGORITHM],
+            )
+        except JWTError:
+            raise credentials_exception
+        family = payload.get("fam")
+        if payload.get("type") != REFRESH_TOKEN_TYPE or not family:
+            raise credentials_exception
+
+        stored_token = await RefreshToken.use(payload.get("jti"))
+        if stored_token is None:
+            await RefreshToken.revoke_family(family)
+            logger.warning(
+                f"Refresh token reused, revoked the tokens of login {family}"
+            )
+            raise credentials_exception
+
+        user = await self._find_user(
+            TokenData(username=payload.get("sub"), user_id=stored_token.user_id)
+        )
+        if user is None or not user.is_active:
+            raise credentials_exception
+        return user, family
+
     async def verify_token(self, token: str) -> TokenData:
         """Verify and decode a JWT token"""
         credentials_exception = HTTPException(
@@ -61,28 +134,28 @@ class AuthenticatorJWT(AuthenticatorInterface):
             headers={"WWW-Authenticate": "Bearer"},
         )
 
-        # Check if token is blacklisted
-        if await self.is_token_blacklisted(token):
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                detail="Token has been revoked",
-                headers={"WWW-Authenticate": "Bearer"},
-            )
-
         try:
             payload = jwt.decode(
                 token,
                 self.settings.SECRET_KEY,
                 algorithms=[self.settings.HASH_ALGORITHM],
             )
-            username: str = payload.get("sub")
-            if username is None:
-                raise credentials_exception
-            token_data = TokenData(username=username)
         except JWTError:
             raise credentials_exception
 
-        return token_data
+        # Check if token is blacklisted, by the id in the claims just verified
+        if await self.is_token_blacklisted(token, payload):
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="Token has been revoked",
+                headers={"WWW-Authenticate": "Bearer"},
+            )
+
+        username: str = payload.get("sub")
+        # Refresh tokens only buy new tokens at /refresh
+        if username is None or payload.get("type") == REFRESH_TOKEN_TYPE:
+            raise credentials_exception
+        return TokenData(username=username, user_id=payload.get("uid"))
 
     async def get_current_user(self, token: str) -> User:
         """Get the current authenticated user from token"""
@@ -94,7 +167,7 @@ class AuthenticatorJWT(AuthenticatorInterface):
                 detail="Invalid token data",
                 headers={"WWW-Authenticate": "Bearer"},
             )
-        user = await self.user_repository.find_by_username(token_data.username)
+        user = await self._find_user(token_data)
         if user is None:
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
@@ -104,6 +177,22 @@ class AuthenticatorJWT(AuthenticatorInterface):
 
         return user
 
+    async def _find_user(self, token_data: TokenData) -> Optional[User]:
+        """Find the user of a token, cached by the user id it carries"""
+        if not token_data.user_id:
+            return await self.user_repository.find_by_username(token_data.username)
+
+        user = self.user_cache.get(token_data.user_id)
+        if user is None:
+            generation = self.user_cache.generation()
+            user = await self.user_repository.find_by_id(token_data.user_id)
+            if user is None:
+                return None
+            self.user_cache.set(user, generation)
+
+        # The token was issued to this user under this username
+        return user if user.username == token_data.username else None
+
     async def get_current_active_user(self, current_user: User) -> User:
         """Get the current active user"""
         if not current_user.is_active:
@@ -117,7 +206,7 @@ class AuthenticatorJWT(AuthenticatorInterface):
         user = await self.user_repository.find_by_username(username)
         if not user:
             return None
-        if not self.verify_password(password, user.hashed_password):
+        if not await self.verify_password(password, user.hashed_password):
             return None
         return user
 
@@ -132,22 +221,57 @@ class AuthenticatorJWT(AuthenticatorInterface):
             )
             expire_timestamp = payload.get("exp")
             if expire_timestamp:
-                expire_datetime = datetime.fromtimestamp(expire_timestamp)
-                await BlackListToken.add_token(token, expire_datetime)
+                expire_datetime = datetime.utcfromtimestamp(expire_timestamp)
+                await self.revocations.revoke(token_id(token, payload), expire_datetime)
+                # The login can't be renewed anymore either
+                if payload.get("fam"):
+                    await RefreshToken.revoke_family(payload["fam"])
                 return True
             return False
         except JWTError:
-            # If token is invalid, we can still blacklist it
+            # If token is invalid, we can still blacklist it, by its hash as
+            # its claims can't be trusted
             # Set a default expiration time (24 hours from now)
             expire_datetime = datetime.utcnow() + timedelta(hours=24)
-            await BlackListToken.add_token(token, expire_datetime)
+            await self.revocations.revoke(token_id(token), expire_datetime)
             return True
         except Exception:
             return False
 
-    async def is_token_blacklisted(self, token: str) -> bool:
-        """Check if a token is blacklisted"""
+    async def is_token_blacklisted(
+        self, token: str, claims: Optional[Dict[str, Any]] = None
+    ) -> bool:
+        """
+        Check if a token is blacklisted, given its claims when the caller
+        already verified its signature so it isn't decoded again
+        """
         try:
-            return await BlackListToken.is_blacklisted(token)
+            revoked_id = token_id(token, claims) if claims else self._token_id(token)
+            return await self.revocations.is_revoked(revoked_id)
         except Exception:
             return False
+
+    def _token_id(self, token: str) -> str:
+        """Id of a token under which it is revoked, see token_id"""
+        try:
+            # Expired tokens keep the id they were revoked under
+            claims = jwt.decode(
+                token,
+                self.settings.SECRET_KEY,
+                algorithms=[self.settings.HASH_ALGORITHM],
+                options={"verify_exp": False},
+            )
+        except JWTError:
+            claims = None
+        return token_id(token, claims)
+
+
+def token_id(token: str, claims: Optional[Dict[str, Any]] = None) -> str:
+    """
+    The jti claim of a token, from its claims once its signature was verified.
+    Tokens issued before they carried one, or whose signature doesn't verify,
+    are identified by their hash: a forged token must never revoke the session
+    whose jti it copied.
+    """
+    jti = claims.get("jti") if claims else None
+    return jti or hashlib.sha256(token.encode()).hexdigest()
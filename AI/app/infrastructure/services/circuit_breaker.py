@@ -0,0 +1,130 @@
+import threading
+import time
+from typing import Any, Callable, Dict
+
+from app.config.settings import Settings
+from app.infrastructure.utils.decorators.singleton import singleton
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitBreaker:
+    """
+    Stops calls to a failing LLM endpoint.
+
+    After failure_threshold consecutive failures the circuit opens and calls
+    are refused for reset_timeout seconds. Then a single trial call is let
+    through (half-open): its success closes the circuit, its failure opens it
+    again, and if it is cancelled the next call is the trial. Thread-safe,
+    blocking agents report from the agent thread pool.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        failure_threshold: int,
+        reset_timeout: float,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.name = name
+        self.failure_threshold = max(failure_threshold, 1)
+        self.reset_timeout = reset_timeout
+        self.clock = clock
+        self._state = CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._lock = threading.Lock()
+
+        # Metrics
+        self._opened = 0
+        self._rejected = 0
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            return self._state
+
+    def allow(self) -> bool:
+        """Whether a call may be made now, the caller must report its outcome"""
+        with self._lock:
+            if self._state == CLOSED:
+                return True
+            if (
+                self._state == OPEN
+                and self.clock() - self._opened_at >= self.reset_timeout
+            ):
+                # Let a single trial call through
+                self._state = HALF_OPEN
+                return True
+            self._rejected += 1
+            return False
+
+    def record_success(self) -> None:
+        with self._lock:
+            self._state = CLOSED
+            self._failures = 0
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._failures += 1
+            if self._state == HALF_OPEN or self._failures >= self.failure_threshold:
+                if self._state != OPEN:
+                    self._opened += 1
+                self._state = OPEN
+                self._opened_at = self.clock()
+
+    def record_cancelled(self) -> None:
+        """
+        A call ended without an outcome. If it was the trial call the circuit
+        goes back to open, its reset timeout already elapsed so the next call
+        is a new trial.
+        """
+        with self._lock:
+            if self._state == HALF_OPEN:
+                self._state = OPEN
+
+    def retry_after(self) -> float:
+        """Seconds until the circuit lets a trial call through, 0 if it isn't open"""
+        with self._lock:
+            if self._state != OPEN:
+                return 0.0
+            return max(self.reset_timeout - (self.clock() - self._opened_at), 0.0)
+
+    def stats(self) -> Dict[str, Any]:
+        """Snapshot of the circuit state"""
+        with self._lock:
+            return {
+                "state": self._state,
+                "consecutive_failures": self._failures,
+                "opened": self._opened,
+                "rejected": self._rejected,
+            }
+
+
+@singleton
+class CircuitBreakerRegistry:
+    """Circuit breakers shared by every agent of the process, one per endpoint"""
+
+    def __init__(self):
+        self.settings = Settings()
+        self._breakers: Dict[str, CircuitBreaker] = {}
+        self._lock = threading.Lock()
+
+    def get(self, name: str) -> CircuitBreaker:
+        """Get the circuit breaker of an endpoint, creating it on first use"""
+        with self._lock:
+            if name not in self._breakers:
+                self._breakers[name] = CircuitBreaker(
+                    name,
+                    self.settings.LLM_CIRCUIT_FAILURE_THRESHOLD,
+                    self.settings.LLM_CIRCUIT_RESET_TIMEOUT,
+                )
+            return self._breakers[name]
+
+    def stats(self) -> Dict[str, Any]:
+        """Snapshot of every circuit"""
+        with self._lock:
+            breakers = list(self._breakers.values())
+        return {breaker.name: breaker.stats() for breaker in breakers}
@@ -0,0 +1,60 @@
+import asyncio
+from typing import Optional
+
+import httpx
+
+from app.config.settings import Settings
+from app.core.enums import ConfigLLm
+from app.infrastructure.utils.decorators.singleton import singleton
+
+
+@singleton
+class LLMHttpClient:
+    """
+    Shared keep-alive HTTP connection pools to the LLM API, so every agent in
+    the process reuses the same connections instead of opening its own.
+    """
+
+    def __init__(self):
+        self.settings = Settings()
+        self._client: Optional[httpx.AsyncClient] = None
+        self._sync_client: Optional[httpx.Client] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def get(self) -> httpx.AsyncClient:
+        """Get the async client of the running event loop"""
+        loop = asyncio.get_running_loop()
+        if self._client is None or self._loop is not loop:
+            # Pooled connections are bound to the loop they were opened on
+            self._client = httpx.AsyncClient(
+                limits=self._limits(), timeout=self._timeout()
+            )
+            self._loop = loop
+        return self._client
+
+    def get_sync(self) -> httpx.Client:
+        """Get the blocking client, for callers outside the event loop"""
+        if self._sync_client is None:
+            self._sync_client = httpx.Client(
+                limits=self._limits(), timeout=self._timeout()
+            )
+        return self._sync_client
+
+    async def close(self) -> None:
+        """Close the pooled connections"""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+        if self._sync_client is not None:
+            self._sync_client.close()
+            self._sync_client = None
+
+    def _limits(self) -> httpx.Limits:
+        return httpx.Limits(
+            max_connections=self.settings.LLM_HTTP_MAX_CONNECTIONS,
+            max_keepalive_connections=self.settings.LLM_HTTP_MAX_KEEPALIVE,
+            keepalive_expiry=self.settings.LLM_HTTP_KEEPALIVE_EXPIRY,
+        )
+
+    def _timeout(self) -> httpx.Timeout:
+        return httpx.Timeout(self.settings.llm_config[ConfigLLm.TIMEOUT])
@@ -0,0 +1,168 @@
+import random
+import threading
+from typing import Any, Dict, List, Optional
+
+from app.config.settings import Settings
+from app.core.models.llm_endpoint import LLMEndpoint
+from app.infrastructure.utils.decorators.singleton import singleton
+
+# How much a 100% error rate multiplies the cost of an endpoint
+ERROR_RATE_PENALTY = 4.0
+# Seconds assumed for an endpoint without latency samples yet, low so new
+# endpoints get tried
+UNKNOWN_LATENCY = 0.001
+# Seconds assumed for an endpoint that has only failed so far, when no
+# endpoint has a latency sample to compare it with
+FAILING_LATENCY = 60.0
+
+
+class EndpointLoad:
+    """Calls in flight and rolling latency and error rate of one endpoint"""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.in_flight = 0
+        self.ewma_latency: Optional[float] = None  # Seconds, of successful calls
+        self.ewma_error_rate = 0.0
+
+        # Metrics
+        self.calls = 0
+        self.failures = 0
+        self.saturated = 0  # Calls refused by the concurrency limit
+
+
+@singleton
+class LLMLoadBalancer:
+    """
+    Routes LLM calls across a pool of interchangeable endpoints.
+
+    Every endpoint tracks its calls in flight (capped by its max_concurrency)
+    and an exponentially weighted moving average of its latency and error
+    rate. Calls go to the cheaper of two endpoints picked at random (power of
+    two choices), the cost being latency x (calls in flight + 1), inflated by
+    the error rate. Picking between two random endpoints rather than always
+    the cheapest one avoids every caller piling onto the same endpoint between
+    two updates. Shared by the whole process and thread-safe, blocking agents
+    report from the agent thread pool.
+    """
+
+    def __init__(self, rng: Optional[random.Random] = None):
+        self.settings = Settings()
+        self.alpha = self.settings.LLM_BALANCER_EWMA_ALPHA
+        self.rng = rng or random.Random()
+        self._loads: Dict[str, EndpointLoad] = {}
+        self._lock = threading.Lock()
+
+    def order(self, endpoints: List[LLMEndpoint]) -> List[LLMEndpoint]:
+        """
+        Endpoints in the order a call should try them: the power of two
+        choices pick first, then the others from cheapest to most expensive
+        """
+        if len(endpoints) < 2:
+            return list(endpoints)
+
+        with self._lock:
+            worst_latency = max(
+                (
+                    load.ewma_latency
+                    for load in self._loads.values()
+                    if load.ewma_latency is not None
+                ),
+                default=FAILING_LATENCY,
+            )
+            costs = {
+                endpoint.name: self._cost(endpoint, worst_latency)
+                for endpoint in endpoints
+            }
+        first, second = self.rng.sample(endpoints, 2)
+        if costs[second.name] < costs[first.name]:
+            first = second
+        others = sorted(
+            (endpoint for endpoint in endpoints if endpoint is not first),
+            key=lambda endpoint: costs[endpoint.name],
+        )
+        return [first] + others
+
+    def try_acquire(self, endpoint: LLMEndpoint) -> bool:
+        """Take a slot of the endpoint, False when it is at its concurrency limit"""
+        with self._lock:
+            load = self._load(endpoint)
+            if endpoint.max_concurrency and load.in_flight >= endpoint.max_concurrency:
+                load.saturated += 1
+                return False
+            load.in_flight += 1
+            return True
+
+    def release(
+        self,
+        endpoint: LLMEndpoint,
+        latency: Optional[float] = None,
+        failed: bool = False,
+    ) -> None:
+        """
+        Free the slot of a finished call and record its outcome
+
+        Args:
+            endpoint: Endpoint the call was made to
+            latency: Seconds the call took, None to leave the latency as is
+            failed: Whether the endpoint failed (not the request itself)
+        """
+        with self._lock:
+            load = self._load(endpoint)
+            load.in_flight = max(load.in_flight - 1, 0)
+            load.calls += 1
+            load.failures += failed
+            load.ewma_error_rate += self.alpha * (failed - load.ewma_error_rate)
+            if latency is not None and not failed:
+                load.ewma_latency = (
+                    latency
+                    if load.ewma_latency is None
+                    else load.ewma_latency + self.alpha * (latency - load.ewma_latency)
+                )
+
+    def stats(self) -> Dict[str, Any]:
+        """Snapshot of the load of every endpoint"""
+        with self._lock:
+            return {
+                load.name: {
+                    "in_flight": load.in_flight,
+                    "ewma_latency_ms": (
+                        round(load.ewma_latency * 1000, 1)
+                        if load.ewma_latency is not None
+                        else None
+                    ),
+                    "ewma_error_rate": round(load.ewma_error_rate, 3),
+                    "calls": load.calls,
+                    "failures": load.failures,
+                    "saturated": load.saturated,
+                }
+                for load in self._loads.values()
+            }
+
+    def _cost(self, endpoint: LLMEndpoint, worst_latency: float) -> float:
+        """
+        Expected wait of a new call, endpoints at their limit cost the most
+
+        An endpoint without latency samples is assumed fast so it gets tried,
+        unless it has failed: latency is only sampled on success, so one that
+        has only failed takes the worst latency known instead.
+        """
+        load = self._load(endpoint)
+        if endpoint.max_concurrency and load.in_flight >= endpoint.max_concurrency:
+            return float("inf")
+        if load.ewma_latency is not None:
+            latency = load.ewma_latency
+        elif load.ewma_error_rate > 0:
+            latency = worst_latency
+        else:
+            latency = UNKNOWN_LATENCY
+        return (
+            latency
+            * (load.in_flight + 1)
+            * (1 + ERROR_RATE_PENALTY * load.ewma_error_rate)
+        )
+
+    def _load(self, endpoint: LLMEndpoint) -> EndpointLoad:
+        if endpoint.name not in self._loads:
+            self._loads[endpoint.name] = EndpointLoad(endpoint.name)
+        return self._loads[endpoint.name]
@@ -0,0 +1,166 @@
+import bisect
+import threading
+from typing import Dict, List, Sequence, Tuple
+
+# Seconds, from a fast cache lookup to a slow LLM call
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120)
+
+LabelValues = Tuple[str, ...]
+
+
+class _Metric:
+    """Metric with a fixed set of label names, one series per label values"""
+
+    type = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str]):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Dict[str, str]) -> LabelValues:
+        if set(labels) != set(self.labelnames):
+            raise ValueError(
+                f"{self.name} expects labels {self.labelnames}, got {tuple(labels)}"
+            )
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def _labels(self, key: LabelValues, extra: str = "") -> str:
+        pairs = [
+            f'{name}="{_escape(value)}"' for name, value in zip(self.labelnames, key)
+        ]
+        if extra:
+            pairs.append(extra)
+        return "{" + ",".join(pairs) + "}" if pairs else ""
+
+    def samples(self) -> List[str]:
+        raise NotImplementedError
+
+
+class Counter(_Metric):
+    """Monotonically increasing total"""
+
+    type = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str]):
+        super().__init__(name, documentation, labelnames)
+        self._values: Dict[LabelValues, float] = {}
+
+    def inc(self, amount: float = 1, **labels: str) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels: str) -> float:
+        return self._values.get(self._key(labels), 0)
+
+    def samples(self) -> List[str]:
+        with self._lock:
+            values = sorted(self._values.items())
+        return [f"{self.name}{self._labels(key)} {value}" for key, value in values]
+
+
+class Histogram(_Metric):
+    """Distribution of observations over cumulative buckets"""
+
+    type = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str],
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # Per series: count of every bucket (last one is +Inf), sum
+        self._series: Dict[LabelValues, Tuple[List[int], List[float]]] = {}
+
+    def observe(self, value: float, **labels: str) -> None:
+        key = self._key(labels)
+        with self._lock:
+            counts, total = self._series.setdefault(
+                key, ([0] * (len(self.buckets) + 1), [0.0])
+            )
+            counts[bisect.bisect_left(self.buckets, value)] += 1
+            total[0] += value
+
+    def count(self, **labels: str) -> int:
+        series = self._series.get(self._key(labels))
+        return sum(series[0]) if series else 0
+
+    def samples(self) -> List[str]:
+        with self._lock:
+            series = sorted(
+                (key, list(counts), total[0])
+                for key, (counts, total) in self._series.items()
+            )
+        lines = []
+        for key, counts, total in series:
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += count
+                le = "+Inf" if bound == float("inf") else _format_bound(bound)
+                labels = self._labels(key, f'le="{le}"')
+                lines.append(f"{self.name}_bucket{labels} {cumulative}")
+            lines.append(f"{self.name}_sum{self._labels(key)} {total}")
+            lines.append(f"{self.name}_count{self._labels(key)} {cumulative}")
+        return lines
+
+
+class MetricsRegistry:
+    """
+    Process-local metrics rendered in the Prometheus text exposition format.
+    Metrics are created once by name, getting an existing one returns it.
+    """
+
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+        self._lock = threading.Lock()
+
+    def counter(
+        self, name: str, documentation: str, labelnames: Sequence[str] = ()
+    ) -> Counter:
+        return self._get_or_create(Counter, name, documentation, labelnames)
+
+    def histogram(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ) -> Histogram:
+        return self._get_or_create(
+            Histogram, name, documentation, labelnames, buckets=buckets
+        )
+
+    def render(self) -> str:
+        """All metrics in the Prometheus text format"""
+        with self._lock:
+            metrics = list(self._metrics.values())
+        lines = []
+        for metric in metrics:
+            lines.append(f"# HELP {metric.name} {metric.documentation}")
+            lines.append(f"# TYPE {metric.name} {metric.type}")
+            lines.extend(metric.samples())
+        return "\n".join(lines) + "\n"
+
+    def _get_or_create(self, metric_type, name, documentation, labelnames, **kwargs):
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = metric_type(name, documentation, labelnames, **kwargs)
+                self._metrics[name] = metric
+            elif not isinstance(metric, metric_type):
+                raise ValueError(f"Metric {name} is already a {metric.type}")
+            return metric
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_bound(bound: float) -> str:
+    return str(int(bound)) if float(bound).is_integer() else repr(bound)
@@ -0,0 +1,43 @@
+import asyncio
+from typing import Callable, Optional
+
+from app.infrastructure.logger import logger
+
+# Seconds a scraper may take to send its request
+REQUEST_TIMEOUT_SECONDS = 5
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+async def start_metrics_server(
+    port: int, render: Callable[[], str], host: Optional[str] = None
+) -> asyncio.Server:
+    """
+    Serve GET /metrics on the given port, on all interfaces unless a host is
+    given, for processes without an HTTP API such as the review worker. Only
+    the request line is read, every other path gets a 404.
+    """
+
+    async def handle(reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            request_line = await asyncio.wait_for(
+                reader.readline(), REQUEST_TIMEOUT_SECONDS
+            )
+            parts = request_line.split()
+            if len(parts) >= 2 and parts[0] == b"GET" and parts[1] == b"/metrics":
+                status, body = "200 OK", render().encode()
+            else:
+                status, body = "404 Not Found", b"Not found\n"
+            writer.write(
+                f"HTTP/1.1 {status}\r\n"
+                f"Content-Type: {CONTENT_TYPE}\r\n"
+                f"Content-Length: {len(body)}\r\n"
+                "Connection: close\r\n\r\n".encode()
+                + body
+            )
+            await writer.drain()
+        except Exception as e:
+            logger.warning(f"Error serving metrics: {str(e)}")
+        finally:
+            writer.close()
+
+    return await asyncio.start_server(handle, host=host, port=port)
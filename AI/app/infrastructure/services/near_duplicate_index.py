@@ -0,0 +1,155 @@
+import asyncio
+from array import array
+from collections import OrderedDict
+from datetime import datetime
+from typing import Any, Dict, Optional, Tuple
+
+from app.config.settings import Settings
+from app.core.enums import ConfigLLm
+from app.infrastructure.logger import logger
+from app.infrastructure.utils.minhash import (
+    MinHasher,
+    MinHashLSHIndex,
+    shingle_hashes,
+    tokenize_code,
+)
+from app.interfaces.repositories.review_repository_interface import (
+    ReviewRepositoryInterface,
+)
+
+NUM_PERM = 128
+SHINGLE_SIZE = 5
+# Shorter submissions are left to the exact review cache
+MIN_TOKENS = 20
+
+
+class NearDuplicateIndex:
+    """
+    In-process MinHash/LSH index of completed reviews.
+
+    Signatures are persisted on the review documents, loaded when the worker
+    starts and refreshed incrementally so reviews completed by other workers
+    are found as well. Like the exact review cache, reviews are only matched
+    with submissions of the same language, model and prompt version.
+
+    Memory is bounded: only the NEAR_DUPLICATE_MAX_ENTRIES most recently
+    indexed reviews are kept, the oldest are evicted first.
+    """
+
+    def __init__(self, review_repository: ReviewRepositoryInterface):
+        self.settings = Settings()
+        self.review_repository = review_repository
+        self.hasher = MinHasher(num_perm=NUM_PERM)
+        self.index = MinHashLSHIndex(
+            num_perm=NUM_PERM, bands=self.settings.NEAR_DUPLICATE_BANDS
+        )
+        self._indexed_after: Optional[datetime] = None
+        self._entries: "OrderedDict[str, None]" = OrderedDict()  # Oldest first
+
+        # Metrics
+        self._queries = 0
+        self._matches = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.settings.NEAR_DUPLICATE_ENABLED
+
+    def signature(self, code_submission: str) -> Optional[array]:
+        """MinHash signature of a submission, None when it is too short"""
+        tokens = tokenize_code(code_submission)
+        if len(tokens) < MIN_TOKENS:
+            return None
+        return self.hasher.signature(shingle_hashes(tokens, SHINGLE_SIZE))
+
+    async def compute_signature(self, code_submission: str) -> Optional[array]:
+        """Compute the signature off the event loop, hashing is CPU bound"""
+        if not self.enabled:
+            return None
+        return await asyncio.to_thread(self.signature, code_submission)
+
+    def find_similar(
+        self, language: str, signature: array
+    ) -> Optional[Tuple[str, float]]:
+        """Most similar completed review for the language above the threshold"""
+        self._queries += 1
+        match = self.index.query(
+            self._partition(language, self._model(), self._prompt_version()),
+            signature,
+            self.settings.NEAR_DUPLICATE_THRESHOLD,
+        )
+        if match:
+            self._matches += 1
+        return match
+
+    async def add(self, review_id: str, language: str, signature: array) -> None:
+        """Persist the signature of a completed review and index it"""
+        model, prompt_version = self._model(), self._prompt_version()
+        try:
+            await self.review_repository.set_minhash_signature(
+                review_id, signature.tobytes(), model, prompt_version
+            )
+        except Exception as e:
+            logger.error(f"Error storing signature of review {review_id}: {str(e)}")
+            return
+        self._insert(
+            review_id, self._partition(language, model, prompt_version), signature
+        )
+
+    async def refresh(self) -> int:
+        """Load signatures stored since the last refresh, returns how many"""
+        if not self.enabled:
+            return 0
+
+        review_signatures = await self.review_repository.find_minhash_signatures(
+            self._model(),
+            self._prompt_version(),
+            self._indexed_after,
+            self.settings.NEAR_DUPLICATE_MAX_ENTRIES,
+        )
+        for review_signature in review_signatures:
+            signature = array("I")
+            signature.frombytes(review_signature.signature)
+            self._insert(
+                review_signature.review_id,
+                self._partition(
+                    review_signature.language,
+                    review_signature.model,
+                    review_signature.prompt_version,
+                ),
+                signature,
+            )
+            if (
+                self._indexed_after is None
+                or review_signature.indexed_at > self._indexed_after
+            ):
+                self._indexed_after = review_signature.indexed_at
+        return len(review_signatures)
+
+    def _insert(self, review_id: str, partition: str, signature: array) -> None:
+        """Index a signature, evicting the oldest ones over the size limit"""
+        self.index.insert(review_id, partition, signature)
+        self._entries[review_id] = None
+        self._entries.move_to_end(review_id)
+        while len(self._entries) > self.settings.NEAR_DUPLICATE_MAX_ENTRIES:
+            oldest, _ = self._entries.popitem(last=False)
+            self.index.remove(oldest)
+
+    def _partition(
+        self, language: str, model: Optional[str], prompt_version: Optional[str]
+    ) -> str:
+        """LSH partition of reviews of a language by a model and prompt version"""
+        return f"{language.lower().strip()}|{model}|{prompt_version}"
+
+    def _model(self) -> str:
+        return self.settings.llm_config[ConfigLLm.MODEL]
+
+    def _prompt_version(self) -> str:
+        return self.settings.get_prompt_version()
+
+    def stats(self) -> Dict[str, Any]:
+        """Snapshot of index size and match rate"""
+        return {
+            "indexed": len(self.index),
+            "queries": self._queries,
+            "matches": self._matches,
+        }
@@ -0,0 +1,259 @@
+import json
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+import httpx
+
+from app.config.settings import Settings
+from app.core.enums import ConfigLLm, ResponseFormat
+from app.core.models.llm_endpoint import LLMEndpoint
+from app.infrastructure.services.llm_http_client import LLMHttpClient
+from app.interfaces.services.agent_base_interface import AgentBaseInterface
+
+
+class LLMResponseError(Exception):
+    """The LLM API answered with an error or an unexpected payload"""
+
+    def __init__(
+        self,
+        message: str,
+        status_code: Optional[int] = None,
+        retry_after: Optional[float] = None,
+    ):
+        super().__init__(message)
+        self.status_code = status_code
+        self.retry_after = retry_after
+
+
+class OpenAICompatibleAgent(AgentBaseInterface):
+    """
+    Agent calling the configured OPENAI_BASE_URL chat completions API directly.
+
+    Natively async: calls don't need the agent thread pool, and all agents of
+    the process share the keep-alive connection pool of LLMHttpClient. The
+    agent keeps no conversation state, every call is a single-turn prompt.
+    """
+
+    def __init__(
+        self,
+        instructions: str = "You are a helpful AI assistant",
+        endpoint: Optional[LLMEndpoint] = None,
+    ):
+        self.instructions = instructions
+        self.settings = Settings()
+        self.endpoint = endpoint or self.settings.get_llm_endpoints()[0]
+        self.http_client = LLMHttpClient()
+
+    def chat(
+        self,
+        prompt: str,
+        temperature: Optional[float] = None,
+        tools: Optional[Any] = None,
+        output_json: Optional[Any] = None,
+        output_pydantic: Optional[Any] = None,
+        reasoning_steps: bool = False,
+        stream: bool = False,
+    ) -> str:
+        """
+        Send a message to the model and get a response, blocking the caller.
+
+        Args:
+            prompt: The message to send to the model
+            temperature: Controls randomness in the response (overrides config if provided)
+            tools: Not supported, ignored
+            output_json: Request a JSON object response
+            output_pydantic: Request a JSON object response
+            reasoning_steps: Not supported, ignored
+            stream: Not supported, use stream_chat
+
+        Returns:
+            str: The response from the model
+        """
+        payload = self._build_payload(
+            prompt, temperature, bool(output_json or output_pydantic)
+        )
+        response = self.http_client.get_sync().post(
+            self._url(), json=payload, headers=self._headers()
+        )
+        return self._parse_response(response)
+
+    async def achat(
+        self,
+        prompt: str,
+        temperature: Optional[float] = None,
+        output_json: Optional[Any] = None,
+        output_pydantic: Optional[Any] = None,
+    ) -> str:
+        """
+        Send a message to the model and get a response without blocking the
+        event loop.
+
+        Args:
+            prompt: The message to send to the model
+            temperature: Controls randomness in the response (overrides config if provided)
+            output_json: Request a JSON object response
+            output_pydantic: Request a JSON object response
+
+        Returns:
+            str: The response from the model
+        """
+        payload = self._build_payload(
+            prompt, temperature, bool(output_json or output_pydantic)
+        )
+        response = await self.http_client.get().post(
+            self._url(), json=payload, headers=self._headers()
+        )
+        return self._parse_response(response)
+
+    def stream_chat(
+        self,
+        prompt: str,
+        on_token: Callable[[str], None],
+        temperature: Optional[float] = None,
+        output_json: Optional[Any] = None,
+    ) -> str:
+        """
+        Send a message to the model and stream the response, blocking the caller.
+
+        Args:
+            prompt: The message to send to the model
+            on_token: Called with every chunk of text as soon as it is received
+            temperature: Controls randomness in the response (overrides config if provided)
+            output_json: Request a JSON object response
+
+        Returns:
+            str: The full response from the model
+        """
+        payload = self._build_payload(prompt, temperature, bool(output_json))
+        payload["stream"] = True
+        with self.http_client.get_sync().stream(
+            "POST", self._url(), json=payload, headers=self._headers()
+        ) as response:
+            if response.is_error:
+                response.read()
+                self._raise_for_status(response)
+            return self._collect_tokens(response.iter_lines(), on_token)
+
+    async def astream_chat(
+        self,
+        prompt: str,
+        on_token: Callable[[str], None],
+        temperature: Optional[float] = None,
+        output_json: Optional[Any] = None,
+    ) -> str:
+        """
+        Send a message to the model and stream the response without blocking
+        the event loop.
+
+        Args:
+            prompt: The message to send to the model
+            on_token: Called with every chunk of text as soon as it is received
+            temperature: Controls randomness in the response (overrides config if provided)
+            output_json: Request a JSON object response
+
+        Returns:
+            str: The full response from the model
+        """
+        payload = self._build_payload(prompt, temperature, bool(output_json))
+        payload["stream"] = True
+        async with self.http_client.get().stream(
+            "POST", self._url(), json=payload, headers=self._headers()
+        ) as response:
+            if response.is_error:
+                await response.aread()
+                self._raise_for_status(response)
+
+            chunks = []
+            async for line in response.aiter_lines():
+                token = self._parse_stream_line(line)
+                if token:
+                    chunks.append(token)
+                    on_token(token)
+            return "".join(chunks)
+
+    def reset(self) -> None:
+        """Nothing to clear, the agent keeps no conversation state"""
+
+    def _build_payload(
+        self, prompt: str, temperature: Optional[float], output_json: bool
+    ) -> Dict[str, Any]:
+        """Build a chat completions request honoring the LLM configuration"""
+        llm_config = self.settings.llm_config
+        return {
+            "model": self.endpoint.api_model,
+            "messages": [
+                {"role": "system", "content": self.instructions},
+                {"role": "user", "content": prompt},
+            ],
+            "temperature": (
+                temperature
+                if temperature is not None
+                else llm_config[ConfigLLm.TEMPERATURE]
+            ),
+            "top_p": llm_config[ConfigLLm.TOP_P],
+            "max_tokens": llm_config[ConfigLLm.MAX_TOKENS],
+            "presence_penalty": llm_config[ConfigLLm.PRESENCE_PENALTY],
+            "frequency_penalty": llm_config[ConfigLLm.FREQUENCY_PENALTY],
+            "seed": llm_config[ConfigLLm.SEED],
+            "stop": llm_config[ConfigLLm.STOP_PHRASES],
+            "response_format": (
+                ResponseFormat.JSON_OBJECT
+                if output_json
+                else llm_config[ConfigLLm.RESPONSE_FORMAT]
+            ),
+        }
+
+    def _url(self) -> str:
+        return f"{self.endpoint.base_url.rstrip('/')}/chat/completions"
+
+    def _headers(self) -> Dict[str, str]:
+        return {"Authorization": f"Bearer {self.endpoint.api_key}"}
+
+    def _parse_response(self, response: httpx.Response) -> str:
+        """Extract the message content of a chat completions response"""
+        self._raise_for_status(response)
+        try:
+            return response.json()["choices"][0]["message"]["content"] or ""
+        except (ValueError, KeyError, IndexError, TypeError) as e:
+            raise LLMResponseError(f"Unexpected LLM response: {str(e)}") from e
+
+    def _collect_tokens(
+        self, lines: Iterable[str], on_token: Callable[[str], None]
+    ) -> str:
+        chunks: List[str] = []
+        for line in lines:
+            token = self._parse_stream_line(line)
+            if token:
+                chunks.append(token)
+                on_token(token)
+        return "".join(chunks)
+
+    @staticmethod
+    def _parse_stream_line(line: str) -> Optional[str]:
+        """Extract the text of a streamed chunk, None for other lines"""
+        if not line.startswith("data:"):
+            return None
+        data = line[len("data:") :].strip()
+        if not data or data == "[DONE]":
+            return None
+        try:
+            choices = json.loads(data).get("choices") or [{}]
+            return choices[0].get("delta", {}).get("content")
+        except (ValueError, AttributeError) as e:
+            raise LLMResponseError(f"Unexpected LLM stream chunk: {str(e)}") from e
+
+    @staticmethod
+    def _raise_for_status(response: httpx.Response) -> None:
+        if response.is_error:
+            raise LLMResponseError(
+                f"LLM API returned {response.status_code}: {response.text[:500]}",
+                status_code=response.status_code,
+                retry_after=_parse_retry_after(response.headers.get("Retry-After")),
+            )
+
+
+def _parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Seconds of a Retry-After header, None when absent or an HTTP date"""
+    try:
+        return max(float(value), 0.0) if value else None
+    except ValueError:
+        return None
@@ -0,0 +1,161 @@
+import asyncio
+import multiprocessing
+import time
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, Dict, Optional
+
+from passlib.context import CryptContext
+
+from app.config.settings import Settings
+from app.infrastructure.logger import logger
+from app.infrastructure.utils.decorators.singleton import singleton
+from app.infrastructure.utils.event_loop import call_soon
+
+# Password contexts of a pool process, by configuration
+_contexts: Dict[str, CryptContext] = {}
+
+
+def _context(config: str) -> CryptContext:
+    context = _contexts.get(config)
+    if context is None:
+        context = _contexts[config] = CryptContext.from_string(config)
+    return context
+
+
+def _hash(config: str, password: str) -> str:
+    return _context(config).hash(password)
+
+
+def _verify(config: str, password: str, hashed_password: str) -> bool:
+    return _context(config).verify(password, hashed_password)
+
+
+class PasswordHasherBusyError(Exception):
+    """Too many password hashes are pending, the request should be retried later"""
+
+    def __init__(self, message: str, retry_after: float = 0.0):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+@singleton
+class PasswordHasher:
+    """
+    Hashes and verifies passwords on a process pool sized to the cores, so a
+    bcrypt round (hundreds of milliseconds of CPU) never blocks the event loop
+    and logins run in parallel despite the GIL. Hashes beyond
+    PASSWORD_HASHER_MAX_PENDING are refused rather than queued, callers answer
+    them with a 503. A hash counts as pending until its process returns, even
+    when its caller was cancelled.
+
+    Password contexts can't be pickled, pool processes rebuild them from their
+    configuration. Processes are spawned, not forked, as the API runs threads.
+    """
+
+    def __init__(self):
+        self.settings = Settings()
+        self.max_workers = max(self.settings.PASSWORD_HASHER_WORKERS, 1)
+        self.max_pending = (
+            self.settings.PASSWORD_HASHER_MAX_PENDING or 4 * self.max_workers
+        )
+        self._executor: Optional[ProcessPoolExecutor] = None
+
+        # Metrics
+        self._pending = 0
+        self._max_pending_seen = 0
+        self._completed = 0
+        self._failed = 0
+        self._rejected = 0
+        self._total_seconds = 0.0
+
+    async def hash(self, pwd_context: CryptContext, password: str) -> str:
+        """Hash a password with the given context"""
+        return await self._run(_hash, pwd_context.to_string(), password)
+
+    async def verify(
+        self, pwd_context: CryptContext, password: str, hashed_password: str
+    ) -> bool:
+        """Verify a password against its hash with the given context"""
+        return await self._run(
+            _verify, pwd_context.to_string(), password, hashed_password
+        )
+
+    async def _run(self, func: Callable[..., Any], *args: Any) -> Any:
+        if self._pending >= self.max_pending:
+            self._rejected += 1
+            raise PasswordHasherBusyError(
+                f"{self._pending} password hashes pending",
+                retry_after=self.settings.PASSWORD_HASHER_RETRY_AFTER,
+            )
+
+        self._pending += 1
+        self._max_pending_seen = max(self._max_pending_seen, self._pending)
+        started_at = time.monotonic()
+        loop = asyncio.get_running_loop()
+        executor = self._get_executor()
+        try:
+            future = executor.submit(func, *args)
+        except BaseException as e:
+            self._pending -= 1
+            self._failed += 1
+            self._restart_if_broken(executor, e)
+            raise
+        # The slot is held until the process returns, not until the caller
+        # stops waiting: a cancelled login leaves its hash running
+        future.add_done_callback(
+            lambda done: call_soon(loop, self._finished, done, started_at)
+        )
+        try:
+            return await asyncio.wrap_future(future, loop=loop)
+        except BrokenProcessPool as e:
+            self._restart_if_broken(executor, e)
+            raise
+
+    def _finished(self, future: Future, started_at: float) -> None:
+        """Record a hash whose process returned and free its slot"""
+        self._pending -= 1
+        self._total_seconds += time.monotonic() - started_at
+        if future.cancelled() or future.exception() is not None:
+            self._failed += 1
+        else:
+            self._completed += 1
+
+    def stats(self) -> Dict[str, Any]:
+        """Snapshot of the pool load and throughput metrics"""
+        finished = self._completed + self._failed
+        return {
+            "max_workers": self.max_workers,
+            "max_pending": self.max_pending,
+            "pending": self._pending,
+            "max_pending_seen": self._max_pending_seen,
+            "completed": self._completed,
+            "failed": self._failed,
+            "rejected": self._rejected,
+            "avg_seconds": round(self._total_seconds / finished, 3)
+            if finished
+            else 0.0,
+        }
+
+    def shutdown(self, wait: bool = True) -> None:
+        """Stop the pool processes, the next call starts a new pool"""
+        if self._executor is not None:
+            self._executor.shutdown(wait=wait)
+            self._executor = None
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return self._executor
+
+    def _restart_if_broken(
+        self, executor: ProcessPoolExecutor, error: BaseException
+    ) -> None:
+        # A pool process died, the next call starts a new pool. Calls that
+        # failed with the same pool don't stop the one started since.
+        if isinstance(error, BrokenProcessPool) and self._executor is executor:
+            logger.error("Password hasher pool broke, restarting it")
+            self.shutdown(wait=False)
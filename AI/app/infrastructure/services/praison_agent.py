@@ -1,32 +1,37 @@
 from pickle import FALSE
-from typing import Any, Optional
+from typing import Any, Callable, Optional
 
 from praisonaiagents import Agent
 
 from app.config.settings import Settings
 from app.core.enums import ConfigLLm
+from app.core.models.llm_endpoint import LLMEndpoint
+from app.infrastructure.services.agent_executor import AgentExecutor
 from app.interfaces.services.agent_base_interface import AgentBaseInterface
 
 
 class PraisonAgent(AgentBaseInterface):
-    def __init__(self, instructions: str = "You are a helpful AI assistant"):
+    def __init__(
+        self,
+        instructions: str = "You are a helpful AI assistant",
+        endpoint: Optional[LLMEndpoint] = None,
+    ):
         self.instructions = instructions
         self.settings = Settings()
+        self.endpoint = endpoint or self.settings.get_llm_endpoints()[0]
         self.agent = self._create_agent()
 
     def _create_agent(self) -> Agent:
         """Create and configure the Praison agent with full LLM configuration"""
-        
-        llm_config = self.settings.llm_config
 
         # Create agent with basic configuration
         agent = Agent(
             instructions=self.instructions,
-            llm=llm_config[ConfigLLm.MODEL],
+            llm=self.endpoint.model,
             self_reflect=False,
             verbose=False,
-            api_key=self.settings.llm_config[ConfigLLm.API_KEY],
-            base_url=self.settings.llm_config[ConfigLLm.OPENAI_BASE_URL],
+            api_key=self.endpoint.api_key,
+            base_url=self.endpoint.base_url,
         )
 
         return agent
@@ -66,4 +71,97 @@ class PraisonAgent(AgentBaseInterface):
             output_pydantic,
             reasoning_steps,
             stream,
-        )
\ No newline at end of file
+        )
+
+    async def achat(
+        self,
+        prompt: str,
+        temperature: Optional[float] = None,
+        output_json: Optional[Any] = None,
+        output_pydantic: Optional[Any] = None,
+    ) -> str:
+        """Run chat on the bounded agent thread pool, the agent call is blocking"""
+        return await AgentExecutor().run(
+            self.chat,
+            prompt,
+            temperature=temperature,
+            output_json=output_json,
+            output_pydantic=output_pydantic,
+        )
+
+    def stream_chat(
+        self,
+        prompt: str,
+        on_token: Callable[[str], None],
+        temperature: Optional[float] = None,
+        output_json: Optional[Any] = None,
+    ) -> str:
+        """
+        Send a message to the model and stream the response as it is generated.
+
+        Calls the model through litellm (the client used by praisonaiagents) so
+        that every chunk reaches on_token instead of only being displayed.
+
+        Args:
+            prompt: The message to send to the model
+            on_token: Called with every chunk of text as soon as it is received
+            temperature: Controls randomness in the response (overrides config if provided)
+            output_json: Request a JSON object response
+
+        Returns:
+            str: The full response from the model
+        """
+        # Imported lazily, litellm is slow to import and only needed here
+        import litellm
+
+        llm_config = self.settings.llm_config
+        completion_kwargs = {
+            "model": self.endpoint.model,
+            "messages": [
+                {"role": "system", "content": self.instructions},
+                {"role": "user", "content": prompt},
+            ],
+            "temperature": (
+                temperature
+                if temperature is not None
+                else llm_config[ConfigLLm.TEMPERATURE]
+            ),
+            "max_tokens": llm_config[ConfigLLm.MAX_TOKENS],
+            "timeout": llm_config[ConfigLLm.TIMEOUT],
+            "api_key": self.endpoint.api_key,
+            "base_url": self.endpoint.base_url,
+            "stream": True,
+        }
+        if output_json:
+            completion_kwargs["response_format"] = llm_config[
+                ConfigLLm.RESPONSE_FORMAT
+            ]
+
+        chunks = []
+        for chunk in litellm.completion(**completion_kwargs):
+            token = chunk.choices[0].delta.content if chunk.choices else None
+            if token:
+                chunks.append(token)
+                on_token(token)
+        return "".join(chunks)
+
+    async def astream_chat(
+        self,
+        prompt: str,
+        on_token: Callable[[str], None],
+        temperature: Optional[float] = None,
+        output_json: Optional[Any] = None,
+    ) -> str:
+        """Run stream_chat on the bounded agent thread pool, the agent call is blocking"""
+        return await AgentExecutor().run(
+            self.stream_chat,
+            prompt,
+            on_token,
+            temperature=temperature,
+            output_json=output_json,
+        )
+
+    def reset(self) -> None:
+        """Clear the chat history so the agent can be reused for a new prompt"""
+        if hasattr(self.agent, "chat_history"):
+            self.agent.chat_history = []
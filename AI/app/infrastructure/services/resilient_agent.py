@@ -0,0 +1,358 @@
+import asyncio
+import random
+import time
+from typing import Any, Awaitable, Callable, Dict, Iterator, List, Optional, Tuple
+
+import httpx
+
+from app.config.settings import Settings
+from app.core.models.llm_endpoint import LLMEndpoint
+from app.infrastructure.logger import logger
+from app.infrastructure.services.circuit_breaker import (
+    OPEN,
+    CircuitBreaker,
+    CircuitBreakerRegistry,
+)
+from app.infrastructure.services.llm_load_balancer import LLMLoadBalancer
+from app.interfaces.services.agent_base_interface import AgentBaseInterface
+
+# Class names of litellm/openai client errors for transient provider failures
+RETRYABLE_ERROR_NAMES = frozenset(
+    {
+        "RateLimitError",
+        "APIConnectionError",
+        "APITimeoutError",
+        "Timeout",
+        "ServiceUnavailableError",
+        "InternalServerError",
+        "BadGatewayError",
+    }
+)
+
+
+class LLMUnavailableError(Exception):
+    """No LLM endpoint could serve the call: all failed or their circuits are open"""
+
+    def __init__(self, message: str, retry_after: float = 0.0):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class EmptyLLMResponseError(Exception):
+    """The agent returned no response, praisonaiagents does so on provider errors"""
+
+
+# Seconds between checks for a free slot when every endpoint is at its limit
+SLOT_WAIT_SECONDS = 0.05
+
+
+def is_retryable_error(error: BaseException) -> bool:
+    """Whether an agent error is a transient provider failure worth retrying"""
+    status_code = getattr(error, "status_code", None)
+    if isinstance(status_code, int):
+        return status_code in (408, 429) or status_code >= 500
+    if isinstance(
+        error,
+        (EmptyLLMResponseError, httpx.TransportError, TimeoutError, ConnectionError),
+    ):
+        return True
+    return type(error).__name__ in RETRYABLE_ERROR_NAMES
+
+
+class ResilientAgent(AgentBaseInterface):
+    """
+    Agent that calls a list of LLM endpoints through one agent each.
+
+    The first pool_size endpoints are a pool of interchangeable endpoints:
+    every call starts with the one the LLMLoadBalancer picks and skips those
+    at their concurrency limit. The other endpoints are fallbacks tried in
+    order. Transient failures (429, 5xx, timeouts, connection errors) are
+    retried with jittered exponential backoff, then the next endpoint is
+    tried. Every endpoint has a circuit breaker shared by the whole process,
+    so once a provider keeps failing calls skip it immediately instead of
+    waiting on it. Other errors are raised right away. Streamed calls are
+    only retried until the first token was received.
+    """
+
+    def __init__(
+        self,
+        endpoints: List[LLMEndpoint],
+        agent_factory: Callable[[LLMEndpoint], AgentBaseInterface],
+        pool_size: int = 1,
+    ):
+        self.settings = Settings()
+        self.endpoints = endpoints
+        self.agent_factory = agent_factory
+        self.pool_size = max(pool_size, 1)
+        self.slot_timeout = self.settings.LLM_BALANCER_SLOT_TIMEOUT
+        self.balancer = LLMLoadBalancer()
+        self.max_attempts = max(self.settings.LLM_RETRY_MAX_ATTEMPTS, 1)
+        self.base_delay = self.settings.LLM_RETRY_BASE_DELAY
+        self.max_delay = self.settings.LLM_RETRY_MAX_DELAY
+        self.breakers = CircuitBreakerRegistry()
+        self._agents: Dict[str, AgentBaseInterface] = {}
+
+    def chat(
+        self,
+        prompt: str,
+        temperature: Optional[float] = None,
+        tools: Optional[Any] = None,
+        output_json: Optional[Any] = None,
+        output_pydantic: Optional[Any] = None,
+        reasoning_steps: bool = False,
+        stream: bool = False,
+    ) -> str:
+        """Send a message to the first available endpoint, blocking the caller"""
+        return self._call(
+            lambda agent: agent.chat(
+                prompt,
+                temperature=temperature,
+                tools=tools,
+                output_json=output_json,
+                output_pydantic=output_pydantic,
+                reasoning_steps=reasoning_steps,
+                stream=stream,
+            )
+        )
+
+    async def achat(
+        self,
+        prompt: str,
+        temperature: Optional[float] = None,
+        output_json: Optional[Any] = None,
+        output_pydantic: Optional[Any] = None,
+    ) -> str:
+        """Send a message to the first available endpoint without blocking the event loop"""
+        return await self._acall(
+            lambda agent: agent.achat(
+                prompt,
+                temperature=temperature,
+                output_json=output_json,
+                output_pydantic=output_pydantic,
+            )
+        )
+
+    def stream_chat(
+        self,
+        prompt: str,
+        on_token: Callable[[str], None],
+        temperature: Optional[float] = None,
+        output_json: Optional[Any] = None,
+    ) -> str:
+        """Stream the response of the first available endpoint, blocking the caller"""
+        on_token, started = _track_tokens(on_token)
+        return self._call(
+            lambda agent: agent.stream_chat(
+                prompt, on_token, temperature=temperature, output_json=output_json
+            ),
+            can_retry=lambda: not started(),
+        )
+
+    async def astream_chat(
+        self,
+        prompt: str,
+        on_token: Callable[[str], None],
+        temperature: Optional[float] = None,
+        output_json: Optional[Any] = None,
+    ) -> str:
+        """Stream the response of the first available endpoint without blocking the event loop"""
+        on_token, started = _track_tokens(on_token)
+        return await self._acall(
+            lambda agent: agent.astream_chat(
+                prompt, on_token, temperature=temperature, output_json=output_json
+            ),
+            can_retry=lambda: not started(),
+        )
+
+    def reset(self) -> None:
+        """Clear the conversation state of every endpoint agent"""
+        for agent in self._agents.values():
+            agent.reset()
+
+    def _call(
+        self,
+        call: Callable[[AgentBaseInterface], Any],
+        can_retry: Callable[[], bool] = lambda: True,
+    ) -> Any:
+        last_error: Optional[BaseException] = None
+        deadline = time.monotonic() + self.slot_timeout
+        while True:
+            saturated: List[LLMEndpoint] = []
+            for endpoint, breaker, attempt in self._attempts(saturated):
+                started = time.monotonic()
+                try:
+                    response = _checked(call(self._agent(endpoint)))
+                except Exception as e:
+                    last_error = e
+                    self._release(endpoint, started, e)
+                    time.sleep(self._on_error(endpoint, breaker, attempt, e, can_retry))
+                    continue
+                except BaseException:
+                    self._abandon(endpoint, breaker)
+                    raise
+                self._release(endpoint, started)
+                breaker.record_success()
+                return response
+            if not self._should_wait(saturated, last_error, deadline):
+                raise self._unavailable(last_error, saturated)
+            time.sleep(SLOT_WAIT_SECONDS)
+
+    async def _acall(
+        self,
+        call: Callable[[AgentBaseInterface], Awaitable[Any]],
+        can_retry: Callable[[], bool] = lambda: True,
+    ) -> Any:
+        last_error: Optional[BaseException] = None
+        deadline = time.monotonic() + self.slot_timeout
+        while True:
+            saturated: List[LLMEndpoint] = []
+            for endpoint, breaker, attempt in self._attempts(saturated):
+                started = time.monotonic()
+                try:
+                    response = _checked(await call(self._agent(endpoint)))
+                except Exception as e:
+                    last_error = e
+                    self._release(endpoint, started, e)
+                    await asyncio.sleep(
+                        self._on_error(endpoint, breaker, attempt, e, can_retry)
+                    )
+                    continue
+                except BaseException:
+                    # Cancelled by the worker or the job timeout
+                    self._abandon(endpoint, breaker)
+                    raise
+                self._release(endpoint, started)
+                breaker.record_success()
+                return response
+            if not self._should_wait(saturated, last_error, deadline):
+                raise self._unavailable(last_error, saturated)
+            await asyncio.sleep(SLOT_WAIT_SECONDS)
+
+    def _attempts(
+        self, saturated: List[LLMEndpoint]
+    ) -> Iterator[Tuple[LLMEndpoint, CircuitBreaker, int]]:
+        """
+        Endpoints in balanced then failover order, each tried until its attempts
+        run out or its circuit opens. Every attempt holds a slot of its endpoint
+        that the caller must release; endpoints without a free slot are skipped
+        and added to saturated.
+        """
+        endpoints = (
+            self.balancer.order(self.endpoints[: self.pool_size])
+            + self.endpoints[self.pool_size :]
+        )
+        for index, endpoint in enumerate(endpoints):
+            breaker = self.breakers.get(endpoint.name)
+            for attempt in range(self.max_attempts):
+                if not self.balancer.try_acquire(endpoint):
+                    saturated.append(endpoint)
+                    break
+                if not breaker.allow():
+                    self.balancer.release(endpoint)
+                    break
+                if index >= self.pool_size and attempt == 0:
+                    logger.warning(f"Failing over to LLM endpoint {endpoint.name}")
+                yield endpoint, breaker, attempt
+
+    def _release(
+        self,
+        endpoint: LLMEndpoint,
+        started: float,
+        error: Optional[Exception] = None,
+    ) -> None:
+        """Free the slot of a call and record its latency, or whether the endpoint failed"""
+        if error is None:
+            self.balancer.release(endpoint, time.monotonic() - started)
+        else:
+            self.balancer.release(endpoint, failed=is_retryable_error(error))
+
+    def _abandon(self, endpoint: LLMEndpoint, breaker: CircuitBreaker) -> None:
+        """Free the slot and circuit trial of a call interrupted before its outcome was known"""
+        self.balancer.release(endpoint)
+        breaker.record_cancelled()
+
+    def _should_wait(
+        self,
+        saturated: List[LLMEndpoint],
+        last_error: Optional[BaseException],
+        deadline: float,
+    ) -> bool:
+        """Wait for a slot only when no call failed and some endpoint was busy"""
+        return bool(saturated) and last_error is None and time.monotonic() < deadline
+
+    def _on_error(
+        self,
+        endpoint: LLMEndpoint,
+        breaker: CircuitBreaker,
+        attempt: int,
+        error: Exception,
+        can_retry: Callable[[], bool],
+    ) -> float:
+        """Record a failed call, raise it when it can't be retried, else return the backoff delay"""
+        if not is_retryable_error(error):
+            # The endpoint answered, the request itself is at fault
+            breaker.record_success()
+            raise error
+        breaker.record_failure()
+        if not can_retry():
+            raise error
+
+        logger.warning(
+            f"LLM call to {endpoint.name} failed "
+            f"(attempt {attempt + 1}/{self.max_attempts}): {str(error)}"
+        )
+        if attempt + 1 >= self.max_attempts or breaker.state == OPEN:
+            return 0.0
+        return self._backoff(attempt, error)
+
+    def _backoff(self, attempt: int, error: Exception) -> float:
+        """Full-jitter exponential backoff, honoring the provider's Retry-After"""
+        delay = random.uniform(0, min(self.max_delay, self.base_delay * 2**attempt))
+        retry_after = getattr(error, "retry_after", None)
+        if retry_after:
+            delay = max(delay, min(retry_after, self.max_delay))
+        return delay
+
+    def _unavailable(
+        self,
+        last_error: Optional[BaseException],
+        saturated: List[LLMEndpoint],
+    ) -> LLMUnavailableError:
+        retry_after = min(
+            self.breakers.get(endpoint.name).retry_after()
+            for endpoint in self.endpoints
+        )
+        if last_error:
+            reason = str(last_error)
+        elif saturated:
+            reason = "all endpoints are at their concurrency limit"
+        else:
+            reason = "all circuits are open"
+        return LLMUnavailableError(
+            f"No LLM endpoint available: {reason}", retry_after=retry_after
+        )
+
+    def _agent(self, endpoint: LLMEndpoint) -> AgentBaseInterface:
+        """Agent of an endpoint, created on first use"""
+        if endpoint.name not in self._agents:
+            self._agents[endpoint.name] = self.agent_factory(endpoint)
+        return self._agents[endpoint.name]
+
+
+def _checked(response: Any) -> Any:
+    if response is None:
+        raise EmptyLLMResponseError("Agent returned no response")
+    return response
+
+
+def _track_tokens(
+    on_token: Callable[[str], None],
+) -> Tuple[Callable[[str], None], Callable[[], bool]]:
+    """Wrap on_token, returning the wrapper and whether a token was received"""
+    received = []
+
+    def tracked(token: str) -> None:
+        received.append(True)
+        on_token(token)
+
+    return tracked, lambda: bool(received)
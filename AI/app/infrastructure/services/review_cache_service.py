@@ -0,0 +1,105 @@
+from datetime import datetime, timedelta
+from typing import Any, Dict, Optional
+
+from app.config.settings import Settings
+from app.core.enums import ConfigLLm
+from app.core.models.review import CodeReviewIAResponse
+from app.infrastructure.logger import logger
+from app.infrastructure.utils.code_fingerprint import code_fingerprint
+from app.interfaces.repositories.review_cache_repository_interface import (
+    ReviewCacheRepositoryInterface,
+)
+
+# Run size-based eviction once every this many cache writes
+EVICTION_WRITE_INTERVAL = 100
+
+
+class ReviewCacheService:
+    """
+    Content-addressed cache of validated reviews, keyed by the normalized code,
+    language, prompt version and model. Cache failures never fail a review,
+    they are logged and treated as a miss.
+    """
+
+    def __init__(self, review_cache_repository: ReviewCacheRepositoryInterface):
+        self.settings = Settings()
+        self.review_cache_repository = review_cache_repository
+
+        # Metrics
+        self._hits = 0
+        self._misses = 0
+        self._writes = 0
+        self._evicted = 0
+
+    def build_key(self, code_submission: str, language: str) -> str:
+        """Content address of a review request under the current prompt and model"""
+        return code_fingerprint(
+            code_submission,
+            language,
+            self.settings.get_prompt_version(),
+            self.settings.llm_config[ConfigLLm.MODEL],
+        )
+
+    async def get(
+        self, code_submission: str, language: str
+    ) -> Optional[CodeReviewIAResponse]:
+        """Get a cached review for this submission, if any"""
+        if not self.settings.REVIEW_CACHE_ENABLED:
+            return None
+
+        try:
+            code_review = await self.review_cache_repository.get(
+                self.build_key(code_submission, language)
+            )
+        except Exception as e:
+            logger.error(f"Error reading review cache: {str(e)}")
+            return None
+
+        if code_review:
+            self._hits += 1
+        else:
+            self._misses += 1
+        return code_review
+
+    async def set(
+        self, code_submission: str, language: str, code_review: CodeReviewIAResponse
+    ) -> None:
+        """Cache a validated review for this submission"""
+        if not self.settings.REVIEW_CACHE_ENABLED:
+            return
+
+        try:
+            await self.review_cache_repository.set(
+                key=self.build_key(code_submission, language),
+                language=language,
+                model=self.settings.llm_config[ConfigLLm.MODEL],
+                prompt_version=self.settings.get_prompt_version(),
+                code_review=code_review,
+                expires_at=datetime.utcnow()
+                + timedelta(seconds=self.settings.REVIEW_CACHE_TTL),
+            )
+            self._writes += 1
+
+            if self._writes % EVICTION_WRITE_INTERVAL == 0:
+                await self.evict()
+        except Exception as e:
+            logger.error(f"Error writing review cache: {str(e)}")
+
+    async def evict(self) -> int:
+        """Remove the least recently used entries above the maximum size"""
+        evicted = await self.review_cache_repository.evict(
+            self.settings.REVIEW_CACHE_MAX_ENTRIES
+        )
+        self._evicted += evicted
+        return evicted
+
+    def stats(self) -> Dict[str, Any]:
+        """Snapshot of cache hit-rate counters"""
+        lookups = self._hits + self._misses
+        return {
+            "hits": self._hits,
+            "misses": self._misses,
+            "hit_rate": round(self._hits / lookups, 3) if lookups else 0.0,
+            "writes": self._writes,
+            "evicted": self._evicted,
+        }
@@ -0,0 +1,155 @@
+import re
+from typing import Optional, Set
+
+from app.infrastructure.services.metrics_registry import MetricsRegistry
+from app.infrastructure.utils.decorators.singleton import singleton
+
+# Parsing a response takes microseconds to milliseconds
+PARSE_BUCKETS = (0.0001, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1)
+# Maintenance jobs take from an indexed delete to a sweep of many reviews
+MAINTENANCE_BUCKETS = (0.01, 0.05, 0.1, 0.5, 1, 5, 10, 30, 60, 300)
+# Distinct language labels kept, later ones are reported as "other"
+MAX_LANGUAGES = 50
+LANGUAGE_PATTERN = re.compile(r"^[a-z0-9+#.\-]{1,20}$")
+
+
+@singleton
+class ReviewMetrics:
+    """
+    Review pipeline metrics of this process, labeled by model and language.
+    Token counts are estimates, the agents don't report usage.
+    """
+
+    def __init__(self):
+        self.registry = MetricsRegistry()
+        self._languages: Set[str] = set()
+
+        self.reviews_submitted = self.registry.counter(
+            "reviews_submitted_total",
+            "Reviews submitted to the API by initial status",
+            ["language", "status"],
+        )
+        self.queue_wait = self.registry.histogram(
+            "review_queue_wait_seconds",
+            "Seconds from submission to a worker picking the review up",
+            ["language"],
+        )
+        self.llm_request_duration = self.registry.histogram(
+            "review_llm_request_duration_seconds",
+            "Seconds of an LLM call, one per chunk of chunked reviews",
+            ["model", "language", "outcome"],
+        )
+        self.llm_time_to_first_token = self.registry.histogram(
+            "review_llm_time_to_first_token_seconds",
+            "Seconds until the first token of a streamed LLM call",
+            ["model", "language"],
+        )
+        self.llm_prompt_tokens = self.registry.counter(
+            "review_llm_prompt_tokens_total",
+            "Estimated prompt tokens sent to the LLM",
+            ["model", "language"],
+        )
+        self.llm_completion_tokens = self.registry.counter(
+            "review_llm_completion_tokens_total",
+            "Estimated completion tokens received from the LLM",
+            ["model", "language"],
+        )
+        self.parse_duration = self.registry.histogram(
+            "review_parse_duration_seconds",
+            "Seconds parsing an LLM response into a review",
+            ["model", "language"],
+            buckets=PARSE_BUCKETS,
+        )
+        self.parse_failures = self.registry.counter(
+            "review_parse_failures_total",
+            "LLM responses no review could be recovered from",
+            ["model", "language"],
+        )
+        self.reviews_finished = self.registry.counter(
+            "reviews_finished_total",
+            "Reviews finished by a worker, by final status and source of the result",
+            ["language", "status", "source"],
+        )
+        self.processing_duration = self.registry.histogram(
+            "review_processing_duration_seconds",
+            "Seconds from a worker picking a review up to its result",
+            ["language", "source"],
+        )
+        self.maintenance_duration = self.registry.histogram(
+            "maintenance_job_duration_seconds",
+            "Seconds of a maintenance job run by outcome",
+            ["job", "outcome"],
+            buckets=MAINTENANCE_BUCKETS,
+        )
+        self.maintenance_items = self.registry.counter(
+            "maintenance_job_items_total",
+            "Items processed by maintenance jobs",
+            ["job"],
+        )
+
+    def review_submitted(self, language: str, status: str) -> None:
+        self.reviews_submitted.inc(language=self._language(language), status=status)
+
+    def observe_queue_wait(self, language: str, seconds: float) -> None:
+        self.queue_wait.observe(seconds, language=self._language(language))
+
+    def observe_llm_call(
+        self,
+        model: str,
+        language: str,
+        seconds: float,
+        outcome: str,
+        time_to_first_token: Optional[float] = None,
+        prompt_tokens: int = 0,
+        completion_tokens: int = 0,
+    ) -> None:
+        """Record an LLM call, outcome is ok or error"""
+        language = self._language(language)
+        self.llm_request_duration.observe(
+            seconds, model=model, language=language, outcome=outcome
+        )
+        if time_to_first_token is not None:
+            self.llm_time_to_first_token.observe(
+                time_to_first_token, model=model, language=language
+            )
+        self.llm_prompt_tokens.inc(prompt_tokens, model=model, language=language)
+        self.llm_completion_tokens.inc(
+            completion_tokens, model=model, language=language
+        )
+
+    def observe_parse(
+        self, model: str, language: str, seconds: float, parsed: bool
+    ) -> None:
+        language = self._language(language)
+        self.parse_duration.observe(seconds, model=model, language=language)
+        if not parsed:
+            self.parse_failures.inc(model=model, language=language)
+
+    def review_finished(
+        self, language: str, status: str, source: str, seconds: Optional[float]
+    ) -> None:
+        """Record a finished review, seconds is None when no worker processed it"""
+        language = self._language(language)
+        self.reviews_finished.inc(language=language, status=status, source=source)
+        if seconds is not None:
+            self.processing_duration.observe(seconds, language=language, source=source)
+
+    def maintenance_job_finished(
+        self, job: str, seconds: float, items: int, outcome: str
+    ) -> None:
+        """Record a maintenance job run, outcome is ok or error"""
+        self.maintenance_duration.observe(seconds, job=job, outcome=outcome)
+        self.maintenance_items.inc(items, job=job)
+
+    def render(self) -> str:
+        return self.registry.render()
+
+    def _language(self, language: str) -> str:
+        """Bounded language label, submissions can name any language"""
+        language = (language or "").lower().strip()
+        if language in self._languages:
+            return language
+        if LANGUAGE_PATTERN.match(language) and len(self._languages) < MAX_LANGUAGES:
+            self._languages.add(language)
+            return language
+        return "other"
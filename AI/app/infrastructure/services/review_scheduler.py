@@ -0,0 +1,81 @@
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from app.config.settings import Settings
+from app.core.models.review_job import ReviewJob
+from app.interfaces.services.review_scheduler_interface import (
+    ReviewSchedulerInterface,
+)
+
+
+class ReviewScheduler(ReviewSchedulerInterface):
+    """
+    Fair-share, size-aware order of available review jobs:
+
+    - users with REVIEW_SCHEDULER_USER_MAX_IN_FLIGHT jobs running are skipped,
+    - the user with the fewest jobs running goes next, so users take turns and
+      an account submitting in bulk can't occupy every worker,
+    - among them, the smallest job by estimated tokens goes first, aged by the
+      time it has been waiting so large jobs are not starved.
+
+    The per-user limit is soft: workers claiming at the same time may briefly
+    run one job more for a user.
+    """
+
+    def __init__(
+        self,
+        user_max_in_flight: Optional[int] = None,
+        aging_tokens_per_second: Optional[float] = None,
+    ):
+        self.settings = Settings()
+        self.user_max_in_flight = (
+            user_max_in_flight or self.settings.REVIEW_SCHEDULER_USER_MAX_IN_FLIGHT
+        )
+        self.aging_tokens_per_second = (
+            aging_tokens_per_second
+            if aging_tokens_per_second is not None
+            else self.settings.REVIEW_SCHEDULER_AGING_TOKENS_PER_SECOND
+        )
+        self.candidates_per_user = self.settings.REVIEW_SCHEDULER_CANDIDATES_PER_USER
+        self.max_users = self.settings.REVIEW_SCHEDULER_MAX_USERS
+
+    def priority(self, job: ReviewJob, now: datetime) -> float:
+        """Lower runs first: estimated tokens minus the credit for waiting"""
+        waited = max((now - job.available_at).total_seconds(), 0)
+        return job.estimated_tokens - self.aging_tokens_per_second * waited
+
+    def order(
+        self,
+        candidates: List[ReviewJob],
+        in_flight: Dict[str, int],
+        now: datetime,
+        limit: int,
+    ) -> List[ReviewJob]:
+        """
+        Up to limit candidates in the order they should be claimed
+
+        Every picked job counts as running for its user, so the next pick is
+        what the scheduler would choose if the previous one was claimed.
+        """
+        load = dict(in_flight)
+        remaining = sorted(candidates, key=lambda job: self.priority(job, now))
+        ordered: List[ReviewJob] = []
+
+        while remaining and len(ordered) < limit:
+            best = None
+            for job in remaining:
+                user_load = load.get(job.user, 0)
+                if user_load >= self.user_max_in_flight:
+                    continue
+                # remaining is sorted by priority, the first job of the least
+                # loaded user wins
+                if best is None or user_load < load[best.user]:
+                    best = job
+                    load.setdefault(job.user, 0)
+            if best is None:
+                break
+
+            ordered.append(best)
+            remaining.remove(best)
+            load[best.user] += 1
+        return ordered
@@ -0,0 +1,146 @@
+import asyncio
+import json
+import threading
+from contextlib import asynccontextmanager
+from datetime import datetime, timedelta
+from typing import Any, AsyncIterator, Dict, List
+
+from app.config.settings import Settings
+from app.core.models.review import ReviewStreamEvent
+from app.infrastructure.logger import logger
+from app.interfaces.repositories.review_stream_repository_interface import (
+    ReviewStreamRepositoryInterface,
+)
+
+# Statuses after which a review stream ends
+TERMINAL_STATUSES = frozenset({"completed", "rejected", "cancelled"})
+# Times an event is renumbered when another writer took its seq first
+SEQ_CONFLICT_RETRIES = 5
+
+
+class ReviewStream:
+    """
+    Events of a single review. Tokens may be pushed from any thread (the agent
+    runs on the agent thread pool); they are buffered and written as one event
+    per flush so a fast model doesn't cause one database write per token.
+    """
+
+    def __init__(self, publisher: "ReviewStreamPublisher", review_id: str, seq: int):
+        self.publisher = publisher
+        self.review_id = review_id
+        self.seq = seq
+        self._tokens: List[str] = []
+        self._lock = threading.Lock()
+        self._write_lock = asyncio.Lock()
+
+    def push(self, token: str) -> None:
+        """Buffer a token, safe to call from the agent thread"""
+        with self._lock:
+            self._tokens.append(token)
+
+    async def flush(self) -> None:
+        """Write buffered tokens as a single token event"""
+        with self._lock:
+            text = "".join(self._tokens)
+            self._tokens.clear()
+        if text:
+            await self._append("token", {"text": text})
+
+    async def status(self, status: str) -> None:
+        """Write a status transition after any buffered tokens"""
+        await self.flush()
+        await self._append("status", {"status": status})
+
+    @asynccontextmanager
+    async def flushing(self) -> AsyncIterator["ReviewStream"]:
+        """Flush buffered tokens periodically while the block runs"""
+        flusher = asyncio.create_task(self._flush_periodically())
+        try:
+            yield self
+        finally:
+            flusher.cancel()
+            await self.flush()
+
+    async def _flush_periodically(self) -> None:
+        while True:
+            await asyncio.sleep(self.publisher.settings.REVIEW_STREAM_FLUSH_INTERVAL)
+            await self.flush()
+
+    async def _append(self, event: str, payload: Dict[str, Any]) -> None:
+        async with self._write_lock:
+            self.seq = await self.publisher.append(
+                ReviewStreamEvent(
+                    review_id=self.review_id,
+                    seq=self.seq + 1,
+                    event=event,
+                    data=json.dumps(payload),
+                    expires_at=datetime.utcnow()
+                    + timedelta(seconds=self.publisher.settings.REVIEW_STREAM_TTL),
+                )
+            )
+
+
+class ReviewStreamPublisher:
+    """
+    Publishes review progress to the review stream collection, read by the
+    SSE endpoint. Stream failures never fail a review, they are logged and the
+    event is dropped.
+    """
+
+    def __init__(self, review_stream_repository: ReviewStreamRepositoryInterface):
+        self.settings = Settings()
+        self.review_stream_repository = review_stream_repository
+
+        # Metrics
+        self._events = 0
+        self._errors = 0
+
+    async def open(self, review_id: str) -> ReviewStream:
+        """Open the stream of a review, continuing after its last event"""
+        try:
+            seq = await self.review_stream_repository.last_seq(review_id)
+        except Exception as e:
+            logger.error(f"Error opening stream of review {review_id}: {str(e)}")
+            seq = 0
+        return ReviewStream(self, review_id, seq)
+
+    async def publish_status(self, review_id: str, status: str) -> None:
+        """Publish a single status transition of a review"""
+        stream = await self.open(review_id)
+        await stream.status(status)
+
+    async def append(self, event: ReviewStreamEvent) -> int:
+        """
+        Store a stream event, returns the seq it was stored under
+
+        The API (cancelling a review) and the worker streaming it both write
+        to the stream. When another writer took the seq of the event first,
+        the event is renumbered after the last stored event and written again,
+        so the stream has neither gaps nor lost events.
+        """
+        for _ in range(SEQ_CONFLICT_RETRIES):
+            try:
+                if await self.review_stream_repository.append([event]):
+                    self._events += 1
+                    return event.seq
+                last_seq = await self.review_stream_repository.last_seq(
+                    event.review_id
+                )
+            except Exception as e:
+                self._errors += 1
+                logger.error(
+                    f"Error publishing {event.event} event of review {event.review_id}: {str(e)}"
+                )
+                return event.seq
+            event = event.model_copy(update={"seq": last_seq + 1})
+
+        self._errors += 1
+        logger.error(
+            f"Error publishing {event.event} event of review {event.review_id}: "
+            f"seq still taken after {SEQ_CONFLICT_RETRIES} attempts"
+        )
+        return event.seq
+
+    def stats(self) -> Dict[str, Any]:
+        """Snapshot of published events"""
+        return {"events": self._events, "errors": self._errors}
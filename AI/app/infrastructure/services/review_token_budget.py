@@ -0,0 +1,95 @@
+from functools import lru_cache
+from typing import NamedTuple
+
+from app.config.settings import Settings
+from app.core.enums import ConfigLLm
+from app.infrastructure.utils.code_compactor import CompactCode, compact_code
+from app.infrastructure.utils.prompts import render_instructions
+from app.infrastructure.utils.token_estimator import estimate_tokens
+
+
+class TokenBudgetExceededError(ValueError):
+    """A review would send more prompt tokens than the configured budget"""
+
+    def __init__(self, estimated_tokens: int, limit: int):
+        super().__init__(
+            f"Code submission needs about {estimated_tokens} prompt tokens, "
+            f"the limit is {limit}"
+        )
+        self.estimated_tokens = estimated_tokens
+        self.limit = limit
+
+
+class ReviewPrompt(NamedTuple):
+    """Code to send for a review and its estimated prompt tokens"""
+
+    code: CompactCode
+    instruction_tokens: int
+    code_tokens: int
+
+    @property
+    def estimated_tokens(self) -> int:
+        return self.instruction_tokens + self.code_tokens
+
+
+class ReviewTokenBudget:
+    """
+    Pre-send stage of reviews: compacts the submission, estimates the prompt
+    tokens of the instructions plus code, and keeps every LLM request within
+    REVIEW_MAX_INPUT_TOKENS (by chunking) and every review within
+    REVIEW_MAX_TOTAL_TOKENS (by refusing it).
+    """
+
+    def __init__(self):
+        self.settings = Settings()
+
+    def prepare(self, code_submission: str, language: str) -> ReviewPrompt:
+        """Compact a submission and estimate the prompt tokens of its review"""
+        if self.settings.REVIEW_COMPACTION_ENABLED:
+            code = compact_code(code_submission, language)
+        else:
+            line_count = len(code_submission.split("\n"))
+            code = CompactCode(code_submission, list(range(1, line_count + 1)))
+
+        return ReviewPrompt(
+            code=code,
+            instruction_tokens=_instruction_tokens(
+                self.settings.llm_config[ConfigLLm.INSTRUCTIONS], language
+            ),
+            code_tokens=estimate_tokens(code.code),
+        )
+
+    def max_review_tokens(self) -> int:
+        """Largest estimate a review may have: a single request, or all its chunks when chunking"""
+        if self.settings.REVIEW_CHUNKING_ENABLED:
+            return self.settings.REVIEW_MAX_TOTAL_TOKENS
+        return self.settings.REVIEW_MAX_INPUT_TOKENS
+
+    def check(self, prompt: ReviewPrompt) -> None:
+        """
+        Refuse a review over the budget
+
+        Raises:
+            TokenBudgetExceededError: If the review exceeds max_review_tokens
+        """
+        limit = self.max_review_tokens()
+        if prompt.estimated_tokens > limit:
+            raise TokenBudgetExceededError(prompt.estimated_tokens, limit)
+
+    def chunk_max_chars(self, prompt: ReviewPrompt) -> int:
+        """Chunk size keeping every request within REVIEW_MAX_INPUT_TOKENS"""
+        code_budget = max(
+            self.settings.REVIEW_MAX_INPUT_TOKENS - prompt.instruction_tokens, 1
+        )
+        chars_per_token = len(prompt.code.code) / max(prompt.code_tokens, 1)
+        return max(
+            min(
+                self.settings.REVIEW_CHUNK_MAX_CHARS, int(code_budget * chars_per_token)
+            ),
+            1,
+        )
+
+
+@lru_cache(maxsize=128)
+def _instruction_tokens(template: str, language: str) -> int:
+    return estimate_tokens(render_instructions(template, language))
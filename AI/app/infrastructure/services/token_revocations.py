@@ -0,0 +1,102 @@
+import time
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, Optional
+
+from app.config.settings import Settings
+from app.infrastructure.db.mongo.models import BlackListToken
+from app.infrastructure.logger import logger
+from app.infrastructure.utils.decorators.singleton import singleton
+
+# Revocations are re-read from a bit before the last refresh, so entries
+# inserted by other processes while it ran, or with a skewed clock, are not missed
+REFRESH_OVERLAP = timedelta(seconds=60)
+
+
+@singleton
+class TokenRevocations:
+    """
+    Ids (jti) of revoked tokens, kept in memory so checking a token costs no
+    I/O. The set is loaded from the blacklist at startup and refreshed every
+    TOKEN_REVOCATION_REFRESH_INTERVAL seconds with the revocations added since,
+    during a request that finds it due. Revocations made in this process apply
+    at once, the ones made by other API processes within the interval.
+
+    Entries are dropped once their token expired, the token itself is rejected
+    from then on.
+    """
+
+    def __init__(self, clock: Callable[[], float] = time.monotonic):
+        self.settings = Settings()
+        self.clock = clock
+        self._revoked: Dict[str, datetime] = {}
+        self._synced_at: Optional[datetime] = None
+        self._refreshed_at: Optional[float] = None
+        self._refreshing = False
+
+        # Metrics
+        self._checks = 0
+        self._refreshes = 0
+        self._refresh_errors = 0
+
+    async def is_revoked(self, jti: str) -> bool:
+        """Whether a token id was revoked"""
+        if self._is_due():
+            await self.refresh()
+        self._checks += 1
+        return jti in self._revoked
+
+    async def revoke(self, jti: str, expire: datetime) -> None:
+        """Revoke a token id until the token expires"""
+        await BlackListToken.add_token(jti, expire)
+        self._revoked[jti] = expire
+
+    async def refresh(self) -> None:
+        """Load the revocations added since the last refresh"""
+        if self._refreshing:
+            # Another request is refreshing, the current set is recent enough
+            return
+        self._refreshing = True
+        try:
+            now = datetime.utcnow()
+            since = self._synced_at - REFRESH_OVERLAP if self._synced_at else None
+            for entry in await BlackListToken.find_revoked_since(since):
+                self._revoked[entry.jti] = entry.expire
+            self._revoked = {
+                jti: expire for jti, expire in self._revoked.items() if expire > now
+            }
+            self._synced_at = now
+            self._refreshes += 1
+        except Exception as e:
+            # Serve the revocations loaded so far, retry on the next interval
+            self._refresh_errors += 1
+            logger.error(f"Error refreshing revoked tokens: {str(e)}")
+        finally:
+            self._refreshed_at = self.clock()
+            self._refreshing = False
+
+    async def cleanup_expired(self) -> int:
+        """
+        Remove revocations of expired tokens from the blacklist, the TTL index
+        on expire does it too within a minute or so
+        """
+        return await BlackListToken.cleanup_expired_tokens()
+
+    def _is_due(self) -> bool:
+        if self._refreshed_at is None:
+            return True
+        elapsed = self.clock() - self._refreshed_at
+        return elapsed >= self.settings.TOKEN_REVOCATION_REFRESH_INTERVAL
+
+    def clear(self) -> None:
+        self._revoked.clear()
+        self._synced_at = None
+        self._refreshed_at = None
+
+    def stats(self) -> Dict[str, Any]:
+        """Snapshot of the revocation set"""
+        return {
+            "revoked": len(self._revoked),
+            "checks": self._checks,
+            "refreshes": self._refreshes,
+            "refresh_errors": self._refresh_errors,
+        }
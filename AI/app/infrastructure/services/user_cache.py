@@ -0,0 +1,96 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from app.config.settings import Settings
+from app.core.models.user import User
+from app.infrastructure.utils.decorators.singleton import singleton
+
+
+@singleton
+class UserCache:
+    """
+    Authenticated users of this process by id, so that protected requests
+    don't read the user collection every time. Entries expire after
+    USER_CACHE_TTL seconds and the least recently used ones are evicted above
+    USER_CACHE_MAX_ENTRIES.
+
+    The user repository invalidates a user when it is updated or deleted. That
+    only reaches this process, other API processes see the change once their
+    entry expires.
+    """
+
+    def __init__(self, clock: Callable[[], float] = time.monotonic):
+        self.settings = Settings()
+        self.clock = clock
+        self._entries: "OrderedDict[str, Tuple[User, float]]" = OrderedDict()
+        self._generation = 0
+        self._lock = threading.Lock()
+
+        # Metrics
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.settings.USER_CACHE_ENABLED and self.settings.USER_CACHE_TTL > 0
+
+    def generation(self) -> int:
+        """Changes on every invalidation, read it before loading a user"""
+        return self._generation
+
+    def get(self, user_id: str) -> Optional[User]:
+        """Cached user, None if missing or expired"""
+        if not self.enabled:
+            return None
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is None or entry[1] <= self.clock():
+                if entry is not None:
+                    del self._entries[user_id]
+                self._misses += 1
+                return None
+            self._entries.move_to_end(user_id)
+            self._hits += 1
+            return entry[0]
+
+    def set(self, user: User, generation: int) -> None:
+        """
+        Cache a user loaded when generation() returned generation. It is
+        dropped if the user may have been invalidated meanwhile.
+        """
+        if not self.enabled or not user.id:
+            return
+        with self._lock:
+            if generation != self._generation:
+                return
+            self._entries[user.id] = (user, self.clock() + self.settings.USER_CACHE_TTL)
+            self._entries.move_to_end(user.id)
+            while len(self._entries) > self.settings.USER_CACHE_MAX_ENTRIES:
+                self._entries.popitem(last=False)
+                self._evictions += 1
+
+    def invalidate(self, user_id: str) -> None:
+        """Forget a user that was updated or deleted"""
+        with self._lock:
+            self._generation += 1
+            self._entries.pop(str(user_id), None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._generation += 1
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """Snapshot of cache size and hit rate"""
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                "entries": len(self._entries),
+                "hits": self._hits,
+                "misses": self._misses,
+                "hit_rate": round(self._hits / lookups, 3) if lookups else 0.0,
+                "evictions": self._evictions,
+            }
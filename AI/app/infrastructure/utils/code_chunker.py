@@ -0,0 +1,134 @@
+import ast
+import io
+import re
+from typing import List, NamedTuple, Optional, Tuple
+
+# Lines starting a top-level definition in brace or keyword delimited languages
+DEFINITION_PATTERN = re.compile(
+    r"""^(?:
+        (?:export\s+)?(?:default\s+)?(?:async\s+)?function\b
+        | (?:export\s+)?(?:abstract\s+)?class\b
+        | (?:public|private|protected|internal|static|final|override)\b
+        | (?:func|fn|def|impl|struct|enum|interface|trait|type|module|namespace)\b
+        | (?:pub(?:\(\w+\))?\s+)
+        | (?:const|let|var)\s+\w+\s*=\s*(?:async\s*)?(?:\(|function)
+    )""",
+    re.VERBOSE,
+)
+
+
+class CodeChunk(NamedTuple):
+    """Contiguous part of a submission, lines are 1-based and inclusive"""
+
+    start_line: int
+    end_line: int
+    code: str
+
+
+def split_code(code: str, language: str, max_chars: int) -> List[CodeChunk]:
+    """
+    Split a submission at function/class boundaries into chunks of at most
+    max_chars (a single definition larger than that is split by lines)
+
+    Args:
+        code: Code submission
+        language: Programming language, Python is split with `ast`
+        max_chars: Maximum size of a chunk
+
+    Returns:
+        List of chunks covering the whole submission, a single chunk when the
+        submission already fits
+    """
+    # Lines as `ast` numbers them, splitlines() also breaks on form feeds
+    lines = io.StringIO(code, newline="").readlines()
+    if len(code) <= max_chars or len(lines) < 2:
+        return [CodeChunk(1, max(len(lines), 1), code)]
+
+    boundaries = None
+    if language.lower().strip() in ("python", "py"):
+        boundaries = _python_boundaries(code)
+    if boundaries is None:
+        boundaries = _heuristic_boundaries(lines)
+
+    return _pack(lines, _segments(boundaries, len(lines)), max_chars)
+
+
+def _python_boundaries(code: str) -> Optional[List[int]]:
+    """0-based start lines of top-level statements and of class members"""
+    try:
+        tree = ast.parse(code)
+    except SyntaxError:
+        return None
+
+    boundaries = []
+    for node in tree.body:
+        boundaries.append(_node_start(node))
+        if isinstance(node, ast.ClassDef) and node.body:
+            # Methods of a class are boundaries too, so big classes can be split
+            boundaries.extend(_node_start(child) for child in node.body[1:])
+    return boundaries
+
+
+def _node_start(node: ast.stmt) -> int:
+    """0-based first line of a statement, including its decorators"""
+    decorators = getattr(node, "decorator_list", [])
+    return min([node.lineno] + [decorator.lineno for decorator in decorators]) - 1
+
+
+def _heuristic_boundaries(lines: List[str]) -> List[int]:
+    """0-based lines where a top-level definition starts outside any brace block"""
+    boundaries = []
+    depth = 0
+    for index, line in enumerate(lines):
+        stripped = line.strip()
+        if depth <= 0 and not line[:1].isspace() and DEFINITION_PATTERN.match(stripped):
+            boundaries.append(index)
+        depth += line.count("{") - line.count("}")
+    return boundaries
+
+
+def _segments(boundaries: List[int], line_count: int) -> List[Tuple[int, int]]:
+    """Turn boundary lines into (start, end) 0-based half-open line ranges"""
+    starts = sorted({0, *(b for b in boundaries if 0 < b < line_count)})
+    return list(zip(starts, starts[1:] + [line_count]))
+
+
+def _pack(
+    lines: List[str], segments: List[Tuple[int, int]], max_chars: int
+) -> List[CodeChunk]:
+    """Greedily group consecutive segments into chunks of at most max_chars"""
+    chunks: List[CodeChunk] = []
+    start = end = None
+    size = 0
+
+    def flush():
+        if start is not None and end > start:
+            chunks.append(CodeChunk(start + 1, end, "".join(lines[start:end])))
+
+    for segment_start, segment_end in segments:
+        segment_size = sum(len(line) for line in lines[segment_start:segment_end])
+
+        if segment_size > max_chars:
+            # A single definition larger than a chunk is split by lines
+            flush()
+            start, size = segment_start, 0
+            for index in range(segment_start, segment_end):
+                if size and size + len(lines[index]) > max_chars:
+                    end = index
+                    flush()
+                    start, size = index, 0
+                size += len(lines[index])
+            end = segment_end
+            continue
+
+        if start is not None and size + segment_size > max_chars:
+            flush()
+            start, size = None, 0
+
+        if start is None:
+            start = segment_start
+        end = segment_end
+        size += segment_size
+
+    flush()
+    return chunks
@@ -0,0 +1,188 @@
+import io
+import tokenize
+from typing import Dict, List, NamedTuple, Optional, Set, Tuple
+
+# Comment syntax per language: (line comment markers, block comment delimiters)
+C_STYLE = (("//",), ("/*", "*/"))
+HASH_STYLE = (("#",), None)
+COMMENT_SYNTAX: Dict[str, Tuple[Tuple[str, ...], Optional[Tuple[str, str]]]] = {
+    "python": HASH_STYLE,
+    "py": HASH_STYLE,
+    "ruby": HASH_STYLE,
+    "shell": HASH_STYLE,
+    "bash": HASH_STYLE,
+    "perl": HASH_STYLE,
+    "r": HASH_STYLE,
+    "elixir": HASH_STYLE,
+    "javascript": C_STYLE,
+    "js": C_STYLE,
+    "typescript": C_STYLE,
+    "ts": C_STYLE,
+    "java": C_STYLE,
+    "c": C_STYLE,
+    "c++": C_STYLE,
+    "cpp": C_STYLE,
+    "c#": C_STYLE,
+    "csharp": C_STYLE,
+    "go": C_STYLE,
+    "rust": C_STYLE,
+    "kotlin": C_STYLE,
+    "swift": C_STYLE,
+    "scala": C_STYLE,
+    "dart": C_STYLE,
+    "php": (("//", "#"), ("/*", "*/")),
+    "sql": (("--",), ("/*", "*/")),
+    "lua": (("--",), None),
+    "haskell": (("--",), ("{-", "-}")),
+}
+
+# String quotes per language, single quotes are lifetimes in Rust
+DEFAULT_QUOTES = "\"'"
+QUOTES = {
+    "javascript": "\"'`",
+    "js": "\"'`",
+    "typescript": "\"'`",
+    "ts": "\"'`",
+    "go": "\"'`",
+    "rust": '"',
+}
+
+
+class CompactCode(NamedTuple):
+    """Code without comments and blank lines, and where its lines come from"""
+
+    code: str
+    line_map: List[int]  # 1-based original line of every compacted line
+
+    def original_lines(self, start_line: int, end_line: int) -> Tuple[int, int]:
+        """Original line range of a 1-based inclusive compacted line range"""
+        if not self.line_map:
+            return start_line, end_line
+        last = len(self.line_map)
+        return (
+            self.line_map[min(max(start_line, 1), last) - 1],
+            self.line_map[min(max(end_line, 1), last) - 1],
+        )
+
+
+def compact_code(code: str, language: str) -> CompactCode:
+    """
+    Strip comments and blank lines from a submission to save prompt tokens
+
+    Python is handled with `tokenize`; other languages with a scanner aware of
+    their string and comment syntax. Lines inside multi-line strings are kept
+    as they are. Languages without known comment syntax only lose blank lines.
+
+    Args:
+        code: Code submission
+        language: Programming language of the code
+
+    Returns:
+        CompactCode with the compacted code and its line map
+    """
+    language = language.lower().strip()
+    # Not splitlines(), which also breaks on form feeds and other separators
+    # tokenize and the scanner count as part of a line
+    lines = [line.removesuffix("\r") for line in code.split("\n")]
+
+    stripped: Optional[List[str]] = None
+    protected: Set[int] = set()
+    if language in ("python", "py"):
+        stripped, protected = _strip_python_comments(code, lines)
+    if stripped is None:
+        line_markers, block = COMMENT_SYNTAX.get(language, ((), None))
+        stripped, protected = _strip_comments(
+            code, line_markers, block, QUOTES.get(language, DEFAULT_QUOTES)
+        )
+
+    kept: List[str] = []
+    line_map: List[int] = []
+    for index, line in enumerate(stripped):
+        if index in protected:
+            kept.append(line)
+        elif line.strip():
+            kept.append(line.rstrip())
+        else:
+            continue
+        line_map.append(index + 1)
+    return CompactCode("\n".join(kept), line_map)
+
+
+def _strip_python_comments(
+    code: str, lines: List[str]
+) -> Tuple[Optional[List[str]], Set[int]]:
+    """Lines without comments and 0-based lines inside multi-line strings"""
+    stripped = list(lines)
+    protected: Set[int] = set()
+    try:
+        for token in tokenize.generate_tokens(io.StringIO(code).readline):
+            (start_row, start_col), (end_row, _) = token.start, token.end
+            if token.type == tokenize.COMMENT and start_row <= len(stripped):
+                stripped[start_row - 1] = stripped[start_row - 1][:start_col]
+            elif token.type == tokenize.STRING and end_row > start_row:
+                protected.update(range(start_row, end_row))
+    except (tokenize.TokenError, IndentationError, SyntaxError):
+        return None, set()
+    return stripped, protected
+
+
+def _strip_comments(
+    code: str,
+    line_markers: Tuple[str, ...],
+    block: Optional[Tuple[str, str]],
+    quotes: str,
+) -> Tuple[List[str], Set[int]]:
+    """
+    Single-pass scanner removing line and block comments outside strings.
+    Newlines of block comments are kept so line numbers don't shift.
+    """
+    out: List[str] = []
+    protected: Set[int] = set()
+    line = 0
+    index = 0
+    length = len(code)
+    quote: Optional[str] = None
+
+    while index < length:
+        char = code[index]
+
+        if quote:
+            out.append(char)
+            if char == "\\" and index + 1 < length:
+                out.append(code[index + 1])
+                if code[index + 1] == "\n":
+                    line += 1
+                    protected.add(line)
+                index += 2
+                continue
+            if char == quote:
+                quote = None
+            elif char == "\n":
+                line += 1
+                protected.add(line)
+            index += 1
+            continue
+
+        if char == "\n":
+            out.append(char)
+            line += 1
+        elif char in quotes:
+            quote = char
+            out.append(char)
+        elif block and code.startswith(block[0], index):
+            end = code.find(block[1], index + len(block[0]))
+            end = length if end == -1 else end + len(block[1])
+            newlines = code.count("\n", index, end)
+            out.append("\n" * newlines)
+            line += newlines
+            index = end
+            continue
+        elif any(code.startswith(marker, index) for marker in line_markers):
+            end = code.find("\n", index)
+            index = length if end == -1 else end
+            continue
+        else:
+            out.append(char)
+        index += 1
+
+    return "".join(out).split("\n"), protected
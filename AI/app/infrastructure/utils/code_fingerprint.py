@@ -0,0 +1,36 @@
+import hashlib
+
+
+def normalize_code(code: str) -> str:
+    """
+    Normalize a code submission so that cosmetic differences hash the same
+
+    Args:
+        code: Raw code submission
+
+    Returns:
+        Code with unified line endings, no trailing whitespace on any line and
+        no leading or trailing blank lines
+    """
+    lines = code.replace("\r\n", "\n").replace("\r", "\n").split("\n")
+    return "\n".join(line.rstrip() for line in lines).strip("\n")
+
+
+def code_fingerprint(code: str, language: str, prompt_version: str, model: str) -> str:
+    """
+    Content address of a review request
+
+    Args:
+        code: Raw code submission
+        language: Programming language of the code
+        prompt_version: Version of the review instructions
+        model: LLM model name
+
+    Returns:
+        Hex sha256 digest of the normalized code, language, prompt version and model
+    """
+    digest = hashlib.sha256()
+    for part in (language.lower().strip(), prompt_version, model, normalize_code(code)):
+        digest.update(part.encode("utf-8"))
+        digest.update(b"\0")
+    return digest.hexdigest()
@@ -0,0 +1,12 @@
+import asyncio
+from typing import Any, Callable
+
+
+def call_soon(
+    loop: asyncio.AbstractEventLoop, callback: Callable[..., Any], *args: Any
+) -> None:
+    """Run a callback on the event loop from any thread, unless the loop is closed"""
+    try:
+        loop.call_soon_threadsafe(callback, *args)
+    except RuntimeError:
+        pass
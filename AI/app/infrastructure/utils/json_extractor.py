@@ -0,0 +1,220 @@
+import json
+from typing import Any, Dict, List, Optional
+
+from pydantic import BaseModel, ValidationError
+
+from app.core.models.review import CodeReviewIAResponse
+
+# Candidate objects tried before giving up on a response
+MAX_CANDIDATES = 5
+
+CLOSERS = {"{": "}", "[": "]"}
+PYTHON_LITERALS = {"True": "true", "False": "false", "None": "null"}
+CONTROL_ESCAPES = {"\n": "\\n", "\r": "\\r", "\t": "\\t"}
+
+
+def extract_json_object(text: str) -> Optional[Dict[str, Any]]:
+    """
+    Find the first JSON object in an LLM response and parse it
+
+    The object may be surrounded by prose or markdown fences. Common defects
+    are repaired on the way: trailing commas, raw newlines and control
+    characters inside strings, Python True/False/None literals and a response
+    truncated before its closing quotes and braces.
+
+    Args:
+        text: Raw LLM response
+
+    Returns:
+        The parsed object, or None when no object could be recovered
+    """
+    start = text.find("{")
+    if start == -1:
+        return None
+
+    # Fast path: well-formed output, possibly wrapped in prose or fences
+    try:
+        parsed = json.loads(text[start : text.rfind("}") + 1])
+        if isinstance(parsed, dict):
+            return parsed
+    except ValueError:
+        pass
+
+    for _ in range(MAX_CANDIDATES):
+        if start == -1:
+            return None
+        candidate = _repair_from(text, start)
+        try:
+            parsed = json.loads(candidate)
+        except ValueError:
+            parsed = None
+        if isinstance(parsed, dict):
+            return parsed
+        start = text.find("{", start + 1)
+    return None
+
+
+def _repair_from(text: str, start: int) -> str:
+    """
+    Copy the object starting at text[start] in a single pass, repairing it,
+    and stop at its closing brace
+    """
+    out: List[str] = []
+    stack: List[str] = []
+    in_string = False
+    escaped = False
+    string_start = 0
+    index = start
+    length = len(text)
+
+    while index < length:
+        char = text[index]
+
+        if in_string:
+            if escaped:
+                escaped = False
+                out.append(char)
+            elif char == "\\":
+                escaped = True
+                out.append(char)
+            elif char == '"':
+                in_string = False
+                out.append(char)
+            elif char < " ":
+                out.append(CONTROL_ESCAPES.get(char, f"\\u{ord(char):04x}"))
+            else:
+                out.append(char)
+            index += 1
+            continue
+
+        if char == '"':
+            in_string = True
+            string_start = len(out)
+            out.append(char)
+        elif char in CLOSERS:
+            stack.append(CLOSERS[char])
+            out.append(char)
+        elif char in "}]":
+            _drop_trailing_comma(out)
+            if stack and stack[-1] == char:
+                stack.pop()
+            out.append(char)
+            if not stack:
+                return "".join(out)
+        elif char.isalpha():
+            # Bare words outside strings: keep JSON literals, map Python ones
+            end = index
+            while end < length and (text[end].isalnum() or text[end] == "_"):
+                end += 1
+            word = text[index:end]
+            out.append(PYTHON_LITERALS.get(word, word))
+            index = end
+            continue
+        else:
+            out.append(char)
+        index += 1
+
+    # Truncated response: close the open string, drop a dangling key or comma
+    if escaped:
+        out.pop()
+    if in_string:
+        out.append('"')
+    _drop_dangling(out, string_start, bool(stack) and stack[-1] == "}")
+    out.extend(reversed(stack))
+    return "".join(out)
+
+
+def _drop_trailing_comma(out: List[str]) -> None:
+    """Remove a comma (and the whitespace after it) before a closing bracket"""
+    position = len(out) - 1
+    while position >= 0 and out[position].isspace():
+        position -= 1
+    if position >= 0 and out[position] == ",":
+        del out[position:]
+
+
+def _drop_dangling(out: List[str], string_start: int, in_object: bool) -> None:
+    """Make a truncated object closable: no trailing comma, colon or lone key"""
+    while out and out[-1].isspace():
+        out.pop()
+
+    if in_object and out and out[-1] == '"' and string_start < len(out) - 1:
+        # A string right after "{" or "," in an object is a key without value
+        position = string_start - 1
+        while position >= 0 and out[position].isspace():
+            position -= 1
+        if position >= 0 and out[position] in "{,":
+            del out[string_start:]
+            while out and out[-1].isspace():
+                out.pop()
+
+    if out and out[-1] == ",":
+        out.pop()
+    elif out and out[-1] == ":":
+        out.append(" null")
+
+
+def parse_code_review(response: Any) -> Optional[CodeReviewIAResponse]:
+    """
+    Turn an agent response into a validated review
+
+    Args:
+        response: Agent output, a string, a dict or a Pydantic model
+
+    Returns:
+        CodeReviewIAResponse, or None when the response can't be recovered
+    """
+    if isinstance(response, CodeReviewIAResponse):
+        return response
+    if isinstance(response, BaseModel):
+        response = response.model_dump()
+    if isinstance(response, str):
+        response = extract_json_object(response)
+    if not isinstance(response, dict):
+        return None
+
+    try:
+        return CodeReviewIAResponse(**_normalize_review(response))
+    except (ValidationError, TypeError, ValueError):
+        return None
+
+
+def _normalize_review(data: Dict[str, Any]) -> Dict[str, Any]:
+    """Coerce the usual schema slips of LLMs into the review schema"""
+    # The review is sometimes wrapped, e.g. {"review": {...}}
+    if "overall_score" not in data and len(data) == 1:
+        (inner,) = data.values()
+        if isinstance(inner, dict):
+            data = inner
+
+    data = dict(data)
+    score = data.get("overall_score")
+    if isinstance(score, str):
+        score = score.split("/")[0].strip()
+    try:
+        data["overall_score"] = min(max(round(float(score)), 1), 10)
+    except (TypeError, ValueError):
+        pass
+
+    if isinstance(data.get("category"), str):
+        data["category"] = data["category"].strip().lower()
+
+    assessment = data.get("security_assessment")
+    if isinstance(assessment, dict):
+        assessment = dict(assessment)
+        if isinstance(assessment.get("risk_level"), str):
+            assessment["risk_level"] = assessment["risk_level"].strip().lower()
+        concerns = assessment.get("concerns")
+        if concerns is None:
+            assessment["concerns"] = []
+        elif isinstance(concerns, str):
+            assessment["concerns"] = [concerns] if concerns else []
+        data["security_assessment"] = assessment
+
+    suggestions = data.get("suggestions")
+    if isinstance(suggestions, list):
+        data["suggestions"] = "\n".join(
+            item if isinstance(item, str) else json.dumps(item) for item in suggestions
+        )
+
+    return data
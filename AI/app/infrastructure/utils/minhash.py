@@ -0,0 +1,189 @@
+import hashlib
+import keyword
+import random
+import re
+from array import array
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+# Keywords kept verbatim by the tokenizer, every other identifier that is not
+# called or accessed as an attribute is replaced by a placeholder
+KEYWORDS = frozenset(keyword.kwlist) | frozenset("""
+    function var let const this new typeof instanceof public private protected
+    static void int long float double char bool boolean string struct enum
+    interface switch case default do goto func fn mut impl match package extends
+    implements throw throws catch null nil true false undefined select from where
+    """.split())
+
+TOKEN_PATTERN = re.compile(
+    r"""
+    (?P<comment>\#[^\n]*|//[^\n]*|/\*.*?\*/)
+    | (?P<string>"(?:\\.|[^"\\\n])*"|'(?:\\.|[^'\\\n])*'|`[^`]*`)
+    | (?P<number>\b\d[\w.]*)
+    | (?P<name>[A-Za-z_$][\w$]*)
+    | (?P<op>\S)
+    """,
+    re.VERBOSE | re.DOTALL,
+)
+
+MERSENNE_PRIME = (1 << 61) - 1
+MAX_HASH = (1 << 32) - 1
+
+
+def tokenize_code(code: str) -> List[str]:
+    """
+    Split code into tokens that ignore formatting, comments, literals and
+    variable names
+
+    Args:
+        code: Code submission in any language
+
+    Returns:
+        List of tokens where strings become STR, numbers NUM and identifiers
+        that are neither keywords, calls nor attributes become ID
+    """
+    matches = [
+        (match.lastgroup, match.group())
+        for match in TOKEN_PATTERN.finditer(code)
+        if match.lastgroup != "comment"
+    ]
+
+    tokens = []
+    for index, (kind, text) in enumerate(matches):
+        if kind == "string":
+            tokens.append("STR")
+        elif kind == "number":
+            tokens.append("NUM")
+        elif kind == "name":
+            is_call = index + 1 < len(matches) and matches[index + 1][1] == "("
+            is_attribute = index > 0 and matches[index - 1][1] == "."
+            keep = text in KEYWORDS or is_call or is_attribute
+            tokens.append(text if keep else "ID")
+        else:
+            tokens.append(text)
+    return tokens
+
+
+def shingle_hashes(tokens: List[str], size: int) -> Set[int]:
+    """Hash every run of `size` consecutive tokens into a 64-bit integer"""
+    return {
+        int.from_bytes(
+            hashlib.blake2b(
+                "\0".join(tokens[index : index + size]).encode("utf-8"),
+                digest_size=8,
+            ).digest(),
+            "little",
+        )
+        for index in range(max(len(tokens) - size + 1, 0))
+    }
+
+
+class MinHasher:
+    """MinHash signatures estimating the Jaccard similarity of shingle sets"""
+
+    def __init__(self, num_perm: int = 128, seed: int = 1):
+        self.num_perm = num_perm
+        rng = random.Random(seed)
+        self.permutations = [
+            (rng.randint(1, MERSENNE_PRIME - 1), rng.randint(0, MERSENNE_PRIME - 1))
+            for _ in range(num_perm)
+        ]
+
+    def signature(self, hashes: Iterable[int]) -> array:
+        """Signature of a set of shingle hashes, one 32-bit minimum per permutation"""
+        values = list(hashes)
+        if not values:
+            return array("I", [MAX_HASH] * self.num_perm)
+        return array(
+            "I",
+            [
+                min(((a * value + b) % MERSENNE_PRIME) & MAX_HASH for value in values)
+                for a, b in self.permutations
+            ],
+        )
+
+    @staticmethod
+    def similarity(first: array, second: array) -> float:
+        """Estimated Jaccard similarity of two signatures"""
+        return sum(1 for a, b in zip(first, second) if a == b) / len(first)
+
+
+class MinHashLSHIndex:
+    """
+    Locality-sensitive hashing index over MinHash signatures.
+
+    Signatures are split in `bands` bands; two signatures become candidates
+    when at least one band is identical, then the candidate with the highest
+    estimated similarity is verified against the threshold. Entries are
+    partitioned, only signatures of the same partition are compared.
+    """
+
+    def __init__(self, num_perm: int = 128, bands: int = 16):
+        if num_perm % bands:
+            raise ValueError("num_perm must be a multiple of bands")
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+        self._tables: Dict[str, List[Dict[bytes, List[str]]]] = {}
+        self._signatures: Dict[str, Tuple[str, array]] = {}
+
+    def __len__(self) -> int:
+        return len(self._signatures)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._signatures
+
+    def insert(self, key: str, partition: str, signature: array) -> None:
+        """Add (or replace) a signature under key"""
+        if key in self._signatures:
+            self.remove(key)
+
+        tables = self._tables.setdefault(partition, [{} for _ in range(self.bands)])
+        for table, band in zip(tables, self._bands(signature)):
+            table.setdefault(band, []).append(key)
+        self._signatures[key] = (partition, signature)
+
+    def remove(self, key: str) -> None:
+        """Remove the signature stored under key, if any"""
+        entry = self._signatures.pop(key, None)
+        if entry is None:
+            return
+
+        partition, signature = entry
+        for table, band in zip(self._tables[partition], self._bands(signature)):
+            bucket = table.get(band)
+            if bucket and key in bucket:
+                bucket.remove(key)
+                if not bucket:
+                    del table[band]
+
+    def query(
+        self, partition: str, signature: array, threshold: float
+    ) -> Optional[Tuple[str, float]]:
+        """
+        Find the most similar stored signature of a partition
+
+        Returns:
+            Optional[Tuple[str, float]]: (key, estimated similarity) of the best
+            candidate at or above threshold, or None
+        """
+        tables = self._tables.get(partition)
+        if not tables:
+            return None
+
+        candidates: Set[str] = set()
+        for table, band in zip(tables, self._bands(signature)):
+            candidates.update(table.get(band, ()))
+
+        best: Optional[Tuple[str, float]] = None
+        for key in candidates:
+            similarity = MinHasher.similarity(signature, self._signatures[key][1])
+            if similarity >= threshold and (best is None or similarity > best[1]):
+                best = (key, similarity)
+        return best
+
+    def _bands(self, signature: array) -> List[bytes]:
+        """Split a signature in its band keys"""
+        return [
+            signature[start : start + self.rows].tobytes()
+            for start in range(0, self.num_perm, self.rows)
+        ]
@@ -0,0 +1,7 @@
+from functools import lru_cache
+
+
+@lru_cache(maxsize=128)
+def render_instructions(template: str, language: str) -> str:
+    """Render the instructions template once per language and reuse it"""
+    return template.format(language=language)
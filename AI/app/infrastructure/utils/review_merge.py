@@ -0,0 +1,86 @@
+from typing import List, Tuple
+
+from app.core.models.review import (
+    CodeReviewIAResponse,
+    SecurityAssessment,
+    SecurytyLevel,
+)
+from app.infrastructure.utils.code_chunker import CodeChunk
+
+RISK_ORDER = [
+    SecurytyLevel.NONE,
+    SecurytyLevel.LOW,
+    SecurytyLevel.MEDIUM,
+    SecurytyLevel.HIGH,
+]
+
+
+def merge_chunk_reviews(
+    chunk_reviews: List[Tuple[CodeChunk, CodeReviewIAResponse]],
+) -> CodeReviewIAResponse:
+    """
+    Merge the reviews of the chunks of one submission into a single review
+
+    The score is the average of the chunk scores weighted by chunk size, or the
+    lowest chunk score when any chunk has a high security risk. The category
+    is the one of the lowest scored chunk, the risk level the highest one and
+    concerns are the union of every chunk's concerns.
+
+    Args:
+        chunk_reviews: (chunk, review) pairs in submission order
+
+    Returns:
+        CodeReviewIAResponse: Review of the whole submission
+    """
+    if len(chunk_reviews) == 1:
+        return chunk_reviews[0][1]
+
+    reviews = [review for _, review in chunk_reviews]
+    weights = [max(len(chunk.code), 1) for chunk, _ in chunk_reviews]
+    lowest = min(reviews, key=lambda review: review.overall_score)
+    risk_level = max(
+        (review.security_assessment.risk_level for review in reviews),
+        key=RISK_ORDER.index,
+    )
+
+    if risk_level == SecurytyLevel.HIGH:
+        overall_score = lowest.overall_score
+    else:
+        overall_score = round(
+            sum(
+                review.overall_score * weight
+                for review, weight in zip(reviews, weights)
+            )
+            / sum(weights)
+        )
+
+    concerns = list(
+        dict.fromkeys(
+            concern
+            for review in reviews
+            for concern in review.security_assessment.concerns
+        )
+    )
+
+    suggestions = "\n\n".join(
+        f"Lines {chunk.start_line}-{chunk.end_line}: {review.suggestions}"
+        for chunk, review in chunk_reviews
+        if review.suggestions
+    )
+    refactored_examples = [
+        review.refactored_example
+        for _, review in chunk_reviews
+        if review.refactored_example
+    ]
+
+    return CodeReviewIAResponse(
+        overall_score=overall_score,
+        category=lowest.category,
+        security_assessment=SecurityAssessment(
+            risk_level=risk_level, concerns=concerns
+        ),
+        suggestions=suggestions,
+        refactored_example=(
+            "\n\n".join(refactored_examples) if refactored_examples else None
+        ),
+    )
@@ -0,0 +1,25 @@
+from typing import Optional
+
+
+def format_sse(event: str, data: str, event_id: Optional[int] = None) -> str:
+    """
+    Format a Server-Sent Events message
+
+    Args:
+        event: Event name
+        data: Event payload, multi-line payloads are sent as several data lines
+        event_id: Optional id clients send back in Last-Event-ID to resume
+
+    Returns:
+        The message, terminated by a blank line
+    """
+    lines = [f"event: {event}"]
+    if event_id is not None:
+        lines.append(f"id: {event_id}")
+    lines.extend(f"data: {line}" for line in data.split("\n"))
+    return "\n".join(lines) + "\n\n"
+
+
+def format_sse_comment(comment: str) -> str:
+    """Format a Server-Sent Events comment, used as keep-alive"""
+    return f": {comment}\n\n"
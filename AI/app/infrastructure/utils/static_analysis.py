@@ -0,0 +1,560 @@
+import ast
+import re
+from typing import List, NamedTuple, Optional, Tuple
+
+from app.core.models.review import (
+    Categories,
+    CodeReviewIAResponse,
+    SecurityAssessment,
+    SecurytyLevel,
+)
+from app.infrastructure.utils.code_compactor import compact_code
+from app.infrastructure.utils.review_merge import RISK_ORDER
+from app.infrastructure.utils.secret_scanner import scan_secrets
+
+PROVISIONAL_NOTE = (
+    "Provisional review from static analysis, the full review is in progress."
+)
+MAX_LISTED_FINDINGS = 20
+MAX_FUNCTION_COMPLEXITY = 10
+MAX_NESTING_DEPTH = 4
+
+SECRET_DESCRIPTIONS = {
+    "private_key": "Hardcoded private key",
+    "aws_access_key": "Hardcoded AWS access key",
+    "github_token": "Hardcoded GitHub token",
+    "slack_token": "Hardcoded Slack token",
+    "google_api_key": "Hardcoded Google API key",
+    "openai_api_key": "Hardcoded OpenAI API key",
+    "stripe_key": "Hardcoded Stripe live key",
+    "jwt": "Hardcoded JSON Web Token",
+    "connection_string_password": "Password in a connection string",
+    "hardcoded_password": "Hardcoded password or secret",
+}
+
+# Score lost per finding
+RISK_PENALTY = {
+    SecurytyLevel.HIGH: 3,
+    SecurytyLevel.MEDIUM: 2,
+    SecurytyLevel.LOW: 1,
+    SecurytyLevel.NONE: 1,
+}
+
+# Python calls that are dangerous whatever their arguments
+PYTHON_DANGEROUS_CALLS = {
+    "eval": (SecurytyLevel.HIGH, "eval() runs arbitrary code"),
+    "exec": (SecurytyLevel.HIGH, "exec() runs arbitrary code"),
+    "os.system": (SecurytyLevel.HIGH, "os.system() runs a shell command"),
+    "os.popen": (SecurytyLevel.HIGH, "os.popen() runs a shell command"),
+    "pickle.loads": (
+        SecurytyLevel.MEDIUM,
+        "pickle can run code when loading untrusted data",
+    ),
+    "pickle.load": (
+        SecurytyLevel.MEDIUM,
+        "pickle can run code when loading untrusted data",
+    ),
+    "marshal.loads": (SecurytyLevel.MEDIUM, "marshal is unsafe for untrusted data"),
+    "hashlib.md5": (
+        SecurytyLevel.LOW,
+        "MD5 is a broken hash, don't use it for security",
+    ),
+    "hashlib.sha1": (
+        SecurytyLevel.LOW,
+        "SHA-1 is a broken hash, don't use it for security",
+    ),
+}
+
+PYTHON_BLOCKING_CALLS = {
+    "time.sleep",
+    "requests.get",
+    "requests.post",
+    "requests.put",
+    "requests.delete",
+    "requests.request",
+}
+
+# Checks of languages without a parser: (pattern, category, risk, message)
+GENERIC_CHECKS = [
+    (
+        re.compile(r"\beval\s*\("),
+        Categories.SECURITY,
+        SecurytyLevel.HIGH,
+        "eval() runs arbitrary code",
+    ),
+    (
+        re.compile(
+            r"\b(?:system|popen|shell_exec|passthru)\s*\(|Runtime\.getRuntime\(\)\.exec"
+        ),
+        Categories.SECURITY,
+        SecurytyLevel.HIGH,
+        "Runs a shell command, sanitize any user input",
+    ),
+    (
+        re.compile(r"\.innerHTML\s*=|dangerouslySetInnerHTML|document\.write\s*\("),
+        Categories.SECURITY,
+        SecurytyLevel.MEDIUM,
+        "Writes raw HTML, possible cross-site scripting",
+    ),
+    (
+        re.compile(
+            r"[\"'`]\s*(?i:select|insert|update|delete)\b[^\n]*[\"'`]\s*(?:\+|\.\s*\$)|"
+            r"\b(?i:select|insert|update|delete)\b[^\"'`\n]*\$\{"
+        ),
+        Categories.SECURITY,
+        SecurytyLevel.MEDIUM,
+        "SQL built from strings, use parameterized queries",
+    ),
+    (
+        re.compile(r"\bcatch\s*\([^)]*\)\s*\{\s*\}|\bexcept\s*:\s*pass\b"),
+        Categories.SYNTAX,
+        SecurytyLevel.NONE,
+        "Errors are silently swallowed",
+    ),
+]
+
+GENERIC_DECISION_PATTERN = re.compile(
+    r"\b(?:if|elif|elsif|for|foreach|while|case|catch|except|when)\b|&&|\|\||\?\?"
+)
+GENERIC_FUNCTION_PATTERN = re.compile(r"\b(?:function|func|def|fn|fun|sub)\b|=>")
+
+
+class Finding(NamedTuple):
+    """An issue found by static analysis"""
+
+    category: Categories
+    risk: SecurytyLevel  # NONE for issues that are not security issues
+    line: int  # 1-based line of the submission
+    message: str
+
+
+class CodeMetrics(NamedTuple):
+    """Size and complexity numbers of a submission"""
+
+    lines: int  # Lines with code, without blank lines and comments
+    functions: int
+    max_complexity: int  # Highest cyclomatic complexity of a function (or the code)
+    most_complex: Optional[str]  # Name of that function, when known
+    max_nesting: int
+
+
+class StaticAnalysis(NamedTuple):
+    """Result of the static analysis of a submission"""
+
+    findings: List[Finding]
+    metrics: CodeMetrics
+
+
+def analyze_code(code: str, language: str) -> StaticAnalysis:
+    """
+    Fast local analysis of a submission, run before the LLM review
+
+    Every language is scanned for hardcoded secrets. Python is parsed with
+    `ast` for dangerous calls, error handling, mutable defaults, blocking
+    calls in coroutines and per-function cyclomatic complexity; other
+    languages get regex checks and complexity counted over their code
+    without comments.
+
+    Args:
+        code: Code submission
+        language: Programming language of the code
+
+    Returns:
+        StaticAnalysis with the findings, in line order, and code metrics
+    """
+    language = language.lower().strip()
+    findings = [
+        Finding(
+            Categories.SECURITY,
+            SecurytyLevel.HIGH,
+            secret.line,
+            SECRET_DESCRIPTIONS[secret.kind],
+        )
+        for secret in scan_secrets(code)
+    ]
+
+    analysis = None
+    if language in ("python", "py"):
+        analysis = _analyze_python(code)
+    if analysis is None:
+        analysis = _analyze_generic(code, language)
+
+    code_findings, metrics = analysis
+    findings.extend(code_findings)
+    findings.sort(key=lambda finding: finding.line)
+    return StaticAnalysis(findings, metrics)
+
+
+def provisional_review(analysis: StaticAnalysis) -> CodeReviewIAResponse:
+    """
+    Code review built from a static analysis, shown until the LLM review is done
+
+    The score starts at 10 and loses points per finding (more for riskier
+    security findings), the category is the one of the most serious kind of
+    finding and security concerns list the security findings.
+    """
+    findings, metrics = analysis
+    security = [f for f in findings if f.category == Categories.SECURITY]
+    syntax = [f for f in findings if f.category == Categories.SYNTAX]
+
+    score = 10 - sum(RISK_PENALTY[finding.risk] for finding in findings)
+    if any(finding.message.startswith("Syntax error") for finding in syntax):
+        score = min(score, 3)
+
+    if security:
+        category = Categories.SECURITY
+    elif syntax or not findings:
+        category = Categories.SYNTAX
+    else:
+        category = Categories.PERFORMANCE
+
+    risk_level = max(
+        (finding.risk for finding in security),
+        key=RISK_ORDER.index,
+        default=SecurytyLevel.NONE,
+    )
+
+    lines = [PROVISIONAL_NOTE]
+    lines.extend(
+        f"- Line {finding.line}: {finding.message}"
+        for finding in findings[:MAX_LISTED_FINDINGS]
+    )
+    if len(findings) > MAX_LISTED_FINDINGS:
+        lines.append(f"- And {len(findings) - MAX_LISTED_FINDINGS} more findings")
+    if not findings:
+        lines.append("No issues found by static analysis.")
+    lines.append(_describe_metrics(metrics))
+
+    return CodeReviewIAResponse(
+        overall_score=max(1, min(10, score)),
+        category=category,
+        security_assessment=SecurityAssessment(
+            risk_level=risk_level,
+            concerns=[f"Line {f.line}: {f.message}" for f in security],
+        ),
+        suggestions="\n".join(lines),
+    )
+
+
+def _describe_metrics(metrics: CodeMetrics) -> str:
+    """One line summary of the code metrics"""
+    complexity = f"highest cyclomatic complexity {metrics.max_complexity}"
+    if metrics.most_complex:
+        complexity += f" ({metrics.most_complex})"
+    return (
+        f"Metrics: {metrics.lines} lines of code, {metrics.functions} functions, "
+        f"{complexity}, nesting depth {metrics.max_nesting}."
+    )
+
+
+def _analyze_python(code: str) -> Optional[Tuple[List[Finding], CodeMetrics]]:
+    """Analysis of Python code with ast, None if the code can't be compiled"""
+    try:
+        tree = ast.parse(code)
+    except SyntaxError as e:
+        findings, metrics = _analyze_generic(code, "python")
+        message = f"Syntax error: {e.msg}"
+        return [
+            Finding(Categories.SYNTAX, SecurytyLevel.NONE, e.lineno or 1, message)
+        ] + findings, metrics
+    except (ValueError, RecursionError):
+        return None
+
+    checker = _PythonChecker()
+    checker.visit(tree)
+
+    max_complexity, most_complex = max(
+        checker.complexities, default=(checker.complexity, None)
+    )
+    metrics = CodeMetrics(
+        lines=sum(
+            1
+            for line in code.splitlines()
+            if line.strip() and not line.lstrip().startswith("#")
+        ),
+        functions=len(checker.complexities),
+        max_complexity=max_complexity,
+        most_complex=most_complex,
+        max_nesting=checker.max_nesting,
+    )
+    return checker.findings, metrics
+
+
+class _PythonChecker(ast.NodeVisitor):
+    """Collects findings, function complexities and nesting depth of a module"""
+
+    NESTING_NODES = (
+        ast.If,
+        ast.For,
+        ast.AsyncFor,
+        ast.While,
+        ast.With,
+        ast.AsyncWith,
+        ast.Try,
+    )
+    LOOP_NODES = (ast.For, ast.AsyncFor, ast.While)
+    DECISION_NODES = (
+        ast.If,
+        ast.IfExp,
+        ast.For,
+        ast.AsyncFor,
+        ast.While,
+        ast.ExceptHandler,
+        ast.Assert,
+        ast.match_case,
+    )
+
+    def __init__(self):
+        self.findings: List[Finding] = []
+        self.complexities: List[Tuple[int, str]] = []  # (complexity, function)
+        self.complexity = 1  # Of the code outside functions
+        self.max_nesting = 0
+        self._nesting = 0
+        self._loops = 0
+        self._in_coroutine = False
+
+    def add(
+        self, node: ast.AST, category: Categories, risk: SecurytyLevel, message: str
+    ):
+        self.findings.append(
+            Finding(category, risk, getattr(node, "lineno", 1), message)
+        )
+
+    def generic_visit(self, node: ast.AST) -> None:
+        if isinstance(node, self.DECISION_NODES):
+            self.complexity += 1
+        elif isinstance(node, ast.BoolOp):
+            self.complexity += len(node.values) - 1
+        elif isinstance(node, ast.comprehension):
+            self.complexity += 1 + len(node.ifs)
+
+        nests = isinstance(node, self.NESTING_NODES)
+        loops = isinstance(node, self.LOOP_NODES)
+        if nests:
+            self._nesting += 1
+            if self._nesting == MAX_NESTING_DEPTH + 1:
+                self.add(
+                    node,
+                    Categories.SYNTAX,
+                    SecurytyLevel.NONE,
+                    f"Blocks nested more than {MAX_NESTING_DEPTH} levels deep, extract functions or return early",
+                )
+            self.max_nesting = max(self.max_nesting, self._nesting)
+        if loops:
+            self._loops += 1
+            if self._loops == 3:
+                self.add(
+                    node,
+                    Categories.PERFORMANCE,
+                    SecurytyLevel.NONE,
+                    "Three nested loops, check the algorithm's complexity",
+                )
+
+        super().generic_visit(node)
+
+        if nests:
+            self._nesting -= 1
+        if loops:
+            self._loops -= 1
+
+    def _visit_function(self, node) -> None:
+        for default in node.args.defaults + node.args.kw_defaults:
+            if isinstance(default, (ast.List, ast.Dict, ast.Set)) or (
+                isinstance(default, ast.Call)
+                and _call_name(default) in ("list", "dict", "set")
+            ):
+                self.add(
+                    default,
+                    Categories.SYNTAX,
+                    SecurytyLevel.NONE,
+                    f"Mutable default argument in {node.name}(), it is shared between calls",
+                )
+
+        # Complexity, nesting and loops restart inside a function
+        outer = (self.complexity, self._nesting, self._loops, self._in_coroutine)
+        self.complexity, self._nesting, self._loops = 1, 0, 0
+        self._in_coroutine = isinstance(node, ast.AsyncFunctionDef)
+        self.generic_visit(node)
+
+        complexity = self.complexity
+        self.complexities.append((complexity, node.name))
+        if complexity > MAX_FUNCTION_COMPLEXITY:
+            self.add(
+                node,
+                Categories.SYNTAX,
+                SecurytyLevel.NONE,
+                f"{node.name}() has cyclomatic complexity {complexity}, split it into smaller functions",
+            )
+        self.complexity, self._nesting, self._loops, self._in_coroutine = outer
+
+    visit_FunctionDef = _visit_function
+    visit_AsyncFunctionDef = _visit_function
+
+    def visit_Lambda(self, node: ast.Lambda) -> None:
+        # Calls in a lambda don't run in the enclosing coroutine
+        in_coroutine, self._in_coroutine = self._in_coroutine, False
+        self.generic_visit(node)
+        self._in_coroutine = in_coroutine
+
+    def visit_Call(self, node: ast.Call) -> None:
+        name = _call_name(node)
+        keywords = {keyword.arg: keyword.value for keyword in node.keywords}
+
+        if name in PYTHON_DANGEROUS_CALLS:
+            risk, message = PYTHON_DANGEROUS_CALLS[name]
+            self.add(node, Categories.SECURITY, risk, message)
+        elif name.startswith("subprocess.") and _is_true(keywords.get("shell")):
+            self.add(
+                node,
+                Categories.SECURITY,
+                SecurytyLevel.HIGH,
+                "subprocess with shell=True, pass a list of arguments instead",
+            )
+        elif name == "yaml.load" and "Loader" not in keywords and len(node.args) < 2:
+            self.add(
+                node,
+                Categories.SECURITY,
+                SecurytyLevel.MEDIUM,
+                "yaml.load() without a Loader, use yaml.safe_load()",
+            )
+        elif (
+            name.endswith(".execute") and node.args and _is_dynamic_string(node.args[0])
+        ):
+            self.add(
+                node,
+                Categories.SECURITY,
+                SecurytyLevel.MEDIUM,
+                "SQL built from strings, use parameterized queries",
+            )
+        elif _is_false(keywords.get("verify")) and name.startswith("requests."):
+            self.add(
+                node,
+                Categories.SECURITY,
+                SecurytyLevel.MEDIUM,
+                "TLS certificate verification is disabled",
+            )
+
+        if self._in_coroutine and name in PYTHON_BLOCKING_CALLS:
+            self.add(
+                node,
+                Categories.PERFORMANCE,
+                SecurytyLevel.NONE,
+                f"{name}() blocks the event loop inside a coroutine",
+            )
+
+        if (
+            name == "range"
+            and len(node.args) == 1
+            and isinstance(node.args[0], ast.Call)
+            and _call_name(node.args[0]) == "len"
+        ):
+            self.add(
+                node,
+                Categories.SYNTAX,
+                SecurytyLevel.NONE,
+                "range(len(...)), iterate directly or use enumerate()",
+            )
+
+        self.generic_visit(node)
+
+    def visit_ExceptHandler(self, node: ast.ExceptHandler) -> None:
+        if node.type is None:
+            self.add(
+                node,
+                Categories.SYNTAX,
+                SecurytyLevel.NONE,
+                "Bare except also catches KeyboardInterrupt and SystemExit",
+            )
+        elif len(node.body) == 1 and isinstance(node.body[0], ast.Pass):
+            self.add(
+                node,
+                Categories.SYNTAX,
+                SecurytyLevel.NONE,
+                "Errors are silently swallowed",
+            )
+        self.generic_visit(node)
+
+    def visit_ImportFrom(self, node: ast.ImportFrom) -> None:
+        if any(alias.name == "*" for alias in node.names):
+            self.add(
+                node,
+                Categories.SYNTAX,
+                SecurytyLevel.NONE,
+                f"Wildcard import from {node.module}, import names explicitly",
+            )
+
+    def visit_Compare(self, node: ast.Compare) -> None:
+        if any(
+            isinstance(op, (ast.Eq, ast.NotEq))
+            and isinstance(comparator, ast.Constant)
+            and comparator.value is None
+            for op, comparator in zip(node.ops, node.comparators)
+        ):
+            self.add(
+                node,
+                Categories.SYNTAX,
+                SecurytyLevel.NONE,
+                "Comparison to None with ==, use 'is None'",
+            )
+        self.generic_visit(node)
+
+
+def _call_name(node: ast.Call) -> str:
+    """Dotted name of the called function, e.g. os.system, or '' if unknown"""
+    parts = []
+    func = node.func
+    while isinstance(func, ast.Attribute):
+        parts.append(func.attr)
+        func = func.value
+    if isinstance(func, ast.Name):
+        parts.append(func.id)
+    elif parts:
+        parts.append("")  # e.g. a method of a call result: ().execute
+    return ".".join(reversed(parts))
+
+
+def _is_true(node: Optional[ast.AST]) -> bool:
+    return isinstance(node, ast.Constant) and node.value is True
+
+
+def _is_false(node: Optional[ast.AST]) -> bool:
+    return isinstance(node, ast.Constant) and node.value is False
+
+
+def _is_dynamic_string(node: ast.AST) -> bool:
+    """An f-string, concatenation, % formatting or .format() call"""
+    if isinstance(node, ast.JoinedStr):
+        return any(isinstance(value, ast.FormattedValue) for value in node.values)
+    if isinstance(node, ast.BinOp) and isinstance(node.op, (ast.Add, ast.Mod)):
+        return True
+    return isinstance(node, ast.Call) and _call_name(node).endswith(".format")
+
+
+def _analyze_generic(code: str, language: str) -> Tuple[List[Finding], CodeMetrics]:
+    """Regex checks and complexity numbers over the code without comments"""
+    compacted = compact_code(code, language)
+    findings: List[Finding] = []
+    nesting = 0
+    max_nesting = 0
+
+    for index, line in enumerate(compacted.code.split("\n")):
+        original_line = compacted.line_map[index] if compacted.line_map else index + 1
+        for pattern, category, risk, message in GENERIC_CHECKS:
+            if pattern.search(line):
+                findings.append(Finding(category, risk, original_line, message))
+        for char in line:
+            if char == "{":
+                nesting += 1
+                max_nesting = max(max_nesting, nesting)
+            elif char == "}":
+                nesting = max(nesting - 1, 0)
+
+    functions = len(GENERIC_FUNCTION_PATTERN.findall(compacted.code))
+    metrics = CodeMetrics(
+        lines=len(compacted.line_map),
+        functions=functions,
+        max_complexity=1 + len(GENERIC_DECISION_PATTERN.findall(compacted.code)),
+        most_complex=None,
+        max_nesting=max_nesting,
+    )
+    return findings, metrics
@@ -0,0 +1,39 @@
+import re
+
+# Runs a BPE tokenizer (cl100k/o200k style) usually keeps or merges together
+TOKEN_PIECE_PATTERN = re.compile(r"[A-Za-z]+|\d+|[^\w\s]|_+|\n|[ \t]+|\S")
+
+# Average characters per token of letter runs (identifiers, keywords, words)
+LETTERS_PER_TOKEN = 5
+DIGITS_PER_TOKEN = 3
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    Estimate the number of tokens of a prompt, without a tokenizer
+
+    Approximates BPE tokenizers on code: letter runs cost one token per
+    LETTERS_PER_TOKEN characters, numbers one per three digits, every
+    punctuation character and newline one token, and whitespace between
+    words is merged into the following word. It tends to overestimate
+    slightly, which is the safe side for a budget.
+
+    Args:
+        text: Prompt text
+
+    Returns:
+        Estimated token count
+    """
+    tokens = 0
+    for piece in TOKEN_PIECE_PATTERN.findall(text):
+        first = piece[0]
+        if first.isalpha():
+            tokens += -(-len(piece) // LETTERS_PER_TOKEN)
+        elif first.isdigit():
+            tokens += -(-len(piece) // DIGITS_PER_TOKEN)
+        elif first in " \t":
+            # A single space is merged into the next word, indentation is not
+            tokens += len(piece) > 1
+        else:
+            tokens += 1
+    return tokens
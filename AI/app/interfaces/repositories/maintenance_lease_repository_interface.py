@@ -0,0 +1,16 @@
+from typing import Protocol
+
+
+class MaintenanceLeaseRepositoryInterface(Protocol):
+    """Interface for the maintenance lease repository - agnostic to database implementation"""
+
+    async def acquire(self, name: str, owner: str, duration_seconds: float) -> bool:
+        """
+        Take the lease of a maintenance job for duration_seconds if it is free or
+        expired, returns False while another owner holds it
+        """
+        pass
+
+    async def release(self, name: str, owner: str) -> None:
+        """Give up a lease held by owner before it expires"""
+        pass
@@ -0,0 +1,28 @@
+from datetime import datetime
+from typing import Optional, Protocol
+
+from app.core.models.review import CodeReviewIAResponse
+
+
+class ReviewCacheRepositoryInterface(Protocol):
+    """Interface for the review cache repository - agnostic to database implementation"""
+
+    async def get(self, key: str) -> Optional[CodeReviewIAResponse]:
+        """Find a cached review by key and record the hit"""
+        pass
+
+    async def set(
+        self,
+        key: str,
+        language: str,
+        model: str,
+        prompt_version: str,
+        code_review: CodeReviewIAResponse,
+        expires_at: datetime,
+    ) -> None:
+        """Store (or refresh) a cached review"""
+        pass
+
+    async def evict(self, max_entries: int) -> int:
+        """Remove the least recently used entries above max_entries, returns how many"""
+        pass
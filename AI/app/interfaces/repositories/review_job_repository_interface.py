@@ -0,0 +1,112 @@
+from typing import Dict, List, Optional, Protocol
+
+from app.core.models.review_job import ReviewJob
+
+
+class ReviewJobRepositoryInterface(Protocol):
+    """Interface for the review job queue - agnostic to database implementation"""
+
+    async def enqueue(self, job: ReviewJob) -> ReviewJob:
+        """Persist a new job so that any worker can claim it"""
+        pass
+
+    async def enqueue_many(self, jobs: List[ReviewJob]) -> List[ReviewJob]:
+        """Persist many jobs with a single write, held jobs wait for release_batch"""
+        pass
+
+    async def release_batch(self, batch_id: str, concurrency: int) -> int:
+        """
+        Queue held jobs of a batch until concurrency of its jobs are queued or
+        leased. Returns how many jobs were released.
+        """
+        pass
+
+    async def attach(
+        self, fingerprint: str, review_ids: List[str], max_reviews: int
+    ) -> Optional[ReviewJob]:
+        """
+        Atomically add reviews to the in-flight (queued, held or leased) job with
+        the given fingerprint, so that the job's result also completes them.
+        Returns the job, None if there is no such job or it can't take them
+        without completing more than max_reviews other reviews.
+        """
+        pass
+
+    async def close_coalescing(
+        self, job_id: str, worker_id: str
+    ) -> Optional[ReviewJob]:
+        """
+        Stop attaching reviews to a job owned by worker_id. Returns the job with
+        its final coalesced reviews.
+        """
+        pass
+
+    async def cancel(self, review_id: str) -> Optional[ReviewJob]:
+        """
+        Atomically cancel the in-flight (queued, held or leased) job of a
+        review, unless reviews are coalesced with it and still need its result.
+        Returns the cancelled job, None if there was nothing to cancel.
+        """
+        pass
+
+    async def find_cancelled(self, job_ids: List[str]) -> List[str]:
+        """Ids of the given jobs that were cancelled"""
+        pass
+
+    async def find_by_review(self, review_id: str) -> List[ReviewJob]:
+        """Find the jobs of a review, including jobs it is coalesced with"""
+        pass
+
+    async def fail_expired(self, job_id: str, error: str) -> bool:
+        """
+        Mark a job as failed if its lease expired with no attempts left, so no
+        worker will ever reclaim it
+        """
+        pass
+
+    async def claim(self, worker_id: str, lease_seconds: int) -> Optional[ReviewJob]:
+        """
+        Atomically lease the oldest available job.
+
+        A job is available when it is queued and its available_at is due, or when
+        it is leased but the lease (visibility timeout) already expired.
+        """
+        pass
+
+    async def claim_by_id(
+        self, job_id: str, worker_id: str, lease_seconds: int
+    ) -> Optional[ReviewJob]:
+        """Atomically lease a given job, only if it is still available"""
+        pass
+
+    async def find_claimable(self, per_user: int, max_users: int) -> List[ReviewJob]:
+        """
+        Available jobs to schedule: the per_user oldest ones of each user, for
+        the max_users users waiting the longest
+        """
+        pass
+
+    async def count_in_flight_by_user(self) -> Dict[str, int]:
+        """Number of jobs of every user currently leased by a worker"""
+        pass
+
+    async def extend_lease(
+        self, job_id: str, worker_id: str, lease_seconds: int
+    ) -> bool:
+        """Extend the lease of a job still owned by worker_id"""
+        pass
+
+    async def ack(self, job_id: str, worker_id: str) -> bool:
+        """Mark a job owned by worker_id as done"""
+        pass
+
+    async def nack(
+        self, job_id: str, worker_id: str, error: str, retry_delay_seconds: int
+    ) -> Optional[ReviewJob]:
+        """
+        Release a failed job owned by worker_id.
+
+        The job is re-queued after retry_delay_seconds while it still has attempts
+        left, otherwise it is marked as failed. Returns the updated job.
+        """
+        pass
@@ -1,7 +1,7 @@
 from datetime import datetime
 from typing import List, Optional, Protocol
 
-from app.core.models.review import Review
+from app.core.models.review import Review, ReviewSignature
 
 
 class ReviewRepositoryInterface(Protocol):
@@ -15,6 +15,10 @@ class ReviewRepositoryInterface(Protocol):
         """Create a new review"""
         pass
 
+    async def create_many(self, reviews: List[Review]) -> List[Review]:
+        """Create many reviews with a single write"""
+        pass
+
     async def update(self, review: Review) -> Review:
         """Update an existing review"""
         pass
@@ -23,6 +27,13 @@ class ReviewRepositoryInterface(Protocol):
         """Delete a review by ID"""
         pass
 
+    async def cancel(self, review_id: str) -> Optional[Review]:
+        """
+        Atomically mark a pending or in progress review as cancelled. Returns
+        the cancelled review, None if it doesn't exist or already finished.
+        """
+        pass
+
     async def find_by_user(self, user_id: str) -> List[Review]:
         """Find all reviews by user ID"""
         pass
@@ -44,3 +55,44 @@ class ReviewRepositoryInterface(Protocol):
     ) -> List[Review]:
         """Find reviews by user with optional filters"""
         pass
+
+    async def find_overdue(
+        self, now: datetime, created_before: datetime, limit: int
+    ) -> List[Review]:
+        """
+        Find pending or in progress reviews past their deadline, or without a
+        deadline and created before created_before
+        """
+        pass
+
+    async def extend_deadline(
+        self,
+        review_id: str,
+        current_deadline: Optional[datetime],
+        deadline_at: datetime,
+    ) -> bool:
+        """
+        Atomically move the deadline of a review, only if it is still
+        current_deadline. Returns False if another process moved it first.
+        """
+        pass
+
+    async def set_minhash_signature(
+        self, review_id: str, signature: bytes, model: str, prompt_version: str
+    ) -> None:
+        """Store the MinHash signature of a review completed by a model and prompt"""
+        pass
+
+    async def find_minhash_signatures(
+        self,
+        model: str,
+        prompt_version: str,
+        indexed_after: Optional[datetime] = None,
+        limit: Optional[int] = None,
+    ) -> List[ReviewSignature]:
+        """
+        Find signatures of reviews by a model and prompt, optionally only the
+        ones indexed after indexed_after, or only the limit most recent ones.
+        Oldest first.
+        """
+        pass
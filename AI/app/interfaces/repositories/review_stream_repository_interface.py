@@ -0,0 +1,21 @@
+from typing import List, Protocol
+
+from app.core.models.review import ReviewStreamEvent
+
+
+class ReviewStreamRepositoryInterface(Protocol):
+    """Interface for the review stream repository - agnostic to database implementation"""
+
+    async def append(self, events: List[ReviewStreamEvent]) -> bool:
+        """Store events of a review stream, False when a seq is already taken"""
+        pass
+
+    async def find_after(
+        self, review_id: str, after_seq: int, limit: int = 500
+    ) -> List[ReviewStreamEvent]:
+        """Find events of a review with seq greater than after_seq, in order"""
+        pass
+
+    async def last_seq(self, review_id: str) -> int:
+        """Get the seq of the last event of a review, 0 if it has none"""
+        pass
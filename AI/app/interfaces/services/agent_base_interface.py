@@ -1,4 +1,4 @@
-from typing import Any, Optional, Protocol
+from typing import Any, Callable, Optional, Protocol
 
 
 class AgentBaseInterface(Protocol):
@@ -30,3 +30,70 @@ class AgentBaseInterface(Protocol):
             str: The response from the agent
         """
         raise NotImplementedError
+
+    async def achat(
+        self,
+        prompt: str,
+        temperature: Optional[float] = None,
+        output_json: Optional[Any] = None,
+        output_pydantic: Optional[Any] = None,
+    ) -> str:
+        """
+        Send a message to the agent and get a response without blocking the event loop.
+
+        Args:
+            prompt: The message to send to the agent
+            temperature: Controls randomness in the response
+            output_json: Optional JSON output format
+            output_pydantic: Optional Pydantic model output
+
+        Returns:
+            str: The response from the agent
+        """
+        raise NotImplementedError
+
+    def stream_chat(
+        self,
+        prompt: str,
+        on_token: Callable[[str], None],
+        temperature: Optional[float] = None,
+        output_json: Optional[Any] = None,
+    ) -> str:
+        """
+        Send a message to the agent and stream the response as it is generated.
+
+        Args:
+            prompt: The message to send to the agent
+            on_token: Called with every chunk of text as soon as it is received
+            temperature: Controls randomness in the response
+            output_json: Optional JSON output format
+
+        Returns:
+            str: The full response from the agent
+        """
+        raise NotImplementedError
+
+    async def astream_chat(
+        self,
+        prompt: str,
+        on_token: Callable[[str], None],
+        temperature: Optional[float] = None,
+        output_json: Optional[Any] = None,
+    ) -> str:
+        """
+        Stream the response to a message without blocking the event loop.
+
+        Args:
+            prompt: The message to send to the agent
+            on_token: Called with every chunk of text as soon as it is received
+            temperature: Controls randomness in the response
+            output_json: Optional JSON output format
+
+        Returns:
+            str: The full response from the agent
+        """
+        raise NotImplementedError
+
+    def reset(self) -> None:
+        """Clear any conversation state so the agent can be reused for a new prompt"""
+        raise NotImplementedError
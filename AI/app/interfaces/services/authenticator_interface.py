@@ -1,5 +1,5 @@
 from datetime import timedelta
-from typing import Optional, Protocol
+from typing import Any, Dict, Optional, Protocol, Tuple
 
 from app.core.models.user import TokenData, User
 
@@ -11,11 +11,11 @@ class AuthenticatorInterface(Protocol):
         """Authenticate a user with username and password"""
         pass
 
-    def verify_password(self, plain_password: str, hashed_password: str) -> bool:
+    async def verify_password(self, plain_password: str, hashed_password: str) -> bool:
         """Verify a password against its hash"""
         pass
 
-    def get_password_hash(self, password: str) -> str:
+    async def get_password_hash(self, password: str) -> str:
         """Hash a password"""
         pass
 
@@ -25,6 +25,14 @@ class AuthenticatorInterface(Protocol):
         """Create a JWT access token"""
         pass
 
+    async def create_refresh_token(self, user: User, family: str) -> str:
+        """Create a refresh token of a login"""
+        pass
+
+    async def rotate_refresh_token(self, refresh_token: str) -> Tuple[User, str]:
+        """Use a refresh token, returns its user and login family"""
+        pass
+
     async def verify_token(self, token: str) -> TokenData:
         """Verify and decode a JWT token"""
         pass
@@ -41,6 +49,8 @@ class AuthenticatorInterface(Protocol):
         """Add a token to the blacklist"""
         pass
 
-    async def is_token_blacklisted(self, token: str) -> bool:
-        """Check if a token is blacklisted"""
+    async def is_token_blacklisted(
+        self, token: str, claims: Optional[Dict[str, Any]] = None
+    ) -> bool:
+        """Check if a token is blacklisted, given its claims once verified"""
         pass
@@ -0,0 +1,24 @@
+from datetime import datetime
+from typing import Dict, List, Protocol
+
+from app.core.models.review_job import ReviewJob
+
+
+class ReviewSchedulerInterface(Protocol):
+    """Interface deciding which available review job a worker should run next"""
+
+    candidates_per_user: int  # Jobs of each user to consider
+    max_users: int  # Users to consider, the ones waiting the longest
+
+    def order(
+        self,
+        candidates: List[ReviewJob],
+        in_flight: Dict[str, int],
+        now: datetime,
+        limit: int,
+    ) -> List[ReviewJob]:
+        """
+        Up to limit candidates in the order they should be claimed, given the
+        number of jobs of every user already running
+        """
+        pass
@@ -11,6 +11,8 @@ from app.infrastructure.api.main_routes import MainRoutes
 from app.infrastructure.db.main import close_database_connection, initialize_database
 from app.infrastructure.dependencies import limiter
 from app.infrastructure.logger import logger
+from app.infrastructure.services.password_hasher import PasswordHasher
+from app.infrastructure.services.token_revocations import TokenRevocations
 
 settings = Settings()
 
@@ -21,6 +23,8 @@ async def lifespan(app: FastAPI):
     try:
         # Initialize database connection using the centralized database module
         await initialize_database()
+        # Revoked tokens are checked in memory on every authenticated request
+        await TokenRevocations().refresh()
 
         main_routes = MainRoutes()
         app.include_router(
@@ -44,6 +48,7 @@ async def lifespan(app: FastAPI):
 
     # Shutdown
     try:
+        PasswordHasher().shutdown(wait=False)
         await close_database_connection()
     except Exception as e:
         logger.error(f"Error during shutdown: {str(e)}")
@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Test module for the agent executor.
+Tests that blocking agent calls run off the event loop with bounded concurrency.
+"""
+
+import asyncio
+import threading
+import time
+
+import pytest
+
+from app.infrastructure.services.agent_executor import AgentExecutor
+
+
+@pytest.mark.asyncio
+class TestAgentExecutor:
+    """Tests for the bounded agent thread pool."""
+
+    async def test_blocking_call_does_not_block_event_loop(self):
+        """The event loop keeps running while a blocking call is in flight."""
+        executor = AgentExecutor()
+        ticks = 0
+
+        async def ticker():
+            nonlocal ticks
+            while True:
+                ticks += 1
+                await asyncio.sleep(0.01)
+
+        ticker_task = asyncio.create_task(ticker())
+        result = await executor.run(lambda: time.sleep(0.2) or "done")
+        ticker_task.cancel()
+
+        assert result == "done"
+        assert ticks > 5
+
+    async def test_concurrency_is_bounded(self):
+        """No more than max_concurrency calls run at the same time."""
+        executor = AgentExecutor()
+        lock = threading.Lock()
+        running = 0
+        peak = 0
+
+        def blocking_call():
+            nonlocal running, peak
+            with lock:
+                running += 1
+                peak = max(peak, running)
+            time.sleep(0.05)
+            with lock:
+                running -= 1
+
+        await asyncio.gather(
+            *(executor.run(blocking_call) for _ in range(executor.max_concurrency * 2))
+        )
+
+        assert peak <= executor.max_concurrency
+        stats = executor.stats()
+        assert stats["in_flight"] == 0
+        assert stats["queued"] == 0
+        assert stats["max_queued"] >= executor.max_concurrency
+
+    async def test_errors_are_propagated_and_counted(self):
+        """Exceptions raised by the call reach the caller."""
+        executor = AgentExecutor()
+        before = executor.stats()
+
+        def failing_call():
+            raise RuntimeError("provider down")
+
+        with pytest.raises(RuntimeError):
+            await executor.run(failing_call)
+
+        assert executor.stats()["failed"] == before["failed"] + 1
+        assert executor.stats()["completed"] == before["completed"]
+
+    async def test_cancelled_call_keeps_its_slot(self, monkeypatch):
+        """The thread of a cancelled call holds its slot until it returns."""
+        executor = AgentExecutor()
+        monkeypatch.setattr(executor, "max_concurrency", 1)
+        monkeypatch.setattr(executor, "_semaphore", None)
+        release = threading.Event()
+
+        first = asyncio.create_task(executor.run(release.wait))
+        await asyncio.sleep(0.05)
+        first.cancel()
+        second = asyncio.create_task(executor.run(lambda: "second"))
+        await asyncio.sleep(0.1)
+        assert not second.done()
+        assert executor.stats()["in_flight"] == 1
+
+        release.set()
+        assert await second == "second"
+        assert executor.stats()["in_flight"] == 0
@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""
+Test module for the agent pool.
+Tests that agents are reused, bounded per key and evicted when idle.
+"""
+
+import asyncio
+from unittest.mock import MagicMock
+
+import pytest
+
+from app.infrastructure.services.agent_pool import AgentPool
+
+
+@pytest.fixture
+def agent_pool():
+    """Agent pool building mock agents instead of real LLM clients."""
+    pool = AgentPool()
+    pool.agent_factory = MagicMock(side_effect=lambda instructions: MagicMock())
+    pool._buckets.clear()
+    return pool
+
+
+@pytest.mark.asyncio
+class TestAgentPool:
+    """Tests for agent reuse in the pool."""
+
+    async def test_agent_is_reused_for_same_instructions(self, agent_pool):
+        """A returned agent is handed out again for the same instructions."""
+        async with agent_pool.acquire("review python", "python") as first:
+            pass
+        async with agent_pool.acquire("review python", "python") as second:
+            pass
+
+        assert first is second
+        first.reset.assert_called()
+        assert agent_pool.agent_factory.call_count == 1
+
+    async def test_pool_size_is_bounded(self, agent_pool, monkeypatch):
+        """Callers wait for a free agent once the pool is full."""
+        monkeypatch.setattr(agent_pool.settings, "AGENT_POOL_SIZE", 2)
+        monkeypatch.setattr(agent_pool.settings, "AGENT_POOL_SIZES", "")
+
+        async def use_agent():
+            async with agent_pool.acquire("review go", "go"):
+                await asyncio.sleep(0.01)
+
+        await asyncio.gather(*(use_agent() for _ in range(6)))
+
+        assert agent_pool.agent_factory.call_count == 2
+
+    async def test_failed_agent_is_discarded(self, agent_pool):
+        """An agent whose call raised is not returned to the pool."""
+        with pytest.raises(RuntimeError):
+            async with agent_pool.acquire("review rust", "rust") as broken:
+                raise RuntimeError("provider down")
+
+        async with agent_pool.acquire("review rust", "rust") as agent:
+            assert agent is not broken
+
+    async def test_idle_agents_are_evicted(self, agent_pool, monkeypatch):
+        """Agents idle past the timeout are dropped from the pool."""
+        monkeypatch.setattr(agent_pool.settings, "AGENT_POOL_IDLE_TIMEOUT", -1)
+
+        async with agent_pool.acquire("review java", "java"):
+            pass
+
+        assert agent_pool.stats()["agents"] == 0
@@ -0,0 +1,233 @@
+#!/usr/bin/env python3
+"""
+Test module for chunked reviews of large submissions.
+Tests splitting code at definition boundaries, reviewing chunks and merging their reviews.
+"""
+
+from contextlib import asynccontextmanager
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from app.core.models.review import (
+    Categories,
+    CodeReviewIAResponse,
+    Review,
+    SecurityAssessment,
+    SecurytyLevel,
+)
+from app.infrastructure.jobs.tasks import IATasks
+from app.infrastructure.utils.code_chunker import CodeChunk, split_code
+from app.infrastructure.utils.review_merge import merge_chunk_reviews
+
+PYTHON_CODE = """import os
+
+
+def first():
+    return os.getcwd()
+
+
+@staticmethod
+def second():
+    return 2
+
+
+class Third:
+    def method(self):
+        return 3
+
+    def other(self):
+        return 4
+"""
+
+JS_CODE = """const x = 1;
+
+function first() {
+  if (x) {
+    return 1;
+  }
+}
+
+function second() {
+  return 2;
+}
+"""
+
+
+def review(score, risk=SecurytyLevel.NONE, concerns=(), category=Categories.SYNTAX):
+    return CodeReviewIAResponse(
+        overall_score=score,
+        category=category,
+        security_assessment=SecurityAssessment(
+            risk_level=risk, concerns=list(concerns)
+        ),
+        suggestions=f"score {score}",
+    )
+
+
+class TestSplitCode:
+    """Tests for splitting submissions at function/class boundaries."""
+
+    def test_small_code_is_one_chunk(self):
+        """Code under the limit is not split."""
+        assert split_code(PYTHON_CODE, "python", 10_000) == [
+            CodeChunk(1, 18, PYTHON_CODE)
+        ]
+
+    def test_chunks_cover_the_whole_submission(self):
+        """Joining the chunks gives back the submission."""
+        for code, language in ((PYTHON_CODE, "python"), (JS_CODE, "javascript")):
+            chunks = split_code(code, language, 40)
+            assert len(chunks) > 1
+            assert "".join(chunk.code for chunk in chunks) == code
+
+    def test_python_splits_at_definitions(self):
+        """Decorators stay with their function and methods can be split."""
+        chunks = split_code(PYTHON_CODE, "python", 40)
+        starts = [chunk.code.splitlines()[0] for chunk in chunks]
+        assert "@staticmethod" in starts
+        assert "    def other(self):" in starts
+
+    def test_braces_are_not_split(self):
+        """Heuristic boundaries are only taken outside brace blocks."""
+        chunks = split_code(JS_CODE, "javascript", 80)
+        assert [chunk.start_line for chunk in chunks] == [1, 9]
+
+    def test_form_feeds_dont_shift_lines(self):
+        """Chunks start at definitions when the code contains form feeds."""
+        code = "def first():\n    return 1\n\x0cdef second():\n    return 2\n"
+        chunks = split_code(code, "python", 30)
+        assert [(chunk.start_line, chunk.end_line) for chunk in chunks] == [
+            (1, 2),
+            (3, 4),
+        ]
+        assert chunks[1].code == "\x0cdef second():\n    return 2\n"
+
+    def test_oversized_definition_is_split_by_lines(self):
+        """A definition larger than a chunk is split by lines."""
+        code = "def big():\n" + "    x = 1\n" * 20
+        chunks = split_code(code, "python", 50)
+        assert all(len(chunk.code) <= 50 for chunk in chunks)
+        assert "".join(chunk.code for chunk in chunks) == code
+
+
+class TestMergeChunkReviews:
+    """Tests for merging chunk reviews into one review."""
+
+    def test_score_is_weighted_by_chunk_size(self):
+        """Bigger chunks weigh more in the overall score."""
+        merged = merge_chunk_reviews(
+            [
+                (CodeChunk(1, 30, "x" * 300), review(8)),
+                (CodeChunk(31, 40, "x" * 100), review(4)),
+            ]
+        )
+        assert merged.overall_score == 7
+        assert merged.suggestions.startswith("Lines 1-30: score 8")
+
+    def test_high_risk_takes_the_lowest_score(self):
+        """A high risk chunk sinks the score and concerns are merged."""
+        merged = merge_chunk_reviews(
+            [
+                (CodeChunk(1, 30, "x" * 300), review(9, concerns=["eval"])),
+                (
+                    CodeChunk(31, 40, "x" * 100),
+                    review(
+                        3,
+                        SecurytyLevel.HIGH,
+                        ["eval", "sql injection"],
+                        Categories.SECURITY,
+                    ),
+                ),
+            ]
+        )
+        assert merged.overall_score == 3
+        assert merged.category == Categories.SECURITY
+        assert merged.security_assessment.risk_level == SecurytyLevel.HIGH
+        assert merged.security_assessment.concerns == ["eval", "sql injection"]
+
+
+@pytest.fixture
+def ia_tasks(mock_review_repository, monkeypatch):
+    """Review tasks splitting PYTHON_CODE in chunks, with mocked caches."""
+    mock_review_repository.find_by_id.return_value = Review(
+        id="review_id",
+        user="test_user_id",
+        language="python",
+        code_submission=PYTHON_CODE,
+    )
+    tasks = IATasks(mock_review_repository, AsyncMock(), AsyncMock())
+    tasks.review_cache = AsyncMock()
+    tasks.review_cache.get.return_value = None
+    tasks.near_duplicates = AsyncMock()
+    tasks.near_duplicates.compute_signature.return_value = None
+    tasks.review_stream = AsyncMock()
+    monkeypatch.setattr(tasks.settings, "REVIEW_CHUNKING_ENABLED", True)
+    monkeypatch.setattr(tasks.settings, "REVIEW_CHUNK_MAX_CHARS", 60)
+    monkeypatch.setattr(tasks.settings, "REVIEW_CHUNK_PARSE_RETRIES", 1)
+    return tasks
+
+
+def chunk_agent(tasks, responses):
+    """Agent answering each chunk with its next response, by a word of the chunk."""
+
+    async def achat(prompt, **kwargs):
+        word = next(word for word in responses if word in prompt)
+        return responses[word].pop(0)
+
+    agent = MagicMock()
+    agent.achat = achat
+
+    @asynccontextmanager
+    async def acquire(instructions, language):
+        yield agent
+
+    tasks.agent_pool = MagicMock()
+    tasks.agent_pool.acquire = acquire
+
+
+@pytest.mark.asyncio
+class TestChunkedReview:
+    """Tests for reviewing a submission in chunks."""
+
+    async def test_unparseable_chunk_is_resent(self, ia_tasks, mock_review_repository):
+        """A chunk whose review can't be parsed is asked for again."""
+        valid = review(8).model_dump_json()
+        chunk_agent(
+            ia_tasks,
+            {
+                "first": [valid],
+                "second": ["not json", valid],
+                "Third": [valid],
+                "other": [valid],
+            },
+        )
+
+        await ia_tasks.process_review_with_agent("review_id", PYTHON_CODE, "python")
+
+        updated_review = mock_review_repository.update.await_args[0][0]
+        assert updated_review.status == "completed"
+        assert updated_review.timings.llm_calls == 5
+        ia_tasks.review_cache.set.assert_awaited_once()
+
+    async def test_unreviewed_chunk_rejects_the_review(
+        self, ia_tasks, mock_review_repository
+    ):
+        """A merge missing some lines is neither completed nor cached."""
+        valid = review(8).model_dump_json()
+        chunk_agent(
+            ia_tasks,
+            {
+                "first": [valid],
+                "second": ["not json"] * 2,
+                "Third": [valid],
+                "other": [valid],
+            },
+        )
+
+        await ia_tasks.process_review_with_agent("review_id", PYTHON_CODE, "python")
+
+        updated_review = mock_review_repository.update.await_args[0][0]
+        assert updated_review.status == "rejected"
+        assert updated_review.code_review is None
+        ia_tasks.review_cache.set.assert_not_awaited()
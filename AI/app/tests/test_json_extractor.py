@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+Test module for tolerant JSON extraction of LLM review responses.
+Tests finding the review object in noisy output and repairing common defects.
+"""
+
+from app.core.models.review import Categories, CodeReviewIAResponse, SecurytyLevel
+from app.infrastructure.utils.json_extractor import (
+    extract_json_object,
+    parse_code_review,
+)
+
+REVIEW = (
+    '{"overall_score": 8, "category": "security", '
+    '"security_assessment": {"risk_level": "low", "concerns": []}, '
+    '"suggestions": "Validate inputs", "refactored_example": null}'
+)
+
+
+class TestExtractJsonObject:
+    """Test cases for extract_json_object"""
+
+    def test_plain_object(self):
+        assert extract_json_object('{"a": 1}') == {"a": 1}
+
+    def test_object_surrounded_by_prose_and_fences(self):
+        text = 'Sure! Here is the review:\n```json\n{"a": {"b": [1, 2]}}\n```\nThanks'
+        assert extract_json_object(text) == {"a": {"b": [1, 2]}}
+
+    def test_braces_inside_strings_are_ignored(self):
+        assert extract_json_object('{"a": "x } y {", "b": 2} tail }') == {
+            "a": "x } y {",
+            "b": 2,
+        }
+
+    def test_skips_candidates_that_are_not_json(self):
+        assert extract_json_object('use {braces} like {"a": 1}') == {"a": 1}
+
+    def test_trailing_commas(self):
+        assert extract_json_object('{"a": [1, 2, ], "b": 3,\n}') == {
+            "a": [1, 2],
+            "b": 3,
+        }
+
+    def test_raw_newlines_in_strings(self):
+        assert extract_json_object('{"a": "line 1\nline 2\tend"}') == {
+            "a": "line 1\nline 2\tend"
+        }
+
+    def test_python_literals(self):
+        assert extract_json_object('{"a": True, "b": None, "c": "True"}') == {
+            "a": True,
+            "b": None,
+            "c": "True",
+        }
+
+    def test_truncated_inside_string(self):
+        assert extract_json_object('{"a": {"b": "cut') == {"a": {"b": "cut"}}
+
+    def test_truncated_after_key_or_colon(self):
+        assert extract_json_object('{"a": 1, "suggest') == {"a": 1}
+        assert extract_json_object('{"a": 1, "b":') == {"a": 1, "b": None}
+        assert extract_json_object('{"a": [1, 2,') == {"a": [1, 2]}
+
+    def test_no_object(self):
+        assert extract_json_object("I can't review this code") is None
+        assert extract_json_object("") is None
+
+
+class TestParseCodeReview:
+    """Test cases for parse_code_review"""
+
+    def test_valid_review(self):
+        review = parse_code_review(REVIEW)
+
+        assert review.overall_score == 8
+        assert review.category == Categories.SECURITY
+        assert review.security_assessment.risk_level == SecurytyLevel.LOW
+
+    def test_model_and_dict_responses(self):
+        review = parse_code_review(REVIEW)
+
+        assert parse_code_review(review) is review
+        assert parse_code_review(review.model_dump()) == review
+
+    def test_truncated_review_with_required_fields(self):
+        review = parse_code_review(REVIEW[: REVIEW.index("Validate") + 5])
+
+        assert review.suggestions == "Valid"
+        assert review.refactored_example is None
+
+    def test_schema_slips_are_normalized(self):
+        text = (
+            '{"review": {"overall_score": "7/10", "category": "Performance", '
+            '"security_assessment": {"risk_level": "HIGH", "concerns": "SQL injection"}, '
+            '"suggestions": ["Use indexes", "Cache results"]}}'
+        )
+
+        review = parse_code_review(text)
+
+        assert isinstance(review, CodeReviewIAResponse)
+        assert review.overall_score == 7
+        assert review.category == Categories.PERFORMANCE
+        assert review.security_assessment.risk_level == SecurytyLevel.HIGH
+        assert review.security_assessment.concerns == ["SQL injection"]
+        assert review.suggestions == "Use indexes\nCache results"
+
+    def test_score_is_clamped(self):
+        review = parse_code_review(
+            REVIEW.replace('"overall_score": 8', '"overall_score": 12.4')
+        )
+
+        assert review.overall_score == 10
+
+    def test_unrecoverable_responses(self):
+        assert parse_code_review(None) is None
+        assert parse_code_review("not json") is None
+        assert parse_code_review('{"overall_score": 8}') is None
@@ -0,0 +1,254 @@
+#!/usr/bin/env python3
+"""
+Test module for LLM load balancing.
+Tests endpoint costs, concurrency limits and routing calls across a pool.
+"""
+
+import asyncio
+import random
+import uuid
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from app.config.settings import Settings
+from app.core.models.llm_endpoint import LLMEndpoint
+from app.infrastructure.services.llm_load_balancer import LLMLoadBalancer
+from app.infrastructure.services.resilient_agent import (
+    LLMUnavailableError,
+    ResilientAgent,
+)
+
+
+def endpoint(model, max_concurrency=0):
+    """Endpoint with a unique URL, so it gets fresh load stats."""
+    return LLMEndpoint(
+        model=f"groq/{model}",
+        api_model=model,
+        base_url=f"http://{uuid.uuid4().hex}",
+        max_concurrency=max_concurrency,
+    )
+
+
+@pytest.fixture
+def balancer(monkeypatch):
+    """Process load balancer with a seeded random generator."""
+    balancer = LLMLoadBalancer()
+    monkeypatch.setattr(balancer, "rng", random.Random(0))
+    return balancer
+
+
+def record(balancer, endpoint, latency, failed=False):
+    assert balancer.try_acquire(endpoint)
+    balancer.release(endpoint, latency, failed=failed)
+
+
+class TestLLMLoadBalancer:
+    """Tests for endpoint costs and slots."""
+
+    def test_faster_endpoint_goes_first(self, balancer):
+        fast, slow = endpoint("fast"), endpoint("slow")
+        record(balancer, fast, 0.5)
+        record(balancer, slow, 3.0)
+
+        for _ in range(10):
+            assert balancer.order([slow, fast]) == [fast, slow]
+
+    def test_calls_in_flight_raise_the_cost(self, balancer):
+        busy, idle = endpoint("busy"), endpoint("idle")
+        record(balancer, busy, 1.0)
+        record(balancer, idle, 1.5)
+        for _ in range(3):
+            balancer.try_acquire(busy)
+
+        assert balancer.order([busy, idle]) == [idle, busy]
+
+    def test_errors_raise_the_cost(self, balancer):
+        flaky, steady = endpoint("flaky"), endpoint("steady")
+        record(balancer, flaky, 1.0)
+        record(balancer, steady, 2.0)
+        record(balancer, flaky, None, failed=True)
+
+        assert balancer.order([flaky, steady]) == [steady, flaky]
+
+    def test_endpoints_that_only_failed_go_last(self, balancer):
+        failing, healthy = endpoint("failing"), endpoint("healthy")
+        record(balancer, failing, None, failed=True)
+        record(balancer, healthy, 2.0)
+
+        for _ in range(10):
+            assert balancer.order([failing, healthy]) == [healthy, failing]
+
+    def test_latency_is_a_moving_average(self, balancer):
+        target = endpoint("target")
+        record(balancer, target, 1.0)
+        record(balancer, target, 2.0)
+
+        stats = balancer.stats()[target.name]
+        assert stats["ewma_latency_ms"] == pytest.approx(
+            (1.0 + balancer.alpha * (2.0 - 1.0)) * 1000
+        )
+        assert stats["in_flight"] == 0
+        assert stats["calls"] == 2
+
+    def test_concurrency_limit(self, balancer):
+        limited, other = endpoint("limited", max_concurrency=2), endpoint("other")
+        record(balancer, other, 5.0)
+
+        assert balancer.try_acquire(limited)
+        assert balancer.try_acquire(limited)
+        assert not balancer.try_acquire(limited)
+        assert balancer.order([limited, other])[-1] == limited
+
+        balancer.release(limited)
+        assert balancer.try_acquire(limited)
+        assert balancer.stats()[limited.name]["saturated"] == 1
+
+    def test_power_of_two_choices_spreads_unknown_endpoints(self, balancer):
+        pool = [endpoint(f"pool-{index}") for index in range(4)]
+
+        firsts = {balancer.order(pool)[0].name for _ in range(50)}
+
+        assert len(firsts) > 1
+
+
+def pool_agent(agents, pool_size=None):
+    """Resilient agent load balancing over the given endpoint -> agent mapping."""
+    agent = ResilientAgent(
+        list(agents),
+        lambda endpoint: agents[endpoint],
+        pool_size=pool_size or len(agents),
+    )
+    agent.base_delay = 0
+    return agent
+
+
+@pytest.mark.asyncio
+class TestBalancedResilientAgent:
+    """Tests for routing agent calls across a pool of endpoints."""
+
+    async def test_routes_to_the_fastest_endpoint(self, balancer):
+        fast, slow = endpoint("fast"), endpoint("slow")
+        record(balancer, fast, 0.2)
+        record(balancer, slow, 4.0)
+        fast_agent, slow_agent = MagicMock(), MagicMock()
+        fast_agent.achat = AsyncMock(return_value="review")
+        slow_agent.achat = AsyncMock(return_value="review")
+
+        agent = pool_agent({slow: slow_agent, fast: fast_agent})
+        for _ in range(5):
+            assert await agent.achat("code") == "review"
+
+        assert fast_agent.achat.await_count == 5
+        slow_agent.achat.assert_not_awaited()
+        assert balancer.stats()[fast.name]["in_flight"] == 0
+
+    async def test_skips_endpoints_at_their_limit(self, balancer):
+        full, spare = endpoint("full", max_concurrency=1), endpoint("spare")
+        record(balancer, full, 0.1)
+        record(balancer, spare, 5.0)
+        balancer.try_acquire(full)
+        full_agent, spare_agent = MagicMock(), MagicMock()
+        full_agent.achat = AsyncMock(return_value="full")
+        spare_agent.achat = AsyncMock(return_value="spare")
+
+        agent = pool_agent({full: full_agent, spare: spare_agent})
+
+        assert await agent.achat("code") == "spare"
+        full_agent.achat.assert_not_awaited()
+
+    async def test_waits_for_a_free_slot(self, balancer):
+        only = endpoint("only", max_concurrency=1)
+        release_slot = asyncio.Event()
+        only_agent = MagicMock()
+
+        async def achat(prompt, **kwargs):
+            await release_slot.wait()
+            return prompt
+
+        only_agent.achat = achat
+        agent = pool_agent({only: only_agent})
+
+        first = asyncio.create_task(agent.achat("first"))
+        await asyncio.sleep(0.01)
+        second = asyncio.create_task(agent.achat("second"))
+        await asyncio.sleep(0.1)
+        assert not second.done()
+
+        release_slot.set()
+        assert await first == "first"
+        assert await second == "second"
+
+    async def test_cancelled_call_frees_its_slot(self, balancer):
+        only = endpoint("only", max_concurrency=1)
+        only_agent = MagicMock()
+
+        async def achat(prompt, **kwargs):
+            await asyncio.sleep(10)
+
+        only_agent.achat = achat
+        agent = pool_agent({only: only_agent})
+
+        call = asyncio.create_task(agent.achat("code"))
+        await asyncio.sleep(0.01)
+        assert balancer.stats()[only.name]["in_flight"] == 1
+        call.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await call
+
+        assert balancer.stats()[only.name]["in_flight"] == 0
+
+    async def test_gives_up_when_no_slot_frees(self, balancer):
+        only = endpoint("only", max_concurrency=1)
+        balancer.try_acquire(only)
+        agent = pool_agent({only: MagicMock()})
+        agent.slot_timeout = 0.1
+
+        with pytest.raises(LLMUnavailableError, match="concurrency limit"):
+            await agent.achat("code")
+
+    async def test_fallbacks_are_not_balanced(self, balancer):
+        primary, fallback = endpoint("primary"), endpoint("fallback")
+        record(balancer, fallback, 0.01)
+        record(balancer, primary, 9.0)
+        primary_agent, fallback_agent = MagicMock(), MagicMock()
+        primary_agent.achat = AsyncMock(return_value="primary")
+        fallback_agent.achat = AsyncMock(return_value="fallback")
+
+        agent = pool_agent({primary: primary_agent, fallback: fallback_agent}, 1)
+
+        assert await agent.achat("code") == "primary"
+
+
+class TestLLMPool:
+    """Tests for the configured endpoint pool."""
+
+    def test_pool_entries(self, monkeypatch):
+        settings = Settings()
+        monkeypatch.setenv("SECOND_KEY", "second-secret")
+        monkeypatch.setattr(settings, "LLM_ENDPOINT_MAX_CONCURRENCY", 4)
+        monkeypatch.setattr(
+            settings,
+            "LLM_POOL",
+            "groq/llama-3.3-70b@https://api.groq.com/openai/v1@SECOND_KEY#16",
+        )
+        monkeypatch.setattr(settings, "LLM_FALLBACKS", "openai/gpt-4o-mini")
+
+        primary, second = settings.get_llm_pool()
+        endpoints = settings.get_llm_endpoints()
+
+        assert primary.max_concurrency == 4
+        assert second.base_url == "https://api.groq.com/openai/v1"
+        assert second.api_key == "second-secret"
+        assert second.max_concurrency == 16
+        assert endpoints[:2] == [primary, second]
+        assert endpoints[2].model == "openai/gpt-4o-mini"
+
+    def test_keys_of_the_same_api_are_different_endpoints(self):
+        first = LLMEndpoint(
+            model="groq/m", api_model="m", base_url="u", api_key="first-key"
+        )
+        second = first.model_copy(update={"api_key": "second-key"})
+
+        assert first.name != second.name
+        assert "first-key" not in first.name
@@ -0,0 +1,239 @@
+#!/usr/bin/env python3
+"""
+Test module for the LLM resilience layer.
+Tests retries, circuit breaking and failover to fallback endpoints.
+"""
+
+import asyncio
+import uuid
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from app.config.settings import Settings
+from app.core.models.llm_endpoint import LLMEndpoint
+from app.infrastructure.services.circuit_breaker import (
+    CLOSED,
+    HALF_OPEN,
+    OPEN,
+    CircuitBreaker,
+)
+from app.infrastructure.services.openai_compatible_agent import LLMResponseError
+from app.infrastructure.services.resilient_agent import (
+    LLMUnavailableError,
+    ResilientAgent,
+)
+
+
+def endpoint(model):
+    """Endpoint with a unique URL, so it gets a fresh circuit breaker."""
+    return LLMEndpoint(
+        model=f"groq/{model}",
+        api_model=model,
+        base_url=f"http://{uuid.uuid4().hex}",
+    )
+
+
+def resilient_agent(agents):
+    """Resilient agent over the given endpoint -> agent mapping, without backoff."""
+    agent = ResilientAgent(list(agents), lambda endpoint: agents[endpoint])
+    agent.base_delay = 0
+    return agent
+
+
+def failing(status_code):
+    return LLMResponseError(f"status {status_code}", status_code=status_code)
+
+
+class TestCircuitBreaker:
+    """Tests for the circuit breaker state machine."""
+
+    def test_opens_after_consecutive_failures(self):
+        breaker = CircuitBreaker("test", failure_threshold=2, reset_timeout=10)
+
+        breaker.record_failure()
+        breaker.record_success()
+        breaker.record_failure()
+        assert breaker.state == CLOSED
+
+        breaker.record_failure()
+        assert breaker.state == OPEN
+        assert not breaker.allow()
+
+    def test_half_open_trial_call(self):
+        now = [0.0]
+        breaker = CircuitBreaker(
+            "test", failure_threshold=1, reset_timeout=10, clock=lambda: now[0]
+        )
+        breaker.record_failure()
+        assert breaker.retry_after() == 10
+
+        now[0] = 10
+        assert breaker.allow()
+        assert breaker.state == HALF_OPEN
+        assert not breaker.allow()  # Only one trial call
+
+        breaker.record_failure()
+        assert breaker.state == OPEN
+
+        now[0] = 20
+        assert breaker.allow()
+        breaker.record_success()
+        assert breaker.state == CLOSED
+        assert breaker.allow()
+
+    def test_cancelled_trial_call(self):
+        now = [0.0]
+        breaker = CircuitBreaker(
+            "test", failure_threshold=1, reset_timeout=10, clock=lambda: now[0]
+        )
+        breaker.record_failure()
+        now[0] = 10
+        assert breaker.allow()
+
+        breaker.record_cancelled()
+        assert breaker.state == OPEN
+        assert breaker.allow()  # The next call is the trial
+        assert breaker.state == HALF_OPEN
+
+    def test_cancel_of_closed_circuit_is_ignored(self):
+        breaker = CircuitBreaker("test", failure_threshold=1, reset_timeout=10)
+
+        breaker.record_cancelled()
+
+        assert breaker.state == CLOSED
+        assert breaker.stats()["consecutive_failures"] == 0
+
+
+@pytest.mark.asyncio
+class TestResilientAgent:
+    """Tests for retrying and failing over agent calls."""
+
+    async def test_retries_transient_errors(self):
+        primary = endpoint("primary")
+        agent = MagicMock()
+        agent.achat = AsyncMock(side_effect=[failing(503), failing(429), "review"])
+
+        response = await resilient_agent({primary: agent}).achat("code")
+
+        assert response == "review"
+        assert agent.achat.await_count == 3
+
+    async def test_fails_over_to_fallback(self):
+        primary, fallback = endpoint("primary"), endpoint("fallback")
+        primary_agent, fallback_agent = MagicMock(), MagicMock()
+        primary_agent.achat = AsyncMock(side_effect=failing(500))
+        fallback_agent.achat = AsyncMock(return_value="review")
+
+        agent = resilient_agent({primary: primary_agent, fallback: fallback_agent})
+
+        assert await agent.achat("code") == "review"
+        assert primary_agent.achat.await_count == agent.max_attempts
+
+    async def test_client_errors_are_not_retried(self):
+        primary, fallback = endpoint("primary"), endpoint("fallback")
+        primary_agent, fallback_agent = MagicMock(), MagicMock()
+        primary_agent.achat = AsyncMock(side_effect=failing(400))
+        fallback_agent.achat = AsyncMock(return_value="review")
+
+        agent = resilient_agent({primary: primary_agent, fallback: fallback_agent})
+
+        with pytest.raises(LLMResponseError):
+            await agent.achat("code")
+        assert primary_agent.achat.await_count == 1
+        fallback_agent.achat.assert_not_awaited()
+
+    async def test_open_circuit_fails_fast(self):
+        primary = endpoint("primary")
+        primary_agent = MagicMock()
+        primary_agent.achat = AsyncMock(side_effect=failing(502))
+        agent = resilient_agent({primary: primary_agent})
+        agent.breakers.get(primary.name).failure_threshold = agent.max_attempts
+
+        with pytest.raises(LLMUnavailableError):
+            await agent.achat("code")
+        calls = primary_agent.achat.await_count
+
+        with pytest.raises(LLMUnavailableError) as error:
+            await agent.achat("code")
+        assert primary_agent.achat.await_count == calls
+        assert error.value.retry_after > 0
+
+    async def test_cancelled_trial_call_is_retried(self):
+        primary = endpoint("primary")
+        primary_agent = MagicMock()
+        agent = resilient_agent({primary: primary_agent})
+        breaker = agent.breakers.get(primary.name)
+        breaker.failure_threshold = 1
+        breaker.reset_timeout = 0
+        breaker.record_failure()
+
+        async def achat(prompt, **kwargs):
+            await asyncio.sleep(10)
+
+        primary_agent.achat = achat
+        call = asyncio.create_task(agent.achat("code"))
+        await asyncio.sleep(0.01)
+        assert breaker.state == HALF_OPEN
+        call.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await call
+
+        primary_agent.achat = AsyncMock(return_value="review")
+        assert await agent.achat("code") == "review"
+        assert breaker.state == CLOSED
+
+    async def test_empty_response_is_retried(self):
+        primary = endpoint("primary")
+        agent = MagicMock()
+        agent.achat = AsyncMock(side_effect=[None, "review"])
+
+        assert await resilient_agent({primary: agent}).achat("code") == "review"
+
+    async def test_stream_is_not_retried_after_first_token(self):
+        primary = endpoint("primary")
+        agent = MagicMock()
+
+        async def astream_chat(prompt, on_token, **kwargs):
+            on_token("{")
+            raise failing(503)
+
+        agent.astream_chat = astream_chat
+        tokens = []
+
+        with pytest.raises(LLMResponseError):
+            await resilient_agent({primary: agent}).astream_chat("code", tokens.append)
+        assert tokens == ["{"]
+
+    def test_sync_chat_fails_over(self):
+        primary, fallback = endpoint("primary"), endpoint("fallback")
+        primary_agent, fallback_agent = MagicMock(), MagicMock()
+        primary_agent.chat.side_effect = ConnectionError("refused")
+        fallback_agent.chat.return_value = "review"
+
+        agent = resilient_agent({primary: primary_agent, fallback: fallback_agent})
+
+        assert agent.chat("code") == "review"
+
+
+class TestLLMEndpoints:
+    """Tests for the failover order of configured endpoints."""
+
+    def test_fallbacks_follow_primary(self, monkeypatch):
+        settings = Settings()
+        monkeypatch.setenv("FALLBACK_KEY", "secret")
+        monkeypatch.setattr(
+            settings,
+            "LLM_FALLBACKS",
+            "groq/llama-3.1-8b-instant, openai/gpt-4o-mini@https://api.openai.com/v1@FALLBACK_KEY",
+        )
+
+        primary, same_provider, other_provider = settings.get_llm_endpoints()
+
+        assert primary.model == settings.llm_config["model"]
+        assert same_provider.api_model == "llama-3.1-8b-instant"
+        assert same_provider.base_url == primary.base_url
+        assert same_provider.api_key == primary.api_key
+        assert other_provider.model == "openai/gpt-4o-mini"
+        assert other_provider.base_url == "https://api.openai.com/v1"
+        assert other_provider.api_key == "secret"
@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+Test module for the maintenance scheduler.
+Tests running housekeeping jobs under a lease and reporting their runs.
+"""
+
+from unittest.mock import AsyncMock
+
+import pytest
+
+from app.infrastructure.jobs.maintenance_scheduler import MaintenanceScheduler
+from app.infrastructure.jobs.worker import ReviewWorker
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def lease_repository():
+    """Lease repository that grants every lease."""
+    repository = AsyncMock()
+    repository.acquire.return_value = True
+    return repository
+
+
+@pytest.fixture
+def maintenance(lease_repository):
+    """Scheduler with a controllable clock."""
+    return MaintenanceScheduler(lease_repository, "worker-0", clock=FakeClock())
+
+
+@pytest.mark.asyncio
+class TestMaintenanceScheduler:
+    """Tests for running maintenance jobs."""
+
+    async def test_job_runs_once_per_interval(self, maintenance, lease_repository):
+        """A job is run and reported, then skipped until its interval elapsed."""
+        cleanup = AsyncMock(return_value=7)
+        maintenance.register("blacklist_cleanup", 3600, cleanup)
+
+        assert await maintenance.run_due() == {"blacklist_cleanup": 7}
+        lease_repository.acquire.assert_awaited_once_with(
+            "blacklist_cleanup", "worker-0", 3600
+        )
+
+        maintenance.clock.now = 3599
+        assert await maintenance.run_due() == {}
+        maintenance.clock.now = 3600
+        assert await maintenance.run_due() == {"blacklist_cleanup": 7}
+
+        stats = maintenance.stats()["blacklist_cleanup"]
+        assert stats["runs"] == 2
+        assert stats["items"] == 14
+        assert stats["last_duration"] == 0
+
+    async def test_job_leased_by_another_worker(self, maintenance, lease_repository):
+        """Jobs another worker holds the lease of are not run."""
+        lease_repository.acquire.return_value = False
+        sweep = AsyncMock(return_value=1)
+        maintenance.register("review_sweep", 60, sweep)
+
+        assert await maintenance.run_due() == {}
+        assert await maintenance.run_due() == {}
+
+        sweep.assert_not_awaited()
+        assert lease_repository.acquire.await_count == 2
+
+    async def test_failing_job_doesnt_stop_the_others(self, maintenance):
+        """A failure is recorded and the next jobs still run."""
+        maintenance.register("review_sweep", 60, AsyncMock(side_effect=RuntimeError))
+        maintenance.register("review_cache_eviction", 300, AsyncMock(return_value=3))
+
+        processed = await maintenance.run_due()
+
+        assert processed == {"review_sweep": 0, "review_cache_eviction": 3}
+        assert maintenance.stats()["review_sweep"]["failures"] == 1
+        assert maintenance.stats()["review_cache_eviction"]["runs"] == 1
+
+
+@pytest.mark.asyncio
+class TestWorkerMaintenance:
+    """Tests for the maintenance jobs of the review worker."""
+
+    async def test_worker_registers_its_jobs(
+        self, mock_review_repository, lease_repository
+    ):
+        """The worker sweeps stuck reviews and compacts the cache and blacklist."""
+        worker = ReviewWorker(
+            mock_review_repository,
+            AsyncMock(),
+            AsyncMock(),
+            AsyncMock(),
+            maintenance_lease_repository=lease_repository,
+        )
+        mock_review_repository.find_overdue.return_value = []
+        worker.ia_tasks.review_cache.review_cache_repository.evict.return_value = 2
+        worker.maintenance._jobs["blacklist_cleanup"].run = AsyncMock(return_value=0)
+
+        processed = await worker.maintenance.run_due()
+
+        assert processed == {
+            "review_sweep": 0,
+            "review_cache_eviction": 2,
+            "blacklist_cleanup": 0,
+        }
+
+    def test_no_maintenance_without_leases(self, mock_review_repository):
+        """Workers built without a lease repository run no maintenance."""
+        worker = ReviewWorker(
+            mock_review_repository, AsyncMock(), AsyncMock(), AsyncMock()
+        )
+
+        assert worker.maintenance is None
@@ -0,0 +1,205 @@
+#!/usr/bin/env python3
+"""
+Test module for near-duplicate review detection.
+Tests the code tokenizer, MinHash signatures and the LSH index.
+"""
+
+from datetime import datetime
+from unittest.mock import AsyncMock
+
+import pytest
+
+from app.core.models.review import ReviewSignature
+from app.infrastructure.services.near_duplicate_index import NearDuplicateIndex
+from app.infrastructure.utils.minhash import (
+    MinHasher,
+    MinHashLSHIndex,
+    tokenize_code,
+)
+
+ORIGINAL = """
+def top_items(items, limit=10):
+    # Count every item
+    counts = {}
+    for item in items:
+        if item is None:
+            continue
+        counts[item] = counts.get(item, 0) + 1
+    ranked = sorted(counts.items(), key=lambda pair: pair[1], reverse=True)
+    return [value for value, _ in ranked[:limit]]
+"""
+
+RENAMED = """
+def top_items(values, limit=5):
+    counts = {}
+    for v in values:
+        if v is None:
+            continue
+        counts[v] = counts.get(v, 0) + 1
+
+    ordered = sorted(counts.items(), key=lambda p: p[1], reverse=True)
+    return [x for x, _ in ordered[:limit]]
+"""
+
+UNRELATED = """
+class Stack:
+    def __init__(self):
+        self._items = []
+
+    def push(self, item):
+        self._items.append(item)
+
+    def pop(self):
+        if not self._items:
+            raise IndexError("pop from empty stack")
+        return self._items.pop()
+"""
+
+
+@pytest.fixture
+def near_duplicates():
+    """Near-duplicate index with a mocked review repository."""
+    return NearDuplicateIndex(AsyncMock())
+
+
+class TestTokenizer:
+    """Tests for the formatting and naming agnostic tokenizer."""
+
+    def test_comments_literals_and_names_are_ignored(self):
+        """Renamed variables, literals and comments give the same tokens."""
+        assert tokenize_code("total = price * 2  # double") == tokenize_code(
+            "amount=cost*3"
+        )
+
+    def test_calls_and_attributes_are_kept(self):
+        """Called functions and attributes keep their names."""
+        tokens = tokenize_code('self.items.append("x")')
+        assert "append" in tokens
+        assert "items" in tokens
+        assert "STR" in tokens
+
+
+class TestMinHashLSHIndex:
+    """Tests for signatures and LSH lookups."""
+
+    def test_renamed_code_is_a_near_duplicate(self, near_duplicates):
+        """Renaming and reformatting keeps the similarity above the threshold."""
+        original = near_duplicates.signature(ORIGINAL)
+        renamed = near_duplicates.signature(RENAMED)
+        assert MinHasher.similarity(original, renamed) >= 0.9
+
+    def test_query_finds_the_duplicate_for_the_same_language(self, near_duplicates):
+        """Only entries of the same language are candidates."""
+        index = MinHashLSHIndex(num_perm=128, bands=16)
+        index.insert("original", "python", near_duplicates.signature(ORIGINAL))
+        index.insert("stack", "python", near_duplicates.signature(UNRELATED))
+
+        match = index.query("python", near_duplicates.signature(RENAMED), 0.9)
+        assert match is not None
+        assert match[0] == "original"
+        assert index.query("ruby", near_duplicates.signature(RENAMED), 0.9) is None
+
+    def test_remove_drops_the_entry(self, near_duplicates):
+        """Removed signatures are no longer returned."""
+        index = MinHashLSHIndex(num_perm=128, bands=16)
+        signature = near_duplicates.signature(ORIGINAL)
+        index.insert("original", "python", signature)
+        index.remove("original")
+
+        assert len(index) == 0
+        assert index.query("python", signature, 0.9) is None
+
+    def test_short_code_has_no_signature(self, near_duplicates):
+        """Snippets too short to compare are left to the exact cache."""
+        assert near_duplicates.signature("print(1)") is None
+
+
+@pytest.mark.asyncio
+class TestNearDuplicateIndex:
+    """Tests for persisting and sharing signatures."""
+
+    async def test_add_persists_and_indexes(self, near_duplicates):
+        """Completed reviews are stored on the review and indexed."""
+        signature = near_duplicates.signature(ORIGINAL)
+        await near_duplicates.add("review-1", "Python", signature)
+
+        near_duplicates.review_repository.set_minhash_signature.assert_awaited_once_with(
+            "review-1",
+            signature.tobytes(),
+            near_duplicates._model(),
+            near_duplicates._prompt_version(),
+        )
+        match = near_duplicates.find_similar(
+            "python", near_duplicates.signature(RENAMED)
+        )
+        assert match[0] == "review-1"
+        assert near_duplicates.stats()["matches"] == 1
+
+    async def test_storage_errors_skip_indexing(self, near_duplicates):
+        """A signature that could not be stored is not indexed."""
+        near_duplicates.review_repository.set_minhash_signature.side_effect = (
+            RuntimeError("down")
+        )
+        await near_duplicates.add(
+            "review-1", "python", near_duplicates.signature(ORIGINAL)
+        )
+        assert near_duplicates.stats()["indexed"] == 0
+
+    async def test_reviews_of_another_prompt_are_not_matched(
+        self, near_duplicates, monkeypatch
+    ):
+        """Changing the model or prompt stops serving reviews made with the old ones."""
+        await near_duplicates.add(
+            "review-1", "python", near_duplicates.signature(ORIGINAL)
+        )
+
+        monkeypatch.setattr(near_duplicates.settings, "PROMPT_VERSION", "v2")
+        assert (
+            near_duplicates.find_similar("python", near_duplicates.signature(RENAMED))
+            is None
+        )
+
+    async def test_refresh_loads_reviews_of_the_current_prompt(self, near_duplicates):
+        """Signatures are loaded for the current model and prompt version only."""
+        model, prompt_version = (
+            near_duplicates._model(),
+            near_duplicates._prompt_version(),
+        )
+        repository = near_duplicates.review_repository
+        repository.find_minhash_signatures.return_value = [
+            ReviewSignature(
+                review_id="review-1",
+                language="Python",
+                signature=near_duplicates.signature(ORIGINAL).tobytes(),
+                indexed_at=datetime.utcnow(),
+                model=model,
+                prompt_version=prompt_version,
+            )
+        ]
+
+        assert await near_duplicates.refresh() == 1
+
+        repository.find_minhash_signatures.assert_awaited_once_with(
+            model,
+            prompt_version,
+            None,
+            near_duplicates.settings.NEAR_DUPLICATE_MAX_ENTRIES,
+        )
+        match = near_duplicates.find_similar(
+            "python", near_duplicates.signature(RENAMED)
+        )
+        assert match[0] == "review-1"
+
+    async def test_oldest_reviews_are_evicted(self, near_duplicates, monkeypatch):
+        """The index keeps only the most recently indexed reviews."""
+        monkeypatch.setattr(near_duplicates.settings, "NEAR_DUPLICATE_MAX_ENTRIES", 2)
+        signature = near_duplicates.signature(ORIGINAL)
+        for review_id in ("review-1", "review-2", "review-3"):
+            await near_duplicates.add(review_id, "python", signature)
+
+        assert near_duplicates.stats()["indexed"] == 2
+        assert "review-1" not in near_duplicates.index
+        match = near_duplicates.find_similar(
+            "python", near_duplicates.signature(RENAMED)
+        )
+        assert match[0] in ("review-2", "review-3")
@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+Test module for the OpenAI-compatible agent.
+Tests request building, streaming and backend selection.
+"""
+
+import json
+from unittest.mock import MagicMock
+
+import httpx
+import pytest
+
+from app.core.enums import ResponseFormat
+from app.infrastructure.factories.agent_factory import AgentFactory
+from app.infrastructure.services.openai_compatible_agent import (
+    LLMResponseError,
+    OpenAICompatibleAgent,
+)
+from app.infrastructure.services.resilient_agent import ResilientAgent
+
+
+def agent_with_transport(handler):
+    """Agent whose shared HTTP client is served by handler."""
+    agent = OpenAICompatibleAgent("Review python code")
+    agent.http_client = MagicMock()
+    agent.http_client.get.return_value = httpx.AsyncClient(
+        transport=httpx.MockTransport(handler)
+    )
+    return agent
+
+
+@pytest.mark.asyncio
+class TestOpenAICompatibleAgent:
+    """Tests for calls to the chat completions API."""
+
+    async def test_request_honors_llm_config(self):
+        """Every LLM setting is sent with the request."""
+        requests = []
+
+        def handler(request):
+            requests.append(request)
+            return httpx.Response(
+                200, json={"choices": [{"message": {"content": '{"ok": true}'}}]}
+            )
+
+        agent = agent_with_transport(handler)
+        response = await agent.achat("print(1)", output_json=True)
+
+        assert response == '{"ok": true}'
+        request = requests[0]
+        payload = json.loads(request.content)
+        llm_config = agent.settings.llm_config
+        assert str(request.url).endswith("/chat/completions")
+        assert request.headers["Authorization"].startswith("Bearer ")
+        assert payload["model"] == agent.settings.get_api_model_name()
+        assert payload["messages"][0] == {
+            "role": "system",
+            "content": "Review python code",
+        }
+        assert payload["max_tokens"] == llm_config["max_tokens"]
+        assert payload["temperature"] == llm_config["temperature"]
+        assert payload["seed"] == llm_config["seed"]
+        assert payload["stop"] == llm_config["stop_phrases"]
+        assert payload["response_format"] == ResponseFormat.JSON_OBJECT
+
+    async def test_stream_forwards_tokens(self):
+        """Streamed chunks reach on_token and are joined in the result."""
+        body = "".join(
+            f"data: {json.dumps({'choices': [{'delta': {'content': token}}]})}\n\n"
+            for token in ("{", '"ok"', ": true}")
+        )
+        agent = agent_with_transport(
+            lambda request: httpx.Response(200, text=body + "data: [DONE]\n\n")
+        )
+        tokens = []
+
+        response = await agent.astream_chat("print(1)", on_token=tokens.append)
+
+        assert tokens == ["{", '"ok"', ": true}"]
+        assert response == '{"ok": true}'
+
+    async def test_api_errors_raise(self):
+        """Error responses raise so the job can be retried."""
+        agent = agent_with_transport(
+            lambda request: httpx.Response(429, text="rate limited")
+        )
+
+        with pytest.raises(LLMResponseError, match="429"):
+            await agent.achat("print(1)")
+
+
+class TestAgentFactory:
+    """Tests for selecting the agent backend."""
+
+    def test_openai_backend(self):
+        """The openai backend creates the OpenAI-compatible agent."""
+        agent = AgentFactory.create("instructions", backend="openai")
+        assert isinstance(agent, ResilientAgent)
+        endpoint = agent.endpoints[0]
+        assert isinstance(agent.agent_factory(endpoint), OpenAICompatibleAgent)
+
+    def test_unknown_backend(self):
+        """Unknown backends are rejected."""
+        with pytest.raises(ValueError):
+            AgentFactory.create("instructions", backend="unknown")
@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Test module for the password hasher.
+Tests hashing passwords on the process pool and refusing work when it is saturated.
+"""
+
+import asyncio
+import time
+from unittest.mock import AsyncMock
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from passlib.context import CryptContext
+
+from app.infrastructure.api.auth_routes import AuthRoutes
+from app.infrastructure.dependencies import get_authenticator
+from app.infrastructure.services.authenticator_jwt import AuthenticatorJWT
+from app.infrastructure.services.password_hasher import (
+    PasswordHasher,
+    PasswordHasherBusyError,
+)
+
+# Cheapest bcrypt cost, the pool is what is tested
+PWD_CONTEXT = CryptContext(schemes=["bcrypt"], bcrypt__rounds=4)
+
+
+@pytest.fixture
+def password_hasher():
+    """Shared password hasher, its pool is stopped after the test."""
+    hasher = PasswordHasher()
+    yield hasher
+    hasher.shutdown()
+
+
+@pytest.mark.asyncio
+class TestPasswordHasher:
+    """Tests for hashing passwords off the event loop."""
+
+    async def test_hash_and_verify(self, password_hasher, mock_user_repository):
+        """A password hashed in the pool verifies, a wrong one doesn't."""
+        authenticator = AuthenticatorJWT(
+            AsyncMock(), PWD_CONTEXT, mock_user_repository
+        )
+
+        hashed = await authenticator.get_password_hash("testpass123")
+
+        assert hashed.startswith("$2b$04$")
+        assert await authenticator.verify_password("testpass123", hashed)
+        assert not await authenticator.verify_password("wrong", hashed)
+        assert password_hasher.stats()["completed"] >= 3
+
+    async def test_saturated_pool_refuses_work(self, password_hasher, monkeypatch):
+        """Hashes over the pending limit fail at once instead of queueing."""
+        monkeypatch.setattr(password_hasher, "_pending", password_hasher.max_pending)
+        rejected = password_hasher.stats()["rejected"]
+
+        with pytest.raises(PasswordHasherBusyError) as exc_info:
+            await password_hasher.hash(PWD_CONTEXT, "testpass123")
+
+        assert exc_info.value.retry_after == (
+            password_hasher.settings.PASSWORD_HASHER_RETRY_AFTER
+        )
+        assert password_hasher.stats()["rejected"] == rejected + 1
+
+
+    async def test_cancelled_hash_keeps_its_slot(self, password_hasher):
+        """A hash stays pending until its process returns, not its caller."""
+        pending = password_hasher.stats()["pending"]
+        call = asyncio.create_task(password_hasher._run(time.sleep, 1))
+        # Queued to the pool processes, the hash can't be cancelled anymore
+        await asyncio.sleep(0.1)
+        call.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await call
+
+        assert password_hasher.stats()["pending"] == pending + 1
+        for _ in range(200):
+            if password_hasher.stats()["pending"] == pending:
+                break
+            await asyncio.sleep(0.05)
+        assert password_hasher.stats()["pending"] == pending
+
+    async def test_failed_hashes_are_not_completed(self, password_hasher):
+        """A hash that raised counts as failed."""
+        stats = password_hasher.stats()
+
+        with pytest.raises(ValueError):
+            await password_hasher._run(int, "not a number")
+
+        assert password_hasher.stats()["failed"] == stats["failed"] + 1
+        assert password_hasher.stats()["completed"] == stats["completed"]
+
+
+class TestBusyResponses:
+    """Tests for the response of auth routes while the hasher is saturated."""
+
+    def test_login_returns_503(self, mock_authenticator):
+        """Logins over the limit are told when to retry."""
+        mock_authenticator.authenticate_user.side_effect = PasswordHasherBusyError(
+            "busy", retry_after=2
+        )
+        app = FastAPI()
+        app.include_router(AuthRoutes().router, prefix="/api")
+        app.dependency_overrides[get_authenticator] = lambda: mock_authenticator
+
+        response = TestClient(app).post(
+            "/api/login", json={"username": "test_user", "password": "testpass123"}
+        )
+
+        assert response.status_code == 503
+        assert response.headers["Retry-After"] == "2"
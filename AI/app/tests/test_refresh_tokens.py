@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+"""
+Test module for refresh tokens.
+Tests POST /api/refresh, rotating refresh tokens and detecting their reuse.
+"""
+
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from fastapi import FastAPI, HTTPException
+from fastapi.testclient import TestClient
+from jose import jwt
+from passlib.context import CryptContext
+
+from app.infrastructure.api.auth_routes import AuthRoutes
+from app.infrastructure.db.mongo.models import RefreshToken
+from app.infrastructure.dependencies import get_authenticator
+from app.infrastructure.services.authenticator_jwt import AuthenticatorJWT
+from app.infrastructure.services.user_cache import UserCache
+
+
+@pytest.fixture
+def refresh_tokens(monkeypatch):
+    """Refresh token collection mocked at the model, every token unused."""
+    stored = SimpleNamespace(user_id="test_user_id", family="family")
+    mocks = SimpleNamespace(
+        add_token=AsyncMock(),
+        use=AsyncMock(return_value=stored),
+        revoke_family=AsyncMock(),
+    )
+    for name in ("add_token", "use", "revoke_family"):
+        monkeypatch.setattr(RefreshToken, name, getattr(mocks, name))
+    return mocks
+
+
+@pytest.fixture
+def authenticator(refresh_tokens, mock_user, mock_user_repository, monkeypatch):
+    """JWT authenticator with mocked users, revocations and refresh tokens."""
+    UserCache().clear()
+    mock_user_repository.find_by_id.return_value = mock_user
+    authenticator = AuthenticatorJWT(
+        MagicMock(), CryptContext(schemes=["bcrypt"]), mock_user_repository
+    )
+    monkeypatch.setattr(authenticator.revocations, "revoke", AsyncMock())
+    yield authenticator
+    UserCache().clear()
+
+
+def claims(token):
+    return jwt.get_unverified_claims(token)
+
+
+@pytest.mark.asyncio
+class TestRefreshTokenRotation:
+    """Tests for using refresh tokens."""
+
+    async def test_refresh_token_is_used_once(
+        self, authenticator, refresh_tokens, mock_user
+    ):
+        """Using a refresh token marks it used and keeps its login family."""
+        token = await authenticator.create_refresh_token(mock_user, "family")
+        jti = claims(token)["jti"]
+        refresh_tokens.add_token.assert_awaited_once()
+        assert refresh_tokens.add_token.await_args[0][:3] == (
+            jti,
+            "family",
+            "test_user_id",
+        )
+
+        user, family = await authenticator.rotate_refresh_token(token)
+
+        assert (user.id, family) == ("test_user_id", "family")
+        refresh_tokens.use.assert_awaited_once_with(jti)
+        refresh_tokens.revoke_family.assert_not_awaited()
+
+    async def test_reuse_revokes_the_login(
+        self, authenticator, refresh_tokens, mock_user
+    ):
+        """A refresh token used a second time revokes its whole family."""
+        token = await authenticator.create_refresh_token(mock_user, "family")
+        refresh_tokens.use.return_value = None
+
+        with pytest.raises(HTTPException) as exc_info:
+            await authenticator.rotate_refresh_token(token)
+
+        assert exc_info.value.status_code == 401
+        refresh_tokens.revoke_family.assert_awaited_once_with("family")
+
+    async def test_token_types_are_not_interchangeable(
+        self, authenticator, refresh_tokens, mock_user, monkeypatch
+    ):
+        """Access tokens can't be refreshed and refresh tokens can't authenticate."""
+        access_token = authenticator.create_access_token(
+            {"sub": "test_user", "uid": "test_user_id", "fam": "family"}
+        )
+        refresh_token = await authenticator.create_refresh_token(mock_user, "family")
+        monkeypatch.setattr(
+            authenticator.revocations, "is_revoked", AsyncMock(return_value=False)
+        )
+
+        with pytest.raises(HTTPException):
+            await authenticator.rotate_refresh_token(access_token)
+        with pytest.raises(HTTPException):
+            await authenticator.verify_token(refresh_token)
+        refresh_tokens.use.assert_not_awaited()
+
+    async def test_logout_revokes_the_login(self, authenticator, refresh_tokens):
+        """After logout the refresh tokens of the login can't be used."""
+        access_token = authenticator.create_access_token(
+            {"sub": "test_user", "uid": "test_user_id", "fam": "family"}
+        )
+
+        assert await authenticator.blacklist_token(access_token)
+
+        refresh_tokens.revoke_family.assert_awaited_once_with("family")
+
+
+class TestRefreshEndpoint:
+    """Tests for POST /api/refresh."""
+
+    def test_refresh_issues_new_tokens(self, authenticator, refresh_tokens):
+        """A refresh token buys a new access token and a new refresh token."""
+        app = FastAPI()
+        app.include_router(AuthRoutes().router, prefix="/api")
+        app.dependency_overrides[get_authenticator] = lambda: authenticator
+        refresh_token = jwt.encode(
+            {"sub": "test_user", "jti": "jti", "fam": "family", "type": "refresh"},
+            authenticator.settings.SECRET_KEY,
+            algorithm=authenticator.settings.HASH_ALGORITHM,
+        )
+
+        response = TestClient(app).post(
+            "/api/refresh", json={"refresh_token": refresh_token}
+        )
+
+        assert response.status_code == 200
+        tokens = response.json()
+        assert claims(tokens["access_token"])["fam"] == "family"
+        assert claims(tokens["access_token"])["uid"] == "test_user_id"
+        assert claims(tokens["refresh_token"])["jti"] != "jti"
+        refresh_tokens.use.assert_awaited_once_with("jti")
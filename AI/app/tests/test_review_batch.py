@@ -0,0 +1,211 @@
+#!/usr/bin/env python3
+"""
+Test module for batch review submission.
+Tests the batch endpoint, batch enqueueing and the batch concurrency cap.
+"""
+
+import asyncio
+from unittest.mock import AsyncMock
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.core.models.review import Review
+from app.core.models.review_job import JobStatus, ReviewJob
+from app.infrastructure.api.main_routes import MainRoutes
+from app.infrastructure.db.mongo import mongo_repository
+from app.infrastructure.db.mongo.mongo_repository import MongoReviewJobRepository
+from app.infrastructure.dependencies import limiter
+from app.infrastructure.jobs.worker import ReviewWorker
+from app.use_cases.review_job_use_case import ReviewJobUseCase
+
+
+def make_review(index, status="pending"):
+    return Review(
+        id=f"review_{index}",
+        user="test_user_id",
+        language="python",
+        code_submission=f"print({index})",
+        status=status,
+    )
+
+
+@pytest.fixture
+def batch_routes(mock_user):
+    """Main routes with mocked use cases and an authenticated user."""
+    routes = MainRoutes()
+    routes.review_use_case = AsyncMock()
+    routes.review_job_use_case = AsyncMock()
+    routes.review_cache = AsyncMock()
+    routes.review_cache.get.return_value = None
+
+    app = FastAPI()
+    limiter.reset()
+    app.state.limiter = limiter
+    app.include_router(routes.router, prefix="/api")
+    app.dependency_overrides[routes.auth_routes.get_current_active_user_dependency] = (
+        lambda: mock_user
+    )
+    return routes, TestClient(app)
+
+
+class TestBatchEndpoint:
+    """Tests for POST /reviews/batch."""
+
+    def test_batch_is_created_with_one_write(self, batch_routes):
+        """All reviews are inserted and enqueued together."""
+        routes, client = batch_routes
+        routes.review_use_case.create_reviews.side_effect = lambda reviews: [
+            review.model_copy(update={"id": f"review_{index}"})
+            for index, review in enumerate(reviews)
+        ]
+
+        response = client.post(
+            "/api/reviews/batch",
+            json={
+                "reviews": [
+                    {"language": "python", "code_submission": f"print({index})"}
+                    for index in range(3)
+                ],
+                "concurrency": 2,
+            },
+        )
+
+        assert response.status_code == 200
+        assert [item["review_id"] for item in response.json()["reviews"]] == [
+            "review_0",
+            "review_1",
+            "review_2",
+        ]
+        routes.review_use_case.create_reviews.assert_awaited_once()
+        enqueue_call = routes.review_job_use_case.enqueue_batch.await_args
+        assert len(enqueue_call.args[0]) == 3
+        assert enqueue_call.kwargs["concurrency"] == 2
+
+    def test_oversized_batch_is_rejected(self, batch_routes):
+        """Batches above REVIEW_BATCH_MAX_SIZE are refused."""
+        routes, client = batch_routes
+        item = {"language": "python", "code_submission": "print(1)"}
+
+        response = client.post(
+            "/api/reviews/batch",
+            json={"reviews": [item] * (routes.settings.REVIEW_BATCH_MAX_SIZE + 1)},
+        )
+
+        assert response.status_code == 413
+        routes.review_use_case.create_reviews.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+class TestBatchScheduling:
+    """Tests for the batch concurrency cap."""
+
+    async def test_jobs_above_concurrency_are_held(self):
+        """Only the first `concurrency` jobs are claimable at first."""
+        repository = AsyncMock()
+        repository.enqueue_many.side_effect = lambda jobs: jobs
+
+        jobs = await ReviewJobUseCase(repository).enqueue_batch(
+            [make_review(index) for index in range(5)], max_attempts=3, concurrency=2
+        )
+
+        assert [job.status for job in jobs] == [
+            JobStatus.QUEUED,
+            JobStatus.QUEUED,
+            JobStatus.HELD,
+            JobStatus.HELD,
+            JobStatus.HELD,
+        ]
+        assert len({job.batch_id for job in jobs}) == 1
+
+    async def test_finished_job_releases_its_batch(self, mock_review_repository):
+        """Acking a batch job lets the next held job run."""
+        mock_review_repository.find_by_id.return_value = make_review(0)
+        job_repository = AsyncMock()
+        worker = ReviewWorker(
+            mock_review_repository,
+            job_repository,
+            AsyncMock(),
+            AsyncMock(),
+            concurrency=1,
+        )
+        worker.ia_tasks = AsyncMock()
+        job = ReviewJob(
+            id="job_id",
+            review_id="review_0",
+            user="test_user_id",
+            language="python",
+            status=JobStatus.LEASED,
+            attempts=1,
+            batch_id="batch_id",
+            batch_concurrency=2,
+        )
+
+        await worker.process_job(job, "worker-0")
+
+        job_repository.release_batch.assert_awaited_once_with("batch_id", 2)
+
+
+class InMemoryLeases:
+    """Lease repository keeping leases in a dict, they never expire."""
+
+    def __init__(self):
+        self.owners = {}
+
+    async def acquire(self, name, owner, duration_seconds):
+        return self.owners.setdefault(name, owner) == owner
+
+    async def release(self, name, owner):
+        if self.owners.get(name) == owner:
+            del self.owners[name]
+
+
+@pytest.mark.asyncio
+class TestBatchRelease:
+    """Tests for releasing held jobs of a batch from several workers."""
+
+    async def test_concurrent_releases_respect_concurrency(self, monkeypatch):
+        """Workers finishing jobs of a batch at once don't release the same slots."""
+        repository = MongoReviewJobRepository(InMemoryLeases())
+        statuses = [JobStatus.HELD] * 6
+
+        async def count_active(batch_id):
+            # Let the other workers run between the count and the updates
+            await asyncio.sleep(0)
+            return statuses.count(JobStatus.QUEUED)
+
+        async def queue_held(batch_id):
+            await asyncio.sleep(0)
+            if JobStatus.HELD not in statuses:
+                return False
+            statuses[statuses.index(JobStatus.HELD)] = JobStatus.QUEUED
+            return True
+
+        monkeypatch.setattr(repository, "_count_active", count_active)
+        monkeypatch.setattr(repository, "_queue_held", queue_held)
+
+        released = await asyncio.gather(
+            *(repository.release_batch("batch_id", 2) for _ in range(3))
+        )
+
+        assert sum(released) == 2
+        assert statuses.count(JobStatus.QUEUED) == 2
+        assert repository.lease_repository.owners == {}
+
+    async def test_gives_up_on_a_lease_that_stays_taken(self, monkeypatch):
+        """Waiting for the lease backs off and stops at a deadline."""
+        leases = InMemoryLeases()
+        leases.owners["review_batch:batch_id"] = "other-worker"
+        leases.acquire = AsyncMock(wraps=leases.acquire)
+        repository = MongoReviewJobRepository(leases)
+        repository._count_active = AsyncMock()
+        monkeypatch.setattr(mongo_repository, "BATCH_LEASE_SECONDS", 0.3)
+
+        with pytest.raises(TimeoutError):
+            await repository.release_batch("batch_id", 2)
+
+        # Waits of 0.05, 0.1 then the 0.15s left, a fixed wait would poll 7 times
+        assert leases.acquire.await_count <= 5
+        repository._count_active.assert_not_awaited()
+        assert leases.owners == {"review_batch:batch_id": "other-worker"}
@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+Test module for the review cache.
+Tests the cache key normalization and the cache hit path.
+"""
+
+from unittest.mock import AsyncMock
+
+import pytest
+
+from app.core.models.review import (
+    Categories,
+    CodeReviewIAResponse,
+    SecurityAssessment,
+    SecurytyLevel,
+)
+from app.infrastructure.services.review_cache_service import ReviewCacheService
+
+
+@pytest.fixture
+def code_review():
+    """Validated code review fixture."""
+    return CodeReviewIAResponse(
+        overall_score=8,
+        category=Categories.SYNTAX,
+        security_assessment=SecurityAssessment(
+            risk_level=SecurytyLevel.NONE, concerns=[]
+        ),
+        suggestions="Looks good",
+    )
+
+
+@pytest.fixture
+def review_cache():
+    """Review cache service with a mocked repository."""
+    return ReviewCacheService(AsyncMock())
+
+
+class TestReviewCacheKey:
+    """Tests for the content address of a review request."""
+
+    def test_cosmetic_differences_share_a_key(self, review_cache):
+        """Line endings, trailing spaces and blank edges don't change the key."""
+        key = review_cache.build_key("def f():\n    return 1\n", "Python")
+        assert key == review_cache.build_key(
+            "\r\n\ndef f():   \r\n    return 1\r\n\r\n", " python "
+        )
+
+    def test_code_and_language_change_the_key(self, review_cache):
+        """Different code or language produce different keys."""
+        key = review_cache.build_key("print(1)", "python")
+        assert key != review_cache.build_key("print(2)", "python")
+        assert key != review_cache.build_key("print(1)", "ruby")
+
+    def test_prompt_version_changes_the_key(self, review_cache, monkeypatch):
+        """Changing the prompt version invalidates cached reviews."""
+        key = review_cache.build_key("print(1)", "python")
+        monkeypatch.setattr(review_cache.settings, "PROMPT_VERSION", "v2")
+        assert key != review_cache.build_key("print(1)", "python")
+
+
+@pytest.mark.asyncio
+class TestReviewCacheService:
+    """Tests for cache lookups and hit-rate counters."""
+
+    async def test_hit_and_miss_are_counted(self, review_cache, code_review):
+        """Lookups update the hit-rate counters."""
+        review_cache.review_cache_repository.get.side_effect = [code_review, None]
+
+        assert await review_cache.get("print(1)", "python") == code_review
+        assert await review_cache.get("print(2)", "python") is None
+
+        stats = review_cache.stats()
+        assert stats["hits"] == 1
+        assert stats["misses"] == 1
+        assert stats["hit_rate"] == 0.5
+
+    async def test_repository_errors_are_a_miss(self, review_cache):
+        """A failing cache never fails the review."""
+        review_cache.review_cache_repository.get.side_effect = RuntimeError("down")
+
+        assert await review_cache.get("print(1)", "python") is None
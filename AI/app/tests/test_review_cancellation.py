@@ -0,0 +1,264 @@
+#!/usr/bin/env python3
+"""
+Test module for review cancellation.
+Tests DELETE /reviews/{review_id}, cancelling review jobs and aborting them in the worker.
+"""
+
+import asyncio
+import uuid
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.core.models.llm_endpoint import LLMEndpoint
+from app.core.models.review import CodeReviewIAResponse, Review
+from app.core.models.review_job import JobStatus, ReviewJob
+from app.infrastructure.api.main_routes import MainRoutes
+from app.infrastructure.jobs.tasks import IATasks
+from app.infrastructure.jobs.worker import ReviewWorker
+from app.infrastructure.services.circuit_breaker import OPEN
+from app.infrastructure.services.resilient_agent import ResilientAgent
+from app.use_cases.review_job_use_case import ReviewJobUseCase
+
+
+def make_review(status="pending", user="test_user_id"):
+    return Review(
+        id="review_id",
+        user=user,
+        language="python",
+        code_submission="print('hello')",
+        status=status,
+    )
+
+
+def make_job(**update):
+    return ReviewJob(
+        id="job_id",
+        review_id="review_id",
+        user="test_user_id",
+        language="python",
+        status=JobStatus.LEASED,
+        attempts=1,
+        worker_id="worker-0",
+    ).model_copy(update=update)
+
+
+@pytest.fixture
+def delete_routes(mock_user):
+    """Main routes with mocked use cases and an authenticated user."""
+    routes = MainRoutes()
+    routes.review_use_case = AsyncMock()
+    routes.review_job_use_case = AsyncMock()
+    routes.review_stream = AsyncMock()
+
+    app = FastAPI()
+    app.include_router(routes.router, prefix="/api")
+    app.dependency_overrides[routes.auth_routes.get_current_active_user_dependency] = (
+        lambda: mock_user
+    )
+    return routes, TestClient(app)
+
+
+class TestDeleteEndpoint:
+    """Tests for DELETE /reviews/{review_id}."""
+
+    def test_in_flight_review_is_cancelled(self, delete_routes):
+        """A pending review is cancelled, with its job, and kept."""
+        routes, client = delete_routes
+        routes.review_use_case.get_review_by_id.return_value = make_review()
+        routes.review_use_case.cancel_review.return_value = make_review("cancelled")
+
+        response = client.delete("/api/reviews/review_id")
+
+        assert response.status_code == 200
+        assert response.json()["status"] == "cancelled"
+        routes.review_job_use_case.cancel_review_job.assert_awaited_once_with(
+            "review_id"
+        )
+        routes.review_stream.publish_status.assert_awaited_once_with(
+            "review_id", "cancelled"
+        )
+        routes.review_use_case.delete_review.assert_not_awaited()
+
+    def test_finished_review_is_deleted(self, delete_routes):
+        """A review that can't be cancelled anymore is deleted."""
+        routes, client = delete_routes
+        routes.review_use_case.get_review_by_id.return_value = make_review("completed")
+        routes.review_use_case.cancel_review.return_value = None
+        routes.review_use_case.delete_review.return_value = True
+
+        response = client.delete("/api/reviews/review_id")
+
+        assert response.status_code == 200
+        assert response.json()["status"] == "deleted"
+        routes.review_use_case.delete_review.assert_awaited_once_with("review_id")
+        routes.review_job_use_case.cancel_review_job.assert_not_awaited()
+
+    def test_only_the_owner_can_delete(self, delete_routes):
+        """Reviews of other users are reported as not found."""
+        routes, client = delete_routes
+        routes.review_use_case.get_review_by_id.return_value = make_review(
+            user="someone_else"
+        )
+
+        response = client.delete("/api/reviews/review_id")
+
+        assert response.status_code == 404
+        routes.review_use_case.cancel_review.assert_not_awaited()
+        routes.review_use_case.delete_review.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+class TestCancelReviewJob:
+    """Tests for cancelling the job of a review."""
+
+    async def test_cancelled_batch_job_frees_its_slot(self):
+        """Cancelling a batch job lets the next held job of the batch run."""
+        job_repository = AsyncMock()
+        job_repository.cancel.return_value = make_job(
+            status=JobStatus.CANCELLED, batch_id="batch", batch_concurrency=2
+        )
+
+        job = await ReviewJobUseCase(job_repository).cancel_review_job("review_id")
+
+        assert job.status == JobStatus.CANCELLED
+        job_repository.release_batch.assert_awaited_once_with("batch", 2)
+
+    async def test_no_job_to_cancel(self):
+        """Nothing is released when the review has no cancellable job."""
+        job_repository = AsyncMock()
+        job_repository.cancel.return_value = None
+
+        assert await ReviewJobUseCase(job_repository).cancel_review_job("id") is None
+        job_repository.release_batch.assert_not_awaited()
+
+
+@pytest.fixture
+def worker(mock_review_repository, monkeypatch):
+    """Review worker with mocked repositories and agent task."""
+    mock_review_repository.find_by_id.return_value = make_review()
+    worker = ReviewWorker(
+        mock_review_repository, AsyncMock(), AsyncMock(), AsyncMock(), concurrency=1
+    )
+    worker.ia_tasks = AsyncMock()
+    monkeypatch.setattr(worker.settings, "JOB_CANCEL_POLL_INTERVAL", 0.01)
+    return worker
+
+
+@pytest.mark.asyncio
+class TestWorkerCancellation:
+    """Tests for aborting cancelled jobs in the worker."""
+
+    async def test_cancelled_job_is_aborted(self, worker):
+        """The LLM call of a job cancelled while it runs is aborted."""
+        job_repository = worker.review_job_use_case.review_job_repository
+        job_repository.find_cancelled.return_value = ["job_id"]
+        llm_call_started = asyncio.Event()
+
+        async def slow_review(*args):
+            llm_call_started.set()
+            await asyncio.sleep(60)
+
+        worker.ia_tasks.process_review_with_agent.side_effect = slow_review
+        watcher = asyncio.create_task(worker._watch_cancellations())
+        try:
+            await asyncio.wait_for(worker.process_job(make_job(), "worker-0"), 5)
+        finally:
+            worker.stop()
+            await watcher
+
+        assert llm_call_started.is_set()
+        assert worker._processing == {}
+        job_repository.ack.assert_not_awaited()
+        job_repository.nack.assert_not_awaited()
+
+    async def test_cancelled_job_frees_its_llm_endpoint(self, worker):
+        """Aborting the LLM call frees its endpoint slot and circuit trial."""
+        job_repository = worker.review_job_use_case.review_job_repository
+        job_repository.find_cancelled.return_value = ["job_id"]
+        endpoint = LLMEndpoint(
+            model="groq/model",
+            api_model="model",
+            base_url=f"http://{uuid.uuid4().hex}",
+            max_concurrency=1,
+        )
+        endpoint_agent = MagicMock()
+
+        async def hung_achat(prompt, **kwargs):
+            await asyncio.sleep(60)
+
+        endpoint_agent.achat = hung_achat
+        agent = ResilientAgent([endpoint], lambda endpoint: endpoint_agent)
+        # The circuit is due for a trial, the cancelled call is that trial
+        breaker = agent.breakers.get(endpoint.name)
+        breaker.failure_threshold, breaker.reset_timeout = 1, 0
+        breaker.record_failure()
+
+        async def review(*args):
+            await agent.achat("code")
+
+        worker.ia_tasks.process_review_with_agent.side_effect = review
+        watcher = asyncio.create_task(worker._watch_cancellations())
+        try:
+            await asyncio.wait_for(worker.process_job(make_job(), "worker-0"), 5)
+        finally:
+            worker.stop()
+            await watcher
+
+        assert agent.balancer.stats()[endpoint.name]["in_flight"] == 0
+        assert breaker.state == OPEN
+        assert breaker.allow()
+
+    async def test_only_running_jobs_are_checked(self, worker):
+        """No query is made while the worker runs no job."""
+        job_repository = worker.review_job_use_case.review_job_repository
+
+        assert await worker.review_job_use_case.find_cancelled_jobs([]) == []
+        job_repository.find_cancelled.assert_not_awaited()
+
+    async def test_cancelled_review_is_not_failed(self, worker):
+        """A failing job leaves the status of a cancelled review alone."""
+        job_repository = worker.review_job_use_case.review_job_repository
+        worker.review_use_case.review_repository.find_by_id.return_value = (
+            make_review("cancelled")
+        )
+        worker.ia_tasks.process_review_with_agent.side_effect = RuntimeError("boom")
+        job_repository.nack.return_value = make_job(status=JobStatus.FAILED)
+
+        await worker.process_job(make_job(), "worker-0")
+
+        updates = worker.review_use_case.review_repository.update.await_args_list
+        assert all(call.args[0].status == "cancelled" for call in updates)
+        worker.ia_tasks.review_stream.publish_status.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+class TestCancelledReviewResults:
+    """Tests for results of cancelled reviews other reviews are coalesced with."""
+
+    async def test_result_keeps_the_review_cancelled(self, mock_review_repository):
+        """The result is stored for coalesced reviews but the status is kept."""
+        review = make_review("cancelled")
+        mock_review_repository.find_by_id.return_value = review
+        ia_tasks = IATasks(mock_review_repository, AsyncMock(), AsyncMock())
+        code_review = CodeReviewIAResponse(
+            overall_score=8,
+            category="syntax",
+            security_assessment={"risk_level": "none", "concerns": []},
+            suggestions="Looks good.",
+        )
+
+        await ia_tasks.complete_review_with("review_id", code_review, "review cache")
+
+        updated_review = mock_review_repository.update.await_args[0][0]
+        assert updated_review.status == "cancelled"
+        assert updated_review.code_review == code_review
+
+        # Reviews coalesced with it are completed from its result
+        mock_review_repository.find_by_id.return_value = make_review()
+        ia_tasks.review_stream = AsyncMock()
+        await ia_tasks._complete_coalesced_review("follower_id", updated_review)
+
+        assert mock_review_repository.update.await_args[0][0].status == "completed"
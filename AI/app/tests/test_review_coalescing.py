@@ -0,0 +1,248 @@
+#!/usr/bin/env python3
+"""
+Test module for coalescing identical in-flight reviews.
+Tests attaching reviews to an identical job and completing them with its result.
+"""
+
+from unittest.mock import AsyncMock
+
+import pytest
+
+from app.core.models.review import Review
+from app.core.models.review_job import JobStatus, ReviewJob
+from app.infrastructure.jobs.tasks import IATasks
+from app.infrastructure.jobs.worker import ReviewWorker
+from app.use_cases.review_job_use_case import ReviewJobUseCase
+
+
+def make_review(review_id, code="print('hello')", status="pending"):
+    return Review(
+        id=review_id,
+        user="test_user_id",
+        language="python",
+        code_submission=code,
+        status=status,
+    )
+
+
+def make_job(review_id="review_0", **update):
+    return ReviewJob(
+        id=f"job_{review_id}",
+        review_id=review_id,
+        user="test_user_id",
+        language="python",
+        status=JobStatus.LEASED,
+        attempts=1,
+        worker_id="worker-0",
+        fingerprint="same-code",
+    ).model_copy(update=update)
+
+
+@pytest.fixture
+def job_repository():
+    """Job repository where enqueued jobs get an id."""
+    repository = AsyncMock()
+    repository.attach.return_value = None
+    repository.enqueue.side_effect = lambda job: job.model_copy(
+        update={"id": f"job_{job.review_id}"}
+    )
+    repository.enqueue_many.side_effect = lambda jobs: jobs
+    return repository
+
+
+@pytest.mark.asyncio
+class TestEnqueueCoalescing:
+    """Tests for attaching reviews to identical in-flight jobs."""
+
+    async def test_identical_review_is_attached(self, job_repository):
+        in_flight = make_job(coalesced_review_ids=["review_1"])
+        job_repository.attach.return_value = in_flight
+
+        job = await ReviewJobUseCase(job_repository).enqueue_review(
+            make_review("review_1"), 3, fingerprint="same-code", max_coalesced=10
+        )
+
+        assert job is in_flight
+        job_repository.attach.assert_awaited_once_with("same-code", ["review_1"], 10)
+        job_repository.enqueue.assert_not_awaited()
+
+    async def test_new_job_carries_its_fingerprint(self, job_repository):
+        job = await ReviewJobUseCase(job_repository).enqueue_review(
+            make_review("review_0"), 3, fingerprint="same-code", max_coalesced=10
+        )
+
+        assert job.review_id == "review_0"
+        assert job.fingerprint == "same-code"
+
+    async def test_disabled_without_a_fingerprint(self, job_repository):
+        await ReviewJobUseCase(job_repository).enqueue_review(
+            make_review("review_0"), 3, max_coalesced=10
+        )
+
+        job_repository.attach.assert_not_awaited()
+        job_repository.enqueue.assert_awaited_once()
+
+    async def test_batch_duplicates_share_a_job(self, job_repository):
+        reviews = [make_review(f"review_{index}") for index in range(4)]
+
+        jobs = await ReviewJobUseCase(job_repository).enqueue_batch(
+            reviews,
+            3,
+            concurrency=1,
+            fingerprints=["same-code", "other-code", "same-code", None],
+            max_coalesced=10,
+        )
+
+        assert [(job.review_id, job.coalesced_review_ids) for job in jobs] == [
+            ("review_0", ["review_2"]),
+            ("review_1", []),
+            ("review_3", []),
+        ]
+        assert [job.status for job in jobs] == [
+            JobStatus.QUEUED,
+            JobStatus.HELD,
+            JobStatus.HELD,
+        ]
+
+    async def test_batch_duplicates_attach_to_in_flight_jobs(self, job_repository):
+        job_repository.attach.side_effect = lambda fingerprint, review_ids, _: (
+            make_job(fingerprint=fingerprint, coalesced_review_ids=review_ids)
+            if fingerprint == "same-code"
+            else None
+        )
+        reviews = [make_review(f"review_{index}") for index in range(3)]
+
+        jobs = await ReviewJobUseCase(job_repository).enqueue_batch(
+            reviews,
+            3,
+            concurrency=2,
+            fingerprints=["same-code", "other-code", "same-code"],
+            max_coalesced=10,
+        )
+
+        job_repository.attach.assert_any_await(
+            "same-code", ["review_0", "review_2"], 10
+        )
+        assert [job.review_id for job in jobs] == ["review_1"]
+
+    async def test_batch_groups_are_capped(self, job_repository):
+        reviews = [make_review(f"review_{index}") for index in range(5)]
+
+        jobs = await ReviewJobUseCase(job_repository).enqueue_batch(
+            reviews,
+            3,
+            concurrency=5,
+            fingerprints=["same-code"] * 5,
+            max_coalesced=1,
+        )
+
+        assert [(job.review_id, job.coalesced_review_ids) for job in jobs] == [
+            ("review_0", ["review_1"]),
+            ("review_2", ["review_3"]),
+            ("review_4", []),
+        ]
+
+
+@pytest.fixture
+def worker(mock_review_repository):
+    """Review worker with mocked repositories and agent task."""
+    mock_review_repository.find_by_id.return_value = make_review("review_0")
+    worker = ReviewWorker(
+        mock_review_repository,
+        AsyncMock(),
+        AsyncMock(),
+        AsyncMock(),
+        concurrency=1,
+    )
+    worker.ia_tasks = AsyncMock()
+    worker.ia_tasks.complete_coalesced_reviews.return_value = 2
+    return worker
+
+
+@pytest.mark.asyncio
+class TestWorkerCoalescing:
+    """Tests for completing coalesced reviews in the worker."""
+
+    async def test_coalesced_reviews_get_the_result(self, worker):
+        job_repository = worker.review_job_use_case.review_job_repository
+        job_repository.close_coalescing.return_value = make_job(
+            fingerprint=None, coalesced_review_ids=["review_1", "review_2"]
+        )
+
+        await worker.process_job(make_job(), "worker-0")
+
+        job_repository.close_coalescing.assert_awaited_once_with(
+            "job_review_0", "worker-0"
+        )
+        worker.ia_tasks.complete_coalesced_reviews.assert_awaited_once_with(
+            "review_0", ["review_1", "review_2"]
+        )
+        job_repository.ack.assert_awaited_once()
+        assert worker.coalescing_stats() == {
+            "coalesced_jobs": 1,
+            "coalesced_reviews": 2,
+        }
+
+    async def test_jobs_without_fingerprint_skip_coalescing(self, worker):
+        await worker.process_job(make_job(fingerprint=None), "worker-0")
+
+        job_repository = worker.review_job_use_case.review_job_repository
+        job_repository.close_coalescing.assert_not_awaited()
+        worker.ia_tasks.complete_coalesced_reviews.assert_not_awaited()
+
+    async def test_failed_job_rejects_coalesced_reviews(self, worker):
+        job_repository = worker.review_job_use_case.review_job_repository
+        worker.ia_tasks.process_review_with_agent.side_effect = RuntimeError("boom")
+        job_repository.nack.return_value = make_job(
+            status=JobStatus.FAILED, attempts=3, coalesced_review_ids=["review_1"]
+        )
+
+        await worker.process_job(make_job(), "worker-0")
+
+        published = worker.ia_tasks.review_stream.publish_status.await_args_list
+        assert [call.args for call in published] == [
+            ("review_0", "rejected"),
+            ("review_1", "rejected"),
+        ]
+
+
+@pytest.mark.asyncio
+class TestCompleteCoalescedReviews:
+    """Tests for copying a finished review to its coalesced reviews."""
+
+    @pytest.fixture
+    def ia_tasks(self, mock_review_repository):
+        tasks = IATasks(mock_review_repository, AsyncMock(), AsyncMock())
+        tasks.review_stream = AsyncMock()
+        return tasks
+
+    async def test_result_is_copied(self, ia_tasks, mock_review_repository):
+        finished = make_review("review_0", status="completed").model_copy(
+            update={"estimated_tokens": 120}
+        )
+        reviews = {
+            "review_0": finished,
+            "review_1": make_review("review_1", status="in_progress"),
+            "review_2": make_review("review_2", status="completed"),
+        }
+        mock_review_repository.find_by_id.side_effect = reviews.get
+
+        completed = await ia_tasks.complete_coalesced_reviews(
+            "review_0", ["review_1", "review_2", "missing"]
+        )
+
+        assert completed == 1
+        updated = mock_review_repository.update.await_args[0][0]
+        assert (updated.id, updated.status) == ("review_1", "completed")
+        assert updated.estimated_tokens == 0
+        ia_tasks.review_stream.publish_status.assert_awaited_once_with(
+            "review_1", "completed"
+        )
+
+    async def test_unfinished_review_has_no_result(
+        self, ia_tasks, mock_review_repository
+    ):
+        mock_review_repository.find_by_id.return_value = make_review("review_0")
+
+        assert await ia_tasks.complete_coalesced_reviews("review_0", ["r"]) == 0
+        mock_review_repository.update.assert_not_awaited()
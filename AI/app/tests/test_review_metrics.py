@@ -0,0 +1,236 @@
+#!/usr/bin/env python3
+"""
+Test module for review instrumentation.
+Tests the Prometheus registry, per-call review timings and the metrics endpoints.
+"""
+
+import asyncio
+import json
+from contextlib import asynccontextmanager
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.core.models.review import Review
+from app.infrastructure.api.main_routes import MainRoutes
+from app.infrastructure.jobs.tasks import IATasks
+from app.infrastructure.services.metrics_registry import MetricsRegistry
+from app.infrastructure.services.metrics_server import start_metrics_server
+from app.infrastructure.services.review_metrics import ReviewMetrics
+
+REVIEW_JSON = json.dumps(
+    {
+        "overall_score": 7,
+        "category": "performance",
+        "security_assessment": {"risk_level": "none", "concerns": []},
+        "suggestions": "Use a set for membership tests.",
+    }
+)
+
+
+class TestMetricsRegistry:
+    """Tests for the Prometheus text format."""
+
+    def test_counter(self):
+        registry = MetricsRegistry()
+        counter = registry.counter("jobs_total", "Jobs", ["status"])
+        counter.inc(status="done")
+        counter.inc(2, status="done")
+
+        assert registry.counter("jobs_total", "Jobs", ["status"]) is counter
+        assert registry.render() == (
+            "# HELP jobs_total Jobs\n"
+            "# TYPE jobs_total counter\n"
+            'jobs_total{status="done"} 3\n'
+        )
+
+    def test_histogram_buckets_are_cumulative(self):
+        registry = MetricsRegistry()
+        histogram = registry.histogram("latency_seconds", "Latency", buckets=(0.5, 1))
+        for value in (0.2, 0.5, 0.7, 3):
+            histogram.observe(value)
+
+        lines = registry.render().splitlines()
+
+        assert lines[2:] == [
+            'latency_seconds_bucket{le="0.5"} 2',
+            'latency_seconds_bucket{le="1"} 3',
+            'latency_seconds_bucket{le="+Inf"} 4',
+            "latency_seconds_sum 4.4",
+            "latency_seconds_count 4",
+        ]
+
+    def test_label_values_are_escaped(self):
+        registry = MetricsRegistry()
+        registry.counter("events_total", "Events", ["name"]).inc(name='a"b\\c')
+
+        assert 'events_total{name="a\\"b\\\\c"} 1' in registry.render()
+
+    def test_labels_must_match(self):
+        counter = MetricsRegistry().counter("jobs_total", "Jobs", ["status"])
+
+        with pytest.raises(ValueError):
+            counter.inc(user="someone")
+
+    def test_unknown_languages_are_bounded(self):
+        metrics = ReviewMetrics()
+
+        assert metrics._language(" Python ") == "python"
+        assert metrics._language("x" * 200) == "other"
+        assert metrics._language("Robert'); DROP TABLE") == "other"
+
+
+def fake_agent_pool(agent):
+    pool = MagicMock()
+
+    @asynccontextmanager
+    async def acquire(instructions, language):
+        yield agent
+
+    pool.acquire = acquire
+    return pool
+
+
+@pytest.mark.asyncio
+class TestReviewTimings:
+    """Tests for the timing breakdown stored on reviews."""
+
+    @pytest.fixture
+    def ia_tasks(self, mock_review_repository, monkeypatch):
+        review = Review(
+            id="review_id",
+            user="test_user_id",
+            language="python",
+            code_submission="def add(a, b):\n    return a + b\n",
+        )
+        mock_review_repository.find_by_id.return_value = review
+        tasks = IATasks(mock_review_repository, AsyncMock(), AsyncMock())
+        tasks.review_cache = AsyncMock()
+        tasks.review_cache.get.return_value = None
+        tasks.near_duplicates = AsyncMock()
+        tasks.near_duplicates.compute_signature.return_value = None
+        tasks.review_stream = AsyncMock()
+        monkeypatch.setattr(tasks.settings, "REVIEW_CHUNKING_ENABLED", False)
+        monkeypatch.setattr(tasks.settings, "REVIEW_STREAMING_ENABLED", True)
+        return tasks
+
+    async def test_streamed_review(self, ia_tasks, mock_review_repository):
+        agent = MagicMock()
+
+        async def astream_chat(prompt, on_token, **kwargs):
+            await asyncio.sleep(0.01)
+            on_token(REVIEW_JSON)
+            return REVIEW_JSON
+
+        agent.astream_chat = astream_chat
+        ia_tasks.agent_pool = fake_agent_pool(agent)
+        stream = AsyncMock()
+        stream.push = MagicMock()
+        stream.flushing = _nothing
+        ia_tasks.review_stream.open.return_value = stream
+        metrics = ReviewMetrics()
+        calls_before = metrics.llm_request_duration.count(
+            model=ia_tasks._model(), language="python", outcome="ok"
+        )
+
+        await ia_tasks.process_review_with_agent(
+            "review_id", "def add(a, b):\n    return a + b\n", "python"
+        )
+
+        review = mock_review_repository.update.await_args[0][0]
+        timings = review.timings
+        assert review.status == "completed"
+        assert timings.source == "llm"
+        assert timings.llm_calls == 1
+        assert timings.llm_seconds >= 0.01
+        assert 0.01 <= timings.time_to_first_token_seconds <= timings.llm_seconds
+        assert timings.prompt_tokens == review.estimated_tokens > 0
+        assert timings.completion_tokens > 0
+        assert timings.parse_failures == 0
+        assert timings.total_seconds >= timings.llm_seconds
+        stream.push.assert_called_once_with(REVIEW_JSON)
+        assert (
+            metrics.llm_request_duration.count(
+                model=ia_tasks._model(), language="python", outcome="ok"
+            )
+            == calls_before + 1
+        )
+
+    async def test_parse_failures_are_counted(self, ia_tasks, mock_review_repository):
+        agent = MagicMock()
+        agent.achat = AsyncMock(return_value="Looks fine to me!")
+        ia_tasks.agent_pool = fake_agent_pool(agent)
+        ia_tasks.settings.REVIEW_STREAMING_ENABLED = False
+        metrics = ReviewMetrics()
+        labels = {"model": ia_tasks._model(), "language": "python"}
+        failures_before = metrics.parse_failures.value(**labels)
+
+        await ia_tasks.process_review_with_agent("review_id", "x = 1\n", "python")
+
+        review = mock_review_repository.update.await_args[0][0]
+        assert review.status == "rejected"
+        assert review.timings.parse_failures == 1
+        assert review.timings.time_to_first_token_seconds is None
+        assert metrics.parse_failures.value(**labels) == failures_before + 1
+
+    async def test_cache_hits_are_timed(self, ia_tasks, mock_review_repository):
+        ia_tasks.review_cache.get.return_value = (
+            ia_tasks._parse_code_review(REVIEW_JSON, "python", MagicMock())
+        )
+
+        await ia_tasks.process_review_with_agent("review_id", "x = 1\n", "python")
+
+        review = mock_review_repository.update.await_args[0][0]
+        assert review.timings.source == "review_cache"
+        assert review.timings.llm_calls == 0
+
+
+@asynccontextmanager
+async def _nothing():
+    yield
+
+
+class TestMetricsEndpoint:
+    """Tests for GET /metrics of the API."""
+
+    def test_metrics_are_served(self, monkeypatch):
+        routes = MainRoutes()
+        routes.metrics.review_submitted("python", "pending")
+        app = FastAPI()
+        app.include_router(routes.router, prefix="/api")
+
+        response = TestClient(app).get("/api/metrics")
+
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/plain")
+        assert 'reviews_submitted_total{language="python",status="pending"}' in (
+            response.text
+        )
+
+        monkeypatch.setattr(routes.settings, "METRICS_ENABLED", False)
+        assert TestClient(app).get("/api/metrics").status_code == 404
+
+
+@pytest.mark.asyncio
+class TestWorkerMetricsServer:
+    """Tests for the metrics server of the worker process."""
+
+    async def test_serves_metrics(self):
+        server = await start_metrics_server(0, lambda: "up 1\n", host="127.0.0.1")
+        port = server.sockets[0].getsockname()[1]
+        try:
+            responses = []
+            for path in ("/metrics", "/other"):
+                reader, writer = await asyncio.open_connection("127.0.0.1", port)
+                writer.write(f"GET {path} HTTP/1.1\r\nHost: x\r\n\r\n".encode())
+                await writer.drain()
+                responses.append(await reader.read())
+                writer.close()
+        finally:
+            server.close()
+
+        assert responses[0].startswith(b"HTTP/1.1 200 OK")
+        assert responses[0].endswith(b"\r\n\r\nup 1\n")
+        assert responses[1].startswith(b"HTTP/1.1 404")
@@ -0,0 +1,245 @@
+#!/usr/bin/env python3
+"""
+Test module for the review scheduler.
+Tests fair-share and size-aware ordering of jobs and how workers claim them.
+"""
+
+from datetime import datetime, timedelta
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from pymongo.errors import OperationFailure
+
+from app.core.models.review import Review
+from app.core.models.review_job import JobStatus, ReviewJob
+from app.infrastructure.db.mongo.models import ReviewJob as MongoReviewJob
+from app.infrastructure.db.mongo.mongo_repository import MongoReviewJobRepository
+from app.infrastructure.jobs.worker import ReviewWorker
+from app.infrastructure.services.review_scheduler import ReviewScheduler
+from app.use_cases.review_job_use_case import ReviewJobUseCase
+
+NOW = datetime(2026, 1, 1, 12, 0, 0)
+
+
+def make_job(job_id, user, estimated_tokens=100, waited_seconds=0):
+    """Queued job of a user that became available waited_seconds ago."""
+    return ReviewJob(
+        id=job_id,
+        review_id=f"review-{job_id}",
+        user=user,
+        language="python",
+        estimated_tokens=estimated_tokens,
+        available_at=NOW - timedelta(seconds=waited_seconds),
+        created_at=NOW - timedelta(seconds=waited_seconds),
+    )
+
+
+class TestReviewScheduler:
+    """Test cases for ReviewScheduler.order"""
+
+    def test_users_take_turns(self):
+        scheduler = ReviewScheduler(user_max_in_flight=10, aging_tokens_per_second=0)
+        bulk = [make_job(f"bulk-{i}", "bulk", waited_seconds=60) for i in range(5)]
+        other = [make_job("alice-0", "alice"), make_job("bob-0", "bob")]
+
+        ordered = scheduler.order(bulk + other, {}, NOW, limit=4)
+
+        assert sorted(job.user for job in ordered[:3]) == ["alice", "bob", "bulk"]
+        assert ordered[3].user == "bulk"
+
+    def test_least_loaded_user_goes_first(self):
+        scheduler = ReviewScheduler(user_max_in_flight=10, aging_tokens_per_second=0)
+        candidates = [
+            make_job("bulk-0", "bulk", 10),
+            make_job("alice-0", "alice", 5000),
+        ]
+
+        ordered = scheduler.order(candidates, {"bulk": 3}, NOW, limit=2)
+
+        assert [job.id for job in ordered] == ["alice-0", "bulk-0"]
+
+    def test_users_at_the_limit_are_skipped(self):
+        scheduler = ReviewScheduler(user_max_in_flight=2, aging_tokens_per_second=0)
+        candidates = [make_job(f"bulk-{i}", "bulk") for i in range(3)]
+
+        assert scheduler.order(candidates, {"bulk": 2}, NOW, limit=3) == []
+        assert len(scheduler.order(candidates, {"bulk": 1}, NOW, limit=3)) == 1
+
+    def test_smaller_jobs_first(self):
+        scheduler = ReviewScheduler(user_max_in_flight=10, aging_tokens_per_second=0)
+        candidates = [make_job("large", "alice", 9000), make_job("small", "bob", 200)]
+
+        ordered = scheduler.order(candidates, {}, NOW, limit=2)
+
+        assert [job.id for job in ordered] == ["small", "large"]
+
+    def test_waiting_jobs_age_ahead_of_small_ones(self):
+        scheduler = ReviewScheduler(user_max_in_flight=10, aging_tokens_per_second=100)
+        candidates = [
+            make_job("large", "alice", 9000, waited_seconds=120),
+            make_job("small", "bob", 200),
+        ]
+
+        ordered = scheduler.order(candidates, {}, NOW, limit=2)
+
+        assert [job.id for job in ordered] == ["large", "small"]
+
+    def test_bulk_account_does_not_delay_other_users(self):
+        """Simulated queue: two workers, one account submitting 40 reviews in bulk."""
+        scheduler = ReviewScheduler(user_max_in_flight=1, aging_tokens_per_second=50)
+        queue = [make_job(f"bulk-{i}", "bulk", 3000) for i in range(40)]
+        queue += [make_job(f"user{i}-0", f"user{i}", 1000) for i in range(6)]
+
+        finished_at = {}
+        for tick in range(len(queue)):
+            running = scheduler.order(queue, {}, NOW + timedelta(seconds=tick), 2)
+            for job in running:
+                finished_at[job.id] = tick
+                queue.remove(job)
+            if not queue:
+                break
+
+        normal = sorted(finished_at[f"user{i}-0"] for i in range(6))
+        assert normal[len(normal) // 2] <= 3
+
+
+@pytest.mark.asyncio
+class TestScheduledClaim:
+    """Test cases for claiming jobs in scheduler order"""
+
+    @pytest.fixture
+    def job_repository(self):
+        repository = AsyncMock()
+        repository.find_claimable.return_value = [
+            make_job("bulk-0", "bulk", 100, waited_seconds=60),
+            make_job("alice-0", "alice", 100),
+        ]
+        repository.count_in_flight_by_user.return_value = {"bulk": 1}
+        return repository
+
+    async def test_claims_the_scheduled_job(self, job_repository):
+        job_repository.claim_by_id.side_effect = lambda job_id, *_: make_job(
+            job_id, "alice"
+        )
+        use_case = ReviewJobUseCase(job_repository, ReviewScheduler(4, 0))
+
+        job = await use_case.claim_job("worker-0", 60)
+
+        assert job.id == "alice-0"
+        job_repository.claim_by_id.assert_awaited_once_with("alice-0", "worker-0", 60)
+        job_repository.claim.assert_not_awaited()
+
+    async def test_tries_the_next_job_when_one_was_taken(self, job_repository):
+        job_repository.claim_by_id.side_effect = [None, make_job("bulk-0", "bulk")]
+        use_case = ReviewJobUseCase(job_repository, ReviewScheduler(4, 0))
+
+        job = await use_case.claim_job("worker-0", 60)
+
+        assert job.id == "bulk-0"
+        assert job_repository.claim_by_id.await_count == 2
+
+    async def test_nothing_to_claim(self, job_repository):
+        job_repository.find_claimable.return_value = []
+        use_case = ReviewJobUseCase(job_repository, ReviewScheduler())
+
+        assert await use_case.claim_job("worker-0", 60) is None
+        job_repository.claim_by_id.assert_not_awaited()
+
+    async def test_without_scheduler_claims_the_oldest_job(self, job_repository):
+        use_case = ReviewJobUseCase(job_repository)
+
+        await use_case.claim_job("worker-0", 60)
+
+        job_repository.claim.assert_awaited_once_with("worker-0", 60)
+        job_repository.find_claimable.assert_not_awaited()
+
+    async def test_enqueue_copies_the_review_size(self, job_repository):
+        use_case = ReviewJobUseCase(job_repository)
+        review = Review(
+            id="review_id",
+            user="test_user_id",
+            language="python",
+            code_submission="print('hello')",
+            estimated_tokens=321,
+        )
+
+        await use_case.enqueue_review(review, max_attempts=3)
+
+        assert job_repository.enqueue.await_args[0][0].estimated_tokens == 321
+
+    async def test_old_servers_group_jobs_with_push(self, monkeypatch):
+        """Servers without $firstN (before MongoDB 5.2) get $push and $slice."""
+        pipelines = []
+
+        def aggregate(pipeline, projection_model=None):
+            pipelines.append(pipeline)
+            cursor = MagicMock()
+            if "$firstN" in str(pipeline):
+                cursor.to_list = AsyncMock(
+                    side_effect=OperationFailure("Unrecognized accumulator $firstN")
+                )
+            else:
+                cursor.to_list = AsyncMock(return_value=[])
+            return cursor
+
+        monkeypatch.setattr(MongoReviewJob, "aggregate", aggregate)
+        monkeypatch.setattr(MongoReviewJobRepository, "_first_n_supported", True)
+        repository = MongoReviewJobRepository(AsyncMock())
+
+        assert await repository.find_claimable(2, 10) == []
+        assert await repository.find_claimable(2, 10) == []
+
+        # $firstN is only tried once
+        assert ["$firstN" in str(pipeline) for pipeline in pipelines] == [
+            True,
+            False,
+            False,
+        ]
+        assert {"$set": {"jobs": {"$slice": ["$jobs", 2]}}} in pipelines[-1]
+
+
+@pytest.mark.asyncio
+class TestQueueWait:
+    """Test cases for recording how long reviews wait for a worker"""
+
+    @pytest.fixture
+    def worker(self, mock_review_repository):
+        worker = ReviewWorker(
+            mock_review_repository, AsyncMock(), AsyncMock(), AsyncMock(), 1
+        )
+        worker.ia_tasks = AsyncMock()
+        return worker
+
+    def leased_job(self, attempts=1):
+        job = make_job("job_id", "test_user_id", waited_seconds=30)
+        return job.model_copy(
+            update={"status": JobStatus.LEASED, "attempts": attempts, "updated_at": NOW}
+        )
+
+    async def test_queue_wait_is_recorded(self, worker, mock_review_repository):
+        review = Review(
+            id="review-job_id",
+            user="test_user_id",
+            language="python",
+            code_submission="print('hello')",
+        )
+        mock_review_repository.find_by_id.return_value = review
+
+        await worker.process_job(self.leased_job(), "worker-0")
+
+        saved = mock_review_repository.update.await_args[0][0]
+        assert saved.queue_wait_seconds == 30
+
+    async def test_retries_keep_the_first_wait(self, worker, mock_review_repository):
+        review = Review(
+            id="review-job_id",
+            user="test_user_id",
+            language="python",
+            code_submission="print('hello')",
+            queue_wait_seconds=5,
+        )
+        mock_review_repository.find_by_id.return_value = review
+
+        await worker.process_job(self.leased_job(attempts=2), "worker-0")
+
+        mock_review_repository.update.assert_not_awaited()
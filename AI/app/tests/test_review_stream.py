@@ -0,0 +1,169 @@
+#!/usr/bin/env python3
+"""
+Test module for review streaming.
+Tests token batching in the worker and the Server-Sent Events stream.
+"""
+
+import json
+from datetime import datetime
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from app.core.models.review import Review, ReviewStreamEvent
+from app.infrastructure.api.main_routes import MainRoutes
+from app.infrastructure.services.review_stream import ReviewStreamPublisher
+from app.infrastructure.utils.sse import format_sse
+
+
+@pytest.fixture
+def publisher():
+    """Review stream publisher with a mocked repository."""
+    repository = AsyncMock()
+    repository.last_seq.return_value = 3
+    return ReviewStreamPublisher(repository)
+
+
+def stored_events(publisher):
+    """Events written to the mocked repository, in order."""
+    return [
+        call.args[0][0]
+        for call in publisher.review_stream_repository.append.await_args_list
+    ]
+
+
+class TestFormatSse:
+    """Tests for Server-Sent Events formatting."""
+
+    def test_multi_line_data(self):
+        """Every payload line gets its own data field."""
+        assert format_sse("token", "a\nb", 7) == (
+            "event: token\nid: 7\ndata: a\ndata: b\n\n"
+        )
+
+
+@pytest.mark.asyncio
+class TestReviewStreamPublisher:
+    """Tests for publishing review progress."""
+
+    async def test_tokens_are_batched_before_status(self, publisher):
+        """Buffered tokens are written as one event before the next status."""
+        stream = await publisher.open("review_id")
+        for token in ('{"overall', '_score"', ": 8}"):
+            stream.push(token)
+        await stream.status("completed")
+
+        events = stored_events(publisher)
+        assert [event.seq for event in events] == [4, 5]
+        assert json.loads(events[0].data) == {"text": '{"overall_score": 8}'}
+        assert json.loads(events[1].data) == {"status": "completed"}
+        assert events[1].expires_at > datetime.utcnow()
+
+    async def test_taken_seq_is_renumbered(self, publisher):
+        """An event whose seq another writer took is written after it."""
+        repository = publisher.review_stream_repository
+        stream = await publisher.open("review_id")
+        # The API stored a cancelled status as seq 4 in the meantime
+        repository.append.side_effect = [False, True, True]
+        repository.last_seq.return_value = 4
+
+        stream.push("token")
+        await stream.flush()
+        await stream.status("completed")
+
+        assert [event.seq for event in stored_events(publisher)] == [4, 5, 6]
+        assert stream.seq == 6
+        assert publisher.stats() == {"events": 2, "errors": 0}
+
+    async def test_repository_errors_are_dropped(self, publisher):
+        """A failing stream never fails the review."""
+        publisher.review_stream_repository.append.side_effect = RuntimeError("down")
+
+        await publisher.publish_status("review_id", "in_progress")
+
+        assert publisher.stats() == {"events": 0, "errors": 1}
+
+
+@pytest.mark.asyncio
+class TestReviewEventStream:
+    """Tests for the SSE review stream."""
+
+    @pytest.fixture
+    def routes(self):
+        """Main routes with mocked review and stream repositories."""
+        routes = MainRoutes()
+        routes.review_use_case = AsyncMock()
+        routes.review_stream_repository = AsyncMock()
+        return routes
+
+    @pytest.fixture
+    def request_mock(self):
+        """Connected client request."""
+        request = MagicMock()
+        request.is_disconnected = AsyncMock(return_value=False)
+        return request
+
+    @staticmethod
+    def review(status):
+        return Review(
+            id="review_id",
+            user="test_user_id",
+            language="python",
+            code_submission="print('hello')",
+            status=status,
+        )
+
+    async def test_streams_events_until_terminal_status(self, routes, request_mock):
+        """Worker events are forwarded, then the final review is sent."""
+        routes.review_stream_repository.find_after.return_value = [
+            ReviewStreamEvent(
+                review_id="review_id",
+                seq=1,
+                event="status",
+                data='{"status": "in_progress"}',
+            ),
+            ReviewStreamEvent(
+                review_id="review_id", seq=2, event="token", data='{"text": "{"}'
+            ),
+            ReviewStreamEvent(
+                review_id="review_id",
+                seq=3,
+                event="status",
+                data='{"status": "rejected"}',
+            ),
+        ]
+        routes.review_use_case.get_review_by_id.return_value = self.review("rejected")
+
+        messages = [
+            message
+            async for message in routes._review_events(
+                request_mock, self.review("pending"), 0
+            )
+        ]
+
+        assert [message.split("\n")[0] for message in messages] == [
+            "event: status",
+            "event: status",
+            "event: token",
+            "event: status",
+            "event: review",
+        ]
+        assert "id: 2" in messages[2]
+        assert json.loads(messages[-1].split("data: ")[1]) == {
+            "status": "rejected",
+            "code_review": None,
+        }
+
+    async def test_finished_review_is_sent_immediately(self, routes, request_mock):
+        """A review that is already completed doesn't wait for events."""
+        routes.review_use_case.get_review_by_id.return_value = self.review("completed")
+
+        messages = [
+            message
+            async for message in routes._review_events(
+                request_mock, self.review("completed"), 0
+            )
+        ]
+
+        assert len(messages) == 2
+        routes.review_stream_repository.find_after.assert_not_awaited()
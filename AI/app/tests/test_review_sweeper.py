@@ -0,0 +1,217 @@
+#!/usr/bin/env python3
+"""
+Test module for review deadlines.
+Tests the per-attempt job timeout of the worker and the stuck review sweeper.
+"""
+
+import asyncio
+import threading
+import uuid
+from datetime import datetime, timedelta
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from app.core.models.llm_endpoint import LLMEndpoint
+from app.core.models.review import Review
+from app.core.models.review_job import JobStatus, ReviewJob
+from app.infrastructure.jobs.review_sweeper import ReviewSweeper
+from app.infrastructure.jobs.worker import ReviewWorker
+from app.infrastructure.services.agent_executor import AgentExecutor
+from app.infrastructure.services.resilient_agent import ResilientAgent
+from app.use_cases.review_job_use_case import ReviewJobUseCase
+from app.use_cases.review_use_case import ReviewUseCase
+
+NOW = datetime.utcnow()
+
+
+def make_review(attempts=0, status="in_progress"):
+    return Review(
+        id="review_id",
+        user="test_user_id",
+        language="python",
+        code_submission="print('hello')",
+        status=status,
+        attempts=attempts,
+        deadline_at=NOW - timedelta(minutes=1),
+    )
+
+
+def make_job(**update):
+    return ReviewJob(
+        id="job_id",
+        review_id="review_id",
+        user="test_user_id",
+        language="python",
+        status=JobStatus.LEASED,
+        attempts=1,
+        max_attempts=3,
+        worker_id="worker-0",
+    ).model_copy(update=update)
+
+
+@pytest.mark.asyncio
+class TestJobTimeout:
+    """Tests for the timeout enforced around a job attempt."""
+
+    async def test_attempt_over_its_deadline_is_failed(self, mock_review_repository):
+        """A hung agent call is aborted and the job retried."""
+        mock_review_repository.find_by_id.return_value = make_review(status="pending")
+        worker = ReviewWorker(
+            mock_review_repository, AsyncMock(), AsyncMock(), AsyncMock()
+        )
+        worker.ia_tasks = AsyncMock()
+        aborted = asyncio.Event()
+
+        async def hung_review(*args):
+            try:
+                await asyncio.sleep(60)
+            except asyncio.CancelledError:
+                aborted.set()
+                raise
+
+        worker.ia_tasks.process_review_with_agent.side_effect = hung_review
+        job_repository = worker.review_job_use_case.review_job_repository
+        job_repository.nack.return_value = make_job(status=JobStatus.QUEUED)
+
+        await asyncio.wait_for(
+            worker.process_job(make_job(timeout_seconds=0.05), "worker-0"), 5
+        )
+
+        assert aborted.is_set()
+        assert "Deadline" in job_repository.nack.await_args[0][2]
+        job_repository.ack.assert_not_awaited()
+
+    async def test_timed_out_blocking_call_frees_its_slots(
+        self, mock_review_repository
+    ):
+        """A timed out agent thread frees its slots once it returns."""
+        mock_review_repository.find_by_id.return_value = make_review(status="pending")
+        worker = ReviewWorker(
+            mock_review_repository, AsyncMock(), AsyncMock(), AsyncMock()
+        )
+        worker.ia_tasks = AsyncMock()
+        endpoint = LLMEndpoint(
+            model="groq/model",
+            api_model="model",
+            base_url=f"http://{uuid.uuid4().hex}",
+            max_concurrency=1,
+        )
+        provider_answered = threading.Event()
+        endpoint_agent = MagicMock()
+        endpoint_agent.chat.side_effect = lambda *args, **kwargs: (
+            provider_answered.wait(5) and "review"
+        )
+        agent = ResilientAgent([endpoint], lambda endpoint: endpoint_agent)
+        executor = AgentExecutor()
+
+        async def blocking_review(*args):
+            await executor.run(agent.chat, "code")
+
+        worker.ia_tasks.process_review_with_agent.side_effect = blocking_review
+        job_repository = worker.review_job_use_case.review_job_repository
+        job_repository.nack.return_value = make_job(status=JobStatus.QUEUED)
+
+        await asyncio.wait_for(
+            worker.process_job(make_job(timeout_seconds=0.05), "worker-0"), 5
+        )
+
+        # The thread can't be interrupted, it holds its slots until it returns
+        assert executor.stats()["in_flight"] == 1
+        assert agent.balancer.stats()[endpoint.name]["in_flight"] == 1
+        provider_answered.set()
+        for _ in range(100):
+            if executor.stats()["in_flight"] == 0:
+                break
+            await asyncio.sleep(0.01)
+        assert executor.stats()["in_flight"] == 0
+        assert agent.balancer.stats()[endpoint.name]["in_flight"] == 0
+
+
+@pytest.fixture
+def sweeper(mock_review_repository):
+    """Sweeper with mocked repositories that wins every deadline update."""
+    job_repository = AsyncMock()
+    job_repository.enqueue.side_effect = lambda job: job.model_copy(
+        update={"id": "new_job_id"}
+    )
+    mock_review_repository.extend_deadline.return_value = True
+    return ReviewSweeper(
+        ReviewUseCase(mock_review_repository),
+        ReviewJobUseCase(job_repository),
+        AsyncMock(),
+    )
+
+
+@pytest.mark.asyncio
+class TestReviewSweeper:
+    """Tests for recovering reviews stuck past their deadline."""
+
+    async def test_orphaned_review_is_requeued(self, sweeper, mock_review_repository):
+        """A review without a job runs again with the attempts it has left."""
+        mock_review_repository.find_overdue.return_value = [make_review(attempts=1)]
+        job_repository = sweeper.review_job_use_case.review_job_repository
+        job_repository.find_by_review.return_value = []
+
+        stats = await sweeper.sweep()
+
+        assert stats == {"overdue": 1, "requeued": 1, "rejected": 0}
+        job = job_repository.enqueue.await_args[0][0]
+        assert job.review_id == "review_id"
+        assert job.max_attempts == sweeper.settings.JOB_MAX_ATTEMPTS - 1
+        assert job.timeout_seconds == sweeper.settings.REVIEW_JOB_TIMEOUT
+
+    async def test_dead_last_attempt_rejects_review(
+        self, sweeper, mock_review_repository
+    ):
+        """A job whose last attempt died with its worker is failed with its review."""
+        max_attempts = sweeper.settings.JOB_MAX_ATTEMPTS
+        mock_review_repository.find_overdue.return_value = [
+            make_review(attempts=max_attempts)
+        ]
+        job_repository = sweeper.review_job_use_case.review_job_repository
+        job_repository.find_by_review.return_value = [
+            make_job(
+                attempts=max_attempts,
+                max_attempts=max_attempts,
+                lease_expires_at=NOW - timedelta(minutes=5),
+            )
+        ]
+
+        stats = await sweeper.sweep()
+
+        assert stats["rejected"] == 1
+        job_repository.fail_expired.assert_awaited_once()
+        job_repository.enqueue.assert_not_awaited()
+        assert mock_review_repository.update.await_args[0][0].status == "rejected"
+        sweeper.review_stream.publish_status.assert_awaited_once_with(
+            "review_id", "rejected"
+        )
+
+    async def test_running_review_is_left_alone(self, sweeper, mock_review_repository):
+        """An overdue review whose job is still leased only gets a new deadline."""
+        mock_review_repository.find_overdue.return_value = [make_review(attempts=1)]
+        job_repository = sweeper.review_job_use_case.review_job_repository
+        job_repository.find_by_review.return_value = [
+            make_job(lease_expires_at=NOW + timedelta(minutes=1))
+        ]
+
+        stats = await sweeper.sweep()
+
+        assert stats == {"overdue": 1, "requeued": 0, "rejected": 0}
+        mock_review_repository.extend_deadline.assert_awaited_once()
+        job_repository.enqueue.assert_not_awaited()
+        mock_review_repository.update.assert_not_awaited()
+
+    async def test_review_handled_by_another_worker(
+        self, sweeper, mock_review_repository
+    ):
+        """Only the worker moving the deadline first handles a review."""
+        mock_review_repository.find_overdue.return_value = [make_review()]
+        mock_review_repository.extend_deadline.return_value = False
+        job_repository = sweeper.review_job_use_case.review_job_repository
+
+        stats = await sweeper.sweep()
+
+        assert stats["overdue"] == 0
+        job_repository.find_by_review.assert_not_awaited()
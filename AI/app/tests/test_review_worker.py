@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+Test module for the review worker.
+Tests how claimed review jobs are acked, retried and failed.
+"""
+
+from datetime import datetime
+from unittest.mock import AsyncMock
+
+import pytest
+
+from app.core.models.review import Review
+from app.core.models.review_job import JobStatus, ReviewJob
+from app.infrastructure.jobs.worker import ReviewWorker
+from app.infrastructure.services.resilient_agent import LLMUnavailableError
+
+
+@pytest.fixture
+def review_job():
+    """Leased review job fixture."""
+    return ReviewJob(
+        id="job_id",
+        review_id="review_id",
+        user="test_user_id",
+        language="python",
+        status=JobStatus.LEASED,
+        attempts=1,
+        max_attempts=3,
+        worker_id="worker-0",
+    )
+
+
+@pytest.fixture
+def review():
+    """Pending review fixture."""
+    return Review(
+        id="review_id",
+        user="test_user_id",
+        language="python",
+        code_submission="print('hello')",
+        created_at=datetime.now(),
+    )
+
+
+@pytest.fixture
+def worker(mock_review_repository, review):
+    """Review worker with mocked repositories and agent task."""
+    mock_review_repository.find_by_id.return_value = review
+    job_repository = AsyncMock()
+    worker = ReviewWorker(
+        mock_review_repository,
+        job_repository,
+        AsyncMock(),
+        AsyncMock(),
+        concurrency=1,
+    )
+    worker.ia_tasks = AsyncMock()
+    return worker
+
+
+@pytest.mark.asyncio
+class TestReviewWorker:
+    """Tests for job processing in the review worker."""
+
+    async def test_successful_job_is_acked(self, worker, review_job):
+        """A job whose review is processed is acked."""
+        await worker.process_job(review_job, "worker-0")
+
+        worker.ia_tasks.process_review_with_agent.assert_awaited_once_with(
+            "review_id", "print('hello')", "python"
+        )
+        worker.review_job_use_case.review_job_repository.ack.assert_awaited_once_with(
+            "job_id", "worker-0"
+        )
+
+    async def test_failed_job_is_requeued(self, worker, review_job):
+        """A job that raises is nacked with a backoff and its review is pending again."""
+        job_repository = worker.review_job_use_case.review_job_repository
+        worker.ia_tasks.process_review_with_agent.side_effect = RuntimeError("boom")
+        job_repository.nack.return_value = review_job.model_copy(
+            update={"status": JobStatus.QUEUED}
+        )
+
+        await worker.process_job(review_job, "worker-0")
+
+        job_repository.nack.assert_awaited_once_with(
+            "job_id", "worker-0", "boom", worker.settings.JOB_RETRY_DELAY
+        )
+        job_repository.ack.assert_not_awaited()
+
+        updated_review = worker.review_use_case.review_repository.update.await_args[0][0]
+        assert updated_review.status == "pending"
+        worker.ia_tasks.review_stream.publish_status.assert_awaited_once_with(
+            "review_id", "pending"
+        )
+
+    async def test_exhausted_job_rejects_review(self, worker, review_job, review):
+        """A job that runs out of attempts marks its review as rejected."""
+        job_repository = worker.review_job_use_case.review_job_repository
+        worker.ia_tasks.process_review_with_agent.side_effect = RuntimeError("boom")
+        job_repository.nack.return_value = review_job.model_copy(
+            update={"status": JobStatus.FAILED, "attempts": 3}
+        )
+
+        await worker.process_job(review_job, "worker-0")
+
+        updated_review = worker.review_use_case.review_repository.update.await_args[0][0]
+        assert updated_review.status == "rejected"
+
+    async def test_unavailable_llm_delays_retry(self, worker, review_job):
+        """A job failing on open circuits isn't retried before they may close."""
+        job_repository = worker.review_job_use_case.review_job_repository
+        worker.ia_tasks.process_review_with_agent.side_effect = LLMUnavailableError(
+            "down", retry_after=42.5
+        )
+        job_repository.nack.return_value = review_job.model_copy(
+            update={"status": JobStatus.QUEUED}
+        )
+
+        await worker.process_job(review_job, "worker-0")
+
+        assert job_repository.nack.await_args[0][3] == 43
@@ -0,0 +1,186 @@
+#!/usr/bin/env python3
+"""
+Test module for the review token budget.
+Tests token estimation, code compaction and refusing submissions over budget.
+"""
+
+from unittest.mock import AsyncMock
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.infrastructure.api.main_routes import MainRoutes
+from app.infrastructure.dependencies import limiter
+from app.infrastructure.services.review_token_budget import (
+    ReviewTokenBudget,
+    TokenBudgetExceededError,
+)
+from app.infrastructure.utils.code_compactor import compact_code
+from app.infrastructure.utils.token_estimator import estimate_tokens
+
+PYTHON_CODE = '''#!/usr/bin/env python
+import os  # needed for getcwd
+
+
+def cwd():
+    """Current directory
+
+    of the process"""
+    # Ask the OS
+    marker = "# not a comment"
+    return os.getcwd()  # absolute path
+'''
+
+JS_CODE = """// Entry point
+const url = "http://example.com"; /* the
+base URL */ const greeting = `hello
+
+world`;
+"""
+
+
+class TestEstimateTokens:
+    """Test cases for estimate_tokens"""
+
+    def test_empty(self):
+        assert estimate_tokens("") == 0
+
+    def test_grows_with_text(self):
+        line = "def review(code, language):\n    return agent.chat(code)\n"
+        assert 0 < estimate_tokens(line) < len(line)
+        assert estimate_tokens(line * 10) == 10 * estimate_tokens(line)
+
+    def test_long_identifiers_cost_more(self):
+        assert estimate_tokens("a") < estimate_tokens("averyveryverylongidentifier")
+
+
+class TestCompactCode:
+    """Test cases for compact_code"""
+
+    def test_python_comments_and_blank_lines(self):
+        compacted = compact_code(PYTHON_CODE, "python")
+
+        assert compacted.code == (
+            "import os\n"
+            "def cwd():\n"
+            '    """Current directory\n'
+            "\n"
+            '    of the process"""\n'
+            '    marker = "# not a comment"\n'
+            "    return os.getcwd()"
+        )
+        assert compacted.line_map == [2, 5, 6, 7, 8, 10, 11]
+        assert compacted.original_lines(2, 7) == (5, 11)
+
+    def test_form_feeds_dont_shift_lines(self):
+        compacted = compact_code("x = 1  # one\n\x0cy = 2  # two\n", "python")
+
+        assert compacted.code == "x = 1\n\x0cy = 2"
+        assert compacted.line_map == [1, 2]
+
+    def test_c_style_comments(self):
+        compacted = compact_code(JS_CODE, "javascript")
+
+        lines = compacted.code.split("\n")
+        assert lines[0] == 'const url = "http://example.com";'
+        assert lines[1] == " const greeting = `hello"
+        assert lines[2] == ""  # Inside the template literal
+        assert compacted.line_map == [2, 3, 4, 5]
+
+    def test_unknown_language_only_drops_blank_lines(self):
+        compacted = compact_code("a # b\n\n  c\n", "cobol")
+
+        assert compacted.code == "a # b\n  c"
+        assert compacted.line_map == [1, 3]
+
+    def test_invalid_python_falls_back_to_scanner(self):
+        compacted = compact_code("def broken(:\n    # comment\n    pass\n", "python")
+
+        assert compacted.code == "def broken(:\n    pass"
+
+
+class TestReviewTokenBudget:
+    """Test cases for ReviewTokenBudget"""
+
+    def test_prepare_estimates_instructions_and_code(self):
+        budget = ReviewTokenBudget()
+
+        prompt = budget.prepare(PYTHON_CODE, "python")
+
+        assert prompt.instruction_tokens > 0
+        assert prompt.code_tokens == estimate_tokens(prompt.code.code)
+        assert prompt.code_tokens < estimate_tokens(PYTHON_CODE)
+
+    def test_check_refuses_over_budget(self, monkeypatch):
+        budget = ReviewTokenBudget()
+        prompt = budget.prepare(PYTHON_CODE, "python")
+        monkeypatch.setattr(
+            budget.settings, "REVIEW_MAX_TOTAL_TOKENS", prompt.estimated_tokens - 1
+        )
+
+        with pytest.raises(TokenBudgetExceededError):
+            budget.check(prompt)
+
+    def test_chunks_fit_the_request_budget(self, monkeypatch):
+        budget = ReviewTokenBudget()
+        prompt = budget.prepare(PYTHON_CODE * 50, "python")
+        monkeypatch.setattr(
+            budget.settings,
+            "REVIEW_MAX_INPUT_TOKENS",
+            prompt.instruction_tokens + 100,
+        )
+
+        max_chars = budget.chunk_max_chars(prompt)
+
+        assert max_chars < budget.settings.REVIEW_CHUNK_MAX_CHARS
+        assert estimate_tokens(prompt.code.code[:max_chars]) <= 110
+
+
+class TestTokenBudgetEndpoint:
+    """Tests for refusing reviews over the token budget."""
+
+    @pytest.fixture
+    def client(self, mock_user, monkeypatch):
+        routes = MainRoutes()
+        routes.review_use_case = AsyncMock()
+        routes.review_job_use_case = AsyncMock()
+        routes.review_cache = AsyncMock()
+        routes.review_cache.get.return_value = None
+        monkeypatch.setattr(routes.settings, "REVIEW_MAX_TOTAL_TOKENS", 2000)
+
+        app = FastAPI()
+        # Every MainRoutes instance registers the route limits again
+        monkeypatch.setattr(limiter, "enabled", False)
+        app.state.limiter = limiter
+        app.include_router(routes.router, prefix="/api")
+        app.dependency_overrides[
+            routes.auth_routes.get_current_active_user_dependency
+        ] = lambda: mock_user
+        return routes, TestClient(app)
+
+    def test_oversized_review_is_refused(self, client):
+        routes, client = client
+
+        response = client.post(
+            "/api/reviews",
+            json={"language": "python", "code_submission": "x = 1\n" * 2000},
+        )
+
+        assert response.status_code == 413
+        routes.review_use_case.create_review.assert_not_awaited()
+
+    def test_estimate_is_recorded(self, client):
+        routes, client = client
+        routes.review_use_case.create_review.side_effect = (
+            lambda review: review.model_copy(update={"id": "review_id"})
+        )
+
+        response = client.post(
+            "/api/reviews",
+            json={"language": "python", "code_submission": "print('hello')"},
+        )
+
+        assert response.status_code == 200
+        review = routes.review_use_case.create_review.await_args[0][0]
+        assert review.estimated_tokens > estimate_tokens("print('hello')")
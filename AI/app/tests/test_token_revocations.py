@@ -0,0 +1,222 @@
+#!/usr/bin/env python3
+"""
+Test module for token revocation.
+Tests the in-memory set of revoked token ids and how the authenticator uses it.
+"""
+
+import hashlib
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from fastapi import HTTPException
+from jose import jwt
+from passlib.context import CryptContext
+from pymongo.errors import DuplicateKeyError
+
+from app.infrastructure.db.mongo.database import migrate_blacklist_tokens
+from app.infrastructure.db.mongo.models import BlackListToken
+from app.infrastructure.services.authenticator_jwt import AuthenticatorJWT, token_id
+from app.infrastructure.services.token_revocations import (
+    REFRESH_OVERLAP,
+    TokenRevocations,
+)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def revocation(jti, expire_in=timedelta(minutes=30)):
+    return SimpleNamespace(jti=jti, expire=datetime.utcnow() + expire_in)
+
+
+class LegacyBlacklist:
+    """Blacklist collection of entries storing the whole token."""
+
+    def __init__(self, tokens):
+        self.entries = [{"_id": index, "token": t} for index, t in enumerate(tokens)]
+        self.indexes = {"_id_": {}, "token_1": {"unique": True}, "expire_1": {}}
+
+    async def index_information(self):
+        return dict(self.indexes)
+
+    async def drop_index(self, name):
+        del self.indexes[name]
+
+    async def find(self, query):
+        for entry in list(self.entries):
+            if "token" in entry:
+                yield entry
+
+    async def update_one(self, query, update):
+        entry = next(e for e in self.entries if e["_id"] == query["_id"])
+        updated = {**entry, **update["$set"]}
+        updated.pop("token")
+        # A unique index counts entries without the field as token None
+        if "token_1" in self.indexes and any(
+            "token" not in other for other in self.entries if other is not entry
+        ):
+            raise DuplicateKeyError("token_1 dup key: { token: null }")
+        entry.clear()
+        entry.update(updated)
+
+
+@pytest.fixture
+def blacklist(monkeypatch):
+    """Blacklist collection mocked at the model."""
+    find_revoked_since = AsyncMock(return_value=[])
+    add_token = AsyncMock()
+    monkeypatch.setattr(BlackListToken, "find_revoked_since", find_revoked_since)
+    monkeypatch.setattr(BlackListToken, "add_token", add_token)
+    return SimpleNamespace(find_revoked_since=find_revoked_since, add_token=add_token)
+
+
+@pytest.fixture
+def revocations(blacklist, monkeypatch):
+    """Empty revocation set with a controllable clock."""
+    revocations = TokenRevocations()
+    revocations.clear()
+    monkeypatch.setattr(revocations, "clock", FakeClock())
+    monkeypatch.setattr(revocations.settings, "TOKEN_REVOCATION_REFRESH_INTERVAL", 5)
+    yield revocations
+    revocations.clear()
+
+
+@pytest.mark.asyncio
+class TestTokenRevocations:
+    """Tests for the in-memory revocation set."""
+
+    async def test_checks_between_refreshes_do_no_io(self, revocations, blacklist):
+        """The blacklist is read once per refresh interval, not per check."""
+        blacklist.find_revoked_since.return_value = [revocation("revoked")]
+
+        assert await revocations.is_revoked("revoked")
+        for _ in range(10):
+            assert not await revocations.is_revoked("other")
+
+        blacklist.find_revoked_since.assert_awaited_once_with(None)
+
+    async def test_refresh_loads_new_revocations(self, revocations, blacklist):
+        """Revocations of other processes are seen after the interval."""
+        await revocations.refresh()
+        synced_at = revocations._synced_at
+        blacklist.find_revoked_since.return_value = [revocation("revoked")]
+
+        assert not await revocations.is_revoked("revoked")
+        revocations.clock.now = 5
+        assert await revocations.is_revoked("revoked")
+        blacklist.find_revoked_since.assert_awaited_with(synced_at - REFRESH_OVERLAP)
+
+    async def test_expired_revocations_are_dropped(self, revocations, blacklist):
+        """Entries of tokens that expired don't accumulate."""
+        await revocations.revoke("old", datetime.utcnow() - timedelta(seconds=1))
+        await revocations.revoke("current", datetime.utcnow() + timedelta(minutes=5))
+
+        await revocations.refresh()
+
+        assert revocations.stats()["revoked"] == 1
+        assert blacklist.add_token.await_count == 2
+
+    async def test_failed_refresh_keeps_the_set(self, revocations, blacklist):
+        """Known revocations still apply while the blacklist can't be read."""
+        blacklist.find_revoked_since.return_value = [revocation("revoked")]
+        await revocations.refresh()
+        blacklist.find_revoked_since.side_effect = RuntimeError("mongo down")
+
+        revocations.clock.now = 5
+        assert await revocations.is_revoked("revoked")
+        assert revocations.stats()["refresh_errors"] == 1
+
+
+@pytest.fixture
+def authenticator(revocations):
+    """JWT authenticator with the mocked blacklist."""
+    return AuthenticatorJWT(MagicMock(), CryptContext(schemes=["bcrypt"]), AsyncMock())
+
+
+@pytest.mark.asyncio
+class TestAuthenticatorRevocation:
+    """Tests for revoking tokens by id."""
+
+    async def test_logged_out_token_is_rejected(self, authenticator, blacklist):
+        """Only the id and expiry of a revoked token are stored."""
+        token = authenticator.create_access_token({"sub": "test_user"})
+        jti = jwt.get_unverified_claims(token)["jti"]
+        await authenticator.verify_token(token)
+
+        assert await authenticator.blacklist_token(token)
+
+        assert blacklist.add_token.await_args[0][0] == jti
+        with pytest.raises(HTTPException) as exc_info:
+            await authenticator.verify_token(token)
+        assert exc_info.value.detail == "Token has been revoked"
+
+    async def test_token_is_decoded_once(self, authenticator, monkeypatch):
+        """The revocation check reuses the claims verify_token decoded."""
+        token = authenticator.create_access_token({"sub": "test_user"})
+        decode = MagicMock(wraps=jwt.decode)
+        monkeypatch.setattr(jwt, "decode", decode)
+
+        assert (await authenticator.verify_token(token)).username == "test_user"
+
+        decode.assert_called_once()
+
+    async def test_tokens_get_distinct_ids(self, authenticator):
+        """Logging out one session leaves the others valid."""
+        first = authenticator.create_access_token({"sub": "test_user"})
+        second = authenticator.create_access_token({"sub": "test_user"})
+
+        assert token_id(first, jwt.get_unverified_claims(first)) != token_id(
+            second, jwt.get_unverified_claims(second)
+        )
+
+    async def test_forged_token_doesnt_revoke_its_jti(self, authenticator, blacklist):
+        """A token signed with another key is revoked by its hash, not its jti."""
+        token = authenticator.create_access_token({"sub": "test_user"})
+        jti = jwt.get_unverified_claims(token)["jti"]
+        forged = jwt.encode(
+            {"sub": "test_user", "jti": jti},
+            "not the secret key",
+            algorithm=authenticator.settings.HASH_ALGORITHM,
+        )
+
+        assert await authenticator.blacklist_token(forged)
+
+        revoked_id = blacklist.add_token.await_args[0][0]
+        assert revoked_id == hashlib.sha256(forged.encode()).hexdigest()
+        assert (await authenticator.verify_token(token)).username == "test_user"
+
+    def test_token_without_jti(self, authenticator):
+        """Tokens issued before they carried a jti are identified by their hash."""
+        token = jwt.encode(
+            {"sub": "test_user"},
+            authenticator.settings.SECRET_KEY,
+            algorithm=authenticator.settings.HASH_ALGORITHM,
+        )
+
+        assert token_id(token, jwt.get_unverified_claims(token)) == (
+            hashlib.sha256(token.encode()).hexdigest()
+        )
+
+
+@pytest.mark.asyncio
+class TestBlacklistMigration:
+    """Tests for the migration of entries storing the whole token."""
+
+    async def test_every_legacy_entry_is_migrated(self):
+        collection = LegacyBlacklist(["first-token", "second-token", "third-token"])
+
+        await migrate_blacklist_tokens({BlackListToken.Settings.name: collection})
+
+        assert [entry["jti"] for entry in collection.entries] == [
+            hashlib.sha256(token.encode()).hexdigest()
+            for token in ["first-token", "second-token", "third-token"]
+        ]
+        assert all("token" not in entry for entry in collection.entries)
+        assert set(collection.indexes) == {"_id_"}
@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""
+Test module for the user cache.
+Tests caching authenticated users by id, their expiry, eviction and invalidation.
+"""
+
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from fastapi import HTTPException
+from passlib.context import CryptContext
+
+from app.core.models.user import User
+from app.infrastructure.services.authenticator_jwt import AuthenticatorJWT
+from app.infrastructure.services.user_cache import UserCache
+
+
+def make_user(user_id="test_user_id", username="test_user"):
+    return User(
+        id=user_id,
+        username=username,
+        email="test@example.com",
+        hashed_password="hashed_password",
+    )
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def user_cache(monkeypatch):
+    """Empty user cache with a controllable clock."""
+    cache = UserCache()
+    cache.clear()
+    clock = FakeClock()
+    monkeypatch.setattr(cache, "clock", clock)
+    monkeypatch.setattr(cache.settings, "USER_CACHE_ENABLED", True)
+    monkeypatch.setattr(cache.settings, "USER_CACHE_TTL", 60)
+    monkeypatch.setattr(cache.settings, "USER_CACHE_MAX_ENTRIES", 2)
+    yield cache
+    cache.clear()
+
+
+class TestUserCache:
+    """Tests for the in-process user cache."""
+
+    def test_entries_expire(self, user_cache):
+        """A user is served until its TTL runs out."""
+        user_cache.set(make_user(), user_cache.generation())
+
+        user_cache.clock.now = 59
+        assert user_cache.get("test_user_id").username == "test_user"
+        user_cache.clock.now = 60
+        assert user_cache.get("test_user_id") is None
+
+    def test_least_recently_used_is_evicted(self, user_cache):
+        """Above the maximum size the user not used for longest goes first."""
+        user_cache.set(make_user("a"), user_cache.generation())
+        user_cache.set(make_user("b"), user_cache.generation())
+        user_cache.get("a")
+        user_cache.set(make_user("c"), user_cache.generation())
+
+        assert user_cache.get("b") is None
+        assert user_cache.get("a") is not None
+        assert user_cache.stats()["evictions"] == 1
+
+    def test_user_loaded_before_invalidation_is_dropped(self, user_cache):
+        """A user read before it was updated isn't cached."""
+        generation = user_cache.generation()
+        user_cache.set(make_user(), generation)
+        user_cache.invalidate("test_user_id")
+        user_cache.set(make_user(), generation)
+
+        assert user_cache.get("test_user_id") is None
+
+
+@pytest.fixture
+def authenticator(user_cache, mock_user_repository, monkeypatch):
+    """JWT authenticator whose tokens are never blacklisted."""
+    mock_user_repository.find_by_id.return_value = make_user()
+    authenticator = AuthenticatorJWT(
+        MagicMock(), CryptContext(schemes=["bcrypt"]), mock_user_repository
+    )
+    monkeypatch.setattr(
+        authenticator, "is_token_blacklisted", AsyncMock(return_value=False)
+    )
+    return authenticator
+
+
+@pytest.mark.asyncio
+class TestAuthenticatorUserCache:
+    """Tests for resolving the user of a token through the cache."""
+
+    async def test_user_is_read_once(self, authenticator, mock_user_repository):
+        """Requests with the same token read the user collection once."""
+        token = authenticator.create_access_token(
+            {"sub": "test_user", "uid": "test_user_id"}
+        )
+
+        for _ in range(3):
+            user = await authenticator.get_current_user(token)
+
+        assert user.id == "test_user_id"
+        mock_user_repository.find_by_id.assert_awaited_once_with("test_user_id")
+        mock_user_repository.find_by_username.assert_not_awaited()
+
+    async def test_token_without_user_id(self, authenticator, mock_user_repository):
+        """Tokens issued before they carried the user id still work."""
+        mock_user_repository.find_by_username.return_value = make_user()
+        token = authenticator.create_access_token({"sub": "test_user"})
+
+        user = await authenticator.get_current_user(token)
+
+        assert user.username == "test_user"
+        mock_user_repository.find_by_id.assert_not_awaited()
+
+    async def test_renamed_user_is_rejected(self, authenticator, mock_user_repository):
+        """A token issued under another username doesn't authenticate."""
+        token = authenticator.create_access_token(
+            {"sub": "old_name", "uid": "test_user_id"}
+        )
+
+        with pytest.raises(HTTPException) as exc_info:
+            await authenticator.get_current_user(token)
+
+        assert exc_info.value.status_code == 401
@@ -1,4 +1,4 @@
-from typing import Any, Optional
+from typing import Any, Callable, Optional
 
 from app.interfaces.services.agent_base_interface import AgentBaseInterface
 
@@ -32,3 +32,57 @@ class AgentSimpleChatUseCase:
         return self.agent.chat(
             prompt=message, output_pydantic=output_pydantic, output_json=output_json
         )
+
+    def execute_stream(
+        self,
+        message: str,
+        on_token: Callable[[str], None],
+        output_json: Optional[bool] = None,
+    ) -> str:
+        """
+        Execute the use case streaming the response
+
+        Args:
+            message: The message to send to the agent
+            on_token: Called with every chunk of the response as it is generated
+            output_json: Optional boolean to request JSON output
+        """
+        return self.agent.stream_chat(
+            prompt=message, on_token=on_token, output_json=output_json
+        )
+
+    async def aexecute(
+        self,
+        message: str,
+        output_pydantic: Optional[Any] = None,
+        output_json: Optional[bool] = None,
+    ) -> Any:
+        """
+        Execute the use case without blocking the event loop
+
+        Args:
+            message: The message to send to the agent
+            output_pydantic: Optional Pydantic model for structured output
+            output_json: Optional boolean to request JSON output
+        """
+        return await self.agent.achat(
+            prompt=message, output_pydantic=output_pydantic, output_json=output_json
+        )
+
+    async def aexecute_stream(
+        self,
+        message: str,
+        on_token: Callable[[str], None],
+        output_json: Optional[bool] = None,
+    ) -> str:
+        """
+        Execute the use case streaming the response without blocking the event loop
+
+        Args:
+            message: The message to send to the agent
+            on_token: Called with every chunk of the response as it is generated
+            output_json: Optional boolean to request JSON output
+        """
+        return await self.agent.astream_chat(
+            prompt=message, on_token=on_token, output_json=output_json
+        )
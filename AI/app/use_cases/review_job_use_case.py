@@ -0,0 +1,206 @@
+import asyncio
+import uuid
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from app.core.models.review import Review
+from app.core.models.review_job import JobStatus, ReviewJob
+from app.interfaces.repositories.review_job_repository_interface import (
+    ReviewJobRepositoryInterface,
+)
+from app.interfaces.services.review_scheduler_interface import (
+    ReviewSchedulerInterface,
+)
+
+# Scheduled jobs a worker tries to lease before giving up until the next poll
+CLAIM_ATTEMPTS = 3
+
+
+class ReviewJobUseCase:
+    def __init__(
+        self,
+        review_job_repository: ReviewJobRepositoryInterface,
+        scheduler: Optional[ReviewSchedulerInterface] = None,
+    ):
+        self.review_job_repository = review_job_repository
+        self.scheduler = scheduler
+
+    async def enqueue_review(
+        self,
+        review: Review,
+        max_attempts: int,
+        fingerprint: Optional[str] = None,
+        max_coalesced: int = 0,
+        timeout_seconds: int = 0,
+    ) -> ReviewJob:
+        """
+        Enqueue a review. With a fingerprint (the review cache key), a review
+        identical to an in-flight job is attached to that job instead, so that
+        a single LLM call completes both. Returns the job that runs the review.
+        """
+        if fingerprint and max_coalesced:
+            job = await self.review_job_repository.attach(
+                fingerprint, [str(review.id)], max_coalesced
+            )
+            if job:
+                return job
+
+        job = ReviewJob(
+            review_id=str(review.id),
+            user=review.user,
+            language=review.language,
+            max_attempts=max_attempts,
+            estimated_tokens=review.estimated_tokens or 0,
+            timeout_seconds=timeout_seconds,
+            fingerprint=fingerprint,
+        )
+        return await self.review_job_repository.enqueue(job)
+
+    async def enqueue_batch(
+        self,
+        reviews: List[Review],
+        max_attempts: int,
+        concurrency: int,
+        fingerprints: Optional[List[Optional[str]]] = None,
+        max_coalesced: int = 0,
+        timeout_seconds: int = 0,
+    ) -> List[ReviewJob]:
+        """
+        Enqueue reviews so that at most concurrency of them run at once.
+        Identical reviews, within the batch or with an in-flight job, are
+        coalesced like in enqueue_review. Returns the new jobs.
+        """
+        groups: Dict[str, List[Review]] = {}
+        for index, (review, fingerprint) in enumerate(
+            zip(reviews, fingerprints or [None] * len(reviews))
+        ):
+            # Reviews without a fingerprint are never coalesced
+            key = fingerprint if fingerprint and max_coalesced else f"#{index}"
+            groups.setdefault(key, []).append(review)
+
+        attached = await asyncio.gather(
+            *(
+                self.review_job_repository.attach(
+                    key, [str(review.id) for review in group], max_coalesced
+                )
+                for key, group in groups.items()
+                if not key.startswith("#") and len(group) <= max_coalesced
+            )
+        )
+        attached_keys = {job.fingerprint for job in attached if job}
+
+        batch_id = uuid.uuid4().hex
+        jobs: List[ReviewJob] = []
+        for key, group in groups.items():
+            if key in attached_keys:
+                continue
+            # One job per max_coalesced + 1 identical reviews
+            for start in range(0, len(group), max_coalesced + 1):
+                leader, *followers = group[start : start + max_coalesced + 1]
+                jobs.append(
+                    ReviewJob(
+                        review_id=str(leader.id),
+                        user=leader.user,
+                        language=leader.language,
+                        max_attempts=max_attempts,
+                        status=(
+                            JobStatus.QUEUED
+                            if len(jobs) < concurrency
+                            else JobStatus.HELD
+                        ),
+                        batch_id=batch_id,
+                        batch_concurrency=concurrency,
+                        estimated_tokens=leader.estimated_tokens or 0,
+                        timeout_seconds=timeout_seconds,
+                        fingerprint=None if key.startswith("#") else key,
+                        coalesced_review_ids=[
+                            str(review.id) for review in followers
+                        ],
+                    )
+                )
+
+        if not jobs:
+            return []
+        return await self.review_job_repository.enqueue_many(jobs)
+
+    async def release_batch(self, job: ReviewJob) -> int:
+        """Free the batch slot of a finished job for the next held job"""
+        if not job.batch_id or not job.batch_concurrency:
+            return 0
+        return await self.review_job_repository.release_batch(
+            job.batch_id, job.batch_concurrency
+        )
+
+    async def claim_job(self, worker_id: str, lease_seconds: int) -> Optional[ReviewJob]:
+        """Lease the next job, in scheduler order if there is a scheduler"""
+        if self.scheduler is None:
+            return await self.review_job_repository.claim(worker_id, lease_seconds)
+
+        candidates = await self.review_job_repository.find_claimable(
+            self.scheduler.candidates_per_user, self.scheduler.max_users
+        )
+        if not candidates:
+            return None
+
+        in_flight = await self.review_job_repository.count_in_flight_by_user()
+        scheduled = self.scheduler.order(
+            candidates, in_flight, datetime.utcnow(), CLAIM_ATTEMPTS
+        )
+        for job in scheduled:
+            # Another worker may have leased it since it was read
+            claimed = await self.review_job_repository.claim_by_id(
+                job.id, worker_id, lease_seconds
+            )
+            if claimed:
+                return claimed
+        return None
+
+    async def extend_lease(
+        self, job_id: str, worker_id: str, lease_seconds: int
+    ) -> bool:
+        return await self.review_job_repository.extend_lease(
+            job_id, worker_id, lease_seconds
+        )
+
+    async def complete_job(self, job_id: str, worker_id: str) -> bool:
+        return await self.review_job_repository.ack(job_id, worker_id)
+
+    async def close_coalescing(
+        self, job_id: str, worker_id: str
+    ) -> Optional[ReviewJob]:
+        return await self.review_job_repository.close_coalescing(job_id, worker_id)
+
+    async def cancel_review_job(self, review_id: str) -> Optional[ReviewJob]:
+        """
+        Cancel the job of a cancelled review so that no worker starts it and the
+        worker running it aborts the LLM call. Jobs other reviews are coalesced
+        with keep running for them.
+        """
+        job = await self.review_job_repository.cancel(review_id)
+        if job:
+            # A held job of its batch can take the freed slot
+            await self.release_batch(job)
+        return job
+
+    async def find_cancelled_jobs(self, job_ids: List[str]) -> List[str]:
+        if not job_ids:
+            return []
+        return await self.review_job_repository.find_cancelled(job_ids)
+
+    async def get_jobs_of_review(self, review_id: str) -> List[ReviewJob]:
+        return await self.review_job_repository.find_by_review(review_id)
+
+    async def fail_expired_job(self, job: ReviewJob, error: str) -> bool:
+        """Fail a job no worker will reclaim and free its batch slot"""
+        if not await self.review_job_repository.fail_expired(job.id, error):
+            return False
+        await self.release_batch(job)
+        return True
+
+    async def fail_job(
+        self, job_id: str, worker_id: str, error: str, retry_delay_seconds: int
+    ) -> Optional[ReviewJob]:
+        return await self.review_job_repository.nack(
+            job_id, worker_id, error, retry_delay_seconds
+        )
+
@@ -14,12 +14,30 @@ class ReviewUseCase:
     async def create_review(self, review: Review) -> Review:
         return await self.review_repository.create(review)
 
+    async def create_reviews(self, reviews: List[Review]) -> List[Review]:
+        return await self.review_repository.create_many(reviews)
+
     async def update_review(self, review: Review) -> Review:
         return await self.review_repository.update(review)
 
     async def delete_review(self, review_id: str) -> bool:
         return await self.review_repository.delete(review_id)
 
+    async def cancel_review(self, review_id: str) -> Optional[Review]:
+        return await self.review_repository.cancel(review_id)
+
+    async def get_overdue_reviews(
+        self, now: datetime, created_before: datetime, limit: int
+    ) -> List[Review]:
+        return await self.review_repository.find_overdue(now, created_before, limit)
+
+    async def extend_review_deadline(
+        self, review: Review, deadline_at: datetime
+    ) -> bool:
+        return await self.review_repository.extend_deadline(
+            str(review.id), review.deadline_at, deadline_at
+        )
+
     async def get_review_by_id(self, review_id: str) -> Optional[Review]:
         return await self.review_repository.find_by_id(review_id)
 
@@ -0,0 +1,66 @@
+"""
+Review worker entry point.
+
+Consumes the persistent review job queue outside the API process:
+
+    python -m app.worker --concurrency 8
+
+Scale review throughput by running more worker processes.
+"""
+
+import argparse
+import asyncio
+import signal
+from typing import Optional
+
+from app.infrastructure.db.main import close_database_connection, initialize_database
+from app.infrastructure.dependencies import (
+    get_maintenance_lease_repository,
+    get_review_cache_repository,
+    get_review_job_repository,
+    get_review_repository,
+    get_review_stream_repository,
+)
+from app.infrastructure.jobs.worker import ReviewWorker
+from app.infrastructure.logger import logger
+
+
+async def run_worker(concurrency: Optional[int] = None) -> None:
+    await initialize_database()
+
+    worker = ReviewWorker(
+        review_repository=get_review_repository(),
+        review_job_repository=get_review_job_repository(),
+        review_cache_repository=get_review_cache_repository(),
+        review_stream_repository=get_review_stream_repository(),
+        concurrency=concurrency,
+        maintenance_lease_repository=get_maintenance_lease_repository(),
+    )
+
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, worker.stop)
+
+    try:
+        await worker.run()
+    except Exception as e:
+        logger.error(f"Review worker crashed: {str(e)}")
+        raise
+    finally:
+        await close_database_connection()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Run review job consumers")
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=None,
+        help="Number of concurrent consumers (defaults to WORKER_CONCURRENCY)",
+    )
+    args = parser.parse_args()
+    asyncio.run(run_worker(args.concurrency))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""
+Benchmark of parsing LLM review responses.
+
+Runs the legacy parser (strip a leading markdown fence, then json.loads) and
+the tolerant extractor over a corpus of real-world shaped model outputs and
+reports the parse success rate and per-response latency of each:
+
+    python benchmarks/json_extraction.py --corpus benchmarks/data/review_responses.jsonl
+"""
+
+import argparse
+import json
+import statistics
+import time
+from pathlib import Path
+
+from app.core.models.review import CodeReviewIAResponse
+from app.infrastructure.utils.json_extractor import parse_code_review
+
+DEFAULT_CORPUS = Path(__file__).parent / "data" / "review_responses.jsonl"
+
+
+def legacy_parse(response):
+    """The parser reviews used before the tolerant extractor"""
+    try:
+        cleaned = response.strip()
+        if cleaned.startswith("```"):
+            first_newline = cleaned.find("\n")
+            if first_newline != -1:
+                cleaned = cleaned[first_newline + 1 :]
+            if cleaned.endswith("```"):
+                cleaned = cleaned[:-3]
+            cleaned = cleaned.strip()
+        data = json.loads(cleaned)
+        if not isinstance(data, dict):
+            return None
+        return CodeReviewIAResponse(**data)
+    except (ValueError, TypeError):
+        return None
+
+
+def bench(parse, responses, repeat):
+    durations = []
+    for _ in range(repeat):
+        for _, response in responses:
+            started = time.perf_counter()
+            parse(response)
+            durations.append(time.perf_counter() - started)
+    failures = [name for name, response in responses if parse(response) is None]
+    return durations, failures
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--corpus", type=Path, default=DEFAULT_CORPUS)
+    parser.add_argument("--repeat", type=int, default=1000)
+    args = parser.parse_args()
+
+    with args.corpus.open() as corpus:
+        entries = [json.loads(line) for line in corpus if line.strip()]
+    responses = [(entry["name"], entry["response"]) for entry in entries]
+
+    for label, parse in (("legacy", legacy_parse), ("extractor", parse_code_review)):
+        durations, failures = bench(parse, responses, args.repeat)
+        parsed = len(responses) - len(failures)
+        print(
+            f"{label}: parsed {parsed}/{len(responses)} "
+            f"({parsed / len(responses):.0%}), "
+            f"mean {statistics.mean(durations) * 1e6:.1f} us, "
+            f"max {max(durations) * 1e6:.1f} us per response"
+        )
+        print(f"  failed: {', '.join(failures) or '-'}")
+
+
+if __name__ == "__main__":
+    main()
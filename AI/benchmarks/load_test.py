@@ -0,0 +1,376 @@
+"""
+End-to-end load test of the review pipeline.
+
+Submits reviews with Poisson arrivals at --rate per second while listing
+reviews at --list-rate per second, follows every review until the worker
+completes it, and reports throughput and p50/p95/p99 latency of
+POST /reviews, GET /reviews and time-to-completion. With --spawn it starts
+the mock LLM server, the real API (app.main:app) and review workers against
+it, otherwise it targets a running API at --api-url. MongoDB must be reachable
+at MONGODB_URL either way:
+
+    python benchmarks/load_test.py --spawn --rate 5 --duration 60 --mock-args="--latency lognormal:2,0.5"
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import shlex
+import subprocess
+import sys
+import time
+import uuid
+from collections import Counter, defaultdict
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import httpx
+
+AI_ROOT = Path(__file__).resolve().parent.parent
+TERMINAL_STATUSES = {"completed", "rejected"}
+
+SNIPPET = '''import sqlite3
+
+
+def {name}(db_path, user_id, items=[]):
+    """Load the orders of a user and total them"""
+    connection = sqlite3.connect(db_path)
+    rows = connection.execute(
+        f"SELECT price, quantity FROM orders WHERE user_id = {{user_id}}"
+    ).fetchall()
+    total = 0
+    for price, quantity in rows:
+        if quantity > {threshold}:
+            total += price * quantity * 0.9
+        else:
+            total += price * quantity
+    items.append(total)
+    return total
+'''
+
+
+def percentile(samples, fraction):
+    ordered = sorted(samples)
+    return ordered[min(int(len(ordered) * fraction), len(ordered) - 1)]
+
+
+class Recorder:
+    """Latencies and outcomes of every operation"""
+
+    def __init__(self):
+        self.latencies: Dict[str, List[float]] = defaultdict(list)
+        self.outcomes: Dict[str, Counter] = defaultdict(Counter)
+
+    def record(self, operation: str, seconds: float, outcome) -> None:
+        self.outcomes[operation][str(outcome)] += 1
+        self.latencies[operation].append(seconds)
+
+    def summary(self, elapsed: float) -> Dict[str, dict]:
+        summary = {}
+        for operation, latencies in self.latencies.items():
+            outcomes = self.outcomes[operation]
+            successes = outcomes["200"] + outcomes["completed"]
+            summary[operation] = {
+                "count": len(latencies),
+                "outcomes": dict(outcomes),
+                "throughput_per_second": round(successes / elapsed, 2),
+                **{
+                    f"p{int(fraction * 100)}_ms": round(
+                        percentile(latencies, fraction) * 1000, 1
+                    )
+                    for fraction in (0.5, 0.95, 0.99)
+                },
+                "max_ms": round(max(latencies) * 1000, 1),
+            }
+        return summary
+
+
+class LoadTest:
+    def __init__(self, args: argparse.Namespace):
+        self.args = args
+        self.rng = random.Random(args.seed)
+        self.recorder = Recorder()
+        self.base = f"{args.api_url.rstrip('/')}{args.api_prefix}"
+        self.run_id = uuid.uuid4().hex[:8]
+        self.tokens: List[str] = []
+        self.followers: List[asyncio.Task] = []
+
+    async def run(self) -> Dict[str, dict]:
+        limits = httpx.Limits(max_connections=self.args.max_connections)
+        async with httpx.AsyncClient(
+            timeout=self.args.request_timeout, limits=limits
+        ) as client:
+            self.tokens = [
+                await self._login(client, index) for index in range(self.args.users)
+            ]
+
+            started = time.perf_counter()
+            await asyncio.gather(
+                self._arrivals(self.args.rate, lambda: self._submit(client)),
+                self._arrivals(self.args.list_rate, lambda: self._list(client)),
+            )
+            # Reviews still queued or running when submissions stop
+            await asyncio.gather(*self.followers)
+            elapsed = time.perf_counter() - started
+
+        return self.recorder.summary(elapsed)
+
+    async def _login(self, client: httpx.AsyncClient, index: int) -> str:
+        username = f"load_{self.run_id}_{index}"
+        password = uuid.uuid4().hex
+        response = await client.post(
+            f"{self.base}/register",
+            json={
+                "username": username,
+                "email": f"{username}@example.com",
+                "password": password,
+            },
+        )
+        response.raise_for_status()
+        response = await client.post(
+            f"{self.base}/login",
+            json={"username": username, "password": password},
+        )
+        response.raise_for_status()
+        return response.json()["access_token"]
+
+    async def _arrivals(self, rate: float, start) -> None:
+        """Start requests with exponential inter-arrival times until the deadline"""
+        if rate <= 0:
+            return
+        deadline = time.perf_counter() + self.args.duration
+        in_flight = set()
+        while True:
+            await asyncio.sleep(self.rng.expovariate(rate))
+            if time.perf_counter() >= deadline:
+                break
+            # Open loop: arrivals don't wait for earlier requests to finish
+            task = asyncio.create_task(start())
+            in_flight.add(task)
+            task.add_done_callback(in_flight.discard)
+        await asyncio.gather(*in_flight)
+
+    def _headers(self) -> Dict[str, str]:
+        return {"Authorization": f"Bearer {self.rng.choice(self.tokens)}"}
+
+    def _code(self) -> str:
+        # Repeated snippets exercise the review cache and coalescing
+        if self.rng.random() < self.args.duplicate_ratio:
+            name = "load_duplicate"
+        else:
+            name = f"load_{uuid.uuid4().hex}"
+        return SNIPPET.format(name=name, threshold=self.rng.randint(1, 1000))
+
+    async def _submit(self, client: httpx.AsyncClient) -> None:
+        headers = self._headers()
+        started = time.perf_counter()
+        try:
+            response = await client.post(
+                f"{self.base}/reviews",
+                json={"language": self.args.language, "code_submission": self._code()},
+                headers=headers,
+            )
+        except httpx.HTTPError as e:
+            self.recorder.record(
+                "POST /reviews", time.perf_counter() - started, type(e).__name__
+            )
+            return
+        self.recorder.record(
+            "POST /reviews", time.perf_counter() - started, response.status_code
+        )
+
+        body = response.json() if response.status_code == 200 else {}
+        if "review_id" in body:
+            self.followers.append(
+                asyncio.create_task(
+                    self._follow(client, body["review_id"], headers, started)
+                )
+            )
+
+    async def _follow(
+        self,
+        client: httpx.AsyncClient,
+        review_id: str,
+        headers: Dict[str, str],
+        started: float,
+    ) -> None:
+        """Poll a review until it is completed or rejected"""
+        deadline = started + self.args.completion_timeout
+        status = None
+        while time.perf_counter() < deadline:
+            try:
+                response = await client.get(
+                    f"{self.base}/reviews/{review_id}", headers=headers
+                )
+                status = response.json().get("status")
+            except (httpx.HTTPError, ValueError):
+                status = None
+            if status in TERMINAL_STATUSES:
+                break
+            await asyncio.sleep(self.args.poll_interval)
+
+        self.recorder.record(
+            "time-to-completion",
+            time.perf_counter() - started,
+            status if status in TERMINAL_STATUSES else "timeout",
+        )
+
+    async def _list(self, client: httpx.AsyncClient) -> None:
+        started = time.perf_counter()
+        try:
+            response = await client.get(f"{self.base}/reviews", headers=self._headers())
+            outcome = response.status_code
+        except httpx.HTTPError as e:
+            outcome = type(e).__name__
+        self.recorder.record("GET /reviews", time.perf_counter() - started, outcome)
+
+
+def spawn(args: argparse.Namespace) -> List[subprocess.Popen]:
+    """Start the mock LLM server, the API and the review workers"""
+    mock_url = f"http://127.0.0.1:{args.mock_port}"
+    env = {
+        **os.environ,
+        "PYTHONPATH": str(AI_ROOT),
+        "AI_PROVIDER": "openai/",
+        "AI_MODEL": "mock",
+        "OPENAI_API_KEY": "mock",
+        "OPENAI_BASE_URL": f"{mock_url}/v1",
+        "AGENT_BACKEND": args.agent_backend,
+        "RATE_LIMIT_ENABLED": "false",
+    }
+    if not args.dedup:
+        # Every submission reaches the LLM unless asked otherwise
+        env.update(
+            {
+                "REVIEW_CACHE_ENABLED": "false",
+                "NEAR_DUPLICATE_ENABLED": "false",
+                "REVIEW_COALESCING_ENABLED": "false",
+            }
+        )
+
+    commands = [
+        [
+            sys.executable,
+            str(AI_ROOT / "benchmarks" / "mock_llm_server.py"),
+            "--port",
+            str(args.mock_port),
+            *shlex.split(args.mock_args),
+        ],
+        [
+            sys.executable,
+            "-m",
+            "uvicorn",
+            "app.main:app",
+            "--port",
+            str(args.api_port),
+            "--log-level",
+            "warning",
+        ],
+    ]
+    worker = [sys.executable, "-m", "app.worker"]
+    if args.worker_concurrency:
+        worker += ["--concurrency", str(args.worker_concurrency)]
+    commands += [worker] * args.workers
+
+    processes = [
+        subprocess.Popen(command, cwd=AI_ROOT, env=env) for command in commands
+    ]
+    wait_until_up(f"{mock_url}/stats")
+    wait_until_up(f"{args.api_url.rstrip('/')}{args.api_prefix}/health")
+    return processes
+
+
+def wait_until_up(url: str, timeout: float = 60) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            if httpx.get(url, timeout=2).status_code == 200:
+                return
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.5)
+    raise RuntimeError(f"{url} did not come up within {timeout:.0f}s")
+
+
+def print_report(summary: Dict[str, dict], mock_stats: Optional[dict]) -> None:
+    for operation, stats in summary.items():
+        print(
+            f"{operation}: {stats['count']} requests, "
+            f"{stats['throughput_per_second']}/s successful, "
+            f"p50 {stats['p50_ms']} ms, p95 {stats['p95_ms']} ms, "
+            f"p99 {stats['p99_ms']} ms, max {stats['max_ms']} ms"
+        )
+        print(f"  outcomes: {stats['outcomes']}")
+    if mock_stats:
+        print(f"mock LLM: {mock_stats}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--api-url", default="http://127.0.0.1:8000")
+    parser.add_argument("--api-prefix", default="/api")
+    parser.add_argument("--rate", type=float, default=2.0, help="Reviews per second")
+    parser.add_argument(
+        "--list-rate", type=float, default=1.0, help="GET /reviews per second"
+    )
+    parser.add_argument("--duration", type=float, default=60.0)
+    parser.add_argument("--users", type=int, default=5)
+    parser.add_argument("--language", default="python")
+    parser.add_argument(
+        "--duplicate-ratio",
+        type=float,
+        default=0.0,
+        help="Share of submissions repeating the same code",
+    )
+    parser.add_argument("--poll-interval", type=float, default=0.5)
+    parser.add_argument("--completion-timeout", type=float, default=300.0)
+    parser.add_argument("--request-timeout", type=float, default=30.0)
+    parser.add_argument("--max-connections", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--output", type=Path, help="Write the summary as JSON")
+
+    spawned = parser.add_argument_group("spawned pipeline")
+    spawned.add_argument(
+        "--spawn",
+        action="store_true",
+        help="Start the mock LLM server, the API and workers",
+    )
+    spawned.add_argument("--mock-port", type=int, default=9000)
+    spawned.add_argument("--mock-args", default="", help="Mock LLM server options")
+    spawned.add_argument("--api-port", type=int, default=8000)
+    spawned.add_argument("--workers", type=int, default=1)
+    spawned.add_argument("--worker-concurrency", type=int, default=None)
+    spawned.add_argument("--agent-backend", default="openai")
+    spawned.add_argument(
+        "--dedup",
+        action="store_true",
+        help="Keep the review cache, near-duplicates and coalescing enabled",
+    )
+    args = parser.parse_args()
+
+    processes = []
+    mock_stats = None
+    if args.spawn:
+        args.api_url = f"http://127.0.0.1:{args.api_port}"
+        processes = spawn(args)
+    try:
+        summary = asyncio.run(LoadTest(args).run())
+        if args.spawn:
+            mock_stats = httpx.get(f"http://127.0.0.1:{args.mock_port}/stats").json()
+    finally:
+        for process in processes:
+            process.terminate()
+        for process in processes:
+            process.wait(timeout=30)
+
+    print_report(summary, mock_stats)
+    if args.output:
+        args.output.write_text(
+            json.dumps({"summary": summary, "mock_llm": mock_stats}, indent=2)
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+"""
+Benchmark of login throughput with bcrypt on the event loop or the process pool.
+
+Runs --logins concurrent logins through AuthenticatorJWT.authenticate_user
+against an in-memory user, once verifying passwords inline on the event loop
+(the previous behavior) and once on the password hasher pool. Reports logins
+per second, p50/p95/p99 login latency and the worst event loop stall seen by a
+10 ms ticker, which is what every other request on the API process waits:
+
+    python benchmarks/login_throughput.py --logins 200 --concurrency 32
+"""
+
+import argparse
+import asyncio
+import json
+import time
+from unittest.mock import MagicMock
+
+from passlib.context import CryptContext
+
+from app.core.models.user import User
+from app.infrastructure.services.authenticator_jwt import AuthenticatorJWT
+from app.infrastructure.services.password_hasher import PasswordHasher
+
+PASSWORD = "correct horse battery staple"
+TICK_SECONDS = 0.01
+
+
+def percentile(samples, fraction):
+    ordered = sorted(samples)
+    return ordered[min(int(len(ordered) * fraction), len(ordered) - 1)]
+
+
+class InMemoryUserRepository:
+    def __init__(self, user):
+        self.user = user
+
+    async def find_by_username(self, username):
+        return self.user if username == self.user.username else None
+
+
+class InlineAuthenticator(AuthenticatorJWT):
+    """Verifies passwords on the event loop, as before the hasher pool"""
+
+    async def verify_password(self, plain_password, hashed_password):
+        return self.pwd_context.verify(plain_password, hashed_password)
+
+
+async def measure_loop_lag(stop: asyncio.Event, lags: list) -> None:
+    while not stop.is_set():
+        started = time.perf_counter()
+        await asyncio.sleep(TICK_SECONDS)
+        lags.append(time.perf_counter() - started - TICK_SECONDS)
+
+
+async def bench(authenticator, logins: int, concurrency: int) -> dict:
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies = []
+
+    async def login():
+        started = time.perf_counter()
+        async with semaphore:
+            user = await authenticator.authenticate_user("bench_user", PASSWORD)
+            latencies.append(time.perf_counter() - started)
+            assert user is not None
+
+    # Start the pool processes outside of the measurement
+    await authenticator.authenticate_user("bench_user", PASSWORD)
+
+    stop, lags = asyncio.Event(), []
+    ticker = asyncio.create_task(measure_loop_lag(stop, lags))
+    started = time.perf_counter()
+    await asyncio.gather(*(login() for _ in range(logins)))
+    elapsed = time.perf_counter() - started
+    stop.set()
+    await ticker
+
+    return {
+        "logins_per_second": round(logins / elapsed, 2),
+        **{
+            f"p{int(fraction * 100)}_ms": round(
+                percentile(latencies, fraction) * 1000, 1
+            )
+            for fraction in (0.5, 0.95, 0.99)
+        },
+        "max_loop_stall_ms": round(max(lags, default=0.0) * 1000, 1),
+    }
+
+
+async def main(args) -> None:
+    pwd_context = CryptContext(
+        schemes=["bcrypt"], deprecated="auto", bcrypt__rounds=args.rounds
+    )
+    user = User(
+        id="bench_user_id",
+        username="bench_user",
+        email="bench@example.com",
+        hashed_password=pwd_context.hash(PASSWORD),
+    )
+    repository = InMemoryUserRepository(user)
+    hasher = PasswordHasher()
+    hasher.max_pending = max(hasher.max_pending, args.concurrency)
+
+    results = {}
+    for name, authenticator_class in (
+        ("inline", InlineAuthenticator),
+        ("process_pool", AuthenticatorJWT),
+    ):
+        authenticator = authenticator_class(MagicMock(), pwd_context, repository)
+        results[name] = await bench(authenticator, args.logins, args.concurrency)
+    results["process_pool"]["workers"] = hasher.max_workers
+    hasher.shutdown()
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--logins", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--rounds", type=int, default=12, help="bcrypt cost factor")
+    asyncio.run(main(parser.parse_args()))
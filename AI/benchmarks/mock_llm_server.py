@@ -0,0 +1,309 @@
+"""
+Local OpenAI-compatible stand-in for load testing the review pipeline.
+
+Serves /chat/completions (plain and streamed) with canned reviews that
+validate as CodeReviewIAResponse, after a latency drawn from a configurable
+distribution, and injects provider errors, malformed responses and hung
+requests at the given rates. Point OPENAI_BASE_URL at it:
+
+    python benchmarks/mock_llm_server.py --port 9000 --latency lognormal:1.5,0.6 --error-rate 0.02
+
+Latency distributions, in seconds: constant:S, uniform:LOW,HIGH,
+normal:MEAN,STDDEV, lognormal:MEDIAN,SIGMA and exponential:MEAN. Counters
+are served at /stats and reset with DELETE /stats.
+"""
+
+import argparse
+import asyncio
+import hashlib
+import json
+import math
+import random
+import re
+import time
+import uuid
+from collections import Counter
+from typing import Any, Callable, Dict, List, Optional
+
+import uvicorn
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, StreamingResponse
+
+from app.core.models.review import CodeReviewIAResponse
+from app.infrastructure.utils.token_estimator import estimate_tokens
+
+CANNED_REVIEWS = [
+    {
+        "overall_score": 8,
+        "category": "performance",
+        "security_assessment": {"risk_level": "none", "concerns": []},
+        "suggestions": (
+            "The code is readable and correct. Build the result with a list "
+            "comprehension instead of appending in a loop, and return early "
+            "for empty inputs to skip the work entirely."
+        ),
+        "refactored_example": "def process(items):\n    return [item * 2 for item in items if item]",
+    },
+    {
+        "overall_score": 4,
+        "category": "security",
+        "security_assessment": {
+            "risk_level": "high",
+            "concerns": [
+                "User input is interpolated into a SQL query",
+                "Credentials are hardcoded in the source",
+            ],
+        },
+        "suggestions": (
+            "Use parameterized queries for every database call and read "
+            "credentials from the environment or a secret manager. Validate "
+            "input lengths before processing them."
+        ),
+        "refactored_example": 'cursor.execute("SELECT * FROM users WHERE id = %s", (user_id,))',
+    },
+    {
+        "overall_score": 6,
+        "category": "syntax",
+        "security_assessment": {
+            "risk_level": "low",
+            "concerns": ["Broad exception handlers hide failures"],
+        },
+        "suggestions": (
+            "Catch specific exceptions instead of a bare except, name "
+            "variables after what they hold and split the long function into "
+            "smaller helpers with a single responsibility each."
+        ),
+        "refactored_example": None,
+    },
+]
+
+MALFORMED_RESPONSE = (
+    "Sure! Here is my review of your code. Overall it looks fine, "
+    "but consider adding more tests."
+)
+
+TOKEN_PATTERN = re.compile(r"\S+\s*|\s+")
+
+
+def latency_sampler(spec: str, rng: random.Random) -> Callable[[], float]:
+    """Sampler of request latencies in seconds from a name:args spec"""
+    name, _, raw_args = spec.partition(":")
+    args = [float(arg) for arg in raw_args.split(",") if arg]
+    samplers = {
+        "constant": lambda seconds: seconds,
+        "uniform": lambda low, high: rng.uniform(low, high),
+        "normal": lambda mean, stddev: max(rng.gauss(mean, stddev), 0.0),
+        "lognormal": lambda median, sigma: rng.lognormvariate(
+            math.log(median), sigma
+        ),
+        "exponential": lambda mean: rng.expovariate(1 / mean),
+    }
+    if name not in samplers:
+        raise ValueError(f"Unknown latency distribution {name!r}")
+    sample = samplers[name]
+    sample(*args)  # Fail on startup for a wrong number of arguments
+    return lambda: sample(*args)
+
+
+class MockLLM:
+    """Behaviour and counters of the mock provider"""
+
+    def __init__(self, args: argparse.Namespace):
+        self.args = args
+        self.rng = random.Random(args.seed)
+        self.latency = latency_sampler(args.latency, self.rng)
+        self.error_statuses = [int(code) for code in args.error_status.split(",")]
+        self.in_flight = 0
+        self.stats: Counter = Counter()
+
+    def review_for(self, prompt: str) -> str:
+        """Canned review JSON, the same one for the same prompt"""
+        digest = hashlib.sha256(prompt.encode()).digest()
+        review = CANNED_REVIEWS[digest[0] % len(CANNED_REVIEWS)]
+        return CodeReviewIAResponse(**review).model_dump_json()
+
+    def outcome(self) -> str:
+        """Draw what happens to a request: ok, error, malformed or hang"""
+        if self.args.max_concurrency and self.in_flight > self.args.max_concurrency:
+            return "rate_limited"
+        draw = self.rng.random()
+        for outcome, rate in (
+            ("error", self.args.error_rate),
+            ("malformed", self.args.malformed_rate),
+            ("hang", self.args.hang_rate),
+        ):
+            if draw < rate:
+                return outcome
+            draw -= rate
+        return "ok"
+
+    def error_response(self, status: int) -> JSONResponse:
+        self.stats[f"errors_{status}"] += 1
+        headers = (
+            {"Retry-After": str(self.args.retry_after)}
+            if status in (429, 503)
+            else None
+        )
+        return JSONResponse(
+            status_code=status,
+            content={"error": {"message": f"Mock error {status}", "code": status}},
+            headers=headers,
+        )
+
+
+def create_app(mock: MockLLM) -> FastAPI:
+    app = FastAPI(title="Mock LLM")
+
+    @app.post("/chat/completions")
+    @app.post("/v1/chat/completions")
+    async def chat_completions(request: Request):
+        payload = await request.json()
+        messages: List[Dict[str, Any]] = payload.get("messages") or []
+        prompt = str(messages[-1].get("content", "")) if messages else ""
+        model = payload.get("model", "mock")
+
+        mock.in_flight += 1
+        mock.stats["requests"] += 1
+        mock.stats["max_in_flight"] = max(mock.stats["max_in_flight"], mock.in_flight)
+        try:
+            outcome = mock.outcome()
+            if outcome == "rate_limited":
+                return mock.error_response(429)
+
+            await asyncio.sleep(mock.latency())
+            if outcome == "error":
+                return mock.error_response(mock.rng.choice(mock.error_statuses))
+            if outcome == "hang":
+                mock.stats["hangs"] += 1
+                await asyncio.sleep(mock.args.hang_seconds)
+                return mock.error_response(504)
+
+            if outcome == "malformed":
+                mock.stats["malformed"] += 1
+                content = MALFORMED_RESPONSE
+            else:
+                content = mock.review_for(prompt)
+
+            if payload.get("stream"):
+                mock.stats["streamed"] += 1
+                # The slot is released once the stream ends
+                mock.in_flight += 1
+                return StreamingResponse(
+                    stream_chunks(mock, model, content),
+                    media_type="text/event-stream",
+                )
+
+            await asyncio.sleep(
+                mock.args.ms_per_token / 1000 * estimate_tokens(content)
+            )
+            mock.stats["completed"] += 1
+            return completion(model, content, prompt)
+        finally:
+            mock.in_flight -= 1
+
+    @app.get("/models")
+    @app.get("/v1/models")
+    async def models():
+        return {"object": "list", "data": [{"id": "mock", "object": "model"}]}
+
+    @app.get("/stats")
+    async def stats():
+        return {"in_flight": mock.in_flight, **mock.stats}
+
+    @app.delete("/stats")
+    async def reset_stats():
+        mock.stats.clear()
+        return {"in_flight": mock.in_flight}
+
+    return app
+
+
+def completion(model: str, content: str, prompt: str) -> Dict[str, Any]:
+    """Chat completions response body"""
+    prompt_tokens = estimate_tokens(prompt)
+    completion_tokens = estimate_tokens(content)
+    return {
+        "id": f"chatcmpl-{uuid.uuid4().hex}",
+        "object": "chat.completion",
+        "created": int(time.time()),
+        "model": model,
+        "choices": [
+            {
+                "index": 0,
+                "message": {"role": "assistant", "content": content},
+                "finish_reason": "stop",
+            }
+        ],
+        "usage": {
+            "prompt_tokens": prompt_tokens,
+            "completion_tokens": completion_tokens,
+            "total_tokens": prompt_tokens + completion_tokens,
+        },
+    }
+
+
+async def stream_chunks(mock: MockLLM, model: str, content: str):
+    """Server-sent chat completion chunks, one token at a time"""
+    chunk_id = f"chatcmpl-{uuid.uuid4().hex}"
+    try:
+        for token in TOKEN_PATTERN.findall(content):
+            await asyncio.sleep(mock.args.ms_per_token / 1000)
+            chunk = {
+                "id": chunk_id,
+                "object": "chat.completion.chunk",
+                "model": model,
+                "choices": [{"index": 0, "delta": {"content": token}}],
+            }
+            yield f"data: {json.dumps(chunk)}\n\n"
+        yield "data: [DONE]\n\n"
+        mock.stats["completed"] += 1
+    finally:
+        mock.in_flight -= 1
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=9000)
+    parser.add_argument(
+        "--latency",
+        default="lognormal:1.0,0.5",
+        help="Time to first token distribution, e.g. uniform:0.5,3",
+    )
+    parser.add_argument(
+        "--ms-per-token", type=float, default=2.0, help="Generation time per token"
+    )
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument(
+        "--error-status",
+        default="429,500,502,503",
+        help="Comma-separated statuses of injected errors",
+    )
+    parser.add_argument(
+        "--retry-after", type=int, default=1, help="Retry-After of 429 and 503"
+    )
+    parser.add_argument(
+        "--malformed-rate", type=float, default=0.0, help="Rate of non-JSON reviews"
+    )
+    parser.add_argument(
+        "--hang-rate", type=float, default=0.0, help="Rate of requests that hang"
+    )
+    parser.add_argument("--hang-seconds", type=float, default=120.0)
+    parser.add_argument(
+        "--max-concurrency",
+        type=int,
+        default=0,
+        help="Requests in flight above which 429 is returned, 0 for no limit",
+    )
+    parser.add_argument("--seed", type=int, default=None)
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    args = build_parser().parse_args(argv)
+    app = create_app(MockLLM(args))
+    uvicorn.run(app, host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+"""
+Benchmark of the near-duplicate MinHash/LSH index.
+
+Measures signature computation for realistic code submissions and insert /
+query cost of the in-process LSH index at a given number of stored reviews:
+
+    python benchmarks/near_duplicate_index.py --size 1000000
+"""
+
+import argparse
+import random
+import resource
+import statistics
+import time
+from array import array
+
+from app.infrastructure.services.near_duplicate_index import (
+    NUM_PERM,
+    SHINGLE_SIZE,
+)
+from app.infrastructure.utils.minhash import (
+    MAX_HASH,
+    MinHasher,
+    MinHashLSHIndex,
+    shingle_hashes,
+    tokenize_code,
+)
+
+SNIPPET = '''
+def {name}(items, limit={limit}):
+    """Return the {limit} most frequent items"""
+    counts = {{}}
+    for item in items:
+        if item is None:
+            continue
+        counts[item] = counts.get(item, 0) + 1
+    ranked = sorted(counts.items(), key=lambda pair: pair[1], reverse=True)
+    return [{var} for {var}, _ in ranked[:limit]]
+'''
+
+
+def percentile(samples, fraction):
+    ordered = sorted(samples)
+    return ordered[min(int(len(ordered) * fraction), len(ordered) - 1)]
+
+
+def perturb(signature, rng, changes):
+    """Copy of a signature with `changes` random slots replaced"""
+    copy = array("I", signature)
+    for slot in rng.sample(range(len(copy)), changes):
+        copy[slot] = rng.randint(0, MAX_HASH)
+    return copy
+
+
+def bench_signatures(hasher, count):
+    durations = []
+    for index in range(count):
+        code = SNIPPET.format(name=f"top_{index}", limit=index % 50, var=f"v{index}")
+        started = time.perf_counter()
+        hasher.signature(shingle_hashes(tokenize_code(code), SHINGLE_SIZE))
+        durations.append(time.perf_counter() - started)
+    return durations
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--size", type=int, default=1_000_000)
+    parser.add_argument("--bands", type=int, default=16)
+    parser.add_argument("--queries", type=int, default=10_000)
+    parser.add_argument("--threshold", type=float, default=0.9)
+    parser.add_argument("--languages", type=int, default=8)
+    args = parser.parse_args()
+
+    rng = random.Random(42)
+    hasher = MinHasher(num_perm=NUM_PERM)
+
+    durations = bench_signatures(hasher, 500)
+    print(
+        f"signature: mean {statistics.mean(durations) * 1e3:.2f} ms, "
+        f"p99 {percentile(durations, 0.99) * 1e3:.2f} ms per ~{len(SNIPPET)} chars"
+    )
+
+    index = MinHashLSHIndex(num_perm=NUM_PERM, bands=args.bands)
+    languages = [f"lang{number}" for number in range(args.languages)]
+    stored = []
+    rss_before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    started = time.perf_counter()
+    for number in range(args.size):
+        signature = array("I", [rng.randint(0, MAX_HASH) for _ in range(NUM_PERM)])
+        language = languages[number % len(languages)]
+        insert_started = time.perf_counter()
+        index.insert(str(number), language, signature)
+        if number % 1000 == 0:
+            stored.append((language, signature, time.perf_counter() - insert_started))
+    elapsed = time.perf_counter() - started
+
+    rss_after = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    insert_samples = [duration for _, _, duration in stored]
+    print(
+        f"insert: {args.size} signatures in {elapsed:.1f}s including generation, "
+        f"mean {statistics.mean(insert_samples) * 1e6:.1f} us, "
+        f"p99 {percentile(insert_samples, 0.99) * 1e6:.1f} us"
+    )
+    print(f"memory: ~{(rss_after - rss_before) / 1024:.0f} MB max RSS growth")
+
+    for label, changes in (("near-duplicate hit", 6), ("miss", NUM_PERM)):
+        durations = []
+        matches = 0
+        for _ in range(args.queries):
+            language, signature, _ = rng.choice(stored)
+            query = perturb(signature, rng, changes)
+            query_started = time.perf_counter()
+            if index.query(language, query, args.threshold):
+                matches += 1
+            durations.append(time.perf_counter() - query_started)
+        print(
+            f"query ({label}): mean {statistics.mean(durations) * 1e6:.1f} us, "
+            f"p99 {percentile(durations, 0.99) * 1e6:.1f} us, "
+            f"matched {matches}/{args.queries}"
+        )
+
+
+if __name__ == "__main__":
+    main()
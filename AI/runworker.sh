@@ -0,0 +1,4 @@
+#!/bin/sh
+
+# Run the review worker that consumes the review job queue
+uv run python -m app.worker